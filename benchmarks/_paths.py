@@ -0,0 +1,19 @@
+"""
+Torna os pacotes do projeto importáveis pelos scripts de benchmark,
+espelhando o mapeamento de pacotes definido em `pyproject.toml`.
+"""
+
+import sys
+
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src" / "tutorial_builder"
+
+for path in (
+    SRC,
+    SRC / "domain",
+    SRC / "application",
+    SRC / "infrastructure",
+):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
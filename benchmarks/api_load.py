@@ -0,0 +1,209 @@
+"""
+Teste de carga da API HTTP (api.py): várias sessões conversam ao mesmo tempo,
+cada mensagem é enviada com "Accept: text/event-stream" e os eventos são
+lidos até o fim da rodada. Mede o tempo até o primeiro token, a duração das
+rodadas, a vazão e a latência de /health durante a carga (o event loop não
+deve ficar bloqueado pelas rodadas).
+
+Sem URL, sobe um servidor uvicorn local com o LLM simulado
+(TUTORIAL_BUILDER_LLM=fake) em um diretório temporário; com URL, usa o
+servidor informado (ex: vários processos atrás de um balanceador de carga).
+
+Uso:
+    python benchmarks/api_load.py [sessões] [mensagens por sessão] [URL]
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import _paths
+
+import httpx
+
+PORT = 8765
+LLM_LATENCY = "0.2"
+LLM_LATENCY_PER_TOKEN = "0.005"
+HEALTH_INTERVAL = 0.05
+
+MESSAGES = ["Olá", "Quero aprender Python", "Sou iniciante", "Um projeto de CLI"]
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def start_server(workers: int, directory: str) -> subprocess.Popen:
+    paths = [str(_paths.SRC / name) for name in ("", "domain", "application")]
+    paths.append(str(_paths.SRC / "infrastructure"))
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(paths),
+        "TUTORIAL_BUILDER_LLM": "fake",
+        "FAKE_LLM_LATENCY": LLM_LATENCY,
+        "FAKE_LLM_LATENCY_PER_TOKEN": LLM_LATENCY_PER_TOKEN,
+        "WORKFLOW_WORKERS": str(workers),
+    }
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api:app",
+            "--app-dir",
+            str(_paths.SRC),
+            "--port",
+            str(PORT),
+            "--log-level",
+            "warning",
+        ],
+        cwd=directory,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+
+    raise RuntimeError("O servidor não respondeu a tempo")
+
+
+async def send_message(client: httpx.AsyncClient, session_id: str, content: str):
+    """
+    Envia uma mensagem e lê os eventos da rodada
+
+    Returns:
+        Tempo até o primeiro token, duração da rodada, quantidade de eventos
+        e dados do evento "done"
+    """
+    start = time.perf_counter()
+    first_token = None
+    events = 0
+    done = None
+    event = None
+
+    async with client.stream(
+        "POST",
+        f"/sessions/{session_id}/messages",
+        json={"content": content},
+        headers={"accept": "text/event-stream"},
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: ") :]
+            elif line.startswith("data: "):
+                events += 1
+                if event == "token" and first_token is None:
+                    first_token = time.perf_counter() - start
+                if event == "done":
+                    done = json.loads(line[len("data: ") :])
+
+    return first_token, time.perf_counter() - start, events, done
+
+
+async def conversation(client: httpx.AsyncClient, messages: int, results: list):
+    response = await client.post("/sessions")
+    response.raise_for_status()
+    session_id = response.json()["id"]
+
+    for index in range(messages):
+        results.append(
+            await send_message(client, session_id, MESSAGES[index % len(MESSAGES)])
+        )
+
+    state = (await client.get(f"/sessions/{session_id}")).json()["state"]
+    assert len(state["messages"]) == 2 * messages
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, results: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        (await client.get("/health")).raise_for_status()
+        results.append((time.perf_counter() - start) * 1e3)
+        await asyncio.sleep(HEALTH_INTERVAL)
+
+
+async def run(url: str, sessions: int, messages: int) -> None:
+    limits = httpx.Limits(max_connections=sessions + 8)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        await wait_until_ready(client)
+
+        # Aquecimento: a primeira rodada inicializa o workflow
+        await conversation(client, 1, [])
+
+        turns, health = [], []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, health))
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(conversation(client, messages, turns) for _ in range(sessions))
+        )
+        total = time.perf_counter() - start
+
+        stop.set()
+        await probe
+
+    completed = [turn for turn in turns if turn[3] and turn[3]["status"] == "completed"]
+    first_tokens = [turn[0] * 1e3 for turn in completed if turn[0] is not None]
+    durations = [turn[1] * 1e3 for turn in completed]
+
+    print(
+        f"{sessions} sessões x {messages} mensagens, LLM simulado com "
+        f"{LLM_LATENCY} s por chamada + {LLM_LATENCY_PER_TOKEN} s por token\n"
+    )
+    print(f"rodadas concluídas: {len(completed)}/{len(turns)}")
+    print(
+        f"eventos por rodada: {sum(turn[2] for turn in turns) / len(turns):.1f} "
+        f"(nós, tokens e fim)"
+    )
+    print(
+        f"primeiro token: p50 {percentile(first_tokens, 0.5):.0f} ms, "
+        f"p95 {percentile(first_tokens, 0.95):.0f} ms"
+    )
+    print(
+        f"rodada completa: p50 {percentile(durations, 0.5):.0f} ms, "
+        f"p95 {percentile(durations, 0.95):.0f} ms"
+    )
+    print(f"vazão: {len(turns) / total:.1f} rodadas/s ({total:.2f} s no total)")
+    print(
+        f"/health durante a carga: p50 {percentile(health, 0.5):.1f} ms, "
+        f"p95 {percentile(health, 0.95):.1f} ms, máx {max(health):.1f} ms"
+    )
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    url = sys.argv[3] if len(sys.argv) > 3 else None
+
+    if url is not None:
+        asyncio.run(run(url, sessions, messages))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = start_server(sessions, directory)
+        try:
+            asyncio.run(run(f"http://127.0.0.1:{PORT}", sessions, messages))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Mede o tempo de um rerun do chat (app.py) e o volume de markdown enviado ao
+navegador em função da quantidade de mensagens no histórico, comparando a
+exibição de todas as mensagens com `st.write` (como era feito) e o
+`chat_history.show_history` (janela das mensagens recentes, passos antigos
+recolhidos em toggles que só geram o conteúdo quando ligados e mensagens
+preparadas em cache).
+
+O histórico simula uma conversa real: as perguntas do planner, o caminho de
+aprendizado e, para cada passo, o "OK" do usuário e o conteúdo do passo
+(fixtures.make_expert). Os reruns são executados com o AppTest do
+Streamlit, então os tempos incluem a sobrecarga do próprio AppTest; a
+renderização no navegador, que cresce com o volume de markdown, não é
+medida.
+
+Uso:
+    python benchmarks/chat_history_rendering.py [passos por conversa...]
+"""
+
+import sys
+import time
+
+import _paths  # noqa: F401
+
+from langchain_core.messages import AIMessage, HumanMessage
+from streamlit.testing.v1 import AppTest
+
+from fixtures import make_expert
+
+RERUNS = 5
+
+
+def full_history_app() -> None:
+    import streamlit as st
+
+    for message in st.session_state.messages:
+        role = "assistant" if message.type == "ai" else "user"
+        with st.chat_message(role):
+            st.write(message.content)
+
+
+def windowed_history_app() -> None:
+    import streamlit as st
+
+    from chat_history import show_history
+
+    show_history(st.session_state.messages)
+
+
+def make_conversation(steps: int) -> list:
+    expert = make_expert(steps=steps, repeat=4)
+    messages = [
+        HumanMessage(content="Quero aprender Python"),
+        AIMessage(content="Qual é o seu nível de conhecimento?"),
+        HumanMessage(content="Iniciante"),
+        AIMessage(
+            content="Caminho de aprendizado gerado:\n\n"
+            + "\n".join(
+                f"{step.step_number}. {step.title}" for step in expert.learning_path
+            )
+            + "\n\n**Digite OK para continuar.**"
+        ),
+    ]
+
+    for step in expert.learning_path:
+        messages.append(HumanMessage(content="OK"))
+        messages.append(
+            AIMessage(
+                content=f"""
+# Passo {step.step_number}: {step.title}
+
+---
+{step.content}
+"""
+            )
+        )
+
+    return messages
+
+
+def measure(app, messages: list) -> tuple[float, int]:
+    """
+    Retorna o tempo médio de um rerun (ms) e o volume de markdown (KB)
+    enviado ao navegador.
+    """
+    test = AppTest.from_function(app)
+    test.session_state.messages = messages
+    test.run()
+
+    start = time.perf_counter()
+    for _ in range(RERUNS):
+        test.run()
+    elapsed = (time.perf_counter() - start) / RERUNS
+
+    assert not test.exception, test.exception
+    sent = sum(len(element.value) for element in test.markdown)
+
+    return elapsed * 1e3, sent // 1024
+
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or [5, 10, 20, 40, 80]
+
+    print(
+        f"{'mensagens':>9} {'st.write (ms)':>14} {'janela (ms)':>12} "
+        f"{'st.write (KB)':>14} {'janela (KB)':>12}"
+    )
+    for steps in sizes:
+        messages = make_conversation(steps)
+        full_ms, full_kb = measure(full_history_app, messages)
+        windowed_ms, windowed_kb = measure(windowed_history_app, messages)
+
+        print(
+            f"{len(messages):>9} {full_ms:>14.1f} {windowed_ms:>12.1f} "
+            f"{full_kb:>14} {windowed_kb:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
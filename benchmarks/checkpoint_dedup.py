@@ -0,0 +1,155 @@
+"""
+Mede os bytes gravados pelo checkpointer a cada turno de uma sessão de
+20 passos, com e sem a deduplicação de textos (DedupSerializer).
+
+A sessão é simulada com o mesmo estado do workflow (TutorialState): o
+primeiro turno gera o caminho de aprendizado, cada turno seguinte completa
+um passo e acrescenta a mensagem que o exibe (como o nó expert), e o último
+turno monta o tutorial final com o conteúdo dos passos (como o writer
+map-reduce). Os bytes de cada turno incluem checkpoints, valores dos canais,
+escritas pendentes e, com a deduplicação, os blobs novos.
+
+Uso:
+    python benchmarks/checkpoint_dedup.py [quantidade de passos]
+"""
+
+import sys
+
+import _paths  # noqa: F401
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, START, END
+
+from entities import Expert, Planner, StepStatus, Writer
+from fixtures import make_expert
+from persistence import DedupSerializer, MemoryState
+from workflow.tutorial_workflow import TutorialState
+
+
+def make_session_graph(memory_state: MemoryState, source: Expert):
+    """
+    Cria um grafo de um nó que reproduz o que cada turno da sessão
+    acrescenta ao estado.
+    """
+
+    def turn(state: TutorialState) -> dict:
+        expert = state.get("expert_output")
+        messages = list(state["messages"])
+
+        if expert is None:
+            expert = source.model_copy(deep=True)
+            for step in expert.learning_path:
+                step.content, step.prerequisites = None, None
+                step.status = StepStatus.PENDING
+
+            summary = "Caminho de aprendizado gerado:\n\n" + "\n".join(
+                f"{step.step_number}. {step.title}" for step in expert.learning_path
+            )
+            messages.append(AIMessage(content=summary))
+            return {"messages": messages, "expert_output": expert}
+
+        if not expert.is_completed():
+            step = expert.get_current_step()
+            completed = source.learning_path[step.step_number - 1]
+            step.content = completed.content
+            step.prerequisites = completed.prerequisites
+            step.status = StepStatus.COMPLETED
+
+            messages.append(
+                AIMessage(
+                    content=f"""
+# Passo {step.step_number}: {step.title}
+
+---
+{step.content}
+"""
+                )
+            )
+            return {"messages": messages, "expert_output": expert}
+
+        tutorial = "\n\n".join(
+            f"## {step.title}\n\n{step.content}" for step in expert.learning_path
+        )
+        writer = Writer(subject=expert.subject, title="Tutorial", tutorial=tutorial)
+        messages.append(AIMessage(content=tutorial))
+        return {"messages": messages, "writer_output": writer}
+
+    graph = StateGraph(TutorialState)
+    graph.add_node("turn", turn)
+    graph.add_edge(START, "turn")
+    graph.add_edge("turn", END)
+    return graph.compile(checkpointer=memory_state.memory_saver)
+
+
+def stored_bytes(memory_state: MemoryState) -> int:
+    saver = memory_state.memory_saver
+    total = sum(len(value[1]) for value in saver.blobs.values())
+    total += sum(
+        len(checkpoint[1]) + len(metadata[1])
+        for namespaces in saver.storage.values()
+        for checkpoints in namespaces.values()
+        for checkpoint, metadata, _ in checkpoints.values()
+    )
+    total += sum(
+        len(value[1])
+        for writes in saver.writes.values()
+        for _, _, value, _ in writes.values()
+    )
+    if isinstance(saver.serde, DedupSerializer):
+        total += memory_state.blob_store.size
+    return total
+
+
+def run_session(dedup: bool, steps: int) -> list[int]:
+    memory_state = MemoryState(dedup=dedup, compact=False)
+    graph = make_session_graph(memory_state, make_expert(steps=steps))
+    config = {"configurable": {"thread_id": "benchmark"}}
+
+    initial = {
+        "messages": [HumanMessage(content="Quero aprender Python")],
+        "planner_output": Planner(subject="Python"),
+        "expert_output": None,
+        "writer_output": None,
+    }
+
+    per_turn = []
+    previous = 0
+    for turn in range(steps + 2):
+        state = initial if turn == 0 else {"messages": [HumanMessage(content="OK")]}
+        graph.invoke(state, config)
+
+        total = stored_bytes(memory_state)
+        per_turn.append(total - previous)
+        previous = total
+
+    # Confere que o estado restaurado do checkpoint é idêntico ao original
+    restored = graph.get_state(config).values
+    assert restored["writer_output"].tutorial.startswith("## Passo 1")
+    assert restored["expert_output"].learning_path[-1].content == (
+        make_expert(steps=steps).learning_path[-1].content
+    )
+
+    return per_turn
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    before = run_session(dedup=False, steps=steps)
+    after = run_session(dedup=True, steps=steps)
+
+    print(f"{'turno':>6} {'sem dedup KB':>14} {'com dedup KB':>14} {'redução':>9}")
+    for turn, (plain, dedup) in enumerate(zip(before, after)):
+        print(
+            f"{turn:>6} {plain / 1024:>14.1f} {dedup / 1024:>14.1f} "
+            f"{1 - dedup / plain:>9.0%}"
+        )
+
+    print(
+        f"{'total':>6} {sum(before) / 1024:>14.1f} {sum(after) / 1024:>14.1f} "
+        f"{1 - sum(after) / sum(before):>9.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Compara a serialização compacta (CompactSerializer) com a serialização
+padrão do LangGraph (JsonPlusSerializer) no estado de sessões realistas de
+20 passos: tamanho e tempo de codificação/decodificação de cada canal do
+estado (planner_output, expert_output, writer_output, messages), do estado
+completo (como nas escritas de cada nó) e do estado completo com a
+deduplicação de textos (DedupSerializer), como os checkpoints são gravados.
+
+Uso:
+    python benchmarks/checkpoint_serialization.py [quantidade de passos]
+"""
+
+import sys
+import time
+
+import _paths  # noqa: F401
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from entities import Planner, Writer
+from fixtures import make_expert
+from persistence import CompactSerializer, DedupSerializer, InMemoryBlobStore
+
+REPETITIONS = 200
+
+
+def make_state(steps: int) -> dict:
+    """
+    Cria o estado ao final de uma sessão: plano, caminho de aprendizado com
+    todos os passos concluídos, mensagens de cada turno e tutorial final.
+    """
+    expert = make_expert(steps=steps)
+    planner = Planner(
+        subject="Python",
+        level="iniciante",
+        project_type="api",
+        environment="linux, vscode",
+        instructions="N/A",
+    )
+
+    messages = [HumanMessage(content="Quero aprender Python")]
+    messages.append(
+        AIMessage(
+            content="Caminho de aprendizado gerado:\n\n"
+            + "\n".join(f"{s.step_number}. {s.title}" for s in expert.learning_path)
+        )
+    )
+    for step in expert.learning_path:
+        messages.append(HumanMessage(content="OK"))
+        messages.append(
+            AIMessage(
+                content=f"# Passo {step.step_number}: {step.title}\n\n---\n{step.content}"
+            )
+        )
+
+    tutorial = "\n\n".join(
+        f"## {step.title}\n\n{step.content}" for step in expert.learning_path
+    )
+    writer = Writer(
+        subject="Python",
+        title="Python na prática",
+        tutorial=tutorial,
+        keywords=["python", "api"],
+        expert=expert,
+    )
+    messages.append(AIMessage(content=tutorial))
+
+    return {
+        "messages": messages,
+        "planner_output": planner,
+        "expert_output": expert,
+        "writer_output": writer,
+    }
+
+
+def measure(serde, value) -> tuple[int, float, float]:
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        data = serde.dumps_typed(value)
+    encode = (time.perf_counter() - start) / REPETITIONS * 1000
+
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        serde.loads_typed(data)
+    decode = (time.perf_counter() - start) / REPETITIONS * 1000
+
+    return len(data[1]), encode, decode
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    state = make_state(steps)
+
+    default, compact = JsonPlusSerializer(), CompactSerializer()
+
+    # Confere a ida e volta antes de medir
+    restored = compact.loads_typed(compact.dumps_typed(state))
+    for name in ("planner_output", "expert_output", "writer_output"):
+        assert restored[name].model_dump() == state[name].model_dump()
+    assert restored["messages"] == state["messages"]
+
+    values = {name: (state[name], default, compact) for name in state}
+    values["estado completo"] = (state, default, compact)
+
+    # Com a deduplicação (DedupSerializer), os textos viram hashes e o
+    # checkpoint passa a ser dominado pela estrutura das entidades
+    values["completo + dedup"] = (
+        state,
+        DedupSerializer(InMemoryBlobStore(), serde=default),
+        DedupSerializer(InMemoryBlobStore(), serde=compact),
+    )
+
+    print(
+        f"{'valor':<22} {'padrão KB':>10} {'compacto KB':>12} {'tamanho':>8} "
+        f"{'enc ms':>13} {'dec ms':>13}"
+    )
+    for name, (value, default_serde, compact_serde) in values.items():
+        size, encode, decode = measure(default_serde, value)
+        compact_size, compact_encode, compact_decode = measure(compact_serde, value)
+        print(
+            f"{name:<22} {size / 1024:>10.1f} {compact_size / 1024:>12.1f} "
+            f"{compact_size / size - 1:>8.0%} "
+            f"{encode:>6.2f}→{compact_encode:<6.2f} {decode:>6.2f}→{compact_decode:<6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
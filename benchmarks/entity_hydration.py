@@ -0,0 +1,92 @@
+"""
+Mede quantos tutoriais (Writer com o Expert e os passos completos) por
+segundo são reconstruídos a partir do armazenamento, com e sem validação.
+
+Cada tutorial é gravado como JSON (`model_dump(mode="json")`, o formato de
+exportações e dos caminhos da biblioteca) e como msgpack compacto (o formato
+do histórico e dos checkpoints). São comparados:
+
+- model_validate: um tutorial por vez, com todos os validadores;
+- validate_many: a lista inteira em um único TypeAdapter (dados externos);
+- hydrate_many: dados já validados, sem validadores (dados da aplicação);
+- compact_codec.decode: msgpack compacto, que usa `hydrate`.
+
+Uso:
+    python benchmarks/entity_hydration.py [quantidade de tutoriais]
+"""
+
+import json
+import sys
+import time
+
+import _paths  # noqa: F401
+
+from fixtures import make_expert, make_tutorial
+from persistence import hydrate_many, validate_many
+from persistence.compact_codec import decode, encode
+from entities import Writer
+from entities.expert import DifficultyLevel
+
+REPETITIONS = 5
+
+
+def best_rate(count: int, function) -> tuple[float, list]:
+    """
+    Executa a função algumas vezes e retorna a melhor taxa (objetos/s)
+    e o resultado da última execução.
+    """
+    best = float("inf")
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    return count / best, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    # O nível é um valor do enum, para que os dados passem na validação
+    writers = [
+        make_tutorial(index).model_copy(
+            update={
+                "expert": make_expert(steps=10, repeat=1),
+                "difficulty_level": DifficultyLevel.BEGINNER,
+            }
+        )
+        for index in range(count)
+    ]
+    rows = [writer.model_dump(mode="json") for writer in writers]
+    payload = json.dumps(rows).encode("utf-8")
+    packed = [encode(writer) for writer in writers]
+
+    cases = {
+        "model_validate (dict)": lambda: [Writer.model_validate(row) for row in rows],
+        "validate_many (dict)": lambda: validate_many(Writer, rows),
+        "validate_many (JSON)": lambda: validate_many(Writer, payload),
+        "json.loads + model_validate": lambda: [
+            Writer.model_validate(row) for row in json.loads(payload)
+        ],
+        "hydrate_many (dict)": lambda: hydrate_many(Writer, rows),
+        "json.loads + hydrate_many": lambda: hydrate_many(Writer, json.loads(payload)),
+        "compact_codec.decode": lambda: [decode(data) for data in packed],
+    }
+
+    expected = [writer.model_dump() for writer in writers[:50]]
+    baseline = None
+
+    print(f"{count} tutoriais com 10 passos cada\n")
+    print(f"{'caminho':<30} {'tutoriais/s':>12} {'vs model_validate':>18}")
+    for name, function in cases.items():
+        rate, result = best_rate(count, function)
+        baseline = baseline or rate
+
+        # Todos os caminhos devem reconstruir os mesmos tutoriais
+        assert [writer.model_dump() for writer in result[:50]] == expected, name
+
+        print(f"{name:<30} {rate:>12,.0f} {rate / baseline:>17.1f}x")
+
+
+if __name__ == "__main__":
+    main()
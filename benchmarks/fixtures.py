@@ -0,0 +1,167 @@
+"""
+Dados sintéticos realistas usados pelos benchmarks.
+"""
+
+import random
+
+import _paths  # noqa: F401
+
+from entities import Expert, ExpertStep, StepStatus, Writer
+
+SUBJECTS = [
+    "Python",
+    "JavaScript",
+    "TypeScript",
+    "React",
+    "Django",
+    "FastAPI",
+    "Flask",
+    "Docker",
+    "Kubernetes",
+    "Git",
+    "PostgreSQL",
+    "SQLite",
+    "Redis",
+    "Rust",
+    "Go",
+    "Java",
+    "Spring Boot",
+    "Node.js",
+    "Vue",
+    "Angular",
+    "Pandas",
+    "NumPy",
+    "LangChain",
+    "LangGraph",
+    "Terraform",
+    "AWS Lambda",
+    "Linux",
+    "Bash",
+]
+
+TOPICS = [
+    "api rest",
+    "autenticação",
+    "testes automatizados",
+    "deploy",
+    "banco de dados",
+    "cache",
+    "filas",
+    "logging",
+    "configuração",
+    "containers",
+    "concorrência",
+    "validação de dados",
+    "migrações",
+    "observabilidade",
+    "cli",
+    "web scraping",
+    "análise de dados",
+    "agentes",
+    "streaming",
+    "segurança",
+    "performance",
+]
+
+LEVELS = ["iniciante", "intermediario", "avancado"]
+
+STEP_CONTENT_TEMPLATE = """
+## Objetivo
+
+Neste passo vamos trabalhar em **{title}**. A ideia é entender o conceito,
+ver um exemplo prático e aplicar no projeto que estamos construindo.
+
+### Conceitos importantes
+
+- Cada módulo do projeto tem uma responsabilidade bem definida ({n}).
+- Mantenha funções pequenas e com nomes descritivos.
+- Escreva testes para o comportamento principal do passo {n}.
+
+### Exemplo de código
+
+```python
+def passo_{n}(dados: list[int]) -> list[int]:
+    \"\"\"Processa os dados do passo {n}.\"\"\"
+    resultado = []
+    for item in dados:
+        if item % {n} == 0:
+            resultado.append(item * 2)
+    return resultado
+
+
+if __name__ == "__main__":
+    print(passo_{n}(list(range(100))))
+```
+
+### Executando
+
+```bash
+python -m projeto.passo_{n} --verbose
+pytest tests/test_passo_{n}.py -q
+```
+
+### Dicas e boas práticas
+
+1. Rode o código após cada alteração para validar o comportamento.
+2. Use o depurador quando o resultado não for o esperado.
+3. Versione o código com `git commit -m "passo {n}"` ao final do passo.
+"""
+
+
+def make_expert(steps: int = 20, repeat: int = 3) -> Expert:
+    """
+    Cria um Expert com `steps` passos completos e conteúdo em markdown.
+
+    Args:
+        steps: Quantidade de passos
+        repeat: Quantas vezes o conteúdo-modelo é repetido em cada passo
+    """
+    return Expert(
+        subject="Python",
+        difficulty_level="beginner",
+        project_type="api",
+        environment="linux, vscode",
+        instructions="N/A",
+        learning_path=[
+            ExpertStep(
+                step_number=n,
+                title=f"Passo {n} do projeto",
+                description=f"Descrição do passo {n}",
+                prerequisites=f"Python 3.11 e conclusão do passo {n - 1}",
+                content="\n".join(
+                    STEP_CONTENT_TEMPLATE.format(title=f"Passo {n} ({i})", n=n)
+                    for i in range(repeat)
+                ),
+                estimated_time=30,
+                status=StepStatus.COMPLETED,
+            )
+            for n in range(1, steps + 1)
+        ],
+    )
+
+
+def make_tutorial(index: int, steps: int = 6) -> Writer:
+    """
+    Cria um tutorial final sintético e determinístico (pelo índice), com
+    assunto, tópico e nível variados, para popular históricos e índices.
+
+    Args:
+        index: Índice do tutorial (mesma entrada, mesmo tutorial)
+        steps: Quantidade de passos do tutorial
+    """
+    rng = random.Random(index)
+    subject = rng.choice(SUBJECTS)
+    topics = rng.sample(TOPICS, 3)
+
+    sections = [
+        f"## Passo {n}: {topic.capitalize()} com {subject}\n"
+        + STEP_CONTENT_TEMPLATE.format(title=f"{topic} em {subject}", n=n)
+        for n, topic in enumerate(rng.choices(topics, k=steps), start=1)
+    ]
+
+    return Writer(
+        subject=subject,
+        title=f"{subject}: {topics[0]} na prática #{index}",
+        keywords=[subject, *topics],
+        tutorial=f"# {subject}: {topics[0]} na prática\n\n" + "\n".join(sections),
+    ).model_copy(update={"difficulty_level": rng.choice(LEVELS)})
@@ -0,0 +1,55 @@
+"""
+Mede a taxa de sucesso do reparo de JSON sobre o corpus de respostas do
+learning path (benchmarks/data/learning_path_corpus.json).
+
+Cada resposta passa pelo JsonRepairService: parse direto, reparo local e,
+só se ambos falharem, a correção via LLM (aqui um FakeLLMService que devolve
+um JSON válido, para contabilizar quantas chamadas seriam necessárias).
+
+Uso:
+    python benchmarks/json_repair.py
+"""
+
+import json
+import time
+
+from pathlib import Path
+
+import _paths  # noqa: F401
+
+from entities import ExpertStep
+from llm import FakeLLMService
+from services.json_repair import JsonRepairError, JsonRepairService
+
+
+CORPUS = Path(__file__).parent / "data" / "learning_path_corpus.json"
+
+FIXED_RESPONSE = json.dumps([{"step_number": 1, "title": "Passo corrigido"}])
+
+
+def main() -> None:
+    cases = json.loads(CORPUS.read_text(encoding="utf-8"))
+    llm = FakeLLMService(responder=lambda prompt, call_site: FIXED_RESPONSE)
+    service = JsonRepairService(llm)
+
+    start = time.perf_counter()
+    for case in cases:
+        try:
+            steps = service.parse(case["text"], ExpertStep, many=True)
+            outcome = f"{len(steps)} passo(s)"
+        except JsonRepairError as e:
+            outcome = f"falha: {str(e)[:60]}"
+
+        print(f"{case['name']:<30} {outcome}")
+
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"\nResultados: {service.stats}")
+    print(f"Chamadas de correção ao LLM: {len(llm.calls)} de {len(cases)} respostas")
+    for name, rate in service.success_rate().items():
+        print(f"{name}: {rate * 100:.1f}%")
+    print(f"Tempo total do reparo local: {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
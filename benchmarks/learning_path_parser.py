@@ -0,0 +1,89 @@
+"""
+Executa o parser incremental do learning path sobre um corpus de respostas
+válidas, malformadas e parciais (benchmarks/data/learning_path_corpus.json).
+
+Cada resposta é entregue ao parser em partes de tamanhos diferentes, para
+simular o streaming, e o resultado é comparado com o esperado. Para
+referência, também mostra se o parser antigo (replace de aspas + json.loads)
+conseguiria ler a resposta.
+
+Uso:
+    python benchmarks/learning_path_parser.py
+"""
+
+import json
+import sys
+
+from pathlib import Path
+
+import _paths  # noqa: F401
+
+from pydantic import ValidationError
+
+from entities import ExpertStep
+from services.json_stream_parser import JsonArrayStreamParser
+
+
+CORPUS = Path(__file__).parent / "data" / "learning_path_corpus.json"
+
+CHUNK_SIZES = (1, 3, 16, 64, 10_000)
+
+
+def parse(text: str, chunk_size: int):
+    parser = JsonArrayStreamParser()
+    steps = []
+
+    for start in range(0, len(text), chunk_size):
+        for item in parser.feed(text[start : start + chunk_size]):
+            # Mesma conversão feita pelo ExpertService: numera pela posição
+            try:
+                steps.append(
+                    ExpertStep(
+                        step_number=len(steps) + 1,
+                        title=item["title"],
+                        description=item.get("description"),
+                        estimated_time=item.get("estimated_time"),
+                    )
+                )
+            except (KeyError, TypeError, ValidationError):
+                pass
+
+    parser.finish()
+    return steps, parser
+
+
+def legacy_parse(text: str) -> int | None:
+    try:
+        return len(json.loads(text.replace("'", '"')))
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def main() -> int:
+    cases = json.loads(CORPUS.read_text(encoding="utf-8"))
+    failures = 0
+
+    for case in cases:
+        results = {size: parse(case["text"], size) for size in CHUNK_SIZES}
+        counts = {len(steps) for steps, _ in results.values()}
+        truncated = {parser.truncated for _, parser in results.values()}
+
+        ok = counts == {case["expected_steps"]} and truncated == {
+            case["expected_truncated"]
+        }
+        failures += not ok
+
+        legacy = legacy_parse(case["text"])
+        print(
+            f"{'OK ' if ok else 'ERRO'} {case['name']:<30} "
+            f"passos={sorted(counts)} esperado={case['expected_steps']:<3} "
+            f"truncado={sorted(truncated)} "
+            f"parser_antigo={'falha' if legacy is None else legacy}"
+        )
+
+    print(f"\n{len(cases) - failures}/{len(cases)} casos corretos")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Mede o arquivo do modo leitura (MmapTutorialArchive) com dezenas de
+milhares de tutoriais: o tempo para abrir o arquivo e exibir a primeira
+página da lista, e a latência de leitura de seções aleatórias.
+
+O arquivo é populado com tutoriais sintéticos (fixtures.make_tutorial, com
+o caminho de aprendizado de fixtures.make_expert), divididos pelo
+ReadingService em uma seção por passo, em um diretório temporário.
+
+Uso:
+    python benchmarks/reading_archive.py [quantidade de tutoriais]
+"""
+
+import random
+import sys
+import tempfile
+import time
+
+import _paths  # noqa: F401
+
+from fixtures import make_expert, make_tutorial
+from persistence import MmapTutorialArchive
+from services import ReadingService, split_sections
+
+READS = 2_000
+STEPS = 6
+
+
+def make_finished_tutorial(index: int):
+    return make_tutorial(index).model_copy(
+        update={"expert": make_expert(steps=STEPS, repeat=1)}
+    )
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = ReadingService(MmapTutorialArchive(directory))
+
+        start = time.perf_counter()
+        for index in range(count):
+            service.archive_tutorial(make_finished_tutorial(index), history_id=index)
+        build = time.perf_counter() - start
+
+        size = sum(path.stat().st_size for path in service.archive.directory.iterdir())
+        print(
+            f"{count} tutoriais arquivados em {build:.1f} s "
+            f"({size / 1024 / 1024:.1f} MB)"
+        )
+
+        # Nova instância, como na abertura da página de leitura
+        service.archive.close()
+
+        start = time.perf_counter()
+        service = ReadingService(MmapTutorialArchive(directory))
+        opened = time.perf_counter() - start
+        tutorials, _ = service.list_tutorials(page=1, page_size=20)
+        first_page = time.perf_counter() - start
+
+        print(f"abertura do arquivo: {opened * 1e3:.2f} ms")
+        print(f"abertura + primeira página da lista: {first_page * 1e3:.2f} ms")
+
+        rng = random.Random(0)
+        latencies = []
+        for _ in range(READS):
+            tutorial_id = rng.randint(1, count)
+            number = rng.randint(1, STEPS)
+
+            start = time.perf_counter()
+            section = service.read(tutorial_id, number)
+            latencies.append((time.perf_counter() - start) * 1e3)
+
+        # A seção lida é a mesma do tutorial original
+        expected = split_sections(make_finished_tutorial(tutorial_id - 1))[
+            section.number - 1
+        ]
+        assert (section.title, section.content) == expected
+
+        print(
+            f"leitura de {READS} seções aleatórias: "
+            f"p50 {percentile(latencies, 0.5):.3f} ms, "
+            f"p95 {percentile(latencies, 0.95):.3f} ms, "
+            f"máx {max(latencies):.3f} ms"
+        )
+        print(
+            f"mais recente: {tutorials[0].title} ({len(tutorials[0].sections)} seções)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Mede a latência das consultas ao índice vetorial local (MemmapVectorIndex)
+conforme o corpus cresce.
+
+O índice é populado com tutoriais sintéticos (fixtures.make_tutorial),
+em um diretório temporário, até cada tamanho de corpus; a cada tamanho,
+as consultas são executadas várias vezes, reportando as latências p50 e p95
+e a separação entre a busca vetorial e a leitura dos trechos. Ao final, o
+índice é reaberto do disco para medir o custo de inicialização.
+
+Uso:
+    python benchmarks/retrieval_index.py [quantidade máxima de tutoriais]
+"""
+
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+import _paths  # noqa: F401
+
+from fixtures import make_tutorial
+from retrieval import MemmapVectorIndex
+
+QUERIES = [
+    "Python api rest autenticação",
+    "Como configurar o Docker para deploy",
+    "testes automatizados com Django",
+    "kubernetes observabilidade",
+    "cache com Redis",
+    "passo inexistente xyz",
+]
+
+REPETITIONS = 30
+
+HEADING = re.compile(r"^(#+) ", re.MULTILINE)
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def measure(index: MemmapVectorIndex) -> tuple[list[float], list[float]]:
+    search_timings, embed_timings = [], []
+
+    for _ in range(REPETITIONS):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.embedder.embed(query)
+            embed_timings.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            index.search(query, k=3)
+            search_timings.append((time.perf_counter() - start) * 1000)
+
+    return search_timings, embed_timings
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    sizes = [size for size in (100, 1_000, 5_000, 10_000) if size < count]
+    sizes.append(count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = MemmapVectorIndex(directory)
+
+        print(
+            f"{'tutoriais':>10} {'trechos':>9} {'indexação s':>12} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'embed ms':>9}"
+        )
+
+        added = 0
+        for size in sizes:
+            start = time.perf_counter()
+            for tutorial_index in range(added, size):
+                # Os tutoriais sintéticos repetem os mesmos parágrafos; marcar os
+                # títulos evita que os trechos sejam deduplicados pelo índice
+                text = HEADING.sub(
+                    rf"\1 [{tutorial_index}] ", make_tutorial(tutorial_index).tutorial
+                )
+                index.add(text, f"tutorial:{tutorial_index}")
+            elapsed = time.perf_counter() - start
+            added = size
+
+            search_timings, embed_timings = measure(index)
+            print(
+                f"{size:>10} {len(index):>9} {elapsed:>12.1f} "
+                f"{statistics.median(search_timings):>8.2f} "
+                f"{percentile(search_timings, 0.95):>8.2f} "
+                f"{statistics.median(embed_timings):>9.2f}"
+            )
+
+        start = time.perf_counter()
+        reopened = MemmapVectorIndex(directory)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"\nÍndice reaberto do disco em {elapsed:.0f} ms ({len(reopened)} trechos)"
+        )
+
+        print("\nMelhores trechos para:", QUERIES[0])
+        for chunk in reopened.search(QUERIES[0], k=3):
+            first_line = chunk.text.splitlines()[0]
+            print(f"  {chunk.score:.3f}  {chunk.source:<16} {first_line}")
+
+
+if __name__ == "__main__":
+    main()
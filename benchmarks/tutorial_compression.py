@@ -0,0 +1,111 @@
+"""
+Mede o espaço ocupado pelo conteúdo dos tutoriais no histórico e a latência
+de descompressão, sem compressão, com zlib e com zlib + dicionário
+pré-definido treinado com parte dos tutoriais (text_codec).
+
+O dicionário é treinado com os primeiros tutoriais e avaliado nos demais,
+como acontece no histórico (SQLiteTutorialRepository), em que o dicionário
+treinado é usado nos tutoriais salvos depois. Ao final, o histórico é
+populado de fato e o tamanho do arquivo SQLite é comparado com e sem a
+compressão.
+
+Uso:
+    python benchmarks/tutorial_compression.py [quantidade de tutoriais]
+"""
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+import _paths  # noqa: F401
+
+from fixtures import make_tutorial
+from persistence import (
+    SQLiteTutorialRepository,
+    compress_text,
+    decompress_text,
+    train_dictionary,
+)
+
+TRAINING_SAMPLES = 500
+BATCH_SIZE = 1_000
+
+
+def measure(texts: list[str], dictionary: bytes | None) -> tuple[int, float]:
+    """
+    Retorna o total de bytes comprimidos e a latência média de
+    descompressão (µs) de cada texto.
+    """
+    compressed = [compress_text(text, dictionary) for text in texts]
+
+    start = time.perf_counter()
+    for data in compressed:
+        decompress_text(data, dictionary)
+    elapsed = time.perf_counter() - start
+
+    return sum(map(len, compressed)), elapsed / len(texts) * 1e6
+
+
+def database_size(count: int, compressed: bool) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "tutorials.db"
+        # Nível 0: blocos sem compressão, como o texto puro
+        repository = SQLiteTutorialRepository(
+            path,
+            auto_train_after=TRAINING_SAMPLES if compressed else None,
+            compression_level=9 if compressed else 0,
+        )
+
+        for first in range(0, count, BATCH_SIZE):
+            repository.save_many(
+                [
+                    make_tutorial(index)
+                    for index in range(first, min(first + BATCH_SIZE, count))
+                ]
+            )
+
+        repository._connection.execute("VACUUM")
+        repository._connection.close()
+        return path.stat().st_size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    texts = [make_tutorial(index).tutorial for index in range(count)]
+    training, evaluation = texts[:TRAINING_SAMPLES], texts[TRAINING_SAMPLES:]
+
+    start = time.perf_counter()
+    dictionary = train_dictionary(training)
+    training_ms = (time.perf_counter() - start) * 1e3
+
+    raw = sum(len(text.encode("utf-8")) for text in evaluation)
+    zlib_bytes, zlib_us = measure(evaluation, None)
+    zdict_bytes, zdict_us = measure(evaluation, dictionary)
+
+    print(
+        f"dicionário: {len(dictionary) / 1024:.1f} KB, treinado com "
+        f"{len(training)} tutoriais em {training_ms:.0f} ms"
+    )
+    print(f"avaliação: {len(evaluation)} tutoriais\n")
+    print(f"{'formato':<18} {'KB':>10} {'razão':>7} {'descompressão µs':>17}")
+    print(f"{'sem compressão':<18} {raw / 1024:>10.1f} {1:>7.2f} {'-':>17}")
+    for name, size, latency in (
+        ("zlib", zlib_bytes, zlib_us),
+        ("zlib + dicionário", zdict_bytes, zdict_us),
+    ):
+        print(f"{name:<18} {size / 1024:>10.1f} {raw / size:>7.2f} {latency:>17.1f}")
+
+    plain_db = database_size(count, compressed=False)
+    compressed_db = database_size(count, compressed=True)
+    print(
+        f"\narquivo SQLite: {plain_db / 1024:.0f} KB sem compressão, "
+        f"{compressed_db / 1024:.0f} KB com compressão "
+        f"({1 - compressed_db / plain_db:.0%} menor, inclui o índice FTS5)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Mede as perguntas sobre tutoriais concluídos (QAService) em comparação com
+enviar o tutorial inteiro ao LLM a cada pergunta: o tamanho do prompt, o
+tempo local de recuperação das seções, a taxa de acerto da recuperação e o
+efeito dos caches do índice e das perguntas repetidas.
+
+As perguntas são geradas a partir dos tópicos das seções dos tutoriais
+sintéticos (fixtures.make_tutorial); uma parte delas é repetida com outra
+grafia (maiúsculas, acentos e pontuação). O LLM é o FakeLLMService, que
+apenas registra o tamanho de cada prompt.
+
+Uso:
+    python benchmarks/tutorial_qa.py [quantidade de perguntas]
+"""
+
+import random
+import re
+import sys
+import time
+
+import _paths  # noqa: F401
+
+from fixtures import make_tutorial
+from llm import FakeLLMService, estimate_tokens
+from services import QAService, split_sections
+
+TUTORIALS = 20
+STEPS = 10
+REPEATED = 0.3
+
+QUESTIONS = [
+    "Como funciona {topic} no projeto? Não entendi.",
+    "Qual comando eu rodo para testar {topic}?",
+    "Por que o tutorial usa {topic} desse jeito?",
+    "Onde fica o código de {topic}?",
+    "O que acontece se eu pular a parte de {topic}?",
+    "Tem alguma dica de boas práticas para {topic}?",
+]
+
+SECTION_TOPIC = re.compile(r"^Passo \d+: (.+) com ")
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    tutorials = [make_tutorial(index, steps=STEPS) for index in range(TUTORIALS)]
+    prompt_tokens: list[int] = []
+
+    def responder(prompt: str, call_site: str | None) -> str:
+        prompt_tokens.append(estimate_tokens(prompt))
+        return "Resposta."
+
+    qa = QAService(FakeLLMService(responder=responder))
+
+    rng = random.Random(0)
+    asked: list[tuple[int, str, str]] = []
+    full_tokens, latencies, hits = [], [], 0
+
+    for _ in range(count):
+        if asked and rng.random() < REPEATED:
+            index, question, topic = rng.choice(asked)
+            question = question.upper().replace("?", " ??")
+        else:
+            index = rng.randrange(TUTORIALS)
+            sections = split_sections(tutorials[index])
+            title, _ = rng.choice(
+                [section for section in sections if SECTION_TOPIC.match(section[0])]
+            )
+            topic = SECTION_TOPIC.match(title).group(1)
+            question = rng.choice(QUESTIONS).format(topic=topic.lower())
+            asked.append((index, question, topic))
+
+        writer = tutorials[index]
+        full_tokens.append(estimate_tokens(writer.tutorial + question))
+
+        start = time.perf_counter()
+        sections = split_sections(writer)
+        answer = qa.answer(question, writer.title, sections)
+        latencies.append((time.perf_counter() - start) * 1e3)
+
+        # Acerto: alguma seção recuperada trata do tópico da pergunta
+        hits += any(
+            topic.lower() in "".join(sections[number - 1]).lower()
+            for number in answer.section_numbers
+        )
+
+    stats = qa.stats
+    print(f"{count} perguntas sobre {TUTORIALS} tutoriais de {STEPS} seções\n")
+    print(
+        f"tokens do prompt: tutorial inteiro {sum(full_tokens) / count:,.0f}, "
+        f"seções relevantes {sum(prompt_tokens) / len(prompt_tokens):,.0f} "
+        f"(por chamada ao LLM)"
+    )
+    print(
+        f"tokens enviados no total: tutorial inteiro {sum(full_tokens):,}, "
+        f"seções relevantes {sum(prompt_tokens):,} "
+        f"({sum(prompt_tokens) / sum(full_tokens):.1%})"
+    )
+    print(
+        f"chamadas ao LLM: {stats['llm_calls']} "
+        f"(cache de perguntas: {stats['cache_hits']} acertos), "
+        f"índices construídos: {stats['index_builds']}"
+    )
+    print(f"alguma seção do tópico entre as recuperadas: {hits / count:.1%}")
+    print(
+        f"tempo local por pergunta (divisão, recuperação, caches): "
+        f"p50 {percentile(latencies, 0.5):.3f} ms, "
+        f"p95 {percentile(latencies, 0.95):.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Mede a latência da busca full-text no histórico de tutoriais
+(SQLiteTutorialRepository) com dezenas de milhares de tutoriais.
+
+O histórico é populado com tutoriais sintéticos (fixtures.make_tutorial)
+em um arquivo temporário e cada consulta é executada várias vezes,
+em diferentes páginas, reportando as latências p50, p95 e máxima.
+
+Uso:
+    python benchmarks/tutorial_search.py [quantidade de tutoriais]
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+import _paths  # noqa: F401
+
+from fixtures import make_tutorial
+from persistence import SQLiteTutorialRepository
+
+QUERIES = [
+    "python",
+    "docker deploy",
+    "autenticação api rest",
+    "autenticacao",
+    "langgr",
+    "kubernetes observabilidade containers",
+    "testes automatizados django",
+    "passo",
+    "inexistente",
+    "",
+]
+
+PAGES = (1, 2, 10)
+REPETITIONS = 20
+BATCH_SIZE = 1_000
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = SQLiteTutorialRepository(Path(directory) / "tutorials.db")
+
+        start = time.perf_counter()
+        for first in range(0, count, BATCH_SIZE):
+            repository.save_many(
+                [
+                    make_tutorial(index)
+                    for index in range(first, min(first + BATCH_SIZE, count))
+                ]
+            )
+        elapsed = time.perf_counter() - start
+        size = (Path(directory) / "tutorials.db").stat().st_size / 1024 / 1024
+
+        print(f"{count} tutoriais indexados em {elapsed:.1f} s ({size:.1f} MB)\n")
+        print(
+            f"{'consulta':<40} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}  1º resultado"
+        )
+
+        worst = 0.0
+        for query in QUERIES:
+            timings = []
+            for _ in range(REPETITIONS):
+                for page in PAGES:
+                    start = time.perf_counter()
+                    result = repository.search(query, page=page, page_size=20)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+            first_page = repository.search(query)
+            top = first_page.results[0].title if first_page.results else "-"
+            worst = max(worst, percentile(timings, 0.95))
+
+            print(
+                f"{repr(query):<40} {statistics.median(timings):>8.2f} "
+                f"{percentile(timings, 0.95):>8.2f} {max(timings):>8.2f}  {top}"
+            )
+
+        print(f"\nPior p95: {worst:.2f} ms (meta: < 50 ms)")
+
+
+if __name__ == "__main__":
+    main()
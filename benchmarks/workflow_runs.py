@@ -0,0 +1,122 @@
+"""
+Mede as execuções do workflow em segundo plano (RunManager): quanto tempo a
+interface fica bloqueada ao enviar uma mensagem, o tempo total de várias
+conversas em paralelo e a latência do cancelamento de uma chamada lenta ao
+LLM, verificando que o checkpoint da conversa cancelada volta ao estado
+anterior à rodada.
+
+O LLM é o FakeLLMService com latência fixa por chamada, envolvido pelo
+CancellableLLMService, como em `main.create_llm_service`.
+
+Uso:
+    python benchmarks/workflow_runs.py [conversas] [latência do LLM em s]
+"""
+
+import sys
+import time
+
+import _paths  # noqa: F401
+
+from langchain_core.messages import HumanMessage
+
+from entities import Expert, Writer
+from llm import CancellableLLMService, FakeLLMService
+from persistence import MemoryState
+from services import ExpertService, PlannerService, WriterService
+from workflow import RunManager, RunStatus, TutorialWorkflow
+
+CANCEL_AFTER = 0.1
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def make_state(*messages: str) -> dict:
+    return {
+        "messages": [HumanMessage(content=message) for message in messages],
+        "planner_output": None,
+        "expert_output": None,
+        "writer_output": None,
+    }
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+
+    llm = CancellableLLMService(
+        FakeLLMService(responder=lambda prompt, site: "Qual assunto?", latency=latency)
+    )
+    workflow = TutorialWorkflow(
+        PlannerService(llm),
+        ExpertService(llm, Expert()),
+        WriterService(llm, Writer(), Expert()),
+        MemoryState(),
+    )
+    manager = RunManager(workflow, max_workers=sessions)
+    graph = workflow.compile()
+
+    # Primeira rodada de cada conversa, em paralelo
+    start = time.perf_counter()
+    submit_times, runs = [], []
+    for session in range(sessions):
+        submitted = time.perf_counter()
+        runs.append(
+            manager.submit(
+                make_state("Olá"), {"configurable": {"thread_id": f"s{session}"}}
+            )
+        )
+        submit_times.append((time.perf_counter() - submitted) * 1e3)
+
+    for run in runs:
+        run.wait()
+    total = time.perf_counter() - start
+
+    assert all(run.status == RunStatus.COMPLETED for run in runs)
+    print(
+        f"{sessions} conversas, LLM com {latency:.2f} s por chamada "
+        f"(2 chamadas por rodada)\n"
+    )
+    print(
+        f"bloqueio da interface ao enviar: p50 {percentile(submit_times, 0.5):.2f} ms, "
+        f"máx {max(submit_times):.2f} ms"
+    )
+    print(
+        f"{sessions} rodadas em paralelo: {total:.2f} s "
+        f"(em sequência: ~{sessions * 2 * latency:.2f} s)"
+    )
+
+    # Segunda rodada, cancelada durante a chamada ao LLM
+    cancel_latencies = []
+    for session, run in enumerate(runs):
+        config = {"configurable": {"thread_id": f"s{session}"}}
+        before = graph.get_state(config).values["messages"]
+
+        state = {**run.result, "messages": [*run.result["messages"]]}
+        state["messages"].append(HumanMessage(content="Python"))
+        second = manager.submit(state, config)
+        time.sleep(CANCEL_AFTER)
+
+        cancelled = time.perf_counter()
+        manager.cancel(f"s{session}")
+        second.wait()
+        cancel_latencies.append((time.perf_counter() - cancelled) * 1e3)
+
+        assert second.status == RunStatus.CANCELLED
+        after = graph.get_state(config)
+        assert after.values["messages"] == before and not after.next
+
+    print(
+        f"cancelamento (chamada de {latency:.2f} s em andamento): "
+        f"p50 {percentile(cancel_latencies, 0.5):.2f} ms, "
+        f"máx {max(cancel_latencies):.2f} ms"
+    )
+    print("checkpoints das rodadas canceladas: restaurados")
+
+    manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
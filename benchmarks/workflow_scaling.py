@@ -0,0 +1,185 @@
+"""
+Mede a vazão das rodadas do workflow com vários processos (WorkerSupervisor)
+em uma máquina, comparada a um único RunManager no processo, e verifica o
+rebalanceamento: ao adicionar e remover um processo, apenas parte das
+conversas muda de dono, e as conversas movidas continuam a partir do estado
+salvo no SQLiteSessionStore.
+
+O LLM é o FakeLLMService sem latência, para que as rodadas sejam limitadas
+pela CPU (o caso em que processos adicionais ajudam; com latência de rede,
+as threads de um único processo já bastam). A vazão só cresce com o número
+de processos até o número de núcleos da máquina.
+
+Uso:
+    python benchmarks/workflow_scaling.py [conversas] [rodadas por conversa] [processos...]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import _paths  # noqa: F401
+
+from langchain_core.messages import HumanMessage
+
+from entities import Expert, Writer
+from llm import CancellableLLMService, FakeLLMService
+from persistence import MemoryState, SQLiteSessionStore
+from services import ExpertService, PlannerService, WriterService
+from workflow import RunManager, RunStatus, TutorialWorkflow, WorkerSupervisor
+
+THREADS_PER_PROCESS = 8
+
+
+def create_manager() -> RunManager:
+    # Executada em cada processo do supervisor (importável pelo nome)
+    llm = CancellableLLMService(
+        FakeLLMService(responder=lambda prompt, site: "Qual assunto?")
+    )
+    workflow = TutorialWorkflow(
+        PlannerService(llm),
+        ExpertService(llm, Expert()),
+        WriterService(llm, Writer(), Expert()),
+        MemoryState(),
+    )
+    return RunManager(workflow, max_workers=THREADS_PER_PROCESS)
+
+
+def run_turns(runner, store: SQLiteSessionStore, sessions: list[str], turns: int):
+    """
+    Executa `turns` rodadas em cada conversa, todas as conversas ao mesmo
+    tempo (cada conversa envia a próxima mensagem quando a anterior termina)
+
+    Returns:
+        float: Tempo total, em segundos
+    """
+    remaining = {session: turns for session in sessions}
+    finished = threading.Event()
+    lock = threading.Lock()
+    failures = []
+
+    def submit(session: str) -> None:
+        state = store.get(session)
+        state["messages"].append(HumanMessage(content="Python"))
+        run = runner.submit(
+            state,
+            {"configurable": {"thread_id": session}},
+            on_complete=lambda result: store.save(session, result),
+        )
+        run.subscribe(lambda: run.done and on_done(session, run))
+
+    def on_done(session: str, run) -> None:
+        if run.status != RunStatus.COMPLETED:
+            failures.append((session, run.status, run.error))
+
+        with lock:
+            remaining[session] -= 1
+            left = remaining[session]
+            if not any(remaining.values()):
+                finished.set()
+
+        if left:
+            # Fora da thread que notificou a rodada
+            threading.Thread(target=submit, args=(session,)).start()
+
+    start = time.perf_counter()
+    for session in sessions:
+        submit(session)
+    finished.wait()
+    elapsed = time.perf_counter() - start
+
+    assert not failures, failures[:3]
+    return elapsed
+
+
+def measure(label: str, runner, sessions: int, turns: int, directory: str) -> float:
+    store = SQLiteSessionStore(os.path.join(directory, f"{label}.db"))
+    ids = [store.create() for _ in range(sessions)]
+
+    # Aquecimento: a primeira rodada de cada conversa
+    run_turns(runner, store, ids, 1)
+    elapsed = run_turns(runner, store, ids, turns)
+
+    assert all(len(store.get(i)["messages"]) == 2 * (turns + 1) for i in ids)
+    return sessions * turns / elapsed
+
+
+def check_rebalancing(directory: str, sessions: int) -> None:
+    store = SQLiteSessionStore(os.path.join(directory, "rebalance.db"))
+    ids = [store.create() for _ in range(sessions)]
+    supervisor = WorkerSupervisor(create_manager, processes=2)
+
+    try:
+        run_turns(supervisor, store, ids, 1)
+        before = {i: supervisor.owner(i) for i in ids}
+
+        added = supervisor.add_worker()
+        after_add = {i: supervisor.owner(i) for i in ids}
+        moved = [i for i in ids if before[i] != after_add[i]]
+        assert all(after_add[i] == added for i in moved)
+        run_turns(supervisor, store, ids, 1)
+
+        removed = supervisor.workers[0]
+        supervisor.remove_worker(removed)
+        after_remove = {i: supervisor.owner(i) for i in ids}
+        moved_back = [i for i in ids if after_add[i] != after_remove[i]]
+        assert all(after_add[i] == removed for i in moved_back)
+        run_turns(supervisor, store, ids, 1)
+
+        # As conversas movidas continuam com o histórico completo, sem
+        # mensagens duplicadas por checkpoints antigos
+        for i in ids:
+            types = [message.type for message in store.get(i)["messages"]]
+            assert types == ["human", "ai"] * 3, (i, types)
+
+        print(
+            f"\nrebalanceamento ({sessions} conversas): "
+            f"+1 processo moveu {len(moved)} ({len(moved) / sessions:.0%}, "
+            f"ideal {1 / 3:.0%}); "
+            f"-1 processo moveu {len(moved_back)} "
+            f"({len(moved_back) / sessions:.0%}, ideal {1 / 3:.0%})"
+        )
+        print("conversas movidas continuaram com o histórico completo")
+    finally:
+        supervisor.shutdown()
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    counts = [int(count) for count in sys.argv[3:]] or [1, 2, 4]
+
+    print(
+        f"{sessions} conversas x {turns} rodadas, LLM simulado sem latência, "
+        f"{os.cpu_count()} núcleo(s)\n"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_manager()
+        baseline = measure("local", manager, sessions, turns, directory)
+        manager.shutdown()
+        print(f"RunManager no processo: {baseline:.1f} rodadas/s")
+
+        for count in counts:
+            started = time.perf_counter()
+            supervisor = WorkerSupervisor(create_manager, processes=count)
+            startup = time.perf_counter() - started
+            try:
+                throughput = measure(
+                    f"p{count}", supervisor, sessions, turns, directory
+                )
+            finally:
+                supervisor.shutdown()
+
+            print(
+                f"{count} processo(s): {throughput:.1f} rodadas/s "
+                f"({throughput / baseline:.2f}x; início em {startup:.1f} s)"
+            )
+
+        check_rebalancing(directory, sessions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: writer em chamada única vs. writer map-reduce vs. writer pipelined.
+
+Compara o tempo total (wall-clock) e a completude do tutorial gerado
+(fração das linhas de conteúdo dos passos presentes no tutorial final)
+usando o FakeLLMService, que simula latência por token e o limite máximo
+de tokens de saída do modelo.
+
+No modo pipelined as seções são antecipadas durante a sessão (como faz o
+nó expert a cada passo concluído); o tempo medido é apenas o do nó writer
+ao final da sessão.
+
+Uso:
+    python benchmarks/writer_map_reduce.py --steps 20 --per-token 0.0005
+"""
+
+import argparse
+import re
+import time
+
+import _paths  # noqa: F401
+from fixtures import make_expert
+
+from entities import Writer, WriterMode
+from llm import FakeLLMService
+from services import WriterService
+
+
+def between(text: str, tag: str) -> str:
+    match = re.search(rf"<{tag}>(.*)</{tag}>", text, re.DOTALL)
+    return match.group(1) if match else text
+
+
+def responder(prompt: str, call_site: str | None) -> str:
+    # O modelo "reescreve" fielmente o conteúdo recebido
+    if call_site == "writer.section":
+        return between(prompt, "step")
+    return between(prompt, "learning_path")
+
+
+def structured_responder(prompt, schema, call_site):
+    if call_site == "writer.structured":
+        return {
+            "tutorial": between(prompt, "learning_path"),
+            "title": "Python na prática",
+            "keywords": ["python", "api"],
+        }
+
+    steps = between(prompt, "steps").strip().splitlines()
+    return {
+        "introduction": "# Introdução\n\nVamos construir o projeto juntos!",
+        "transitions": [
+            f"Agora, vamos para o passo {i + 1}." for i in range(len(steps))
+        ],
+        "conclusion": "## Conclusão\n\nParabéns, você concluiu o tutorial!",
+        "title": "Python na prática",
+        "keywords": ["python", "api"],
+    }
+
+
+def completeness(expert, tutorial: str) -> float:
+    lines = [
+        line.strip()
+        for step in expert.learning_path
+        for line in step.content.splitlines()
+        if line.strip()
+    ]
+    return sum(1 for line in lines if line in tutorial) / len(lines)
+
+
+def run(mode: WriterMode, args) -> None:
+    expert = make_expert(args.steps)
+    llm = FakeLLMService(
+        responder=responder,
+        structured_responder=structured_responder,
+        latency=args.latency,
+        latency_per_token=args.per_token,
+        max_output_tokens=args.max_output_tokens,
+    )
+    service = WriterService(llm, Writer(), expert, mode=mode, max_workers=args.workers)
+
+    if mode == WriterMode.PIPELINED:
+        # Simula a sessão: o frame é antecipado quando o caminho de aprendizado
+        # é gerado e cada seção quando o passo é concluído
+        service.prefetch_frame(expert)
+        for step in expert.learning_path:
+            service.prefetch_section(step, expert)
+        service._executor.shutdown(wait=True)
+
+    start = time.perf_counter()
+    tutorial = service.generate_tutorial(expert).tutorial
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{mode.value:<12} tempo={elapsed:7.2f}s  chamadas={len(llm.calls):3d}  "
+        f"completude={completeness(expert, tutorial) * 100:6.1f}%  "
+        f"tamanho={len(tutorial)} caracteres"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--per-token", type=float, default=0.0005)
+    parser.add_argument("--max-output-tokens", type=int, default=16_384)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    for mode in WriterMode:
+        run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
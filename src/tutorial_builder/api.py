@@ -0,0 +1,747 @@
+"""
+API HTTP (ASGI) do Tutorial Builder, para front ends próprios: sessões de
+conversa, envio de mensagens ao workflow, estado da sessão e histórico de
+tutoriais. O progresso das rodadas (nós concluídos, mensagens dos nós e as
+respostas do LLM parte a parte) é enviado por server-sent events.
+
+As rodadas rodam em segundo plano no RunManager, fora do event loop, ou, com
+WORKFLOW_PROCESSES > 1, em vários processos (ver WorkerSupervisor); a API só
+aguarda os eventos, então um processo atende muitas conexões abertas.
+
+Rotas:
+    POST   /sessions                Cria uma sessão
+    GET    /sessions/{id}           Estado da sessão e da última rodada
+    POST   /sessions/{id}/messages  Envia uma mensagem ({"content": "..."}); com
+                                    "Accept: text/event-stream", responde com
+                                    os eventos da rodada
+    GET    /sessions/{id}/events    Eventos da rodada atual (aceita
+                                    Last-Event-ID para retomar)
+    POST   /sessions/{id}/cancel    Cancela a rodada em andamento
+    POST   /sessions/{id}/steps     Insere um passo no caminho de aprendizado
+                                    ({"position", "title", "description",
+                                    "estimated_time", "depends_on"})
+    PATCH  /sessions/{id}/steps/{n} Altera um passo ({"title", "description",
+                                    "feedback", "position"})
+    DELETE /sessions/{id}/steps/{n} Remove um passo
+    GET    /tutorials               Histórico (?query=&page=&page_size=)
+    GET    /tutorials/{id}          Tutorial do histórico
+    GET    /health                  Verificação para o balanceador de carga
+
+As edições do caminho de aprendizado deixam pendentes o passo editado e os
+que dependem dele; eles são gerados novamente, em ordem, nas próximas
+mensagens da sessão (ex: "OK"), e o tutorial final é escrito outra vez.
+
+As sessões ficam no SQLite (SESSION_STORE), compartilhadas entre processos.
+As rodadas em andamento, no entanto, pertencem ao processo da API que as
+recebeu: com várias instâncias da API atrás de um balanceador de carga, as
+requisições de uma sessão devem ir sempre para a mesma instância (ex: pelo
+identificador na URL).
+
+Uso:
+    uvicorn api:app --app-dir src/tutorial_builder
+"""
+
+import asyncio
+import json
+import logging
+import re
+
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs
+
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from entities import Expert, ExpertStep
+from interfaces import SessionStore, TutorialRepository
+from main import (
+    create_session_store,
+    create_tutorial_repository,
+    create_workflow_runner,
+)
+from workflow import RunManager, RunStatus, WorkerSupervisor, WorkflowRun
+
+logger = logging.getLogger(__name__)
+
+# Tamanho máximo do corpo das requisições, em bytes
+MAX_BODY_SIZE = 64 * 1024
+
+# Intervalo, em segundos, dos comentários enviados nas conexões SSE sem
+# eventos, para que proxies e balanceadores não as encerrem
+HEARTBEAT_INTERVAL = 15.0
+
+MAX_PAGE_SIZE = 100
+
+ROLES = {"human": "user", "ai": "assistant", "system": "system"}
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class HTTPError(Exception):
+    """
+    Erro de uma requisição, respondido como JSON com o status indicado
+    """
+
+    def __init__(self, status: int, message: str):
+        self.status = status
+        self.message = message
+        super().__init__(message)
+
+
+class Request:
+    """
+    Dados da requisição usados pelas rotas
+    """
+
+    def __init__(self, scope: Scope, receive: Receive, params: Dict[str, str]):
+        self.scope = scope
+        self.receive = receive
+        self.params = params
+        self.query = {
+            name: values[-1]
+            for name, values in parse_qs(
+                scope.get("query_string", b"").decode("latin-1")
+            ).items()
+        }
+        self.headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", [])
+        }
+
+    async def json(self) -> Dict[str, Any]:
+        """
+        Lê o corpo da requisição como um objeto JSON
+
+        Raises:
+            HTTPError: Se o corpo for grande demais ou não for um objeto JSON
+        """
+        body = bytearray()
+        while True:
+            message = await self.receive()
+            if message["type"] == "http.disconnect":
+                raise HTTPError(400, "Conexão encerrada pelo cliente")
+
+            body.extend(message.get("body", b""))
+            if len(body) > MAX_BODY_SIZE:
+                raise HTTPError(413, "Corpo da requisição muito grande")
+            if not message.get("more_body", False):
+                break
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Corpo da requisição não é um JSON válido")
+
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Corpo da requisição deve ser um objeto JSON")
+
+        return payload
+
+    def query_int(self, name: str, default: int) -> int:
+        value = self.query.get(name)
+        if value is None:
+            return default
+
+        try:
+            return int(value)
+        except ValueError:
+            raise HTTPError(400, f"Parâmetro {name} deve ser um número inteiro")
+
+
+def text_field(payload: Dict[str, Any], name: str, required: bool = True) -> str | None:
+    """
+    Lê um campo de texto não vazio do corpo da requisição
+
+    Raises:
+        HTTPError: Se o campo for obrigatório e estiver ausente, ou não for um
+            texto não vazio
+    """
+    value = payload.get(name)
+    if value is None and not required:
+        return None
+
+    if not isinstance(value, str) or not value.strip():
+        raise HTTPError(400, f'Campo "{name}" deve ser um texto não vazio')
+
+    return value
+
+
+def int_field(payload: Dict[str, Any], name: str, required: bool = True) -> int | None:
+    """
+    Lê um campo numérico inteiro do corpo da requisição
+
+    Raises:
+        HTTPError: Se o campo for obrigatório e estiver ausente, ou não for um
+            número inteiro
+    """
+    value = payload.get(name)
+    if value is None and not required:
+        return None
+
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPError(400, f'Campo "{name}" deve ser um número inteiro')
+
+    return value
+
+
+def serialize_message(message: BaseMessage) -> Dict[str, Any]:
+    """
+    Converte uma mensagem da conversa para JSON
+    """
+    return {"role": ROLES.get(message.type, message.type), "content": message.content}
+
+
+def serialize_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte o estado do workflow de uma sessão para JSON
+    """
+    payload: Dict[str, Any] = {
+        "messages": [serialize_message(message) for message in state["messages"]]
+    }
+    for name in ("planner_output", "expert_output", "writer_output"):
+        output = state.get(name)
+        payload[name] = output.model_dump(mode="json") if output is not None else None
+
+    return payload
+
+
+def serialize_run(run: WorkflowRun | None) -> Dict[str, Any] | None:
+    """
+    Converte a situação de uma rodada para JSON
+    """
+    if run is None:
+        return None
+
+    return {
+        "status": run.status.value,
+        "events": len(run.events),
+        "created_at": run.created_at.isoformat(),
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "error": str(run.error) if run.error is not None else None,
+    }
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: int | None = None) -> bytes:
+    """
+    Formata um evento no formato de server-sent events
+
+    Args:
+        event: Tipo do evento
+        data: Dados do evento, enviados como JSON
+        event_id: Identificador do evento, para retomar com Last-Event-ID
+
+    Returns:
+        bytes: O evento pronto para envio
+    """
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def send_json(
+    send: Send,
+    status: int,
+    payload: Any,
+    headers: List[Tuple[bytes, bytes]] | None = None,
+) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                *(headers or []),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class TutorialAPI:
+    """
+    Aplicação ASGI da API. As dependências não informadas são criadas com as
+    fábricas de `main` na inicialização (lifespan) ou na primeira requisição.
+    """
+
+    def __init__(
+        self,
+        run_manager: RunManager | WorkerSupervisor | None = None,
+        sessions: SessionStore | None = None,
+        tutorial_repository: TutorialRepository | None = None,
+    ):
+        """
+        Args:
+            run_manager: Gerenciador das rodadas do workflow
+            sessions: Armazenamento das sessões
+            tutorial_repository: Histórico de tutoriais
+        """
+        self.run_manager = run_manager
+        self.sessions = sessions
+        self.tutorial_repository = tutorial_repository
+        self.routes: List[Tuple[str, re.Pattern, Callable]] = [
+            ("GET", re.compile(r"^/health$"), self.health),
+            ("POST", re.compile(r"^/sessions$"), self.create_session),
+            ("GET", re.compile(r"^/sessions/(?P<session_id>\w+)$"), self.get_session),
+            (
+                "POST",
+                re.compile(r"^/sessions/(?P<session_id>\w+)/messages$"),
+                self.send_message,
+            ),
+            (
+                "GET",
+                re.compile(r"^/sessions/(?P<session_id>\w+)/events$"),
+                self.stream_events,
+            ),
+            (
+                "POST",
+                re.compile(r"^/sessions/(?P<session_id>\w+)/cancel$"),
+                self.cancel_run,
+            ),
+            (
+                "POST",
+                re.compile(r"^/sessions/(?P<session_id>\w+)/steps$"),
+                self.insert_step,
+            ),
+            (
+                "PATCH",
+                re.compile(
+                    r"^/sessions/(?P<session_id>\w+)/steps/(?P<step_number>\d+)$"
+                ),
+                self.update_step,
+            ),
+            (
+                "DELETE",
+                re.compile(
+                    r"^/sessions/(?P<session_id>\w+)/steps/(?P<step_number>\d+)$"
+                ),
+                self.remove_step,
+            ),
+            ("GET", re.compile(r"^/tutorials$"), self.list_tutorials),
+            (
+                "GET",
+                re.compile(r"^/tutorials/(?P<tutorial_id>\d+)$"),
+                self.get_tutorial,
+            ),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.handle(scope, receive, send)
+
+    def startup(self) -> None:
+        """
+        Cria as dependências não informadas
+        """
+        if self.run_manager is None:
+            self.run_manager = create_workflow_runner()
+        if self.sessions is None:
+            self.sessions = create_session_store()
+        if self.tutorial_repository is None:
+            self.tutorial_repository = create_tutorial_repository()
+
+    async def lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await asyncio.to_thread(self.startup)
+                except Exception as e:
+                    logger.exception("Falha ao iniciar a API")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+
+            elif message["type"] == "lifespan.shutdown":
+                # Cancela as rodadas em andamento (os checkpoints são desfeitos)
+                if self.run_manager is not None:
+                    await asyncio.to_thread(self.run_manager.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.run_manager is None:
+            await asyncio.to_thread(self.startup)
+
+        path = scope["path"].rstrip("/") or "/"
+        allowed = []
+        try:
+            for method, pattern, handler in self.routes:
+                match = pattern.match(path)
+                if match is None:
+                    continue
+                if method != scope["method"]:
+                    allowed.append(method)
+                    continue
+
+                await handler(Request(scope, receive, match.groupdict()), send)
+                return
+
+            if allowed:
+                await send_json(
+                    send,
+                    405,
+                    {"error": "Método não permitido"},
+                    headers=[(b"allow", ", ".join(allowed).encode())],
+                )
+            else:
+                await send_json(send, 404, {"error": "Rota não encontrada"})
+
+        except HTTPError as e:
+            await send_json(send, e.status, {"error": e.message})
+
+    async def health(self, request: Request, send: Send) -> None:
+        await send_json(send, 200, {"status": "ok"})
+
+    async def create_session(self, request: Request, send: Send) -> None:
+        session_id = await asyncio.to_thread(self.sessions.create)
+        state = await asyncio.to_thread(self.sessions.get, session_id)
+        await send_json(
+            send,
+            201,
+            {"id": session_id, "state": serialize_state(state)},
+            headers=[(b"location", f"/sessions/{session_id}".encode())],
+        )
+
+    async def get_session(self, request: Request, send: Send) -> None:
+        session_id = request.params["session_id"]
+        state = await self._get_state(session_id)
+        await send_json(
+            send,
+            200,
+            {
+                "id": session_id,
+                "state": serialize_state(state),
+                "run": serialize_run(self.run_manager.get(session_id)),
+            },
+        )
+
+    async def send_message(self, request: Request, send: Send) -> None:
+        session_id = request.params["session_id"]
+        payload = await request.json()
+
+        content = payload.get("content")
+        if not isinstance(content, str) or not content.strip():
+            raise HTTPError(400, 'Campo "content" deve ser um texto não vazio')
+
+        state = await self._get_state(session_id)
+        state["messages"].append(HumanMessage(content=content))
+
+        try:
+            run = await asyncio.to_thread(
+                self.run_manager.submit,
+                state,
+                {"configurable": {"thread_id": session_id}},
+                lambda result: self.sessions.save(session_id, result),
+            )
+        except RuntimeError as e:
+            raise HTTPError(409, str(e))
+
+        if "text/event-stream" in request.headers.get("accept", ""):
+            await self._stream(run, request, send)
+            return
+
+        await send_json(
+            send,
+            202,
+            {"id": session_id, "run": serialize_run(run)},
+            headers=[(b"location", f"/sessions/{session_id}/events".encode())],
+        )
+
+    async def stream_events(self, request: Request, send: Send) -> None:
+        session_id = request.params["session_id"]
+        await self._get_state(session_id)
+
+        run = self.run_manager.get(session_id)
+        if run is None:
+            raise HTTPError(404, "A sessão não tem rodadas")
+
+        await self._stream(run, request, send)
+
+    async def cancel_run(self, request: Request, send: Send) -> None:
+        session_id = request.params["session_id"]
+        await self._get_state(session_id)
+
+        cancelled = self.run_manager.cancel(session_id)
+        await send_json(send, 202 if cancelled else 409, {"cancelled": cancelled})
+
+    async def insert_step(self, request: Request, send: Send) -> None:
+        payload = await request.json()
+        position = int_field(payload, "position")
+        title = text_field(payload, "title")
+        description = text_field(payload, "description", required=False)
+        estimated_time = int_field(payload, "estimated_time", required=False)
+
+        depends_on = payload.get("depends_on") or []
+        if not isinstance(depends_on, list) or not all(
+            isinstance(number, int) and not isinstance(number, bool)
+            for number in depends_on
+        ):
+            raise HTTPError(400, 'Campo "depends_on" deve ser uma lista de números')
+
+        await self._edit_learning_path(
+            request.params["session_id"],
+            send,
+            lambda expert: [
+                expert.insert_step(
+                    position, title, description, estimated_time, depends_on
+                )
+            ],
+            status=201,
+        )
+
+    async def update_step(self, request: Request, send: Send) -> None:
+        step_number = int(request.params["step_number"])
+        payload = await request.json()
+        title = text_field(payload, "title", required=False)
+        description = text_field(payload, "description", required=False)
+        feedback = text_field(payload, "feedback", required=False)
+        position = int_field(payload, "position", required=False)
+
+        if all(value is None for value in (title, description, feedback, position)):
+            raise HTTPError(400, "Informe title, description, feedback ou position")
+
+        def edit(expert: Expert) -> List[ExpertStep]:
+            numbers = []
+            if title is not None or description is not None:
+                step = expert.get_step(step_number)
+                numbers += expert.rename_step(
+                    step_number, title or step.title, description
+                )
+            if feedback is not None:
+                numbers += expert.add_feedback(step_number, feedback)
+
+            # Os passos são guardados antes da renumeração feita pela mudança
+            # de posição
+            steps = [expert.get_step(number) for number in numbers]
+            if position is not None:
+                steps += [
+                    expert.get_step(number)
+                    for number in expert.move_step(step_number, position)
+                ]
+
+            return steps
+
+        await self._edit_learning_path(request.params["session_id"], send, edit)
+
+    async def remove_step(self, request: Request, send: Send) -> None:
+        step_number = int(request.params["step_number"])
+
+        await self._edit_learning_path(
+            request.params["session_id"],
+            send,
+            lambda expert: [
+                expert.get_step(number) for number in expert.remove_step(step_number)
+            ],
+        )
+
+    async def list_tutorials(self, request: Request, send: Send) -> None:
+        page = request.query_int("page", 1)
+        page_size = request.query_int("page_size", 20)
+        if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise HTTPError(
+                400, f"page deve ser >= 1 e page_size entre 1 e {MAX_PAGE_SIZE}"
+            )
+
+        result = await asyncio.to_thread(
+            self.tutorial_repository.search,
+            request.query.get("query", ""),
+            page,
+            page_size,
+        )
+        await send_json(send, 200, result.model_dump(mode="json"))
+
+    async def get_tutorial(self, request: Request, send: Send) -> None:
+        tutorial_id = int(request.params["tutorial_id"])
+        writer = await asyncio.to_thread(self.tutorial_repository.get, tutorial_id)
+        if writer is None:
+            raise HTTPError(404, "Tutorial não encontrado")
+
+        await send_json(
+            send, 200, {"id": tutorial_id, **writer.model_dump(mode="json")}
+        )
+
+    async def _get_state(self, session_id: str) -> Dict[str, Any]:
+        state = await asyncio.to_thread(self.sessions.get, session_id)
+        if state is None:
+            raise HTTPError(404, "Sessão não encontrada")
+
+        return state
+
+    async def _edit_learning_path(
+        self,
+        session_id: str,
+        send: Send,
+        edit: Callable[[Expert], List[ExpertStep]],
+        status: int = 200,
+    ) -> None:
+        """
+        Aplica uma edição ao caminho de aprendizado da sessão e responde com
+        os passos que ficaram pendentes (a serem gerados novamente).
+
+        Args:
+            session_id: Identificador da sessão
+            send: Função de envio da resposta
+            edit: Edição a ser aplicada; retorna os passos que ficaram pendentes
+            status: Status da resposta
+        """
+        state = await self._get_state(session_id)
+
+        # A rodada em andamento salvaria o estado anterior por cima da edição
+        run = self.run_manager.get(session_id)
+        if run is not None and not run.done:
+            raise HTTPError(409, "A sessão tem uma rodada em andamento")
+
+        expert = state.get("expert_output")
+        if expert is None or not expert.learning_path:
+            raise HTTPError(409, "A sessão ainda não tem um caminho de aprendizado")
+
+        try:
+            steps = edit(expert)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        # O tutorial final deixa de corresponder aos passos: ele é escrito
+        # novamente quando os passos pendentes forem gerados
+        if steps:
+            state["writer_output"] = None
+
+        await asyncio.to_thread(self.sessions.save, session_id, state)
+        await send_json(
+            send,
+            status,
+            {
+                "id": session_id,
+                "pending_steps": sorted({step.step_number for step in steps}),
+                "state": serialize_state(state),
+            },
+        )
+
+    async def _stream(self, run: WorkflowRun, request: Request, send: Send) -> None:
+        """
+        Envia os eventos da rodada por server-sent events até ela terminar ou
+        o cliente desconectar. Desconectar não cancela a rodada: o cliente
+        pode retomar em /events com o último identificador recebido.
+        """
+        try:
+            position = int(
+                request.headers.get("last-event-id")
+                or request.query.get("last_event_id")
+                or 0
+            )
+        except ValueError:
+            raise HTTPError(400, "Last-Event-ID deve ser um número inteiro")
+
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        disconnected = False
+
+        async def watch_disconnect() -> None:
+            nonlocal disconnected
+            while (await request.receive())["type"] != "http.disconnect":
+                pass
+            disconnected = True
+            changed.set()
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream; charset=utf-8"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+
+        unsubscribe = run.subscribe(lambda: loop.call_soon_threadsafe(changed.set))
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            while not disconnected:
+                changed.clear()
+
+                # Os eventos são publicados antes do término, então, com a
+                # rodada terminada, a lista já está completa
+                done = run.done
+                events = run.events[position:]
+                chunks = []
+                for event in events:
+                    position += 1
+                    data = {"text": event.text}
+                    if event.source is not None:
+                        data["source"] = event.source
+                    chunks.append(format_sse(event.kind, data, position))
+
+                if done:
+                    chunks.append(format_sse("done", self._summary(run)))
+
+                if chunks:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": b"".join(chunks),
+                            "more_body": not done,
+                        }
+                    )
+                if done:
+                    return
+
+                try:
+                    await asyncio.wait_for(changed.wait(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": b": ping\n\n",
+                            "more_body": True,
+                        }
+                    )
+        finally:
+            unsubscribe()
+            watcher.cancel()
+
+    def _summary(self, run: WorkflowRun) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"status": run.status.value}
+        if run.status == RunStatus.COMPLETED:
+            messages = run.result["messages"]
+            summary["message"] = (
+                serialize_message(messages[-1])
+                if messages and messages[-1].type == "ai"
+                else None
+            )
+        elif run.status == RunStatus.FAILED:
+            summary["error"] = str(run.error)
+
+        return summary
+
+
+def create_app(
+    run_manager: RunManager | WorkerSupervisor | None = None,
+    sessions: SessionStore | None = None,
+    tutorial_repository: TutorialRepository | None = None,
+) -> TutorialAPI:
+    """
+    Cria a aplicação ASGI da API
+
+    Args:
+        run_manager: Gerenciador das rodadas do workflow (se omitido, criado
+            com `main.create_workflow_runner`)
+        sessions: Armazenamento das sessões (se omitido, criado com
+            `main.create_session_store`)
+        tutorial_repository: Histórico de tutoriais (se omitido, criado com
+            `main.create_tutorial_repository`)
+
+    Returns:
+        TutorialAPI: A aplicação
+    """
+    return TutorialAPI(run_manager, sessions, tutorial_repository)
+
+
+app = create_app()
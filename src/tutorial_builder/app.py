@@ -1,10 +1,20 @@
+import uuid
+
 import streamlit as st
-from typing import Dict, Any
-from main import create_workflow
-from langchain_core.messages import HumanMessage, BaseMessage
+from main import create_run_manager
+from chat_history import show_history
+from langchain_core.messages import HumanMessage
+from workflow import RunManager, RunStatus, WorkflowRun
+
+# Intervalo, em segundos, entre as atualizações do progresso de uma execução
+POLL_INTERVAL = 0.5
 
 
-workflow = create_workflow()
+@st.cache_resource
+def get_run_manager() -> RunManager:
+    # O workflow e as execuções em andamento sobrevivem aos reruns e são
+    # compartilhados entre as sessões
+    return create_run_manager()
 
 
 def init_session_state() -> None:
@@ -17,7 +27,75 @@ def init_session_state() -> None:
     if "writer_output" not in st.session_state:
         st.session_state.writer_output = None
     if "config" not in st.session_state:
-        st.session_state.config = {"configurable": {"thread_id": "1"}}
+        st.session_state.config = {"configurable": {"thread_id": uuid.uuid4().hex}}
+    if "pending_prompt" not in st.session_state:
+        st.session_state.pending_prompt = None
+
+
+def thread_id() -> str:
+    return st.session_state.config["configurable"]["thread_id"]
+
+
+def start_run(prompt: str) -> None:
+    """
+    Envia a mensagem do usuário para o workflow, em segundo plano. O estado
+    da sessão só é atualizado quando a execução termina com sucesso.
+    """
+    st.session_state.pending_prompt = prompt
+    get_run_manager().submit(
+        {
+            "messages": [*st.session_state.messages, HumanMessage(content=prompt)],
+            "planner_output": st.session_state.planner_output,
+            "expert_output": st.session_state.expert_output,
+            "writer_output": st.session_state.writer_output,
+        },
+        st.session_state.config,
+    )
+
+
+def cancel_run() -> None:
+    get_run_manager().cancel(thread_id())
+
+
+def apply_result(run: WorkflowRun) -> None:
+    prompt = st.session_state.pending_prompt
+    st.session_state.pending_prompt = None
+
+    if run.status == RunStatus.COMPLETED:
+        st.session_state.messages = run.result["messages"]
+        st.session_state.planner_output = run.result["planner_output"]
+        st.session_state.expert_output = run.result["expert_output"]
+        st.session_state.writer_output = run.result["writer_output"]
+    elif run.status == RunStatus.CANCELLED:
+        st.info(f'Execução cancelada. A mensagem "{prompt}" não foi processada.')
+    else:
+        st.error(f"Erro ao processar a mensagem: {run.error}")
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def show_run_progress(run: WorkflowRun) -> None:
+    # Apenas este trecho é atualizado enquanto a execução está em andamento;
+    # ao terminar, a página inteira é atualizada com o resultado
+    if run.done:
+        st.rerun()
+
+    with st.chat_message("assistant"):
+        label = "Na fila..." if run.status == RunStatus.QUEUED else "Pensando..."
+        if run.token.cancelled:
+            label = "Cancelando..."
+
+        events = list(run.events)
+        steps = [event.text for event in events if event.kind != "token"]
+        with st.status(label, expanded=bool(steps)):
+            for step in steps:
+                st.markdown(step)
+
+        # Resposta sendo gerada, parte a parte
+        partial = "".join(event.text for event in events if event.kind == "token")
+        if partial:
+            st.markdown(partial)
+
+        st.button("Cancelar", on_click=cancel_run, disabled=run.token.cancelled)
 
 
 def main() -> None:
@@ -26,45 +104,25 @@ def main() -> None:
     # Inicializar estado da sessão
     init_session_state()
 
-    # Mostrar mensagens anteriores
-    for message in st.session_state.messages:
-        role: str = "assistant" if message.type == "ai" else "user"
-        with st.chat_message(role):
-            st.write(message.content)
+    run = get_run_manager().get(thread_id())
+    if run is not None and run.done and st.session_state.pending_prompt is not None:
+        apply_result(run)
 
-    # Input do usuário
-    if prompt := st.chat_input("Digite sua mensagem..."):
-        # Adicionar mensagem do usuário ao histórico
-        user_message = HumanMessage(content=prompt)
-        st.session_state.messages.append(user_message)
+    # Mostrar mensagens anteriores (janela das mais recentes, passos antigos
+    # recolhidos)
+    show_history(st.session_state.messages)
 
-        # Mostrar mensagem do usuário
+    # Execução em andamento: a mensagem enviada e o progresso
+    running = run is not None and not run.done
+    if running:
         with st.chat_message("user"):
-            st.write(prompt)
-
-        # Processar a mensagem com o workflow
-        with st.spinner("Pensando..."):
-            output: Dict[str, Any] = workflow.invoke(
-                {
-                    "messages": st.session_state.messages,
-                    "planner_output": st.session_state.planner_output,
-                    "expert_output": st.session_state.expert_output,
-                    "writer_output": st.session_state.writer_output,
-                },
-                st.session_state.config,
-            )
-
-            # Atualizar o estado com todas as mensagens do output
-            st.session_state.messages = output["messages"]
-            st.session_state.planner_output = output["planner_output"]
-            st.session_state.expert_output = output["expert_output"]
-            st.session_state.writer_output = output["writer_output"]
-
-            # Mostrar resposta do assistente
-            if output and "messages" in output:
-                last_message: BaseMessage = output["messages"][-1]
-                with st.chat_message("assistant"):
-                    st.write(last_message.content)
+            st.markdown(st.session_state.pending_prompt)
+        show_run_progress(run)
+
+    # Input do usuário
+    if prompt := st.chat_input("Digite sua mensagem...", disabled=running):
+        start_run(prompt)
+        st.rerun()
 
 
 if __name__ == "__main__":
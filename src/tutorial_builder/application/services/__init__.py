@@ -1,5 +1,16 @@
 from .planner_service import PlannerService
 from .expert_service import ExpertService
 from .writer_service import WriterService
+from .troubleshooting_service import TroubleshootingService
+from .reading_service import ReadingService, split_sections
+from .qa_service import QAService
 
-__all__ = ["PlannerService", "ExpertService", "WriterService"]
+__all__ = [
+    "PlannerService",
+    "ExpertService",
+    "WriterService",
+    "TroubleshootingService",
+    "ReadingService",
+    "split_sections",
+    "QAService",
+]
@@ -0,0 +1,149 @@
+import re
+
+from typing import List
+
+# Linhas que costumam conter a mensagem principal de um erro
+ERROR_LINE = re.compile(
+    r"""
+    \b[\w.]*(?:Error|Exception|Errno|Warning)\b
+    | \bERR!
+    | \berror\b\s*[:\[]
+    | command\ not\ found
+    | is\ not\ recognized\ as
+    | permission\ denied
+    | no\ such\ file\ or\ directory
+    | cannot\ find\ module
+    | could\ not\ (?:find|resolve|connect)
+    | unable\ to\ (?:find|locate|resolve|connect)
+    | segmentation\ fault
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Indícios de que a mensagem do usuário relata um erro
+ERROR_REPORT = re.compile(
+    r"""
+    traceback
+    | \b[\w.]*(?:Error|Exception)\b
+    | \berr(?:o|or|os|ors)?\b
+    | \bERR!
+    | \bfalh(?:a|ou|ando)\b
+    | \bfail(?:ed|s|ure)?\b
+    | n[aã]o\ (?:funciona|funcionou|roda|rodou|compila|encontr)
+    | command\ not\ found
+    | permission\ denied
+    | no\ such\ file
+    | exit\ (?:code|status)\ [1-9]
+    | segmentation\ fault
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Negação logo antes de um indício de erro (ex: "sem erros", "nenhum erro",
+# "não deu erro", "no errors"): até duas palavras entre a negação e o indício
+NEGATION = re.compile(
+    r"\b(?:sem|nenhum|nenhuma|nem|n[aã]o|nunca|no|not|without|never)\b"
+    r"(?:\s+\w+){0,2}\s*$",
+    re.IGNORECASE,
+)
+
+# Caracteres antes de um indício de erro verificados em busca de uma negação
+NEGATION_WINDOW = 30
+
+# Linha final de uma exceção (ex: "ModuleNotFoundError: No module named 'x'")
+EXCEPTION_LINE = re.compile(r"^[\w.]*(?:Error|Exception)\b\s*:")
+
+NORMALIZATIONS = [
+    # "bash: flask: command not found" e "zsh: command not found: flask"
+    (
+        re.compile(
+            r"^-?(?:ba|z|fi|c|k)?sh: (?:line \d+: )?"
+            r"(?:command not found: (\S+)|(\S+): command not found)",
+            re.IGNORECASE,
+        ),
+        lambda match: f"command not found: {match.group(1) or match.group(2)}",
+    ),
+    # Caminhos de arquivos (Unix e Windows) e URLs
+    (re.compile(r"\b\w+://\S+"), "<url>"),
+    (re.compile(r"(?:[a-z]:)?(?:[\\/][\w.@~+-]+)+[\\/]?", re.IGNORECASE), "<path>"),
+    # Posição no arquivo: "line 42", ":12:5"
+    (re.compile(r"\bline \d+", re.IGNORECASE), "line <n>"),
+    (re.compile(r"(?<=<path>):\d+(?::\d+)?"), ""),
+    # Versões (3.11.2, v18.2.0, 1.0.0-beta) e endereços de memória
+    (re.compile(r"\bv?\d+(?:\.\d+)+(?:[-+][\w.]+)?\b"), "<version>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.IGNORECASE), "<addr>"),
+    (re.compile(r"\b\d+\b"), "<n>"),
+]
+
+MAX_SIGNATURE_LENGTH = 200
+
+
+def is_error_report(message: str) -> bool:
+    """
+    Verifica se a mensagem do usuário parece relatar um erro: uma linha de
+    exceção (ex: o final de um traceback) ou um indício de erro que não seja
+    negado (ex: "deu erro", mas não "ok, sem erros" ou "nenhum erro").
+
+    Args:
+        message: Mensagem do usuário
+
+    Returns:
+        bool: True se a mensagem contém indícios de um erro
+    """
+    message = message or ""
+
+    if any(EXCEPTION_LINE.match(line) for line in error_lines(message)):
+        return True
+
+    for match in ERROR_REPORT.finditer(message):
+        before = message[max(match.start() - NEGATION_WINDOW, 0) : match.start()]
+        if not NEGATION.search(before):
+            return True
+
+    return False
+
+
+def error_lines(text: str) -> List[str]:
+    """
+    Retorna as linhas do texto que contêm a mensagem de um erro.
+
+    Args:
+        text: Texto reportado pelo usuário
+
+    Returns:
+        List[str]: Linhas com mensagens de erro, na ordem em que aparecem
+    """
+    return [line.strip() for line in text.splitlines() if ERROR_LINE.search(line)]
+
+
+def error_signature(text: str) -> str:
+    """
+    Calcula a assinatura normalizada de um erro: a mensagem principal do erro
+    sem caminhos, versões, números de linha e outros valores que variam entre
+    usuários, para que o mesmo erro tenha a mesma assinatura.
+
+    A mensagem principal é a última linha de exceção (final de um traceback)
+    ou, se não houver, a primeira linha de erro (ex: `npm ERR! code ...`);
+    sem linhas de erro reconhecíveis, o texto inteiro é usado.
+
+    Args:
+        text: Texto reportado pelo usuário
+
+    Returns:
+        str: Assinatura do erro
+    """
+    lines = error_lines(text)
+    exceptions = [line for line in lines if EXCEPTION_LINE.match(line)]
+
+    if exceptions:
+        signature = exceptions[-1]
+    elif lines:
+        signature = lines[0]
+    else:
+        signature = text.strip()
+
+    for pattern, replacement in NORMALIZATIONS:
+        signature = pattern.sub(replacement, signature)
+
+    signature = " ".join(signature.lower().split())
+    return signature[:MAX_SIGNATURE_LENGTH]
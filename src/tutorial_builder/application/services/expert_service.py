@@ -1,26 +1,96 @@
-import json
+import hashlib
+import logging
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from pydantic import BaseModel, ValidationError
+from domain.interfaces import (
+    LLMService,
+    ExpertAgent,
+    LearningPathLibrary,
+    RetrievalIndex,
+    StructuredOutputError,
+)
+from entities import Expert, ExpertStep, StepStatus, Planner
+from langchain_core.messages import SystemMessage
 
-from typing import List
+from .json_repair import JsonRepairService
+from .json_stream_parser import JsonArrayStreamParser
 
-from pydantic import BaseModel
-from domain.interfaces import LLMService, ExpertAgent
-from domain.entities import Expert, ExpertStep, StepStatus, Planner
-from langchain_core.messages import SystemMessage
+
+logger = logging.getLogger(__name__)
+
+# Respostas do usuário que indicam que um campo opcional não foi informado
+EMPTY_ANSWERS = {"", "n/a", "na", "nenhuma", "nenhum", "nao", "não", "none"}
+
+
+def _is_empty(value: str | None) -> bool:
+    return (value or "").strip().strip(".").lower() in EMPTY_ANSWERS
+
+
+def _parse_depends_on(value, index: int) -> List[int]:
+    """
+    Lê as dependências de um passo, mantendo apenas números de passos
+    anteriores a ele (o passo na posição `index` tem o número `index + 1`).
+    """
+    if not isinstance(value, list):
+        return []
+
+    depends_on = set()
+    for number in value:
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            continue
+
+        if 1 <= number <= index:
+            depends_on.add(number)
+
+    return sorted(depends_on)
 
 
 class ExpertService(ExpertAgent):
-    def __init__(self, llm_service: LLMService, expert: Expert):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        expert: Expert,
+        json_repair: JsonRepairService | None = None,
+        library: LearningPathLibrary | None = None,
+        max_workers: int = 4,
+        max_speculations: int = 64,
+        retrieval: RetrievalIndex | None = None,
+        retrieval_k: int = 3,
+        recent_steps: int = 3,
+    ):
         self.llm_service = llm_service
         self.expert = expert
+        self.json_repair = json_repair or JsonRepairService(llm_service)
+        self.library = library
+        self.retrieval = retrieval
+        self.retrieval_k = retrieval_k
+        self.recent_steps = recent_steps
+        self.prompt_version = self.get_prompt_version()
+
+        # Gerações especulativas do caminho de aprendizado, por sessão
+        self.max_speculations = max_speculations
+        self.speculation_stats = {"started": 0, "reused": 0, "discarded": 0}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="expert"
+        )
+        self._speculations: Dict[str, Tuple[tuple, Future]] = {}
+        self._speculation_lock = threading.Lock()
 
     def get_expert(self) -> Expert:
         """
-        Retorna o objeto Expert
+        Retorna um novo objeto Expert, cópia do Expert recebido na criação do
+        serviço; cada sessão deve ter o seu, pois o serviço é compartilhado
 
         Returns:
             Expert: O objeto Expert
         """
-        return self.expert
+        return self.expert.model_copy(deep=True)
 
     def create_system_message(self, planner: Planner) -> str:
         """
@@ -33,7 +103,8 @@ class ExpertService(ExpertAgent):
         "step_number": int,
         "title": str,
         "description": str,
-        "estimated_time": int
+        "estimated_time": int,
+        "depends_on": [int]
     }
 ]
 """
@@ -64,6 +135,9 @@ DESCRIÇÃO DOS CAMPOS:
 - title: Título descritivo do passo
 - description: Descrição simples do passo, informando o que será feito.
 - estimated_time: Tempo estimado para conclusão do passo em minutos
+- depends_on: Números dos passos ANTERIORES dos quais este passo depende
+    diretamente (ex: usa o código ou conceito criado neles). Use [] se não
+    depender de nenhum passo.
 
 Devolva em formato JSON (sem inserir marcação de JSON: ```json),
     sem nenhum texto adicional e com o seguinte formato:
@@ -81,6 +155,60 @@ INSTRUÇÕES ADICIONAIS DO USUÁRIO: {planner.instructions}
 
         return SystemMessage(content=SYSTEM_MESSAGE).content
 
+    def get_prompt_version(self) -> str:
+        """
+        Calcula a versão do prompt do caminho de aprendizado a partir do
+        próprio template, de modo que qualquer alteração no prompt invalide
+        os caminhos salvos na biblioteca.
+
+        Returns:
+            str: Hash do template do prompt
+        """
+        template = self.create_system_message(
+            Planner.model_construct(
+                subject="{subject}",
+                level="{level}",
+                project_type="{project_type}",
+                environment="{environment}",
+                instructions="{instructions}",
+            )
+        )
+        return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+    def can_use_library(self, planner: Planner) -> bool:
+        """
+        Verifica se o caminho de aprendizado do plano pode vir da biblioteca.
+        Planos com instruções adicionais do usuário sempre são gerados pelo LLM,
+        pois as instruções não fazem parte da chave da biblioteca.
+
+        Args:
+            planner: Objeto Planner contendo informações sobre o tutorial
+
+        Returns:
+            bool: True se a biblioteca pode ser consultada e alimentada
+        """
+        return self.library is not None and _is_empty(planner.instructions)
+
+    def save_learning_path(
+        self, planner: Planner, learning_path: List[ExpertStep]
+    ) -> None:
+        """
+        Salva na biblioteca o caminho de aprendizado de uma sessão concluída
+
+        Args:
+            planner: Objeto Planner contendo informações sobre o tutorial
+            learning_path: Passos do caminho de aprendizado concluído
+        """
+        if not self.can_use_library(planner):
+            return
+
+        try:
+            self.library.save(
+                planner, learning_path, self.prompt_version, source="session"
+            )
+        except Exception as e:
+            logger.warning("Não foi possível salvar o caminho de aprendizado: %s", e)
+
     def generate_learning_path(self, planner: Planner) -> List[ExpertStep]:
         """
         Gera um caminho de aprendizado baseado no plano de aprendizagem
@@ -88,71 +216,262 @@ INSTRUÇÕES ADICIONAIS DO USUÁRIO: {planner.instructions}
         Returns:
             List[ExpertStep]: Lista de passos do caminho de aprendizado gerados pela LLM
         """
-        # 1. Obter o plano atual
-        # planner = planner
+        return list(self.stream_learning_path(planner))
+
+    def stream_learning_path(
+        self, planner: Planner, session_id: str | None = None
+    ) -> Iterator[ExpertStep]:
+        """
+        Gera o caminho de aprendizado em streaming, devolvendo cada passo assim
+        que o seu objeto JSON é concluído na resposta do LLM.
+
+        Se houver uma geração especulativa da sessão para o mesmo plano, o
+        resultado dela é usado (aguardando-a, se ainda estiver em andamento).
+
+        Args:
+            planner: Objeto Planner contendo informações sobre o tutorial a ser gerado
+            session_id: Identificador da sessão (thread_id) da especulação
+
+        Returns:
+            Iterator[ExpertStep]: Passos do caminho de aprendizado, em ordem
+        """
+        speculative_steps = self._take_speculation(planner, session_id)
+        if speculative_steps is not None:
+            yield from speculative_steps
+        else:
+            yield from self._generate_steps(planner)
+
+    def speculate_learning_path(self, planner: Planner, session_id: str) -> None:
+        """
+        Inicia em segundo plano a geração do caminho de aprendizado de um plano
+        válido, enquanto o planner ainda pergunta pelos campos opcionais.
+
+        O resultado é reutilizado por `stream_learning_path` se os campos
+        opcionais permanecerem vazios (ou "N/A"); caso o usuário os preencha,
+        a especulação é descartada. Uma nova chamada para a mesma sessão com
+        o mesmo plano não inicia outra geração.
+
+        Args:
+            planner: Objeto Planner com ao menos assunto e nível definidos
+            session_id: Identificador da sessão (thread_id)
+        """
+        if not planner.is_valid():
+            return
+
+        snapshot = planner.model_copy(deep=True)
+        fingerprint = self._plan_fingerprint(snapshot)
+
+        with self._speculation_lock:
+            current = self._speculations.pop(session_id, None)
+            if current is not None and current[0] == fingerprint:
+                self._speculations[session_id] = current
+                return
+
+            if current is not None:
+                self._discard(current[1])
+
+            while len(self._speculations) >= self.max_speculations:
+                oldest = next(iter(self._speculations))
+                self._discard(self._speculations.pop(oldest)[1])
+
+            future = self._executor.submit(lambda: list(self._generate_steps(snapshot)))
+            self._speculations[session_id] = (fingerprint, future)
+            self.speculation_stats["started"] += 1
+
+        logger.info("Geração especulativa iniciada (sessão %s)", session_id)
+
+    def _take_speculation(
+        self, planner: Planner, session_id: str | None
+    ) -> List[ExpertStep] | None:
+        """
+        Retira a especulação da sessão e devolve seus passos se ela foi feita
+        para o mesmo plano; caso contrário, descarta-a e devolve None.
+        """
+        if session_id is None:
+            return None
+
+        with self._speculation_lock:
+            speculation = self._speculations.pop(session_id, None)
+
+        if speculation is None:
+            return None
+
+        fingerprint, future = speculation
+
+        if fingerprint != self._plan_fingerprint(planner):
+            with self._speculation_lock:
+                self._discard(future)
+            return None
+
+        try:
+            steps = future.result()
+        except Exception as e:
+            logger.warning("Geração especulativa falhou: %s", e)
+            return None
+
+        if not steps:
+            return None
+
+        with self._speculation_lock:
+            self.speculation_stats["reused"] += 1
+
+        return steps
+
+    def _discard(self, future: Future) -> None:
+        future.cancel()
+        self.speculation_stats["discarded"] += 1
+
+    @staticmethod
+    def _plan_fingerprint(planner: Planner) -> tuple:
+        """
+        Identifica o plano para a especulação; campos opcionais vazios e
+        respostas como "N/A" ou "nenhum" são equivalentes.
+        """
+        return tuple(
+            "" if _is_empty(value) else value.strip().lower()
+            for value in (
+                planner.subject,
+                planner.level,
+                planner.project_type,
+                planner.environment,
+                planner.instructions,
+            )
+        )
+
+    def _generate_steps(self, planner: Planner) -> Iterator[ExpertStep]:
+        """
+        Gera os passos do caminho de aprendizado sem alterar o Expert.
+
+        Se a biblioteca tiver um caminho para o plano, gerado pela versão
+        atual do prompt, ele é usado sem chamar o LLM. Os passos são
+        renumerados sequencialmente caso algum objeto inválido seja ignorado.
+        Se nenhum passo puder ser lido durante o streaming, a resposta completa
+        passa pelo reparo local de JSON e, só então, por uma correção via LLM.
+        """
+        expert_steps: List[ExpertStep] = []
+
+        if (library_path := self._find_in_library(planner)) is not None:
+            for step in library_path:
+                step = self._create_step(step.model_dump(), len(expert_steps))
+                if step is not None:
+                    expert_steps.append(step)
+                    yield step
+
+            return
 
-        # 2. Criar a mensagem do sistema
         system_message = self.create_system_message(planner)
+        parser = JsonArrayStreamParser()
+        response: List[str] = []
 
-        # 3. Enviar para o LLM
-        response = self.llm_service.invoke([system_message])
+        chunks = self.llm_service.stream(
+            [system_message], call_site="expert.learning_path"
+        )
 
-        # 4. Processar a resposta e converter para ExpertStep
-        # Substituir aspas simples por aspas duplas para garantir que o JSON seja válido
-        response = response.replace("'", '"')
-        steps_data = json.loads(response)
+        for chunk in chunks:
+            response.append(chunk)
+            for step_data in parser.feed(chunk):
+                if (step := self._create_step(step_data, len(expert_steps))) is None:
+                    continue
 
-        expert_steps = [
-            ExpertStep(
-                step_number=step["step_number"],
-                title=step["title"],
-                description=step["description"],
-                estimated_time=step["estimated_time"],
-                status=StepStatus.PENDING,
+                expert_steps.append(step)
+                yield step
+
+        parser.finish()
+
+        for error in parser.errors:
+            logger.warning("Learning path: %s", error)
+
+        if not expert_steps:
+            repaired_steps = self.json_repair.parse(
+                "".join(response),
+                ExpertStep,
+                many=True,
+                call_site="expert.learning_path.repair",
             )
-            for step in steps_data
-        ]
 
-        self.expert.learning_path = expert_steps
+            for step in repaired_steps:
+                step = self._create_step(step.model_dump(), len(expert_steps))
+                if step is not None:
+                    expert_steps.append(step)
+                    yield step
+
+    def _find_in_library(self, planner: Planner) -> List[ExpertStep] | None:
+        """
+        Consulta a biblioteca; falhas na biblioteca não impedem a geração pelo LLM.
+        """
+        if not self.can_use_library(planner):
+            return None
+
+        try:
+            learning_path = self.library.find(planner, self.prompt_version)
+        except Exception as e:
+            logger.warning("Falha ao consultar a biblioteca de caminhos: %s", e)
+            return None
 
-        return expert_steps
+        if learning_path:
+            logger.info("Caminho de aprendizado reutilizado da biblioteca")
 
-    def generate_step_content(self, step: ExpertStep) -> ExpertStep:
+        return learning_path or None
+
+    def _create_step(self, step_data: dict, index: int) -> ExpertStep | None:
+        """
+        Converte um objeto do learning path em ExpertStep, numerando-o pela
+        posição para manter a sequência iniciada em 1.
+        """
+        try:
+            return ExpertStep(
+                step_number=index + 1,
+                title=step_data["title"],
+                description=step_data.get("description"),
+                estimated_time=step_data.get("estimated_time"),
+                depends_on=_parse_depends_on(step_data.get("depends_on"), index),
+                status=StepStatus.PENDING,
+            )
+        except (KeyError, TypeError, ValidationError) as e:
+            logger.warning("Passo inválido ignorado (%s): %s", e, step_data)
+            return None
+
+    def generate_step_content(self, step: ExpertStep, expert: Expert) -> ExpertStep:
         """
         Gera o conteúdo detalhado para um passo específico do caminho de aprendizado
 
         Args:
             step: Objeto ExpertStep contendo informações sobre o passo a ser gerado
+            expert: Expert da sessão, com o caminho de aprendizado do passo
 
         Returns:
             ExpertStep: Objeto ExpertStep com o conteúdo detalhado gerado pela LLM
         """
 
         completed_steps = [
-            step
-            for step in self.expert.learning_path
-            if step.status == StepStatus.COMPLETED
+            step for step in expert.learning_path if step.status == StepStatus.COMPLETED
         ]
 
+        # O conteúdo dos últimos passos concluídos da sessão entra sempre por
+        # inteiro. Com o índice de recuperação, os passos mais antigos entram
+        # só pelo título e pela descrição; os trechos recuperados (de qualquer
+        # tutorial) são apenas referências extras
+        first_recent = len(completed_steps) - self.recent_steps
         completed_steps_string = "\n".join(
             [
-                f"""
-{step.step_number}. {step.title}
-DESCRIÇÃO DO PASSO:
-{step.description}
+                self._describe_completed_step(
+                    step, self.retrieval is None or index >= first_recent
+                )
+                for index, step in enumerate(completed_steps)
+            ]
+        )
 
-CONTEÚDO:
-{step.content}
+        references = self._retrieve_references(step, expert)
 
-PRÉ-REQUISITOS:
-{step.prerequisites}
+        feedback = (
+            f"""
+FEEDBACK DO USUÁRIO SOBRE ESTE PASSO (o conteúdo deve atendê-lo):
+{step.feedback}
 """
-                for step in completed_steps
-            ]
+            if step.feedback
+            else ""
         )
 
-        expert = self.expert
-
         SYSTEM_MESSAGE = f"""
 Você é um especialista em {expert.subject} e também em criar conteúdo detalhado para tutoriais.
 
@@ -172,13 +491,13 @@ INSTRUÇÕES ADICIONAIS DO USUÁRIO: {expert.instructions}
 
 OBSERVAÇÃO IMPORTANTE:
     Observe os passos já completados e NÃO adicione informações repetidas.
-
+{references}
 ## PASSO ATUAL
 
 NÚMERO DO PASSO: {step.step_number}
 TÍTULO DO PASSO: {step.title}
 DESCRIÇÃO DO PASSO: {step.description}
-
+{feedback}
 ## INSTRUÇÕES
 
 Gere um conteúdo detalhado (campo `content`) para este passo, incluindo:
@@ -206,15 +525,95 @@ NÃO INVENTE COMANDOS, FERRAMENTAS OU CONCEITOS,
             content: str
             prerequisites: str
 
-        extracted_info = self.llm_service.invoke_with_structured_output(
-            SYSTEM_MESSAGE,
-            ExtractedInfo.model_json_schema(),
+        try:
+            extracted_info = self.llm_service.invoke_with_structured_output(
+                SYSTEM_MESSAGE,
+                ExtractedInfo.model_json_schema(),
+                call_site="expert.step_content",
+            )
+        except StructuredOutputError as e:
+            extracted_info = e.raw_output
+
+        extracted_info = self.json_repair.parse(
+            extracted_info, ExtractedInfo, call_site="expert.step_content.repair"
         )
 
-        step.content = extracted_info["content"]
-        step.prerequisites = extracted_info["prerequisites"]
+        step.content = extracted_info.content
+        step.prerequisites = extracted_info.prerequisites
         step.status = StepStatus.COMPLETED
 
-        self.expert.learning_path[step.step_number - 1] = step
+        expert.learning_path[step.step_number - 1] = step
+        self._index_step(step, expert)
 
         return step
+
+    @staticmethod
+    def _describe_completed_step(step: ExpertStep, with_content: bool) -> str:
+        content = f"""
+CONTEÚDO:
+{step.content}
+"""
+
+        return f"""
+{step.step_number}. {step.title}
+DESCRIÇÃO DO PASSO:
+{step.description}
+{content if with_content else ""}
+PRÉ-REQUISITOS:
+{step.prerequisites}
+"""
+
+    def _retrieve_references(self, step: ExpertStep, expert: Expert) -> str:
+        """
+        Busca no índice de recuperação os trechos de tutoriais e passos já
+        gerados mais relevantes para o passo atual.
+
+        Args:
+            step: Passo a ser gerado
+            expert: Expert da sessão
+
+        Returns:
+            str: Seção do prompt com os trechos (vazia se não houver)
+        """
+        if self.retrieval is None:
+            return ""
+
+        query = f"{expert.subject}\n{step.title}\n{step.description}"
+
+        try:
+            chunks = self.retrieval.search(query, k=self.retrieval_k)
+        except Exception as e:
+            logger.warning("Falha ao consultar o índice de recuperação: %s", e)
+            return ""
+
+        if not chunks:
+            return ""
+
+        chunks_string = "\n\n".join(
+            f'<CHUNK source="{chunk.source}">\n{chunk.text}\n</CHUNK>'
+            for chunk in chunks
+        )
+
+        return f"""
+## TRECHOS DE REFERÊNCIA (dentro da tag <REFERENCES>)
+
+Trechos de outros tutoriais já gerados, relacionados a este passo. Use-os
+apenas como referência de terminologia; os passos deste tutorial são os de
+<COMPLETED_STEPS>. Não os copie.
+
+<REFERENCES>
+{chunks_string}
+</REFERENCES>
+"""
+
+    def _index_step(self, step: ExpertStep, expert: Expert) -> None:
+        if self.retrieval is None or not step.content:
+            return
+
+        try:
+            self.retrieval.add(
+                f"## {step.title}\n\n{step.content}",
+                source=f"step:{expert.subject}:{step.step_number}",
+            )
+        except Exception as e:
+            logger.warning("Falha ao indexar o passo %s: %s", step.step_number, e)
@@ -0,0 +1,484 @@
+import json
+import logging
+import re
+import threading
+
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel, ValidationError
+from domain.interfaces import LLMService
+
+
+logger = logging.getLogger(__name__)
+
+# Bloco de código markdown: ```json ... ```
+_CODE_FENCE = re.compile(r"```[\w-]*\s*(.*?)```", re.DOTALL)
+
+# Vírgulas finais antes de fechar objetos ou listas: {"a": 1,}
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+# Pares chave/valor incompletos no final de uma resposta truncada
+_DANGLING_PAIR = re.compile(r'(?:,|(?<=[{\[]))\s*"[^"]*"\s*:?\s*$')
+_DANGLING_COMMA = re.compile(r",\s*$")
+
+# Literais do Python que o modelo às vezes usa no lugar dos literais JSON
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+# Caracteres que, após uma aspa simples, indicam o fim da string
+_STRING_TERMINATORS = ",}]:"
+
+_CLOSING = {"{": "}", "[": "]"}
+
+
+class JsonRepairError(ValueError):
+    """
+    Lançada quando não é possível obter um JSON válido para o schema esperado.
+    """
+
+
+class JsonTextNormalizer:
+    """
+    Converte, caractere a caractere, um texto "quase JSON" em JSON válido.
+
+    Corrige os desvios mais comuns das respostas do LLM:
+
+    - strings com aspas simples, inclusive com apóstrofos no conteúdo
+      (ex: 'Don't panic'), sem alterar strings com aspas duplas;
+    - quebras de linha e tabulações sem escape dentro de strings;
+    - literais True, False e None.
+
+    Também acompanha a pilha de objetos e listas abertos, o que permite saber
+    quando um valor terminou (`is_complete`) e fechar respostas truncadas
+    (`close`).
+    """
+
+    def __init__(self):
+        self.stack: List[str] = []
+        self._output: List[str] = []
+        self._word: List[str] = []
+        self._quote: str | None = None
+        self._escape = False
+        self._pending_close = False
+        self._pending_whitespace: List[str] = []
+        self._started = False
+        self._item_boundary = 0
+
+    @property
+    def is_complete(self) -> bool:
+        """
+        Indica se um valor JSON completo (objeto ou lista) já foi processado.
+        """
+        return self._started and not self.stack and self._quote is None
+
+    @property
+    def text(self) -> str:
+        """
+        Texto normalizado até o momento.
+        """
+        return "".join(self._output) + "".join(self._word)
+
+    def push(self, char: str) -> None:
+        """
+        Processa o próximo caractere.
+        """
+        if self._quote is not None and self._push_string(char):
+            return
+
+        self._push_structure(char)
+
+    def close(self) -> str:
+        """
+        Finaliza o texto, fechando strings, objetos e listas que ficaram
+        abertos (resposta truncada) e removendo pares chave/valor incompletos.
+        Em uma lista truncada, o último item incompleto é descartado.
+
+        Returns:
+            str: O texto normalizado e fechado
+        """
+        if len(self.stack) > 1 and self.stack[0] == "[" and self._item_boundary:
+            self._output = self._output[: self._item_boundary]
+            self.stack = self.stack[:1]
+            self._word = []
+            self._quote = None
+            self._pending_close = False
+
+        if self._pending_close:
+            self._pending_close = False
+            self._output.append('"' + "".join(self._pending_whitespace))
+            self._quote = None
+
+        if self._quote is not None:
+            if self._escape:
+                self._escape = False
+            self._output.append('"')
+            self._quote = None
+
+        self._flush_word()
+
+        text = "".join(self._output).rstrip()
+        if self.stack:
+            text = _DANGLING_PAIR.sub("", text)
+            text = _DANGLING_COMMA.sub("", text)
+
+        text += "".join(_CLOSING[opening] for opening in reversed(self.stack))
+        self.stack = []
+
+        return text
+
+    def _push_string(self, char: str) -> bool:
+        """
+        Processa um caractere dentro de uma string. Devolve False quando o
+        caractere encerra a string e deve ser processado como estrutura.
+        """
+        if self._pending_close:
+            if char.isspace():
+                self._pending_whitespace.append(char)
+                return True
+
+            self._pending_close = False
+            whitespace = "".join(self._pending_whitespace)
+
+            if char in _STRING_TERMINATORS:
+                # A aspa simples anterior realmente fechava a string
+                self._output.append('"' + whitespace)
+                self._quote = None
+                return False
+
+            # Era um apóstrofo dentro do texto
+            self._output.append("'" + whitespace)
+
+        if self._escape:
+            self._escape = False
+            self._output.append("'" if char == "'" else "\\" + char)
+        elif char == "\\":
+            self._escape = True
+        elif char == self._quote:
+            if self._quote == '"':
+                self._output.append('"')
+                self._quote = None
+            else:
+                self._pending_close = True
+                self._pending_whitespace = []
+        elif char == '"':
+            self._output.append('\\"')
+        elif char == "\n":
+            self._output.append("\\n")
+        elif char == "\t":
+            self._output.append("\\t")
+        else:
+            self._output.append(char)
+
+        return True
+
+    def _push_structure(self, char: str) -> None:
+        if char.isalpha() or char == "_" or (self._word and char.isalnum()):
+            self._word.append(char)
+            return
+
+        self._flush_word()
+
+        if char in "\"'":
+            self._quote = char
+            self._output.append('"')
+            return
+
+        if char in _CLOSING:
+            self._started = True
+            self.stack.append(char)
+        elif char in "}]" and self.stack:
+            self.stack.pop()
+
+        self._output.append(char)
+
+        # Fim de um item de uma lista de primeiro nível
+        if char in "}]" and len(self.stack) == 1:
+            self._item_boundary = len(self._output)
+
+    def _flush_word(self) -> None:
+        if self._word:
+            word = "".join(self._word)
+            self._output.append(_LITERALS.get(word, word))
+            self._word = []
+
+
+def loads_lenient(text: str) -> Any:
+    """
+    Faz o parse de um JSON já normalizado, removendo vírgulas finais
+    caso o parse direto falhe.
+
+    Raises:
+        json.JSONDecodeError: Se o texto não for um JSON válido
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", text))
+
+
+def repair_json(text: str) -> Any:
+    """
+    Repara localmente, sem chamar o LLM, uma resposta JSON malformada.
+
+    Remove blocos de código markdown e textos antes e depois do JSON, corrige
+    aspas simples, literais do Python, quebras de linha sem escape e vírgulas
+    finais, e fecha objetos e listas de respostas truncadas.
+
+    Args:
+        text: Resposta do LLM
+
+    Returns:
+        Any: O valor JSON (objeto ou lista)
+
+    Raises:
+        JsonRepairError: Se não for possível reparar o JSON
+    """
+    if match := _CODE_FENCE.search(text or ""):
+        text = match.group(1)
+
+    start = min(
+        (index for index in (text.find("{"), text.find("[")) if index >= 0),
+        default=-1,
+    )
+    if start < 0:
+        raise JsonRepairError("Nenhum objeto ou lista JSON encontrado na resposta")
+
+    normalizer = JsonTextNormalizer()
+    for char in text[start:]:
+        normalizer.push(char)
+        if normalizer.is_complete:
+            break
+
+    try:
+        return loads_lenient(normalizer.close())
+    except json.JSONDecodeError as e:
+        raise JsonRepairError(f"JSON inválido após reparo local: {e}") from e
+
+
+def drop_invalid_fields(
+    data: Dict[str, Any], model: Type[BaseModel], error: ValidationError
+) -> Dict[str, Any]:
+    """
+    Remove do objeto os campos opcionais que falharam na validação, para que
+    assumam o valor padrão do modelo. Campos obrigatórios são mantidos.
+    """
+    invalid = {
+        error_detail["loc"][0]
+        for error_detail in error.errors()
+        if error_detail["loc"]
+        and error_detail["loc"][0] in model.model_fields
+        and not model.model_fields[error_detail["loc"][0]].is_required()
+    }
+
+    return {key: value for key, value in data.items() if key not in invalid}
+
+
+def validate_object(data: Any, model: Type[BaseModel]) -> BaseModel:
+    """
+    Valida um objeto contra o schema do modelo, descartando localmente os
+    campos opcionais inválidos.
+
+    Raises:
+        ValidationError: Se o objeto não satisfizer o schema
+    """
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        if not isinstance(data, dict):
+            raise
+
+        repaired = drop_invalid_fields(data, model, e)
+        if repaired == data:
+            raise
+
+        return model.model_validate(repaired)
+
+
+def validate_json(
+    data: Any, model: Type[BaseModel], many: bool = False
+) -> BaseModel | List[BaseModel]:
+    """
+    Valida o JSON contra o schema de um modelo pydantic.
+
+    Args:
+        data: Valor JSON reparado
+        model: Modelo pydantic esperado (ex: ExpertStep, Planner)
+        many: Se True, espera uma lista de objetos. Listas dentro de um
+            objeto (ex: {"steps": [...]}) também são aceitas, e um último
+            item inválido (resposta truncada) é descartado.
+
+    Returns:
+        BaseModel | List[BaseModel]: O(s) objeto(s) validado(s)
+
+    Raises:
+        ValidationError: Se o JSON não satisfizer o schema
+    """
+    if not many:
+        return validate_object(data, model)
+
+    if isinstance(data, dict):
+        lists = [value for value in data.values() if isinstance(value, list)]
+        data = lists[0] if len(lists) == 1 else [data]
+
+    # Escalares (ex: 42, true, "texto") não são uma lista de objetos; o erro
+    # de validação leva ao reparo, como nos demais JSONs inválidos
+    if not isinstance(data, list):
+        raise ValidationError.from_exception_data(
+            model.__name__, [{"type": "list_type", "loc": (), "input": data}]
+        )
+
+    items = []
+    for index, item in enumerate(data):
+        try:
+            items.append(validate_object(item, model))
+        except ValidationError:
+            if index < len(data) - 1 or not items:
+                raise
+
+    return items
+
+
+class JsonRepairService:
+    """
+    Obtém objetos válidos a partir de respostas JSON do LLM.
+
+    Primeiro tenta o parse direto; depois o reparo local (`repair_json`);
+    apenas se ambos falharem faz uma chamada pequena e direcionada ao LLM
+    pedindo a correção do JSON, com o erro encontrado e o schema esperado.
+
+    As estatísticas (`stats` e `success_rate`) mostram quantas respostas
+    foram válidas, reparadas localmente, reparadas pelo LLM ou perdidas.
+    """
+
+    FIX_PROMPT = """
+Corrija o JSON abaixo para que ele seja válido e satisfaça o schema informado.
+Devolva APENAS o JSON corrigido, sem marcação de código e sem texto adicional.
+Não altere o conteúdo dos campos além do necessário para a correção.
+
+ERRO ENCONTRADO:
+{error}
+
+SCHEMA ESPERADO{many}:
+{schema}
+
+<json>
+{text}
+</json>
+"""
+
+    def __init__(self, llm_service: LLMService | None = None):
+        self.llm_service = llm_service
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "valid": 0,
+            "repaired_locally": 0,
+            "repaired_by_llm": 0,
+            "failed": 0,
+        }
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+        logger.info("JSON %s (estatísticas: %s)", outcome, self.stats)
+
+    def success_rate(self) -> Dict[str, float]:
+        """
+        Retorna as taxas de sucesso do reparo.
+
+        Returns:
+            Dict[str, float]: `local_repair_rate` (fração das respostas inválidas
+                reparadas sem chamar o LLM) e `overall_success_rate`
+        """
+        with self._lock:
+            stats = dict(self.stats)
+
+        total = sum(stats.values())
+        invalid = total - stats["valid"]
+
+        return {
+            "local_repair_rate": (
+                stats["repaired_locally"] / invalid if invalid else 1.0
+            ),
+            "overall_success_rate": (total - stats["failed"]) / total if total else 1.0,
+        }
+
+    def parse(
+        self,
+        text: str | Dict[str, Any],
+        model: Type[BaseModel],
+        many: bool = False,
+        call_site: str = "json.repair",
+    ) -> BaseModel | List[BaseModel]:
+        """
+        Converte uma resposta do LLM em objeto(s) validado(s) pelo schema.
+
+        Args:
+            text: Resposta do LLM (texto ou dicionário já decodificado)
+            model: Modelo pydantic esperado
+            many: Se True, espera uma lista de objetos
+            call_site: Identificador da chamada de correção ao LLM
+
+        Returns:
+            BaseModel | List[BaseModel]: O(s) objeto(s) validado(s)
+
+        Raises:
+            JsonRepairError: Se nem o reparo local nem o LLM produzirem JSON válido
+        """
+        if not isinstance(text, str):
+            try:
+                result = validate_json(text, model, many)
+                self._count("valid")
+                return result
+            except ValidationError as e:
+                error = str(e)
+                text = json.dumps(text, ensure_ascii=False)
+        else:
+            try:
+                result = validate_json(json.loads(text), model, many)
+                self._count("valid")
+                return result
+            except (json.JSONDecodeError, ValidationError):
+                pass
+
+            try:
+                result = validate_json(repair_json(text), model, many)
+                self._count("repaired_locally")
+                return result
+            except (JsonRepairError, ValidationError) as e:
+                error = str(e)
+
+        if self.llm_service is not None:
+            try:
+                result = validate_json(
+                    repair_json(self._ask_fix(text, error, model, many, call_site)),
+                    model,
+                    many,
+                )
+                self._count("repaired_by_llm")
+                return result
+            except (JsonRepairError, ValidationError) as e:
+                error = str(e)
+
+        self._count("failed")
+        raise JsonRepairError(error)
+
+    def _ask_fix(
+        self,
+        text: str,
+        error: str,
+        model: Type[BaseModel],
+        many: bool,
+        call_site: str,
+    ) -> str:
+        """
+        Pede ao LLM apenas a correção do JSON (prompt pequeno, sem o contexto
+        original da geração).
+        """
+        prompt = self.FIX_PROMPT.format(
+            error=error[:1_000],
+            many=" (uma lista de objetos com este schema)" if many else "",
+            schema=json.dumps(model.model_json_schema(), ensure_ascii=False),
+            text=text,
+        )
+
+        return self.llm_service.invoke([prompt], call_site=call_site)
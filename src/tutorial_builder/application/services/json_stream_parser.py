@@ -0,0 +1,104 @@
+import json
+
+from typing import Any, Dict, List
+
+from .json_repair import JsonTextNormalizer, loads_lenient
+
+
+class JsonArrayStreamParser:
+    """
+    Parser incremental de um array JSON de objetos recebido em partes (streaming).
+
+    Cada chamada a `feed` recebe o próximo trecho da resposta do LLM e devolve
+    os objetos do array que foram concluídos naquele trecho, sem esperar o
+    fim da resposta. O parser tolera os desvios mais comuns das respostas:
+
+    - texto ou marcação (```json) antes e depois do array;
+    - strings com aspas simples, inclusive com apóstrofos no conteúdo
+      (ex: 'Don't panic'), sem corromper strings com aspas duplas;
+    - quebras de linha e tabulações sem escape dentro de strings;
+    - literais True, False e None e vírgulas finais.
+
+    Objetos inválidos são ignorados e registrados em `errors`. Se a resposta
+    terminar com um objeto incompleto, `truncated` fica True após `finish`.
+    """
+
+    def __init__(self):
+        self.errors: List[str] = []
+        self.truncated = False
+        self.started = False
+        self.finished = False
+
+        self._item: JsonTextNormalizer | None = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Processa o próximo trecho da resposta.
+
+        Args:
+            chunk: Trecho de texto recebido do LLM
+
+        Returns:
+            List[Dict[str, Any]]: Objetos do array concluídos neste trecho
+        """
+        items: List[Dict[str, Any]] = []
+
+        for char in chunk:
+            if self.finished:
+                break
+
+            if not self.started:
+                self.started = char == "["
+                continue
+
+            if self._item is None:
+                self._feed_between_items(char)
+                continue
+
+            self._item.push(char)
+
+            if self._item.is_complete:
+                if (item := self._parse_item(self._item.text)) is not None:
+                    items.append(item)
+                self._item = None
+
+        return items
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """
+        Sinaliza o fim da resposta.
+
+        Returns:
+            List[Dict[str, Any]]: Objetos restantes (sempre vazio, pois objetos
+                incompletos não são devolvidos)
+        """
+        if not self.started:
+            self.errors.append("Nenhum array JSON encontrado na resposta")
+        elif self._item is not None:
+            self.truncated = True
+            self.errors.append(
+                "Resposta terminou com um objeto incompleto: " + self._item.text[:200]
+            )
+
+        self.finished = True
+        return []
+
+    def _feed_between_items(self, char: str) -> None:
+        if char == "]":
+            self.finished = True
+        elif char in "{[":
+            self._item = JsonTextNormalizer()
+            self._item.push(char)
+
+    def _parse_item(self, text: str) -> Dict[str, Any] | None:
+        try:
+            item = loads_lenient(text)
+        except json.JSONDecodeError:
+            self.errors.append(f"Objeto JSON inválido: {text[:200]}")
+            return None
+
+        if not isinstance(item, dict):
+            self.errors.append(f"Item do array não é um objeto: {text[:200]}")
+            return None
+
+        return item
@@ -0,0 +1,76 @@
+import re
+
+from collections import Counter
+from typing import List
+
+from domain.text import fold
+
+
+# Palavras comuns (português e inglês) que não são boas palavras-chave
+STOPWORDS = set(
+    """
+para como com uma umas uns por mais que dos das nos nas seu sua seus suas
+este esta isso esse essa aqui vamos voce vai ser sao tem ter sobre quando
+entre depois antes tambem muito pode cada passo passos tutorial exemplo
+agora ainda qual onde apenas todo toda todos todas seja fazer ate nao sim
+bem foi mas pelo pela pelos pelas num numa ele ela eles elas nosso nossa ao
+aos os as um de do da em no na se ou o a e
+the and for with from this that your you are into will can use using how
+what step steps
+""".split()
+)
+
+
+# Palavra: começa com uma letra e pode incluir ".", "+", "#" e "-" (ex: C++, C#)
+WORD = re.compile(r"[^\W\d_](?:[\w.+#-]*[\w+#])?")
+
+
+def extract_keywords(
+    title: str, tutorial: str, limit: int = 10, subject: str | None = None
+) -> List[str]:
+    """
+    Extrai palavras-chave localmente, sem chamar o LLM.
+
+    As palavras são ponderadas pela frequência no texto, com peso maior para
+    as que aparecem no título e nos títulos markdown (#, ##, ###). Blocos de
+    código são ignorados, exceto os nomes em código inline (`assim`). Palavras
+    curtas só são aceitas no título, onde costumam ser o assunto (ex: Go, C, R).
+
+    Args:
+        title: Título do tutorial
+        tutorial: Conteúdo do tutorial em markdown
+        limit: Quantidade máxima de palavras-chave
+        subject: Assunto do tutorial, sempre a primeira palavra-chave
+
+    Returns:
+        List[str]: Palavras-chave, da mais relevante para a menos relevante
+    """
+    text = re.sub(r"```.*?```", " ", tutorial or "", flags=re.DOTALL)
+    headings = " ".join(re.findall(r"^#{1,3}\s+(.+)$", text, re.MULTILINE))
+
+    scores: Counter = Counter()
+    display: dict = {}
+
+    for source, weight, min_length in (
+        (text, 1, 3),
+        (headings, 2, 3),
+        (title or "", 5, 1),
+    ):
+        for word in WORD.findall(source):
+            key = fold(word)
+            if len(key) < min_length or key in STOPWORDS:
+                continue
+
+            scores[key] += weight
+            display.setdefault(key, word)
+
+    keywords = [subject.strip()] if subject and subject.strip() else []
+    seen = {fold(keyword) for keyword in keywords}
+
+    for key, _ in scores.most_common():
+        if len(keywords) >= limit:
+            break
+        if key not in seen:
+            keywords.append(display[key])
+
+    return keywords
@@ -1,8 +1,10 @@
 from typing import List
 from langchain_core.messages import BaseMessage, SystemMessage
-from domain.entities.planner import Planner
+from entities.planner import Planner
 from domain.interfaces.planner_agent import PlannerAgent
-from domain.interfaces.llm_service import LLMService
+from domain.interfaces.llm_service import LLMService, StructuredOutputError
+
+from .json_repair import JsonRepairService
 
 
 class PlannerService(PlannerAgent):
@@ -10,8 +12,11 @@ class PlannerService(PlannerAgent):
     Implementação do agente Planner.
     """
 
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self, llm_service: LLMService, json_repair: JsonRepairService | None = None
+    ):
         self.llm_service = llm_service
+        self.json_repair = json_repair or JsonRepairService(llm_service)
 
     def create_system_message(self, planner: Planner) -> str:
         """
@@ -110,12 +115,12 @@ class PlannerService(PlannerAgent):
               - ele pode cometer erros de digitação, como beginner, intermidiate, advanded, etc.
               - ele pode usar abreviaturas, como "API" para "Application Programming Interface", etc.
               - ele pode usar gírias, como:
-                "básico" para "beginner",
-                "mid" para "intermediate",
-                "ninja" para "advanced", etc.
+                "básico" para "iniciante",
+                "mid" para "intermediario",
+                "ninja" para "avancado", etc.
 
             - `level` deve ser sempre convertido para o padrão definido no schema do Planner:
-                "beginner", "intermediate" ou "advanced"
+                "iniciante", "intermediario" ou "avancado"
 
             Informacoes já obtidas:
             {str(current_planner)}
@@ -125,8 +130,18 @@ class PlannerService(PlannerAgent):
             {message}
         """
 
-        extracted_info = self.llm_service.invoke_with_structured_output(
-            extracted_prompt, Planner.model_json_schema()
+        try:
+            extracted_info = self.llm_service.invoke_with_structured_output(
+                extracted_prompt,
+                Planner.model_json_schema(),
+                call_site="planner.extract_info",
+            )
+        except StructuredOutputError as e:
+            extracted_info = e.raw_output
+
+        # Valida contra o schema do Planner, reparando localmente quando possível
+        extracted_info = self.json_repair.parse(
+            extracted_info, Planner, call_site="planner.extract_info.repair"
         )
 
         PLANNER_FIELDS = [
@@ -138,7 +153,7 @@ class PlannerService(PlannerAgent):
         ]
 
         for field in PLANNER_FIELDS:
-            if (value := extracted_info.get(field)) is not None:
+            if (value := getattr(extracted_info, field)) is not None:
                 setattr(current_planner, field, value)
 
         return current_planner
@@ -157,5 +172,6 @@ class PlannerService(PlannerAgent):
             str: A resposta gerada
         """
         return self.llm_service.invoke(
-            [SystemMessage(content=system_message)] + messages
+            [SystemMessage(content=system_message)] + messages,
+            call_site="planner.response",
         )
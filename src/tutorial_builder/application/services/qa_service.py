@@ -0,0 +1,353 @@
+import hashlib
+import math
+import re
+import threading
+
+from collections import Counter, OrderedDict
+from typing import Dict, List, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from entities import TutorialAnswer
+from domain.interfaces import LLMService, QAAgent
+from domain.text import fold
+
+from .keyword_extractor import STOPWORDS
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Peso das palavras do título da seção em relação às do conteúdo
+TITLE_WEIGHT = 3
+
+TERM = re.compile(r"[a-z0-9][a-z0-9_+#]*")
+
+# Referência explícita a um passo na pergunta (ex: "no passo 3")
+STEP_REFERENCE = re.compile(r"\b(?:passo|secao|step|section)\s+(\d+)\b")
+
+# Número do passo no título da seção (ex: "3. Rotas" ou "Passo 3: Rotas")
+STEP_TITLE = re.compile(r"^(?:(?:passo|step)\s+)?(\d+)\b")
+
+
+def _terms(text: str) -> List[str]:
+    terms = []
+    for word in TERM.findall(fold(text)):
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+
+        # Plural simples: "arquivos" e "arquivo" são o mesmo termo
+        if len(word) > 3 and word.endswith("s"):
+            word = word[:-1]
+
+        terms.append(word)
+
+    return terms
+
+
+def _normalize_question(question: str) -> str:
+    return " ".join(TERM.findall(fold(question)))
+
+
+def _content_key(title: str, sections: List[Tuple[str, str]]) -> str:
+    digest = hashlib.blake2b(title.encode("utf-8"), digest_size=16)
+    for section_title, content in sections:
+        digest.update(b"\0" + section_title.encode("utf-8"))
+        digest.update(b"\0" + content.encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+
+    # Corta no fim de um parágrafo, se houver um na segunda metade do limite
+    cut = text.rfind("\n\n", 0, limit)
+    return text[: cut if cut > limit // 2 else limit].rstrip() + "\n\n[...]"
+
+
+class SectionIndex:
+    """
+    Índice BM25 das seções de um tutorial, em memória. As palavras do título
+    de cada seção têm peso maior que as do conteúdo.
+    """
+
+    def __init__(self, sections: List[Tuple[str, str]]):
+        """
+        Args:
+            sections: Título e conteúdo (Markdown) de cada seção do tutorial
+        """
+        self.sections = list(sections)
+        self._frequencies: List[Counter] = []
+        self._lengths: List[int] = []
+        self._steps: Dict[int, int] = {}
+
+        document_frequency: Counter = Counter()
+        for number, (title, content) in enumerate(self.sections, start=1):
+            step = STEP_TITLE.match(fold(title).strip())
+            if step:
+                self._steps.setdefault(int(step.group(1)), number)
+
+            frequencies = Counter(_terms(content))
+            for term in _terms(title):
+                frequencies[term] += TITLE_WEIGHT
+
+            self._frequencies.append(frequencies)
+            self._lengths.append(sum(frequencies.values()))
+            document_frequency.update(frequencies.keys())
+
+        count = len(self.sections)
+        self._average_length = (sum(self._lengths) / count if count else 0) or 1
+        self._idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def find_step(self, step_number: int) -> int | None:
+        """
+        Busca a seção de um passo pelo número no título
+
+        Args:
+            step_number: Número do passo
+
+        Returns:
+            int | None: Número da seção, ou None se nenhuma for do passo
+        """
+        return self._steps.get(step_number)
+
+    def search(self, question: str, limit: int) -> List[Tuple[int, float]]:
+        """
+        Busca as seções mais relevantes para a pergunta
+
+        Args:
+            question: Pergunta do usuário
+            limit: Quantidade máxima de seções
+
+        Returns:
+            List[Tuple[int, float]]: Número (começando em 1) e pontuação de
+                cada seção com algum termo da pergunta, da mais para a menos
+                relevante
+        """
+        terms = set(_terms(question)) & self._idf.keys()
+        if not terms:
+            return []
+
+        scores = []
+        for position, frequencies in enumerate(self._frequencies):
+            norm = BM25_K1 * (
+                1 - BM25_B + BM25_B * self._lengths[position] / self._average_length
+            )
+            score = sum(
+                self._idf[term]
+                * frequencies[term]
+                * (BM25_K1 + 1)
+                / (frequencies[term] + norm)
+                for term in terms
+                if term in frequencies
+            )
+            if score > 0:
+                scores.append((position + 1, score))
+
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:limit]
+
+
+class QAService(QAAgent):
+    """
+    Implementação do agente de perguntas e respostas sobre um tutorial
+    concluído.
+
+    O tutorial não é enviado inteiro a cada pergunta: as seções (uma por
+    passo) são indexadas localmente (BM25) e apenas as mais relevantes para
+    a pergunta, mais a seção que o usuário está lendo ou que a pergunta cita
+    ("no passo 3"), vão para o LLM, junto com a lista de títulos das seções.
+    O índice de cada tutorial e as respostas das perguntas repetidas (mesma
+    pergunta normalizada com as mesmas seções de contexto) são mantidos em
+    caches LRU em memória.
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        top_k: int = 2,
+        max_context_chars: int = 6_000,
+        index_cache_size: int = 32,
+        answer_cache_size: int = 256,
+    ):
+        """
+        Args:
+            llm_service: Serviço LLM usado para responder
+            top_k: Quantidade máxima de seções recuperadas por pergunta
+            max_context_chars: Tamanho máximo do conteúdo das seções enviado
+                ao LLM, dividido igualmente entre elas
+            index_cache_size: Quantidade de tutoriais com o índice em memória
+            answer_cache_size: Quantidade de respostas mantidas em memória
+        """
+        self.llm_service = llm_service
+        self.top_k = top_k
+        self.max_context_chars = max_context_chars
+        self.index_cache_size = index_cache_size
+        self.answer_cache_size = answer_cache_size
+        self.stats = {"index_builds": 0, "cache_hits": 0, "llm_calls": 0}
+
+        self._indexes: OrderedDict[str, SectionIndex] = OrderedDict()
+        self._answers: OrderedDict[Tuple[str, Tuple[int, ...], str], str] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def select_sections(
+        self, index: SectionIndex, question: str, current_section: int | None = None
+    ) -> List[int]:
+        """
+        Escolhe as seções enviadas ao LLM como contexto
+
+        Args:
+            index: Índice das seções do tutorial
+            question: Pergunta do usuário
+            current_section: Número da seção que o usuário está lendo, se houver
+
+        Returns:
+            List[int]: Números das seções (começando em 1), em ordem de leitura
+        """
+        numbers = {number for number, _ in index.search(question, self.top_k)}
+
+        for step_number in STEP_REFERENCE.findall(fold(question)):
+            number = index.find_step(int(step_number))
+            if number is not None:
+                numbers.add(number)
+
+        if current_section is not None and 1 <= current_section <= len(index):
+            numbers.add(current_section)
+
+        return sorted(numbers)
+
+    def create_system_message(
+        self, title: str, index: SectionIndex, numbers: List[int]
+    ) -> str:
+        """
+        Cria a mensagem do sistema para o LLM com as seções escolhidas
+
+        Args:
+            title: Título do tutorial
+            index: Índice das seções do tutorial
+            numbers: Números das seções enviadas como contexto
+
+        Returns:
+            str: A mensagem do sistema formatada
+        """
+        outline = "\n".join(f"- {section_title}" for section_title, _ in index.sections)
+
+        limit = self.max_context_chars // max(len(numbers), 1)
+        excerpts = "\n\n".join(
+            f"### {index.sections[number - 1][0]}\n\n"
+            + _truncate(index.sections[number - 1][1], limit)
+            for number in numbers
+        )
+
+        SYSTEM_MESSAGE = f"""
+Você está respondendo às dúvidas de um usuário sobre o tutorial "{title}",
+    que ele já concluiu.
+
+## SEÇÕES DO TUTORIAL
+
+{outline}
+
+## TRECHOS RELEVANTES
+
+{excerpts or "Nenhuma seção do tutorial trata diretamente da pergunta."}
+
+## INSTRUÇÕES
+
+1. Responda com base nos trechos acima, de forma direta e em Markdown.
+2. Se a resposta estiver em outra seção, indique a seção pelo título.
+3. Se o tutorial não tratar do assunto da pergunta, diga isso ao usuário.
+
+NÃO INVENTE COMANDOS, FERRAMENTAS OU CONCEITOS.
+"""
+
+        return SystemMessage(content=SYSTEM_MESSAGE).content
+
+    def answer(
+        self,
+        question: str,
+        title: str,
+        sections: List[Tuple[str, str]],
+        tutorial_key: str | None = None,
+        current_section: int | None = None,
+    ) -> TutorialAnswer:
+        """
+        Responde a uma pergunta sobre o tutorial
+
+        Args:
+            question: Pergunta do usuário
+            title: Título do tutorial
+            sections: Título e conteúdo (Markdown) de cada seção do tutorial
+            tutorial_key: Identificador estável do tutorial, usado nos caches
+                (se omitido, é calculado a partir do conteúdo)
+            current_section: Número da seção que o usuário está lendo, se houver
+
+        Returns:
+            TutorialAnswer: A resposta e as seções usadas como contexto
+        """
+        key = tutorial_key or _content_key(title, sections)
+        index = self._index(key, sections)
+        numbers = self.select_sections(index, question, current_section)
+        used = [index.sections[number - 1][0] for number in numbers]
+
+        cache_key = (key, tuple(numbers), _normalize_question(question))
+        with self._lock:
+            response = self._answers.get(cache_key)
+            if response is not None:
+                self._answers.move_to_end(cache_key)
+                self.stats["cache_hits"] += 1
+                return TutorialAnswer(
+                    question=question,
+                    answer=response,
+                    sections=used,
+                    section_numbers=numbers,
+                    from_cache=True,
+                )
+
+            self.stats["llm_calls"] += 1
+
+        response = self.llm_service.invoke(
+            [
+                SystemMessage(
+                    content=self.create_system_message(title, index, numbers)
+                ),
+                HumanMessage(content=question),
+            ],
+            call_site="qa.answer",
+        )
+
+        with self._lock:
+            self._answers[cache_key] = response
+            if len(self._answers) > self.answer_cache_size:
+                self._answers.popitem(last=False)
+
+        return TutorialAnswer(
+            question=question, answer=response, sections=used, section_numbers=numbers
+        )
+
+    def _index(self, key: str, sections: List[Tuple[str, str]]) -> SectionIndex:
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+
+        # Construído fora do lock: outra sessão pode indexar ao mesmo tempo
+        index = SectionIndex(sections)
+
+        with self._lock:
+            self.stats["index_builds"] += 1
+            self._indexes[key] = index
+            if len(self._indexes) > self.index_cache_size:
+                self._indexes.popitem(last=False)
+
+        return index
@@ -0,0 +1,172 @@
+import re
+
+from typing import List, Tuple
+
+from entities import ArchivedTutorial, TutorialAnswer, TutorialSection, Writer
+from domain.interfaces import QAAgent, TutorialArchive
+
+# Seções do tutorial final: títulos de nível 2, fora de blocos de código
+SECTION_HEADING = re.compile(r"^##\s+(.+?)\s*#*\s*$")
+CODE_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+def split_sections(writer: Writer) -> List[Tuple[str, str]]:
+    """
+    Divide um tutorial concluído nas seções do modo leitura: uma por passo do
+    caminho de aprendizado ou, se o tutorial não tiver o caminho (ex:
+    históricos antigos), uma por título de nível 2 do texto final.
+
+    Args:
+        writer: Objeto Writer com o tutorial concluído
+
+    Returns:
+        List[Tuple[str, str]]: Título e conteúdo (Markdown) de cada seção
+    """
+    steps = writer.expert.learning_path if writer.expert is not None else []
+    if any(step.content for step in steps):
+        return [
+            (
+                f"{step.step_number}. {step.title}",
+                step.content or step.description or "",
+            )
+            for step in steps
+        ]
+
+    sections: List[Tuple[str, List[str]]] = [("Introdução", [])]
+    in_code = False
+
+    for line in (writer.tutorial or "").splitlines():
+        if CODE_FENCE.match(line):
+            in_code = not in_code
+
+        heading = None if in_code else SECTION_HEADING.match(line)
+        if heading:
+            sections.append((heading.group(1), []))
+        else:
+            sections[-1][1].append(line)
+
+    sections = [(title, "\n".join(lines).strip()) for title, lines in sections]
+
+    # O título do tutorial (nível 1) já é exibido fora das seções; a
+    # introdução só é uma seção se tiver algo além dele
+    introduction = re.sub(r"^#\s.*$", "", sections[0][1], flags=re.MULTILINE).strip()
+    sections[0] = (sections[0][0], introduction)
+    if len(sections) > 1 and not introduction:
+        sections.pop(0)
+
+    return sections
+
+
+class ReadingService:
+    """
+    Modo leitura: guarda os tutoriais concluídos no arquivo somente de
+    acréscimo (TutorialArchive), divididos em seções, e os exibe uma seção
+    por vez, sem carregar o tutorial inteiro. Com um agente de perguntas e
+    respostas, também responde às dúvidas do usuário sobre o tutorial.
+    """
+
+    def __init__(self, archive: TutorialArchive, qa_agent: QAAgent | None = None):
+        self.archive = archive
+        self.qa_agent = qa_agent
+
+    def archive_tutorial(self, writer: Writer, history_id: int | None = None) -> int:
+        """
+        Acrescenta um tutorial concluído ao arquivo do modo leitura
+
+        Args:
+            writer: Objeto Writer com o tutorial concluído
+            history_id: Identificador do tutorial no histórico, se houver
+
+        Returns:
+            int: Identificador do tutorial no arquivo
+        """
+        sections = split_sections(writer)
+        level = writer.difficulty_level
+
+        tutorial = ArchivedTutorial(
+            title=writer.title or writer.subject,
+            subject=writer.subject,
+            difficulty_level=getattr(level, "value", level),
+            sections=[title for title, _ in sections],
+            history_id=history_id,
+            created_at=writer.created_at,
+        )
+        return self.archive.append(tutorial, [content for _, content in sections])
+
+    def list_tutorials(
+        self, page: int = 1, page_size: int = 20
+    ) -> Tuple[List[ArchivedTutorial], bool]:
+        """
+        Lista os tutoriais do arquivo, do mais recente para o mais antigo
+
+        Args:
+            page: Número da página, começando em 1
+            page_size: Quantidade máxima de tutoriais por página
+
+        Returns:
+            Tuple[List[ArchivedTutorial], bool]: Tutoriais da página e se há
+                uma próxima página
+        """
+        page, page_size = max(page, 1), max(page_size, 1)
+        offset = (page - 1) * page_size
+        tutorials = self.archive.recent(offset, page_size)
+
+        return tutorials, offset + len(tutorials) < len(self.archive)
+
+    def read(self, tutorial_id: int, number: int = 1) -> TutorialSection | None:
+        """
+        Lê uma seção de um tutorial. Números fora do intervalo são ajustados
+        para a primeira ou a última seção.
+
+        Args:
+            tutorial_id: Identificador do tutorial no arquivo
+            number: Número da seção, começando em 1
+
+        Returns:
+            TutorialSection | None: A seção, ou None se o tutorial não existir
+                ou não tiver seções
+        """
+        tutorial = self.archive.get(tutorial_id)
+        if tutorial is None or not tutorial.sections:
+            return None
+
+        number = min(max(number, 1), len(tutorial.sections))
+
+        return TutorialSection(
+            tutorial=tutorial,
+            number=number,
+            title=tutorial.sections[number - 1],
+            content=self.archive.read_section(tutorial_id, number),
+        )
+
+    def ask(
+        self, tutorial_id: int, question: str, current_section: int | None = None
+    ) -> TutorialAnswer | None:
+        """
+        Responde a uma pergunta sobre um tutorial do arquivo
+
+        Args:
+            tutorial_id: Identificador do tutorial no arquivo
+            question: Pergunta do usuário
+            current_section: Número da seção que o usuário está lendo, se houver
+
+        Returns:
+            TutorialAnswer | None: A resposta, ou None se não houver um agente
+                de perguntas e respostas ou se o tutorial não existir
+        """
+        tutorial = self.archive.get(tutorial_id)
+        if self.qa_agent is None or tutorial is None or not tutorial.sections:
+            return None
+
+        sections = [
+            (title, self.archive.read_section(tutorial_id, number))
+            for number, title in enumerate(tutorial.sections, start=1)
+        ]
+
+        return self.qa_agent.answer(
+            question,
+            tutorial.title or tutorial.subject or "",
+            sections,
+            tutorial_key=f"archive:{tutorial_id}",
+            current_section=current_section,
+        )
@@ -0,0 +1,135 @@
+import logging
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from entities import Expert, ExpertStep, TroubleShooting
+from domain.interfaces import LLMService, SolutionCache, TroubleshootingAgent
+
+from .error_signature import error_lines, error_signature, is_error_report
+
+logger = logging.getLogger(__name__)
+
+
+class TroubleshootingService(TroubleshootingAgent):
+    """
+    Implementação do agente de solução de problemas.
+
+    Envia ao LLM apenas o passo em que o problema ocorreu, o ambiente do
+    usuário e o erro reportado. Soluções de erros reconhecíveis (com uma
+    mensagem de erro, e não apenas "não funcionou") são salvas no cache
+    pela assinatura do erro e pelo assunto, e respondidas sem o LLM.
+    """
+
+    def __init__(self, llm_service: LLMService, cache: SolutionCache | None = None):
+        self.llm_service = llm_service
+        self.cache = cache
+        self.stats = {"cache_hits": 0, "llm_calls": 0}
+
+    def is_error_report(self, message: str) -> bool:
+        """
+        Verifica se a mensagem do usuário relata um erro
+
+        Args:
+            message: Mensagem do usuário
+
+        Returns:
+            bool: True se a mensagem parece relatar um erro
+        """
+        return is_error_report(message)
+
+    def create_system_message(self, expert: Expert, step: ExpertStep) -> str:
+        """
+        Cria a mensagem do sistema para o LLM com o contexto do passo
+
+        Args:
+            expert: Objeto Expert com o plano de aprendizado
+            step: Passo no qual o problema ocorreu
+
+        Returns:
+            str: A mensagem do sistema formatada
+        """
+        SYSTEM_MESSAGE = f"""
+Você é um especialista em {expert.subject} ajudando um usuário de nível
+    {expert.difficulty_level} que está seguindo um tutorial passo a passo
+    e encontrou um problema.
+
+AMBIENTE DO USUÁRIO: {expert.environment}
+
+## PASSO EM QUE O PROBLEMA OCORREU
+
+{step.step_number}. {step.title}
+
+PRÉ-REQUISITOS:
+{step.prerequisites}
+
+CONTEÚDO DO PASSO:
+{step.content}
+
+## INSTRUÇÕES
+
+1. Identifique a causa mais provável do problema relatado pelo usuário.
+2. Explique a solução de forma direta, com os comandos ou o código corrigido.
+3. Considere o ambiente do usuário ao sugerir comandos.
+4. Se houver mais de uma causa possível, liste-as da mais para a menos provável.
+
+Responda em Markdown, sem repetir o conteúdo do passo.
+
+NÃO INVENTE COMANDOS, FERRAMENTAS OU CONCEITOS.
+"""
+
+        return SystemMessage(content=SYSTEM_MESSAGE).content
+
+    def solve(self, expert: Expert, step: ExpertStep, problem: str) -> TroubleShooting:
+        """
+        Gera (ou recupera do cache) a solução para o problema reportado,
+        registrando-a no passo
+
+        Args:
+            expert: Objeto Expert com o plano de aprendizado
+            step: Passo no qual o problema ocorreu
+            problem: Problema reportado pelo usuário
+
+        Returns:
+            TroubleShooting: O problema e sua solução
+        """
+        subject = (expert.subject or "").strip().lower()
+        signature = error_signature(problem) if error_lines(problem) else None
+
+        solution = self._get_cached(signature, subject)
+
+        if solution is None:
+            self.stats["llm_calls"] += 1
+            solution = self.llm_service.invoke(
+                [
+                    SystemMessage(content=self.create_system_message(expert, step)),
+                    HumanMessage(content=problem),
+                ],
+                call_site="troubleshooting.solve",
+            )
+            self._put_cached(signature, subject, solution)
+        else:
+            self.stats["cache_hits"] += 1
+
+        trouble_shooting = TroubleShooting(problem=problem, solution=solution)
+        step.trouble_shooting = [*(step.trouble_shooting or []), trouble_shooting]
+
+        return trouble_shooting
+
+    def _get_cached(self, signature: str | None, subject: str) -> str | None:
+        if self.cache is None or signature is None:
+            return None
+
+        try:
+            return self.cache.get(signature, subject)
+        except Exception as e:
+            logger.warning("Falha ao consultar o cache de soluções: %s", e)
+            return None
+
+    def _put_cached(self, signature: str | None, subject: str, solution: str) -> None:
+        if self.cache is None or signature is None:
+            return
+
+        try:
+            self.cache.put(signature, subject, solution)
+        except Exception as e:
+            logger.warning("Não foi possível salvar a solução no cache: %s", e)
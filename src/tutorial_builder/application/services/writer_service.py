@@ -1,13 +1,56 @@
-from typing import List
-from entities import Writer, Expert
+import datetime
+import hashlib
+import json
+import re
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from pydantic import BaseModel
+from entities import Writer, Expert, ExpertStep, WriterMode
 from interfaces import WriterAgent, LLMService
 
+from .keyword_extractor import extract_keywords
+
+
+WRITER_RULES = """
+INSTRUÇÕES OBRIGATÓRIAS:
+- Use o conteúdo INTEGRAL de todos os passos do caminho de aprendizado.
+- NÃO RESUMA os conteúdos. NÃO omita trechos de código, comandos ou anotações.
+- Preserve todos os comandos, códigos e blocos técnicos exatamente como aparecem,
+  apenas formatando adequadamente em markdown (com blocos de código, etc).
+- O tutorial deve ser escrito em português brasileiro,
+  com linguagem acessível e descontraída,
+  como se estivesse explicando para alguém em um blog de tecnologia.
+- O estilo deve ser informal, amigável e divertido,
+  mas SEM inventar ou alterar nenhuma informação.
+- Estruture o texto com títulos e subtítulos em markdown (#, ##, ###).
+- Use listas, blocos de código e observações (dicas) quando for útil.
+- Não adicione nada que não esteja no caminho trilhado pelo usuário.
+  Não invente, complemente ou altere fatos.
+"""
+
 
 class WriterService(WriterAgent):
-    def __init__(self, llm_service: LLMService, writer: Writer, expert: Expert):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        writer: Writer,
+        expert: Expert,
+        mode: WriterMode = WriterMode.SINGLE_CALL,
+        max_workers: int = 8,
+        max_cached_results: int = 512,
+    ):
         self.llm_service = llm_service
         self.writer = writer
         self.expert = expert
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_cached_results = max_cached_results
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._results: Dict[str, Future] = {}
+        self._results_lock = threading.Lock()
 
     def create_system_message(self, expert: Expert) -> str:
         learning_path_str = "\n".join(
@@ -25,22 +68,7 @@ no assunto: {expert.subject}.
 Você receberá abaixo um caminho de aprendizado REAL trilhado por um usuário,
 marcado entre as tags <learning_path>. Seu trabalho é transformar esse caminho
 em um tutorial completo, claro e útil para outras pessoas, sem resumir ou omitir nada.
-
-INSTRUÇÕES OBRIGATÓRIAS:
-- Use o conteúdo INTEGRAL de todos os passos do caminho de aprendizado.
-- NÃO RESUMA os conteúdos. NÃO omita trechos de código, comandos ou anotações.
-- Preserve todos os comandos, códigos e blocos técnicos exatamente como aparecem,
-  apenas formatando adequadamente em markdown (com blocos de código, etc).
-- O tutorial deve ser escrito em português brasileiro,
-  com linguagem acessível e descontraída,
-  como se estivesse explicando para alguém em um blog de tecnologia.
-- O estilo deve ser informal, amigável e divertido,
-  mas SEM inventar ou alterar nenhuma informação.
-- Estruture o texto com títulos e subtítulos em markdown (#, ##, ###).
-- Use listas, blocos de código e observações (dicas) quando for útil.
-- Não adicione nada que não esteja no caminho trilhado pelo usuário.
-  Não invente, complemente ou altere fatos.
-
+{WRITER_RULES}
 Objetivo: transformar a jornada real do usuário
 em um tutorial fiel, útil e bem formatado.
 
@@ -50,14 +78,350 @@ em um tutorial fiel, útil e bem formatado.
 
 """
 
+    def create_section_message(self, step: ExpertStep, expert: Expert) -> str:
+        """
+        Cria a mensagem para reescrever um único passo como seção do tutorial
+        (etapa "map" do modo MAP_REDUCE).
+        """
+        return f"""
+Você é um escritor de tutoriais de tecnologia,
+especializado em criar tutoriais a partir de jornadas reais de aprendizado
+no assunto: {expert.subject}.
+
+Você receberá abaixo UM passo de um caminho de aprendizado REAL trilhado por um
+usuário, marcado entre as tags <step>. Este passo é a seção {step.step_number}
+de {len(expert.learning_path)} do tutorial. Seu trabalho é transformar esse passo
+em uma seção completa, clara e útil para outras pessoas, sem resumir ou omitir nada.
+{WRITER_RULES}
+- Comece a seção com um título de nível 2 (##) contendo o número e o título do passo.
+- Escreva APENAS esta seção: não escreva introdução, transições ou conclusão
+  do tutorial, elas serão escritas separadamente.
+
+<step>
+{step.step_number}. {step.title}: {step.description}
+{step.content}
+</step>
+"""
+
+    def create_reduce_message(self, expert: Expert) -> str:
+        """
+        Cria a mensagem para gerar introdução, transições e conclusão do tutorial
+        (etapa "reduce" do modo MAP_REDUCE). Envia apenas títulos e descrições.
+        """
+        steps_str = "\n".join(
+            f"{step.step_number}. {step.title}: {step.description}"
+            for step in expert.learning_path
+        )
+
+        return f"""
+Você é um escritor de tutoriais de tecnologia,
+especializado em criar tutoriais a partir de jornadas reais de aprendizado
+no assunto: {expert.subject}.
+
+As seções do tutorial já foram escritas, uma para cada passo listado abaixo
+entre as tags <steps>. Escreva, em português brasileiro e em estilo informal,
+amigável e divertido, SEM inventar informações:
+
+- `introduction`: a introdução do tutorial, em markdown, começando com um
+  título de nível 1 (#), apresentando o que será construído.
+- `transitions`: uma frase curta de transição para cada passo, na mesma ordem,
+  conectando o passo anterior ao próximo ({len(expert.learning_path)} frases).
+- `conclusion`: a conclusão do tutorial, em markdown, começando com um título
+  de nível 2 (##), recapitulando o que foi aprendido.
+- `title`: o título do tutorial, em estilo informal e descontraído.
+- `keywords`: de 5 a 10 palavras-chave do tutorial.
+
+NÍVEL DE DIFICULDADE: {expert.difficulty_level}
+TIPO DE PROJETO: {expert.project_type}
+
+<steps>
+{steps_str}
+</steps>
+"""
+
+    def write_section(self, step: ExpertStep, expert: Expert) -> str:
+        """
+        Reescreve um passo do caminho de aprendizado como seção do tutorial.
+
+        Args:
+            step: Passo a ser reescrito
+            expert: Expert com o contexto do tutorial
+
+        Returns:
+            str: A seção do tutorial em markdown
+        """
+        return self.llm_service.invoke(
+            [self.create_section_message(step, expert)], call_site="writer.section"
+        )
+
+    def write_frame(self, expert: Expert) -> Dict[str, str | List[str]]:
+        """
+        Gera introdução, transições e conclusão do tutorial.
+
+        Args:
+            expert: Expert com o caminho de aprendizado
+
+        Returns:
+            Dict: Campos `introduction`, `transitions`, `conclusion`,
+                `title` e `keywords`
+        """
+
+        class TutorialFrame(BaseModel):
+            introduction: str
+            transitions: List[str]
+            conclusion: str
+            title: str
+            keywords: List[str]
+
+        return self.llm_service.invoke_with_structured_output(
+            self.create_reduce_message(expert),
+            TutorialFrame.model_json_schema(),
+            call_site="writer.reduce",
+        )
+
+    def assemble_tutorial(
+        self, sections: List[str], frame: Dict[str, str | List[str]]
+    ) -> str:
+        """
+        Monta o tutorial final a partir das seções e do enquadramento
+        (introdução, transições e conclusão).
+
+        Args:
+            sections: Seções do tutorial, na ordem dos passos
+            frame: Introdução, transições e conclusão geradas na etapa "reduce"
+
+        Returns:
+            str: O tutorial completo em markdown
+        """
+        transitions = frame.get("transitions") or []
+        parts = [frame.get("introduction", "").strip()]
+
+        for index, section in enumerate(sections):
+            if index < len(transitions) and transitions[index]:
+                parts.append(transitions[index].strip())
+            parts.append(section.strip())
+
+        parts.append(frame.get("conclusion", "").strip())
+
+        return "\n\n".join(part for part in parts if part) + "\n"
+
     def generate_tutorial(self, expert: Expert) -> Writer:
-        system_message = self.create_system_message(expert)
+        if self.mode in (WriterMode.MAP_REDUCE, WriterMode.PIPELINED):
+            result = self.generate_tutorial_map_reduce(expert)
+        elif self.mode == WriterMode.STRUCTURED:
+            result = self.generate_tutorial_structured(expert)
+        else:
+            system_message = self.create_system_message(expert)
+
+            tutorial = self.llm_service.invoke(
+                [system_message], call_site="writer.tutorial"
+            )
+            result = {"tutorial": tutorial}
+
+        return self.build_writer(
+            expert, result["tutorial"], result.get("title"), result.get("keywords")
+        )
+
+    def build_writer(
+        self,
+        expert: Expert,
+        tutorial: str,
+        title: str | None = None,
+        keywords: List[str] | None = None,
+    ) -> Writer:
+        """
+        Cria um novo Writer com todos os campos preenchidos. Quando o título ou as palavras-chave
+        não vierem do LLM, são obtidos localmente, sem novas chamadas.
+
+        Args:
+            expert: Expert com o caminho de aprendizado
+            tutorial: O tutorial gerado
+            title: Título gerado pelo LLM, se houver
+            keywords: Palavras-chave geradas pelo LLM, se houver
+
+        Returns:
+            Writer: O objeto Writer completo
+        """
+        title = (title or "").strip() or self.extract_title(tutorial, expert)
+        keywords = keywords or self.generate_keywords(title, tutorial, expert.subject)
+
+        # Uma cópia por chamada: o serviço é compartilhado entre as sessões
+        return self.writer.model_copy(
+            deep=True,
+            update={
+                "subject": expert.subject,
+                "difficulty_level": expert.difficulty_level,
+                "expert": expert,
+                "tutorial": tutorial,
+                "title": title,
+                "keywords": keywords,
+                "created_at": datetime.datetime.now(),
+            },
+        )
+
+    def generate_tutorial_structured(self, expert: Expert) -> Dict[str, Any]:
+        """
+        Gera tutorial, título e palavras-chave em uma única chamada estruturada
+        (modo STRUCTURED), evitando reenviar o tutorial para gerar o título.
+
+        Args:
+            expert: Expert com o caminho de aprendizado completo
+
+        Returns:
+            Dict: Campos `tutorial`, `title` e `keywords`
+        """
+
+        class TutorialPackage(BaseModel):
+            tutorial: str
+            title: str
+            keywords: List[str]
 
-        tutorial = self.llm_service.invoke([system_message])
+        prompt = (
+            self.create_system_message(expert)
+            + """
+Devolva os seguintes campos:
 
-        self.writer.tutorial = tutorial
+- `tutorial`: o tutorial completo em markdown, seguindo as instruções acima.
+- `title`: o título do tutorial, em português brasileiro,
+  em estilo informal e descontraído.
+- `keywords`: de 5 a 10 palavras-chave do tutorial.
+"""
+        )
 
-        return self.writer
+        return self.llm_service.invoke_with_structured_output(
+            prompt,
+            TutorialPackage.model_json_schema(),
+            call_site="writer.structured",
+        )
+
+    def generate_tutorial_map_reduce(self, expert: Expert) -> Dict[str, Any]:
+        """
+        Gera o tutorial no modo MAP_REDUCE: cada passo é reescrito em paralelo
+        e, ao mesmo tempo, uma chamada pequena gera introdução, transições e
+        conclusão. Nenhuma chamada recebe ou devolve o tutorial inteiro.
+
+        No modo PIPELINED as seções e o enquadramento já foram antecipados
+        em segundo plano (`prefetch_section` e `prefetch_frame`), e aqui
+        apenas os resultados em cache são reunidos.
+
+        Args:
+            expert: Expert com o caminho de aprendizado completo
+
+        Returns:
+            Dict: Campos `tutorial`, `title` e `keywords`
+        """
+        steps = sorted(expert.learning_path, key=lambda step: step.step_number)
+
+        frame_future = self._submit_frame(expert)
+        section_futures = [self._submit_section(step, expert) for step in steps]
+
+        sections = [
+            self._result(future, self.write_section, step, expert)
+            for future, step in zip(section_futures, steps)
+        ]
+        frame = self._result(frame_future, self.write_frame, expert)
+
+        return {
+            "tutorial": self.assemble_tutorial(sections, frame),
+            "title": frame.get("title"),
+            "keywords": frame.get("keywords"),
+        }
+
+    def prefetch_frame(self, expert: Expert) -> None:
+        """
+        No modo PIPELINED, gera em segundo plano a introdução, as transições e a
+        conclusão assim que o caminho de aprendizado é conhecido.
+        """
+        if self.mode == WriterMode.PIPELINED and expert.learning_path:
+            self._submit_frame(expert)
+
+    def prefetch_section(self, step: ExpertStep, expert: Expert) -> None:
+        """
+        No modo PIPELINED, reescreve em segundo plano um passo como seção do
+        tutorial assim que o seu conteúdo é gerado.
+        """
+        if self.mode == WriterMode.PIPELINED and step.content:
+            self._submit_section(step, expert)
+
+    @staticmethod
+    def _cache_key(kind: str, payload: Any) -> str:
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return f"{kind}:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _section_key(self, step: ExpertStep, expert: Expert) -> str:
+        return self._cache_key(
+            "section",
+            [
+                expert.subject,
+                len(expert.learning_path),
+                step.step_number,
+                step.title,
+                step.description,
+                step.content,
+            ],
+        )
+
+    def _frame_key(self, expert: Expert) -> str:
+        return self._cache_key(
+            "frame",
+            [
+                expert.subject,
+                expert.difficulty_level,
+                expert.project_type,
+                [
+                    (step.step_number, step.title, step.description)
+                    for step in expert.learning_path
+                ],
+            ],
+        )
+
+    def _submit(self, key: str, fn: Callable, *args: Any) -> Future:
+        """
+        Agenda a execução de `fn` no executor, reaproveitando o resultado em
+        cache (concluído ou em andamento) para a mesma chave.
+        """
+        with self._results_lock:
+            if (future := self._results.get(key)) is not None:
+                return future
+
+            future = self._executor.submit(fn, *args)
+            self._results[key] = future
+
+            # Descarta os resultados mais antigos já concluídos
+            for old_key in list(self._results):
+                if len(self._results) <= self.max_cached_results:
+                    break
+                if self._results[old_key].done():
+                    del self._results[old_key]
+
+            return future
+
+    def _submit_section(self, step: ExpertStep, expert: Expert) -> Future:
+        # Cópias, para que alterações posteriores não afetem a geração em andamento
+        step = step.model_copy()
+        expert = expert.model_copy(update={"learning_path": list(expert.learning_path)})
+        return self._submit(
+            self._section_key(step, expert), self.write_section, step, expert
+        )
+
+    def _submit_frame(self, expert: Expert) -> Future:
+        expert = expert.model_copy(update={"learning_path": list(expert.learning_path)})
+        return self._submit(self._frame_key(expert), self.write_frame, expert)
+
+    def _result(self, future: Future, fn: Callable, *args: Any) -> Any:
+        """
+        Retorna o resultado de uma geração agendada. Se a geração em segundo
+        plano falhou, ela é refeita de forma síncrona.
+        """
+        try:
+            return future.result()
+        except Exception:
+            with self._results_lock:
+                for key, cached in list(self._results.items()):
+                    if cached is future:
+                        del self._results[key]
+
+            return fn(*args)
 
     def generate_title(self, tutorial: str, expert: Expert) -> str:
         prompt = f"""
@@ -78,9 +442,25 @@ em um tutorial fiel, útil e bem formatado.
         </tutorial>
         """
 
-        response = self.llm_service.invoke([prompt])
+        response = self.llm_service.invoke([prompt], call_site="writer.title")
 
         return response
 
-    def generate_keywords(self, title: str, tutorial: str) -> List[str]:
-        return self.writer_agent.generate_keywords(title, tutorial)
+    def extract_title(self, tutorial: str, expert: Expert) -> str:
+        """
+        Obtém o título localmente, a partir do primeiro título markdown (#)
+        do tutorial, sem chamar o LLM.
+        """
+        if match := re.search(r"^#\s+(.+)$", tutorial or "", re.MULTILINE):
+            return match.group(1).strip()
+
+        return f"Tutorial de {expert.subject}"
+
+    def generate_keywords(
+        self, title: str, tutorial: str, subject: str | None = None
+    ) -> List[str]:
+        """
+        Gera palavras-chave localmente, a partir do título e do conteúdo,
+        começando pelo assunto.
+        """
+        return extract_keywords(title, tutorial, subject=subject)
@@ -0,0 +1,119 @@
+import re
+import textwrap
+
+from functools import lru_cache
+from typing import List, NamedTuple
+
+import streamlit as st
+from langchain_core.messages import BaseMessage
+
+# Mensagens exibidas inicialmente e a cada clique em "mensagens anteriores"
+PAGE_SIZE = 20
+
+# Últimas mensagens sempre exibidas por inteiro
+RECENT_MESSAGES = 4
+
+# Mensagens do assistente maiores que isso, fora das recentes, são recolhidas
+COLLAPSE_CHARS = 1_500
+
+# Mensagens preparadas mantidas em memória (compartilhadas entre as sessões)
+CACHE_SIZE = 1_024
+
+HEADING = re.compile(r"^#{1,3}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+LABEL_CHARS = 80
+
+
+class RenderedMessage(NamedTuple):
+    """
+    Mensagem do histórico pronta para exibição
+    """
+
+    role: str
+    label: str
+    body: str
+    collapsible: bool
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_message(message_type: str, content: str) -> RenderedMessage:
+    """
+    Prepara uma mensagem para exibição: papel, rótulo usado quando ela é
+    recolhida (o primeiro título markdown ou a primeira linha) e o markdown
+    sem a indentação dos templates. O resultado fica em cache pelo conteúdo,
+    então cada mensagem é preparada uma única vez, e não a cada rerun.
+
+    Args:
+        message_type: Tipo da mensagem ("ai", "human", ...)
+        content: Conteúdo da mensagem em markdown
+
+    Returns:
+        RenderedMessage: A mensagem preparada
+    """
+    body = textwrap.dedent(content).strip()
+    role = "assistant" if message_type == "ai" else "user"
+
+    heading = HEADING.search(body)
+    label = heading.group(1) if heading else next(iter(body.splitlines()), "")
+    label = label.strip().replace("**", "")
+    if len(label) > LABEL_CHARS:
+        label = label[: LABEL_CHARS - 1].rstrip() + "…"
+
+    return RenderedMessage(
+        role=role,
+        label=label or "Mensagem",
+        body=body,
+        collapsible=role == "assistant" and len(body) > COLLAPSE_CHARS,
+    )
+
+
+def _show_more(page_size: int) -> None:
+    st.session_state.history_visible += page_size
+
+
+def show_history(
+    messages: List[BaseMessage],
+    page_size: int = PAGE_SIZE,
+    recent: int = RECENT_MESSAGES,
+) -> None:
+    """
+    Exibe o histórico do chat sem enviar ao navegador, a cada rerun, o
+    conteúdo de todas as mensagens:
+
+    - apenas as últimas `page_size` mensagens são exibidas, e as anteriores
+        são carregadas sob demanda, uma página por clique;
+    - mensagens longas do assistente (os passos do tutorial), exceto as
+        `recent` últimas, são recolhidas em toggles com o título do passo,
+        cujo conteúdo só é enviado enquanto o toggle está ligado.
+
+    Args:
+        messages: Mensagens do histórico, da mais antiga para a mais recente
+        page_size: Quantidade de mensagens exibidas por página
+        recent: Quantidade de mensagens finais sempre exibidas por inteiro
+    """
+    if "history_visible" not in st.session_state:
+        st.session_state.history_visible = page_size
+
+    first = max(len(messages) - st.session_state.history_visible, 0)
+    if first:
+        st.button(
+            f"Mostrar mensagens anteriores ({first} ocultas)",
+            key="history-more",
+            on_click=_show_more,
+            args=(page_size,),
+        )
+
+    last_collapsed = len(messages) - recent
+    for index in range(first, len(messages)):
+        message = messages[index]
+        rendered = render_message(message.type, str(message.content))
+
+        with st.chat_message(rendered.role):
+            if not rendered.collapsible or index >= last_collapsed:
+                st.markdown(rendered.body)
+                continue
+
+            # Um toggle, e não um st.expander, que sempre envia o conteúdo:
+            # o markdown só é gerado enquanto o toggle está ligado. A chave
+            # usa a posição, que não muda com novas mensagens
+            if st.toggle(rendered.label, key=f"history-{index}"):
+                st.markdown(rendered.body)
@@ -1,5 +1,22 @@
 from .planner import Planner
-from .expert import Expert, ExpertStep, StepStatus
-from .writer import Writer
+from .expert import Expert, ExpertStep, StepStatus, TroubleShooting
+from .writer import Writer, WriterMode
+from .retrieval import RetrievedChunk
+from .reading import ArchivedTutorial, TutorialAnswer, TutorialSection
+from .tutorial_search import TutorialSearchResult, TutorialSearchPage
 
-__all__ = ["Planner", "Expert", "ExpertStep", "StepStatus", "Writer"]
+__all__ = [
+    "Planner",
+    "Expert",
+    "ExpertStep",
+    "StepStatus",
+    "TroubleShooting",
+    "Writer",
+    "WriterMode",
+    "TutorialSearchResult",
+    "TutorialSearchPage",
+    "RetrievedChunk",
+    "ArchivedTutorial",
+    "TutorialSection",
+    "TutorialAnswer",
+]
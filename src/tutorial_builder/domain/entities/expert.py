@@ -48,6 +48,7 @@ class ExpertStep(BaseModel):
         resources (Optional[List[str]]): Links ou recursos relacionados ao passo
         trouble_shooting (Optional[List[TroubleShooting]]): Problemas reportados pelo usuário e como solucioná-los
         feedback (Optional[str]): Feedback do usuário sobre o passo
+        depends_on (List[int]): Números dos passos anteriores dos quais este passo depende
         status (StepStatus): Status do passo
         completed_at (Optional[datetime]): Data e hora de conclusão do passo
     """
@@ -79,6 +80,10 @@ class ExpertStep(BaseModel):
     feedback: Optional[str] = Field(
         default=None, description="Feedback do usuário sobre o passo"
     )
+    depends_on: List[int] = Field(
+        default_factory=list,
+        description="Números dos passos anteriores dos quais este passo depende",
+    )
     status: StepStatus = Field(
         default=StepStatus.PENDING,
         description="Status do passo",
@@ -94,6 +99,15 @@ class ExpertStep(BaseModel):
             raise ValueError("O número do passo deve ser maior que zero")
         return v
 
+    def invalidate(self):
+        """
+        Descarta o conteúdo gerado do passo, para que ele seja gerado novamente
+        """
+        self.content = None
+        self.prerequisites = None
+        self.completed_at = None
+        self.status = StepStatus.PENDING
+
 
 class Expert(BaseModel):
     """
@@ -162,6 +176,14 @@ class Expert(BaseModel):
         if sorted(step_numbers) != list(range(1, len(step_numbers) + 1)):
             raise ValueError("Os números de passo devem ser sequenciais começando em 1")
 
+        # Um passo só pode depender de passos anteriores a ele
+        for step in v:
+            if any(not 1 <= number < step.step_number for number in step.depends_on):
+                raise ValueError(
+                    f"O passo {step.step_number} depende de um passo inexistente "
+                    "ou posterior a ele"
+                )
+
         return v
 
     def get_current_step(self) -> Optional[ExpertStep]:
@@ -242,6 +264,18 @@ class Expert(BaseModel):
         total_time = sum(step.estimated_time or 0 for step in self.learning_path)
         return total_time if total_time > 0 else None
 
+    def get_last_completed_step(self) -> Optional[ExpertStep]:
+        """
+        Retorna o último passo concluído, isto é, o último exibido ao usuário
+
+        Returns:
+            Optional[ExpertStep]: O último passo concluído ou None se nenhum foi concluído
+        """
+        completed_steps = [
+            step for step in self.learning_path if step.status == StepStatus.COMPLETED
+        ]
+        return completed_steps[-1] if completed_steps else None
+
     def get_next_available_step(self) -> Optional[ExpertStep]:
         """
         Retorna o próximo passo disponível para execução
@@ -262,3 +296,233 @@ class Expert(BaseModel):
             bool: True se todos os passos estiverem completos, False caso contrário
         """
         return all(step.status == StepStatus.COMPLETED for step in self.learning_path)
+
+    def get_step(self, step_number: int) -> ExpertStep:
+        """
+        Retorna um passo pelo número
+
+        Args:
+            step_number (int): Número do passo
+
+        Returns:
+            ExpertStep: O passo encontrado
+
+        Raises:
+            ValueError: Se o passo não for encontrado
+        """
+        if not 1 <= step_number <= len(self.learning_path):
+            raise ValueError(f"Passo {step_number} não encontrado")
+
+        return self.learning_path[step_number - 1]
+
+    def get_dependents(self, step_number: int) -> List[int]:
+        """
+        Retorna os passos que dependem, direta ou indiretamente, de um passo
+
+        Args:
+            step_number (int): Número do passo
+
+        Returns:
+            List[int]: Números dos passos dependentes, em ordem
+        """
+        affected = {step_number}
+
+        # Dependências sempre apontam para passos anteriores, então uma única
+        # passagem em ordem encontra todos os dependentes transitivos
+        for step in self.learning_path[step_number:]:
+            if affected.intersection(step.depends_on):
+                affected.add(step.step_number)
+
+        affected.discard(step_number)
+        return sorted(affected)
+
+    def invalidate_step(self, step_number: int) -> List[int]:
+        """
+        Invalida um passo e seus dependentes, que voltam a ficar pendentes
+        para que seu conteúdo seja gerado novamente
+
+        Args:
+            step_number (int): Número do passo alterado
+
+        Returns:
+            List[int]: Números dos passos invalidados, em ordem
+        """
+        invalidated = [step_number, *self.get_dependents(step_number)]
+
+        for number in invalidated:
+            self.learning_path[number - 1].invalidate()
+
+        self.last_updated_at = datetime.now()
+        return invalidated
+
+    def insert_step(
+        self,
+        position: int,
+        title: str,
+        description: Optional[str] = None,
+        estimated_time: Optional[int] = None,
+        depends_on: Optional[List[int]] = None,
+    ) -> ExpertStep:
+        """
+        Insere um novo passo (pendente) na posição informada.
+        Os passos existentes não são invalidados.
+
+        Args:
+            position (int): Posição do novo passo (1 a len(learning_path) + 1)
+            title (str): Título do passo
+            description (Optional[str]): Descrição do passo
+            estimated_time (Optional[int]): Tempo estimado em minutos
+            depends_on (Optional[List[int]]): Passos anteriores dos quais o novo passo depende
+
+        Returns:
+            ExpertStep: O passo inserido
+
+        Raises:
+            ValueError: Se a posição ou as dependências forem inválidas
+        """
+        if not 1 <= position <= len(self.learning_path) + 1:
+            raise ValueError(f"Posição {position} inválida")
+
+        depends_on = sorted(set(depends_on or []))
+        if any(not 1 <= number < position for number in depends_on):
+            raise ValueError("O novo passo só pode depender de passos anteriores")
+
+        step = ExpertStep(
+            step_number=position,
+            title=title,
+            description=description,
+            estimated_time=estimated_time,
+            depends_on=depends_on,
+        )
+
+        order = list(self.learning_path)
+        order.insert(position - 1, step)
+        self._renumber(order, new_step=step)
+
+        return step
+
+    def remove_step(self, step_number: int) -> List[int]:
+        """
+        Remove um passo. Os passos que dependiam dele são invalidados.
+
+        Args:
+            step_number (int): Número do passo a ser removido
+
+        Returns:
+            List[int]: Números (após a renumeração) dos passos invalidados
+
+        Raises:
+            ValueError: Se o passo não for encontrado
+        """
+        removed = self.get_step(step_number)
+        dependents = [
+            self.get_step(number) for number in self.get_dependents(step_number)
+        ]
+
+        order = [step for step in self.learning_path if step is not removed]
+        self._renumber(order)
+
+        for step in dependents:
+            step.invalidate()
+
+        self.last_updated_at = datetime.now()
+        return [step.step_number for step in dependents]
+
+    def move_step(self, step_number: int, new_position: int) -> List[int]:
+        """
+        Move um passo para outra posição. O passo movido e seus dependentes
+        são invalidados, pois o contexto dos passos anteriores mudou.
+
+        Args:
+            step_number (int): Número do passo a ser movido
+            new_position (int): Nova posição do passo
+
+        Returns:
+            List[int]: Números (após a renumeração) dos passos invalidados
+
+        Raises:
+            ValueError: Se a nova posição deixar um passo antes de uma dependência
+        """
+        step = self.get_step(step_number)
+        if not 1 <= new_position <= len(self.learning_path):
+            raise ValueError(f"Posição {new_position} inválida")
+
+        if new_position == step_number:
+            return []
+
+        order = [other for other in self.learning_path if other is not step]
+        order.insert(new_position - 1, step)
+
+        positions = {id(other): index for index, other in enumerate(order, start=1)}
+        for other in order:
+            dependencies = [self.get_step(number) for number in other.depends_on]
+            if any(positions[id(dep)] > positions[id(other)] for dep in dependencies):
+                raise ValueError(
+                    f"O passo '{other.title}' ficaria antes de uma de suas dependências"
+                )
+
+        self._renumber(order)
+        return self.invalidate_step(step.step_number)
+
+    def rename_step(
+        self, step_number: int, title: str, description: Optional[str] = None
+    ) -> List[int]:
+        """
+        Altera o título (e opcionalmente a descrição) de um passo, invalidando-o
+        junto com seus dependentes.
+
+        Args:
+            step_number (int): Número do passo
+            title (str): Novo título
+            description (Optional[str]): Nova descrição (None mantém a atual)
+
+        Returns:
+            List[int]: Números dos passos invalidados
+        """
+        step = self.get_step(step_number)
+        step.title = title
+        if description is not None:
+            step.description = description
+
+        return self.invalidate_step(step_number)
+
+    def add_feedback(self, step_number: int, feedback: str) -> List[int]:
+        """
+        Registra o feedback do usuário sobre um passo. O passo e seus
+        dependentes são invalidados para serem gerados considerando o feedback.
+
+        Args:
+            step_number (int): Número do passo
+            feedback (str): Feedback do usuário
+
+        Returns:
+            List[int]: Números dos passos invalidados
+        """
+        self.get_step(step_number).feedback = feedback
+        return self.invalidate_step(step_number)
+
+    def _renumber(
+        self, order: List[ExpertStep], new_step: Optional[ExpertStep] = None
+    ) -> None:
+        """
+        Renumera os passos na ordem informada e remapeia as dependências,
+        mantendo as invariantes de `validate_learning_path` sem revalidar a lista.
+        Dependências de passos removidos são descartadas. As dependências de
+        `new_step` já usam a numeração nova.
+        """
+        mapping = {
+            step.step_number: index
+            for index, step in enumerate(order, start=1)
+            if step is not new_step
+        }
+
+        for index, step in enumerate(order, start=1):
+            if step is not new_step:
+                # Mover um passo pode inverter a ordem das suas dependências
+                step.depends_on = sorted(
+                    mapping[number] for number in step.depends_on if number in mapping
+                )
+            step.step_number = index
+
+        self.learning_path = order
+        self.last_updated_at = datetime.now()
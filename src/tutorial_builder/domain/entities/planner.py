@@ -1,6 +1,28 @@
 # Planner schema
+
 from typing import Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from domain.text import fold
+
+# Formas do nível aceitas da conversa (em português ou inglês, sem acentos)
+# e o valor correspondente do schema
+LEVEL_SYNONYMS = {
+    "iniciante": "iniciante",
+    "beginner": "iniciante",
+    "basico": "iniciante",
+    "basic": "iniciante",
+    "novato": "iniciante",
+    "intermediario": "intermediario",
+    "intermediate": "intermediario",
+    "medio": "intermediario",
+    "mid": "intermediario",
+    "avancado": "avancado",
+    "advanced": "avancado",
+    "expert": "avancado",
+    "especialista": "avancado",
+    "ninja": "avancado",
+}
 
 
 class Planner(BaseModel):
@@ -9,7 +31,7 @@ class Planner(BaseModel):
 
     Attributes:
         subject (Optional[str]): O assunto, tecnologia ou ferramenta que o usuário deseja aprender.
-        level (Optional[Literal["beginner", "intermediate", "advanced"]]): O nível atual de proficiência do usuário.
+        level (Optional[Literal["iniciante", "intermediario", "avancado"]]): O nível atual de proficiência do usuário.
         project_type (Optional[str]): O tipo de projeto no qual o usuário está aprendendo ou planeja aprender.
         environment (Optional[str]): O ambiente ou contexto onde o usuário pretende usar o conhecimento adquirido.
         instructions (Optional[str]): Instruções adicionais ou preferências para o plano de aprendizagem.
@@ -41,6 +63,15 @@ class Planner(BaseModel):
         default=None,
     )
 
+    @field_validator("level", mode="before")
+    def normalize_level(cls, v):
+        # Sinônimos e acentos (ex: "beginner", "Avançado") viram o valor do
+        # schema; valores desconhecidos seguem para a validação do Literal
+        if not isinstance(v, str):
+            return v
+
+        return LEVEL_SYNONYMS.get(fold(v.strip()), v)
+
     def is_valid(self) -> bool:
         """
         Verifica se o plano de aprendizagem é válido
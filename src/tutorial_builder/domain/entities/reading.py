@@ -0,0 +1,94 @@
+import datetime
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class ArchivedTutorial(BaseModel):
+    """
+    Tutorial guardado no arquivo do modo leitura (apenas os metadados; o
+    conteúdo de cada seção é lido sob demanda)
+
+    Attributes:
+        id (int): Identificador do tutorial no arquivo, começando em 1
+        title (str): Título do tutorial
+        subject (str): Assunto do tutorial
+        difficulty_level (str): Nível de dificuldade do tutorial
+        sections (List[str]): Títulos das seções, na ordem de leitura
+        history_id (int): Identificador do tutorial no histórico, se houver
+        created_at (datetime): Data e hora de criação do tutorial
+    """
+
+    id: int = Field(default=0, description="Identificador do tutorial no arquivo")
+    title: str | None = Field(default=None, description="Título do tutorial")
+    subject: str | None = Field(default=None, description="Assunto do tutorial")
+    difficulty_level: str | None = Field(
+        default=None, description="Nível de dificuldade do tutorial"
+    )
+    sections: List[str] = Field(
+        default_factory=list, description="Títulos das seções, na ordem de leitura"
+    )
+    history_id: int | None = Field(
+        default=None, description="Identificador do tutorial no histórico"
+    )
+    created_at: datetime.datetime | None = Field(
+        default=None, description="Data e hora de criação do tutorial"
+    )
+
+
+class TutorialSection(BaseModel):
+    """
+    Seção de um tutorial exibida no modo leitura (um passo do caminho de
+    aprendizado)
+
+    Attributes:
+        tutorial (ArchivedTutorial): Tutorial ao qual a seção pertence
+        number (int): Número da seção, começando em 1
+        title (str): Título da seção
+        content (str): Conteúdo da seção em Markdown
+    """
+
+    tutorial: ArchivedTutorial = Field(
+        ..., description="Tutorial ao qual a seção pertence"
+    )
+    number: int = Field(..., ge=1, description="Número da seção, começando em 1")
+    title: str = Field(default="", description="Título da seção")
+    content: str = Field(default="", description="Conteúdo da seção em Markdown")
+
+    @property
+    def has_previous(self) -> bool:
+        """
+        Indica se há uma seção anterior
+        """
+        return self.number > 1
+
+    @property
+    def has_next(self) -> bool:
+        """
+        Indica se há uma próxima seção
+        """
+        return self.number < len(self.tutorial.sections)
+
+
+class TutorialAnswer(BaseModel):
+    """
+    Resposta a uma pergunta sobre um tutorial concluído
+
+    Attributes:
+        question (str): Pergunta do usuário
+        answer (str): Resposta em Markdown
+        sections (List[str]): Títulos das seções enviadas ao LLM como contexto
+        section_numbers (List[int]): Números das seções enviadas como contexto
+        from_cache (bool): Se a resposta veio do cache de perguntas repetidas
+    """
+
+    question: str = Field(..., description="Pergunta do usuário")
+    answer: str = Field(default="", description="Resposta em Markdown")
+    sections: List[str] = Field(
+        default_factory=list, description="Títulos das seções usadas como contexto"
+    )
+    section_numbers: List[int] = Field(
+        default_factory=list, description="Números das seções usadas como contexto"
+    )
+    from_cache: bool = Field(
+        default=False, description="Se a resposta veio do cache de perguntas"
+    )
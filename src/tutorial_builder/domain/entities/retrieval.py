@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+
+class RetrievedChunk(BaseModel):
+    """
+    Trecho de conteúdo recuperado do índice de busca por similaridade
+
+    Attributes:
+        text (str): Texto do trecho
+        source (str): Origem do trecho (ex: tutorial ou passo que o gerou)
+        score (float): Similaridade com a consulta (0 a 1)
+    """
+
+    text: str = Field(..., description="Texto do trecho")
+    source: str = Field(default="", description="Origem do trecho")
+    score: float = Field(default=0.0, description="Similaridade com a consulta")
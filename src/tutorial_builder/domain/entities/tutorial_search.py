@@ -0,0 +1,62 @@
+import datetime
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class TutorialSearchResult(BaseModel):
+    """
+    Resultado da busca no histórico de tutoriais
+
+    Attributes:
+        id (int): Identificador do tutorial no histórico
+        title (str): Título do tutorial
+        subject (str): Assunto do tutorial
+        difficulty_level (str): Nível de dificuldade do tutorial
+        keywords (List[str]): Palavras-chave do tutorial
+        snippet (str): Trecho do tutorial com os termos buscados destacados
+        score (float): Relevância do resultado (maior é mais relevante)
+        created_at (datetime): Data e hora de criação do tutorial
+    """
+
+    id: int = Field(..., description="Identificador do tutorial no histórico")
+    title: str | None = Field(default=None, description="Título do tutorial")
+    subject: str | None = Field(default=None, description="Assunto do tutorial")
+    difficulty_level: str | None = Field(
+        default=None, description="Nível de dificuldade do tutorial"
+    )
+    keywords: List[str] = Field(
+        default_factory=list, description="Palavras-chave do tutorial"
+    )
+    snippet: str | None = Field(
+        default=None,
+        description="Trecho do tutorial com os termos buscados destacados",
+    )
+    score: float = Field(
+        default=0.0, description="Relevância do resultado (maior é mais relevante)"
+    )
+    created_at: datetime.datetime | None = Field(
+        default=None, description="Data e hora de criação do tutorial"
+    )
+
+
+class TutorialSearchPage(BaseModel):
+    """
+    Página de resultados da busca no histórico de tutoriais
+
+    Attributes:
+        query (str): Texto buscado (vazio lista os tutoriais mais recentes)
+        page (int): Número da página, começando em 1
+        page_size (int): Quantidade máxima de resultados por página
+        has_more (bool): Indica se há uma próxima página
+        results (List[TutorialSearchResult]): Resultados da página
+    """
+
+    query: str = Field(default="", description="Texto buscado")
+    page: int = Field(default=1, ge=1, description="Número da página")
+    page_size: int = Field(
+        default=20, ge=1, description="Quantidade máxima de resultados por página"
+    )
+    has_more: bool = Field(default=False, description="Indica se há uma próxima página")
+    results: List[TutorialSearchResult] = Field(
+        default_factory=list, description="Resultados da página"
+    )
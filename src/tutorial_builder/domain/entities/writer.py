@@ -1,10 +1,30 @@
 import datetime
+from enum import StrEnum
 from typing import List
 from pydantic import BaseModel, Field
 
 from entities.expert import Expert, DifficultyLevel
 
 
+class WriterMode(StrEnum):
+    """
+    Modo de geração do tutorial final
+
+    - SINGLE_CALL: todo o caminho de aprendizado em uma única chamada ao LLM
+    - MAP_REDUCE: cada passo reescrito em paralelo, seguido de uma chamada
+        pequena para introdução, transições e conclusão
+    - PIPELINED: como MAP_REDUCE, mas cada passo é reescrito em segundo plano
+        assim que é concluído; ao final, as seções em cache são apenas reunidas
+    - STRUCTURED: tutorial, título e palavras-chave em uma única chamada
+        com saída estruturada
+    """
+
+    SINGLE_CALL = "single_call"
+    MAP_REDUCE = "map_reduce"
+    PIPELINED = "pipelined"
+    STRUCTURED = "structured"
+
+
 class Writer(BaseModel):
     """
     Modelo para o Writer Agent que escreve o tutorial
@@ -1,7 +1,32 @@
+from .blob_store import BlobStore
 from .planner_agent import PlannerAgent
 from .expert_agent import ExpertAgent
-from .llm_service import LLMService
+from .learning_path_library import LearningPathLibrary
+from .llm_service import LLMService, StructuredOutputError
+from .qa_agent import QAAgent
+from .retrieval_index import RetrievalIndex
+from .session_store import SessionStore
+from .solution_cache import SolutionCache
+from .troubleshooting_agent import TroubleshootingAgent
+from .tutorial_archive import TutorialArchive
+from .tutorial_repository import TutorialRepository
 from .workflow import Workflow
 from .writer_agent import WriterAgent
 
-__all__ = ["PlannerAgent", "ExpertAgent", "LLMService", "Workflow", "WriterAgent"]
+__all__ = [
+    "BlobStore",
+    "PlannerAgent",
+    "ExpertAgent",
+    "LearningPathLibrary",
+    "LLMService",
+    "StructuredOutputError",
+    "QAAgent",
+    "RetrievalIndex",
+    "SessionStore",
+    "SolutionCache",
+    "TroubleshootingAgent",
+    "TutorialArchive",
+    "TutorialRepository",
+    "Workflow",
+    "WriterAgent",
+]
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+
+
+class BlobStore(ABC):
+    """
+    Interface para um armazenamento endereçado por conteúdo: cada blob é
+    identificado pelo hash do seu conteúdo, então conteúdos iguais são
+    guardados uma única vez.
+    """
+
+    @abstractmethod
+    def put(self, data: bytes, owner: str | None = None) -> str:
+        """
+        Guarda um blob (sem efeito se ele já existir)
+
+        Args:
+            data: Conteúdo do blob
+            owner: Dono que passa a referenciar o blob (ex: a conversa do
+                checkpoint); blobs sem dono nunca são removidos
+
+        Returns:
+            str: Hash do conteúdo, usado para referenciar o blob
+        """
+        pass
+
+    @abstractmethod
+    def get(self, digest: str) -> bytes:
+        """
+        Busca um blob pelo hash
+
+        Args:
+            digest: Hash do conteúdo
+
+        Returns:
+            bytes: Conteúdo do blob
+
+        Raises:
+            KeyError: Se o blob não existir
+        """
+        pass
+
+    @abstractmethod
+    def release(self, owner: str) -> int:
+        """
+        Remove as referências de um dono e descarta os blobs que não são mais
+        referenciados por nenhum dono
+
+        Args:
+            owner: Dono das referências
+
+        Returns:
+            int: Quantidade de blobs descartados
+        """
+        pass
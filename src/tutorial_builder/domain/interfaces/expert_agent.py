@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List
 
-from domain.entities import Planner, ExpertStep, Expert
+from entities import Planner, ExpertStep, Expert
 
 
 class ExpertAgent(ABC):
@@ -40,12 +40,54 @@ class ExpertAgent(ABC):
         pass
 
     @abstractmethod
-    def generate_step_content(self, step: ExpertStep) -> ExpertStep:
+    def stream_learning_path(
+        self, planner: Planner, session_id: str | None = None
+    ) -> Iterator[ExpertStep]:
+        """
+        Gera o caminho de aprendizado em streaming, devolvendo cada passo
+        assim que ele é recebido do LLM
+
+        Args:
+            planner: Objeto Planner contendo informações sobre o tutorial a ser gerado
+            session_id: Identificador da sessão, para reutilizar uma especulação
+
+        Returns:
+            Iterator[ExpertStep]: Passos do caminho de aprendizado, em ordem
+        """
+        pass
+
+    @abstractmethod
+    def speculate_learning_path(self, planner: Planner, session_id: str) -> None:
+        """
+        Inicia em segundo plano a geração especulativa do caminho de aprendizado
+
+        Args:
+            planner: Objeto Planner com ao menos assunto e nível definidos
+            session_id: Identificador da sessão (thread_id)
+        """
+        pass
+
+    @abstractmethod
+    def save_learning_path(
+        self, planner: Planner, learning_path: List[ExpertStep]
+    ) -> None:
+        """
+        Salva o caminho de aprendizado de uma sessão concluída para reutilização
+
+        Args:
+            planner: Objeto Planner contendo informações sobre o tutorial
+            learning_path: Passos do caminho de aprendizado concluído
+        """
+        pass
+
+    @abstractmethod
+    def generate_step_content(self, step: ExpertStep, expert: Expert) -> ExpertStep:
         """
         Gera o conteúdo detalhado para um passo específico do caminho de aprendizado
 
         Args:
             step: Objeto ExpertStep contendo informações sobre o passo a ser gerado
+            expert: Expert da sessão, com o caminho de aprendizado do passo
 
         Returns:
             ExpertStep: Objeto ExpertStep com o conteúdo detalhado gerado pela LLM
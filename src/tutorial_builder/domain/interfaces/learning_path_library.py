@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from entities import Planner, ExpertStep
+
+
+class LearningPathLibrary(ABC):
+    """
+    Interface para a biblioteca de caminhos de aprendizado já gerados
+
+    A biblioteca indexa caminhos de aprendizado pelo plano normalizado
+    (assunto, nível, tipo de projeto e ambiente) e pela versão do prompt
+    que os gerou, para que caminhos de prompts antigos não sejam reutilizados.
+    """
+
+    @abstractmethod
+    def find(self, planner: Planner, prompt_version: str) -> List[ExpertStep] | None:
+        """
+        Busca um caminho de aprendizado compatível com o plano
+
+        Args:
+            planner: Plano de aprendizado do usuário
+            prompt_version: Versão do prompt que gera o caminho de aprendizado
+
+        Returns:
+            List[ExpertStep] | None: Passos do caminho encontrado, ou None
+        """
+        pass
+
+    @abstractmethod
+    def save(
+        self,
+        planner: Planner,
+        learning_path: List[ExpertStep],
+        prompt_version: str,
+        source: str = "session",
+    ) -> None:
+        """
+        Salva (ou substitui) o caminho de aprendizado do plano
+
+        Args:
+            planner: Plano de aprendizado do usuário
+            learning_path: Passos do caminho de aprendizado
+            prompt_version: Versão do prompt que gerou o caminho
+            source: Origem do caminho (ex: "precompute" ou "session")
+        """
+        pass
+
+    @abstractmethod
+    def purge(self, prompt_version: str) -> int:
+        """
+        Remove os caminhos gerados por versões do prompt diferentes da atual
+
+        Args:
+            prompt_version: Versão atual do prompt
+
+        Returns:
+            int: Quantidade de caminhos removidos
+        """
+        pass
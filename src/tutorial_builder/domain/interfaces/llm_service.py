@@ -1,29 +1,63 @@
 from abc import ABC, abstractmethod
-from typing import List, Any, Dict
+from typing import Iterator, List, Any, Dict
 from langchain_core.messages import BaseMessage
 
 
+class StructuredOutputError(Exception):
+    """
+    Lançada quando a saída estruturada do modelo não pôde ser decodificada.
+
+    Attributes:
+        raw_output (str): Texto bruto devolvido pelo modelo, para reparo local
+    """
+
+    def __init__(self, raw_output: str, message: str = ""):
+        self.raw_output = raw_output
+        super().__init__(message or "Saída estruturada inválida")
+
+
 class LLMService(ABC):
     """
     Interface que define o contrato para implementações do serviço LLM.
+
+    O parâmetro opcional `call_site` identifica o ponto de chamada
+    (ex: "writer.tutorial") e permite que implementações apliquem
+    políticas específicas, como orçamento de tokens e métricas.
     """
 
     @abstractmethod
-    def invoke(self, messages: List[BaseMessage]) -> str:
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
         """
         Invoca o modelo de linguagem com as mensagens fornecidas.
 
         Args:
             messages: Lista de mensagens para o modelo
+            call_site: Identificador do ponto de chamada
 
         Returns:
             str: A resposta do modelo
         """
         pass
 
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Invoca o modelo de linguagem devolvendo a resposta em partes, à medida
+        que é gerada. Por padrão, devolve a resposta completa em uma única parte.
+
+        Args:
+            messages: Lista de mensagens para o modelo
+            call_site: Identificador do ponto de chamada
+
+        Returns:
+            Iterator[str]: Partes da resposta do modelo
+        """
+        yield self.invoke(messages, call_site=call_site)
+
     @abstractmethod
     def invoke_with_structured_output(
-        self, prompt: str, schema: Dict[str, Any]
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
     ) -> Dict[str, Any]:
         """
         Invoca o modelo de linguagem com saída estruturada.
@@ -31,8 +65,12 @@ class LLMService(ABC):
         Args:
             prompt: O prompt para o modelo
             schema: O schema esperado para a saída
+            call_site: Identificador do ponto de chamada
 
         Returns:
             Dict[str, Any]: A resposta estruturada do modelo
+
+        Raises:
+            StructuredOutputError: Se a resposta não puder ser decodificada
         """
         pass
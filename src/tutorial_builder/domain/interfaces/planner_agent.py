@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List
 from langchain_core.messages import BaseMessage
-from domain.entities.planner import Planner
+from entities.planner import Planner
 
 
 class PlannerAgent(ABC):
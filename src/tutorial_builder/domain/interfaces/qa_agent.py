@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+from entities import TutorialAnswer
+
+
+class QAAgent(ABC):
+    """
+    Interface para o agente de perguntas e respostas
+
+    Responsável por responder às perguntas do usuário sobre um tutorial
+    concluído, com base nas suas seções.
+    """
+
+    @abstractmethod
+    def answer(
+        self,
+        question: str,
+        title: str,
+        sections: List[Tuple[str, str]],
+        tutorial_key: str | None = None,
+        current_section: int | None = None,
+    ) -> TutorialAnswer:
+        """
+        Responde a uma pergunta sobre o tutorial
+
+        Args:
+            question: Pergunta do usuário
+            title: Título do tutorial
+            sections: Título e conteúdo (Markdown) de cada seção do tutorial
+            tutorial_key: Identificador estável do tutorial, usado nos caches
+                (se omitido, é calculado a partir do conteúdo)
+            current_section: Número da seção que o usuário está lendo, se houver
+
+        Returns:
+            TutorialAnswer: A resposta e as seções usadas como contexto
+        """
+        pass
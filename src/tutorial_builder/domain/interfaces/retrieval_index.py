@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from entities import RetrievedChunk
+
+
+class RetrievalIndex(ABC):
+    """
+    Interface para o índice de recuperação de conteúdo (RAG)
+
+    O índice divide os documentos em trechos e responde às consultas com os
+    trechos mais parecidos, para que o prompt inclua apenas o contexto relevante.
+    """
+
+    @abstractmethod
+    def add(self, text: str, source: str) -> int:
+        """
+        Divide um documento em trechos e os adiciona ao índice
+
+        Args:
+            text: Texto do documento (Markdown)
+            source: Origem do documento (ex: "tutorial:42")
+
+        Returns:
+            int: Quantidade de trechos adicionados
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query: str, k: int = 3) -> List[RetrievedChunk]:
+        """
+        Busca os trechos mais parecidos com a consulta
+
+        Args:
+            query: Texto da consulta
+            k: Quantidade máxima de trechos
+
+        Returns:
+            List[RetrievedChunk]: Trechos em ordem decrescente de similaridade
+        """
+        pass
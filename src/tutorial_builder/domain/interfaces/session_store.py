@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class SessionStore(ABC):
+    """
+    Interface para o armazenamento das sessões de conversa da API: cada
+    sessão guarda o estado do workflow (mensagens e saídas dos agentes) após
+    a última rodada concluída.
+    """
+
+    @abstractmethod
+    def create(self) -> str:
+        """
+        Cria uma sessão com o estado inicial do workflow
+
+        Returns:
+            str: Identificador da sessão (usado também como thread_id)
+        """
+        pass
+
+    @abstractmethod
+    def get(self, session_id: str) -> Dict[str, Any] | None:
+        """
+        Busca o estado de uma sessão
+
+        Args:
+            session_id: Identificador da sessão
+
+        Returns:
+            Dict[str, Any] | None: Estado do workflow, ou None se a sessão
+                não existir
+        """
+        pass
+
+    @abstractmethod
+    def save(self, session_id: str, state: Dict[str, Any]) -> None:
+        """
+        Salva o estado de uma sessão
+
+        Args:
+            session_id: Identificador da sessão
+            state: Estado do workflow após a rodada
+        """
+        pass
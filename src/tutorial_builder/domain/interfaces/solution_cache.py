@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+
+
+class SolutionCache(ABC):
+    """
+    Interface para o cache de soluções de problemas reportados pelos usuários
+
+    As soluções são indexadas pela assinatura normalizada do erro e pelo
+    assunto do tutorial, de modo que erros comuns sejam respondidos sem o LLM.
+    """
+
+    @abstractmethod
+    def get(self, signature: str, subject: str) -> str | None:
+        """
+        Busca a solução de um erro
+
+        Args:
+            signature: Assinatura normalizada do erro
+            subject: Assunto do tutorial
+
+        Returns:
+            str | None: A solução salva, ou None
+        """
+        pass
+
+    @abstractmethod
+    def put(self, signature: str, subject: str, solution: str) -> None:
+        """
+        Salva a solução de um erro
+
+        Args:
+            signature: Assinatura normalizada do erro
+            subject: Assunto do tutorial
+            solution: Solução para o erro
+        """
+        pass
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+
+from entities import Expert, ExpertStep, TroubleShooting
+
+
+class TroubleshootingAgent(ABC):
+    """
+    Interface para o agente de solução de problemas
+
+    Responsável por responder aos erros reportados pelo usuário durante
+    a execução de um passo do tutorial.
+    """
+
+    @abstractmethod
+    def is_error_report(self, message: str) -> bool:
+        """
+        Verifica se a mensagem do usuário relata um erro
+
+        Args:
+            message: Mensagem do usuário
+
+        Returns:
+            bool: True se a mensagem parece relatar um erro
+        """
+        pass
+
+    @abstractmethod
+    def solve(self, expert: Expert, step: ExpertStep, problem: str) -> TroubleShooting:
+        """
+        Gera (ou recupera do cache) a solução para o problema reportado,
+        registrando-a no passo
+
+        Args:
+            expert: Objeto Expert com o plano de aprendizado
+            step: Passo no qual o problema ocorreu
+            problem: Problema reportado pelo usuário
+
+        Returns:
+            TroubleShooting: O problema e sua solução
+        """
+        pass
@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from entities import ArchivedTutorial
+
+
+class TutorialArchive(ABC):
+    """
+    Interface para o arquivo somente de acréscimo dos tutoriais concluídos,
+    usado pelo modo leitura
+
+    Cada tutorial é guardado como uma sequência de seções, lidas uma a uma
+    sem carregar o tutorial inteiro.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Quantidade de tutoriais no arquivo
+        """
+        pass
+
+    @abstractmethod
+    def append(self, tutorial: ArchivedTutorial, contents: List[str]) -> int:
+        """
+        Acrescenta um tutorial ao arquivo
+
+        Args:
+            tutorial: Metadados do tutorial (o identificador é ignorado)
+            contents: Conteúdo de cada seção, na ordem de `tutorial.sections`
+
+        Returns:
+            int: Identificador do tutorial no arquivo
+        """
+        pass
+
+    @abstractmethod
+    def get(self, tutorial_id: int) -> ArchivedTutorial | None:
+        """
+        Busca os metadados de um tutorial
+
+        Args:
+            tutorial_id: Identificador do tutorial no arquivo
+
+        Returns:
+            ArchivedTutorial | None: O tutorial, ou None se não existir
+        """
+        pass
+
+    @abstractmethod
+    def recent(self, offset: int = 0, limit: int = 20) -> List[ArchivedTutorial]:
+        """
+        Lista os tutoriais do mais recente para o mais antigo
+
+        Args:
+            offset: Quantidade de tutoriais a pular
+            limit: Quantidade máxima de tutoriais
+
+        Returns:
+            List[ArchivedTutorial]: Metadados dos tutoriais
+        """
+        pass
+
+    @abstractmethod
+    def read_section(self, tutorial_id: int, number: int) -> str:
+        """
+        Lê o conteúdo de uma seção
+
+        Args:
+            tutorial_id: Identificador do tutorial no arquivo
+            number: Número da seção, começando em 1
+
+        Returns:
+            str: Conteúdo da seção em Markdown
+
+        Raises:
+            KeyError: Se o tutorial ou a seção não existirem
+        """
+        pass
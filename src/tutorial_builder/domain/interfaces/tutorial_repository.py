@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+
+from entities import Writer, TutorialSearchPage
+
+
+class TutorialRepository(ABC):
+    """
+    Interface para o histórico de tutoriais gerados
+    """
+
+    @abstractmethod
+    def save(self, writer: Writer) -> int:
+        """
+        Salva um tutorial no histórico
+
+        Args:
+            writer: Objeto Writer com o tutorial gerado
+
+        Returns:
+            int: Identificador do tutorial no histórico
+        """
+        pass
+
+    @abstractmethod
+    def get(self, tutorial_id: int) -> Writer | None:
+        """
+        Busca um tutorial pelo identificador
+
+        Args:
+            tutorial_id: Identificador do tutorial
+
+        Returns:
+            Writer | None: O tutorial, ou None se não existir
+        """
+        pass
+
+    @abstractmethod
+    def search(
+        self, query: str = "", page: int = 1, page_size: int = 20
+    ) -> TutorialSearchPage:
+        """
+        Busca tutoriais por texto, ordenados por relevância. Sem texto,
+        lista os tutoriais mais recentes.
+
+        Args:
+            query: Texto buscado no título, palavras-chave, assunto e conteúdo
+            page: Número da página, começando em 1
+            page_size: Quantidade máxima de resultados por página
+
+        Returns:
+            TutorialSearchPage: Página de resultados
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, tutorial_id: int) -> bool:
+        """
+        Remove um tutorial do histórico
+
+        Args:
+            tutorial_id: Identificador do tutorial
+
+        Returns:
+            bool: True se o tutorial existia e foi removido
+        """
+        pass
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List
-from entities.expert import Expert
+from entities.expert import Expert, ExpertStep
 
 
 class WriterAgent(ABC):
@@ -32,6 +32,29 @@ class WriterAgent(ABC):
         """
         pass
 
+    @abstractmethod
+    def prefetch_frame(self, expert: Expert) -> None:
+        """
+        Antecipa, em segundo plano, a geração das partes do tutorial que dependem
+        apenas do caminho de aprendizado (introdução, transições e conclusão)
+
+        Args:
+            expert (Expert): Expert com o caminho de aprendizado recém-gerado
+        """
+        pass
+
+    @abstractmethod
+    def prefetch_section(self, step: ExpertStep, expert: Expert) -> None:
+        """
+        Antecipa, em segundo plano, a reescrita de um passo concluído
+        como seção do tutorial
+
+        Args:
+            step (ExpertStep): Passo cujo conteúdo acabou de ser gerado
+            expert (Expert): Expert com o contexto do tutorial
+        """
+        pass
+
     @abstractmethod
     def generate_title(self, tutorial: str) -> str:
         """
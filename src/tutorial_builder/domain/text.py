@@ -0,0 +1,36 @@
+import unicodedata
+
+from typing import List
+
+
+def fold(text: str) -> str:
+    """
+    Normaliza um texto para comparação: minúsculas e sem acentos
+    (ex: "Avançado" vira "avancado").
+
+    Args:
+        text: Texto de entrada
+
+    Returns:
+        str: Texto normalizado
+    """
+    if text.isascii():
+        return text.lower()
+
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def char_trigrams(word: str) -> List[str]:
+    """
+    Trigramas de caracteres de uma palavra, com marcadores de início e fim;
+    tolerantes a variações como plural e erros de digitação.
+
+    Args:
+        word: Palavra normalizada (ver fold)
+
+    Returns:
+        List[str]: Trigramas da palavra (ex: "#3#py", "#3pyt", ...)
+    """
+    padded = f"#{word}#"
+    return [f"#3{padded[i:i + 3]}" for i in range(len(padded) - 2)]
@@ -1,3 +1,47 @@
 from .openai_service import OpenAIService
+from .llm_service_decorator import LLMServiceDecorator
+from .fake_service import FakeLLMService
+from .context_guard import (
+    ContextGuardLLMService,
+    ContextOverflowError,
+    OverflowStrategy,
+    TokenBudget,
+)
+from .semantic_cache import (
+    SemanticCacheAudit,
+    SemanticCacheLLMService,
+    SemanticCachePolicy,
+)
+from .single_flight import SingleFlightLLMService
+from .cancellation import (
+    CancellableLLMService,
+    CancellationToken,
+    RunCancelledError,
+    cancellation_scope,
+    current_token,
+)
+from .token_stream import TokenStreamingLLMService, token_stream_scope
+from .token_counter import estimate_tokens, count_message_tokens
 
-__all__ = ["OpenAIService"]
+__all__ = [
+    "OpenAIService",
+    "LLMServiceDecorator",
+    "FakeLLMService",
+    "ContextGuardLLMService",
+    "ContextOverflowError",
+    "OverflowStrategy",
+    "TokenBudget",
+    "SemanticCacheAudit",
+    "SemanticCacheLLMService",
+    "SemanticCachePolicy",
+    "SingleFlightLLMService",
+    "CancellableLLMService",
+    "CancellationToken",
+    "RunCancelledError",
+    "cancellation_scope",
+    "current_token",
+    "TokenStreamingLLMService",
+    "token_stream_scope",
+    "estimate_tokens",
+    "count_message_tokens",
+]
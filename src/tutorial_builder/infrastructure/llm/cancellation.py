@@ -0,0 +1,214 @@
+import threading
+
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterator, List
+from langchain_core.messages import BaseMessage
+
+from monitoring import metrics
+
+from .llm_service_decorator import LLMServiceDecorator
+
+
+class RunCancelledError(BaseException):
+    """
+    Lançada quando a execução em andamento é cancelada pelo usuário.
+
+    Deriva de BaseException (como asyncio.CancelledError) para atravessar os
+    `except Exception` dos nós do workflow e dos serviços, que tratam falhas
+    do LLM, e não cancelamentos.
+    """
+
+    def __init__(self, message: str = "Execução cancelada"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """
+    Sinal de cancelamento de uma execução, compartilhado entre quem cancela
+    (ex: o botão "Cancelar" da interface) e o código em execução.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Indica se o cancelamento foi solicitado
+        """
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """
+        Solicita o cancelamento e avisa quem está aguardando
+        """
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Registra uma função chamada no cancelamento (imediatamente, se o
+        cancelamento já foi solicitado)
+
+        Args:
+            callback: Função sem argumentos
+
+        Returns:
+            Callable[[], None]: Função que remove o registro
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raises:
+            RunCancelledError: Se o cancelamento foi solicitado
+        """
+        if self._event.is_set():
+            raise RunCancelledError()
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+_current_token: ContextVar[CancellationToken | None] = ContextVar(
+    "cancellation_token", default=None
+)
+
+
+@contextmanager
+def cancellation_scope(token: CancellationToken) -> Iterator[CancellationToken]:
+    """
+    Associa o token ao contexto atual: as chamadas ao LLM feitas dentro do
+    bloco (inclusive nos nós do LangGraph, que herdam o contexto) são
+    interrompidas quando o token é cancelado.
+
+    Args:
+        token: Token de cancelamento da execução
+    """
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def current_token() -> CancellationToken | None:
+    """
+    Retorna o token de cancelamento do contexto atual, se houver
+    """
+    return _current_token.get()
+
+
+class CancellableLLMService(LLMServiceDecorator):
+    """
+    Torna as chamadas ao LLM canceláveis pelo token do contexto atual
+    (ver `cancellation_scope`). Fora de um escopo de cancelamento, as chamadas
+    são repassadas sem alteração.
+
+    - invoke e saída estruturada: a chamada roda em uma thread auxiliar e
+        quem chamou é liberado assim que o cancelamento é solicitado, com
+        RunCancelledError. A requisição em si não é interrompida: ela segue
+        até o fim na thread auxiliar, pois pode estar sendo aguardada por
+        chamadas idênticas de outras sessões (ver SingleFlightLLMService), e
+        a resposta é descartada (os decorators internos, como o cache
+        semântico, ainda a aproveitam);
+    - streaming: o cancelamento é verificado a cada parte recebida, e o
+        gerador do serviço envolvido é fechado. A requisição é encerrada
+        quando nenhuma outra sessão acompanha o mesmo streaming.
+    """
+
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
+        """
+        Repassa a chamada, interrompendo a espera se a execução for cancelada.
+        """
+        return self._call(self.llm_service.invoke, messages, call_site=call_site)
+
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Repassa a chamada em streaming, encerrando-a se a execução for
+        cancelada.
+        """
+        token = current_token()
+        if token is None:
+            yield from self.llm_service.stream(messages, call_site=call_site)
+            return
+
+        token.raise_if_cancelled()
+        chunks = self.llm_service.stream(messages, call_site=call_site)
+        try:
+            for chunk in chunks:
+                if token.cancelled:
+                    metrics.increment(
+                        "llm.cancelled_calls", call_site=call_site or "default"
+                    )
+                    raise RunCancelledError()
+                yield chunk
+        finally:
+            chunks.close()
+
+    def invoke_with_structured_output(
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Repassa a chamada estruturada, interrompendo a espera se a execução
+        for cancelada.
+        """
+        return self._call(
+            self.llm_service.invoke_with_structured_output,
+            prompt,
+            schema,
+            call_site=call_site,
+        )
+
+    def _call(self, fn: Callable, *args, call_site: str | None = None) -> Any:
+        token = current_token()
+        if token is None:
+            return fn(*args, call_site=call_site)
+
+        token.raise_if_cancelled()
+
+        done = threading.Event()
+        outcome: Dict[str, Any] = {}
+
+        def run() -> None:
+            try:
+                outcome["result"] = fn(*args, call_site=call_site)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        remove = token.add_callback(done.set)
+        threading.Thread(
+            target=copy_context().run, args=(run,), name="llm-call", daemon=True
+        ).start()
+
+        try:
+            done.wait()
+        finally:
+            remove()
+
+        if "error" in outcome:
+            raise outcome["error"]
+        if "result" in outcome:
+            return outcome["result"]
+
+        metrics.increment("llm.cancelled_calls", call_site=call_site or "default")
+        raise RunCancelledError()
@@ -0,0 +1,305 @@
+import logging
+import re
+
+from enum import StrEnum
+from typing import Iterator, List, Any, Dict
+from pydantic import BaseModel, ConfigDict, Field
+from langchain_core.messages import BaseMessage
+
+from domain.interfaces.llm_service import LLMService
+from monitoring import metrics
+
+from .llm_service_decorator import LLMServiceDecorator
+from .token_counter import count_message_tokens, estimate_tokens, message_text
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = "\n\n[... conteúdo truncado para caber no contexto ...]\n\n"
+
+
+class OverflowStrategy(StrEnum):
+    """
+    Estratégia aplicada quando o prompt excede o orçamento de tokens.
+
+    - TRUNCATE_OLDEST: remove as mensagens mais antigas do histórico,
+        preservando a primeira (sistema) e a última; se ainda exceder,
+        remove o trecho central da maior mensagem.
+    - COMPACT: remove espaços e linhas em branco redundantes (fora de blocos
+        de código) e, se ainda exceder, aplica TRUNCATE_OLDEST.
+    - SPLIT: não altera o prompt e lança ContextOverflowError, para que o
+        chamador divida o trabalho em chamadas menores.
+    """
+
+    TRUNCATE_OLDEST = "truncate_oldest"
+    COMPACT = "compact"
+    SPLIT = "split"
+
+
+class TokenBudget(BaseModel):
+    """
+    Orçamento de tokens de um ponto de chamada do LLM
+
+    Attributes:
+        max_prompt_tokens (int): Máximo de tokens permitido no prompt
+        max_output_tokens (int): Tokens reservados para a resposta
+        strategy (OverflowStrategy): Estratégia usada quando o prompt excede o orçamento
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    max_prompt_tokens: int = Field(
+        ..., gt=0, description="Máximo de tokens permitido no prompt"
+    )
+    max_output_tokens: int = Field(
+        default=4_096, ge=0, description="Tokens reservados para a resposta"
+    )
+    strategy: OverflowStrategy = Field(
+        default=OverflowStrategy.TRUNCATE_OLDEST,
+        description="Estratégia usada quando o prompt excede o orçamento",
+    )
+
+
+class ContextOverflowError(Exception):
+    """
+    Lançada quando o prompt não cabe no orçamento de tokens do ponto de chamada.
+    """
+
+    def __init__(self, call_site: str | None, prompt_tokens: int, limit: int):
+        self.call_site = call_site
+        self.prompt_tokens = prompt_tokens
+        self.limit = limit
+        super().__init__(
+            f"Prompt com {prompt_tokens} tokens excede o limite de {limit} tokens "
+            f"(call_site={call_site})"
+        )
+
+
+class ContextGuardLLMService(LLMServiceDecorator):
+    """
+    Guarda de contexto: estima os tokens de cada chamada antes de enviá-la,
+    aplica o orçamento do ponto de chamada e registra as contagens como métricas.
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        budgets: Dict[str, TokenBudget] | None = None,
+        default_budget: TokenBudget | None = None,
+        context_window: int = 128_000,
+    ):
+        """
+        Args:
+            llm_service: Serviço LLM que receberá as chamadas
+            budgets: Orçamentos por ponto de chamada (call_site)
+            default_budget: Orçamento usado quando o call_site não tem um específico
+            context_window: Tamanho da janela de contexto do modelo em tokens
+        """
+        super().__init__(llm_service)
+        self.budgets = budgets or {}
+        self.context_window = context_window
+        self.default_budget = default_budget or TokenBudget(
+            max_prompt_tokens=context_window - 4_096
+        )
+
+    def get_budget(self, call_site: str | None) -> TokenBudget:
+        """
+        Retorna o orçamento do ponto de chamada, ou o orçamento padrão.
+        """
+        return self.budgets.get(call_site, self.default_budget)
+
+    def get_prompt_limit(self, call_site: str | None) -> int:
+        """
+        Retorna o limite efetivo de tokens do prompt para o ponto de chamada,
+        considerando o orçamento e o espaço reservado para a resposta.
+        """
+        budget = self.get_budget(call_site)
+        return min(
+            budget.max_prompt_tokens,
+            self.context_window - budget.max_output_tokens,
+        )
+
+    def guard(self, messages: List[Any], call_site: str | None = None) -> List[Any]:
+        """
+        Aplica o orçamento de tokens às mensagens de uma chamada.
+
+        Args:
+            messages: Mensagens da chamada (strings ou BaseMessage)
+            call_site: Identificador do ponto de chamada
+
+        Returns:
+            List[Any]: Mensagens que cabem no orçamento
+
+        Raises:
+            ContextOverflowError: Se a estratégia for SPLIT e o prompt exceder o limite
+        """
+        budget = self.get_budget(call_site)
+        limit = self.get_prompt_limit(call_site)
+        site = call_site or "default"
+
+        prompt_tokens = count_message_tokens(messages)
+        metrics.observe("llm.prompt_tokens", prompt_tokens, call_site=site)
+
+        if prompt_tokens <= limit:
+            return messages
+
+        metrics.increment(
+            "llm.prompt_overflow", call_site=site, strategy=budget.strategy.value
+        )
+        logger.warning(
+            "Prompt de %d tokens excede o limite de %d (call_site=%s, estratégia=%s)",
+            prompt_tokens,
+            limit,
+            site,
+            budget.strategy.value,
+        )
+
+        if budget.strategy == OverflowStrategy.SPLIT:
+            raise ContextOverflowError(call_site, prompt_tokens, limit)
+
+        if budget.strategy == OverflowStrategy.COMPACT:
+            messages = [
+                _replace_text(message, compact_text(message_text(message)))
+                for message in messages
+            ]
+            if count_message_tokens(messages) <= limit:
+                metrics.observe(
+                    "llm.prompt_tokens_after_guard",
+                    count_message_tokens(messages),
+                    call_site=site,
+                )
+                return messages
+
+        messages = truncate_oldest(messages, limit)
+        metrics.observe(
+            "llm.prompt_tokens_after_guard",
+            count_message_tokens(messages),
+            call_site=site,
+        )
+
+        return messages
+
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
+        """
+        Invoca o modelo após aplicar o orçamento de tokens às mensagens.
+        """
+        messages = self.guard(list(messages), call_site)
+        return self.llm_service.invoke(messages, call_site=call_site)
+
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Invoca o modelo em streaming após aplicar o orçamento de tokens às mensagens.
+        """
+        messages = self.guard(list(messages), call_site)
+        yield from self.llm_service.stream(messages, call_site=call_site)
+
+    def invoke_with_structured_output(
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Invoca o modelo com saída estruturada após aplicar o orçamento de tokens.
+        """
+        [prompt] = self.guard([prompt], call_site)
+        return self.llm_service.invoke_with_structured_output(
+            prompt, schema, call_site=call_site
+        )
+
+
+def _replace_text(message: Any, text: str) -> Any:
+    """
+    Retorna uma cópia da mensagem com o novo texto, preservando o tipo.
+    """
+    if isinstance(message, str):
+        return text
+
+    if isinstance(message, BaseMessage):
+        return message.model_copy(update={"content": text})
+
+    return text
+
+
+def compact_text(text: str) -> str:
+    """
+    Compacta um texto removendo indentação, espaços finais e linhas em branco
+    redundantes. O conteúdo de blocos de código (```) é preservado.
+
+    Args:
+        text: Texto a ser compactado
+
+    Returns:
+        str: Texto compactado
+    """
+    lines = []
+    in_code_block = False
+
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code_block = not in_code_block
+            lines.append(line.strip())
+            continue
+
+        lines.append(line.rstrip() if in_code_block else line.strip())
+
+    compacted = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", compacted).strip()
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """
+    Reduz um texto para caber em `max_tokens`, preservando o início
+    (instruções) e o final (conteúdo mais recente) e removendo o trecho central.
+
+    Args:
+        text: Texto a ser truncado
+        max_tokens: Quantidade máxima de tokens
+
+    Returns:
+        str: Texto truncado
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+
+    # Mantém a mesma proporção de caracteres por token do texto original
+    max_chars = max(0, int(len(text) * max_tokens / tokens) - len(TRUNCATION_MARKER))
+    head_chars = max_chars // 2
+    tail_chars = max_chars - head_chars
+
+    return text[:head_chars] + TRUNCATION_MARKER + text[len(text) - tail_chars :]
+
+
+def truncate_oldest(messages: List[Any], limit: int) -> List[Any]:
+    """
+    Remove as mensagens mais antigas até que o prompt caiba no limite,
+    preservando a primeira (sistema) e a última mensagem. Se ainda assim
+    o prompt exceder o limite, trunca o trecho central da maior mensagem.
+
+    Args:
+        messages: Mensagens da chamada
+        limit: Limite de tokens do prompt
+
+    Returns:
+        List[Any]: Mensagens que cabem no limite
+    """
+    messages = list(messages)
+
+    while len(messages) > 2 and count_message_tokens(messages) > limit:
+        del messages[1]
+
+    while (excess := count_message_tokens(messages) - limit) > 0:
+        largest = max(
+            range(len(messages)),
+            key=lambda i: estimate_tokens(message_text(messages[i])),
+        )
+        text = message_text(messages[largest])
+        target = estimate_tokens(text) - excess
+        truncated = truncate_text(text, target) if target > 0 else ""
+
+        if target <= 0 or estimate_tokens(truncated) >= estimate_tokens(text):
+            messages[largest] = _replace_text(messages[largest], "")
+            break
+
+        messages[largest] = _replace_text(messages[largest], truncated)
+
+    return messages
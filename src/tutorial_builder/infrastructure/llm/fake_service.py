@@ -0,0 +1,134 @@
+import time
+
+from typing import Callable, Iterator, List, Any, Dict
+from langchain_core.messages import BaseMessage
+
+from domain.interfaces.llm_service import LLMService
+
+from .token_counter import estimate_tokens, message_text
+
+
+def echo_responder(prompt: str, call_site: str | None) -> str:
+    """
+    Responde repetindo o prompt recebido.
+    """
+    return prompt
+
+
+def schema_responder(
+    prompt: str, schema: Dict[str, Any], call_site: str | None
+) -> Dict[str, Any]:
+    """
+    Responde com um objeto que satisfaz o schema de forma trivial.
+    """
+    defaults = {
+        "string": "",
+        "integer": 0,
+        "number": 0.0,
+        "boolean": False,
+        "array": [],
+        "object": {},
+    }
+
+    return {
+        name: defaults.get(prop.get("type"), None)
+        for name, prop in schema.get("properties", {}).items()
+    }
+
+
+class FakeLLMService(LLMService):
+    """
+    LLMService determinístico e local, usado em benchmarks e testes de carga.
+
+    Simula a latência de um modelo real (latência fixa por chamada mais um
+    custo por token de saída) e o limite máximo de tokens de saída, truncando
+    a resposta quando o limite é atingido.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str, str | None], str] = echo_responder,
+        structured_responder: Callable[
+            [str, Dict[str, Any], str | None], Dict[str, Any]
+        ] = schema_responder,
+        latency: float = 0.0,
+        latency_per_token: float = 0.0,
+        max_output_tokens: int | None = None,
+        stream_chunk_size: int = 16,
+    ):
+        """
+        Args:
+            responder: Função que gera a resposta de texto a partir do prompt
+            structured_responder: Função que gera a resposta estruturada
+            latency: Latência fixa por chamada, em segundos
+            latency_per_token: Latência por token de saída, em segundos
+            max_output_tokens: Limite de tokens de saída (None para ilimitado)
+            stream_chunk_size: Tamanho, em caracteres, das partes do streaming
+        """
+        self.responder = responder
+        self.structured_responder = structured_responder
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.max_output_tokens = max_output_tokens
+        self.stream_chunk_size = stream_chunk_size
+        self.calls: List[str | None] = []
+
+    def _limit_output(self, text: str) -> str:
+        if self.max_output_tokens is None:
+            return text
+
+        tokens = estimate_tokens(text)
+        if tokens <= self.max_output_tokens:
+            return text
+
+        return text[: int(len(text) * self.max_output_tokens / tokens)]
+
+    def _wait(self, output: str) -> None:
+        delay = self.latency + self.latency_per_token * estimate_tokens(output)
+        if delay > 0:
+            time.sleep(delay)
+
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
+        """
+        Gera uma resposta local a partir das mensagens.
+        """
+        self.calls.append(call_site)
+
+        prompt = "\n".join(message_text(message) for message in messages)
+        output = self._limit_output(self.responder(prompt, call_site))
+        self._wait(output)
+
+        return output
+
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Gera uma resposta local em partes, distribuindo a latência entre elas.
+        """
+        self.calls.append(call_site)
+
+        prompt = "\n".join(message_text(message) for message in messages)
+        output = self._limit_output(self.responder(prompt, call_site))
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        for start in range(0, len(output), self.stream_chunk_size):
+            chunk = output[start : start + self.stream_chunk_size]
+            if self.latency_per_token > 0:
+                time.sleep(self.latency_per_token * estimate_tokens(chunk))
+            yield chunk
+
+    def invoke_with_structured_output(
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Gera uma resposta estruturada local a partir do prompt.
+        """
+        self.calls.append(call_site)
+
+        output = self.structured_responder(prompt, schema, call_site)
+        self._wait(str(output))
+
+        return output
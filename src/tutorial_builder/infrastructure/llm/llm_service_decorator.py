@@ -0,0 +1,39 @@
+from typing import Iterator, List, Any, Dict
+from langchain_core.messages import BaseMessage
+from domain.interfaces.llm_service import LLMService
+
+
+class LLMServiceDecorator(LLMService):
+    """
+    Base para serviços que envolvem outro LLMService e adicionam comportamento
+    (guarda de contexto, cache, métricas etc).
+
+    Por padrão, todas as chamadas são repassadas para o serviço envolvido.
+    """
+
+    def __init__(self, llm_service: LLMService):
+        self.llm_service = llm_service
+
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
+        """
+        Repassa a chamada para o serviço envolvido.
+        """
+        return self.llm_service.invoke(messages, call_site=call_site)
+
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Repassa a chamada em streaming para o serviço envolvido.
+        """
+        yield from self.llm_service.stream(messages, call_site=call_site)
+
+    def invoke_with_structured_output(
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Repassa a chamada estruturada para o serviço envolvido.
+        """
+        return self.llm_service.invoke_with_structured_output(
+            prompt, schema, call_site=call_site
+        )
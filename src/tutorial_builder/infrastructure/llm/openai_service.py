@@ -1,7 +1,20 @@
-from typing import List, Any, Dict
-from langchain_core.messages import BaseMessage
+import json
+import logging
+
+from typing import Iterator, List, Any, Dict
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_openai import ChatOpenAI
-from domain.interfaces.llm_service import LLMService
+from domain.interfaces.llm_service import LLMService, StructuredOutputError
+from monitoring import metrics
+
+
+logger = logging.getLogger(__name__)
+
+CONTINUATION_PROMPT = """
+Sua resposta anterior foi interrompida por atingir o limite de tamanho.
+Continue EXATAMENTE do ponto onde parou, sem repetir nenhum trecho já escrito
+e sem adicionar introduções, comentários ou avisos.
+"""
 
 
 class OpenAIService(LLMService):
@@ -9,24 +22,91 @@ class OpenAIService(LLMService):
     Implementação do serviço LLM usando OpenAI.
     """
 
-    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.0):
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.0,
+        max_continuations: int = 3,
+    ):
+        """
+        Args:
+            model: Nome do modelo da OpenAI
+            temperature: Temperatura de amostragem
+            max_continuations: Máximo de chamadas de continuação quando a resposta
+                é truncada pelo limite de tokens de saída (0 desativa)
+        """
         self.model = ChatOpenAI(model=model, temperature=temperature)
+        self.max_continuations = max_continuations
 
-    def invoke(self, messages: List[BaseMessage]) -> str:
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
         """
         Invoca o modelo de linguagem com as mensagens fornecidas.
 
+        Se a resposta for interrompida pelo limite de tokens de saída
+        (`finish_reason == "length"`), novas chamadas pedem ao modelo que
+        continue o texto, até `max_continuations` vezes, e as partes são unidas.
+
         Args:
             messages: Lista de mensagens para o modelo
+            call_site: Identificador do ponto de chamada
 
         Returns:
             str: A resposta do modelo
         """
+        site = call_site or "default"
+        messages = list(messages)
+
         response = self.model.invoke(messages)
-        return response.content
+        text = response.content
+        rounds = 0
+
+        while is_truncated(response) and rounds < self.max_continuations:
+            rounds += 1
+            metrics.increment("llm.continuations", call_site=site)
+            logger.info(
+                "Resposta truncada (call_site=%s), continuação %d de %d",
+                site,
+                rounds,
+                self.max_continuations,
+            )
+
+            messages += [
+                AIMessage(content=response.content),
+                HumanMessage(content=CONTINUATION_PROMPT),
+            ]
+            response = self.model.invoke(messages)
+            text = stitch_continuation(text, response.content)
+
+        if is_truncated(response):
+            metrics.increment("llm.truncated_responses", call_site=site)
+            logger.warning(
+                "Resposta ainda truncada após %d continuações (call_site=%s)",
+                rounds,
+                site,
+            )
+
+        return text
+
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Invoca o modelo de linguagem devolvendo a resposta em partes,
+        à medida que os tokens são gerados.
+
+        Args:
+            messages: Lista de mensagens para o modelo
+            call_site: Identificador do ponto de chamada
+
+        Returns:
+            Iterator[str]: Partes da resposta do modelo
+        """
+        for chunk in self.model.stream(messages):
+            if chunk.content:
+                yield chunk.content
 
     def invoke_with_structured_output(
-        self, prompt: str, schema: Dict[str, Any]
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
     ) -> Dict[str, Any]:
         """
         Invoca o modelo de linguagem com saída estruturada.
@@ -34,9 +114,68 @@ class OpenAIService(LLMService):
         Args:
             prompt: O prompt para o modelo
             schema: O schema esperado para a saída
+            call_site: Identificador do ponto de chamada
 
         Returns:
             Dict[str, Any]: A resposta estruturada do modelo
+
+        Raises:
+            StructuredOutputError: Se a resposta não puder ser decodificada,
+                com o texto bruto para reparo local
         """
-        structured_llm = self.model.with_structured_output(schema)
-        return structured_llm.invoke(prompt)
+        structured_llm = self.model.with_structured_output(schema, include_raw=True)
+        result = structured_llm.invoke(prompt)
+
+        if result.get("parsing_error") is None and result.get("parsed") is not None:
+            return result["parsed"]
+
+        raise StructuredOutputError(
+            raw_structured_output(result["raw"]), str(result.get("parsing_error"))
+        )
+
+
+def raw_structured_output(response: BaseMessage) -> str:
+    """
+    Extrai o texto bruto (argumentos da função ou conteúdo) de uma resposta
+    estruturada que não pôde ser decodificada.
+    """
+    if invalid_calls := getattr(response, "invalid_tool_calls", None):
+        return invalid_calls[0].get("args") or ""
+
+    if tool_calls := getattr(response, "tool_calls", None):
+        return json.dumps(tool_calls[0].get("args"), ensure_ascii=False)
+
+    return response.content if isinstance(response.content, str) else ""
+
+
+def is_truncated(response: BaseMessage) -> bool:
+    """
+    Verifica, pelos metadados da resposta, se ela foi interrompida pelo
+    limite de tokens de saída.
+    """
+    metadata = getattr(response, "response_metadata", None) or {}
+    return metadata.get("finish_reason") == "length"
+
+
+def stitch_continuation(
+    text: str, continuation: str, min_overlap: int = 16, max_overlap: int = 500
+) -> str:
+    """
+    Une o texto já gerado com a sua continuação, removendo o trecho inicial
+    da continuação que eventualmente repita o final do texto.
+
+    Args:
+        text: Texto gerado até o momento
+        continuation: Continuação gerada pelo modelo
+        min_overlap: Tamanho mínimo, em caracteres, para considerar repetição
+        max_overlap: Tamanho máximo, em caracteres, da sobreposição verificada
+
+    Returns:
+        str: O texto completo
+    """
+    longest = min(len(text), len(continuation), max_overlap)
+    for size in range(longest, min_overlap - 1, -1):
+        if text.endswith(continuation[:size]):
+            return text + continuation[size:]
+
+    return text + continuation
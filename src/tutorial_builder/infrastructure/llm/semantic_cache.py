@@ -0,0 +1,585 @@
+import copy
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List
+
+import numpy as np
+
+from pydantic import BaseModel, ConfigDict, Field
+from langchain_core.messages import BaseMessage
+
+from domain.interfaces.llm_service import LLMService
+from domain.text import char_trigrams, fold
+from monitoring import metrics
+
+from .llm_service_decorator import LLMServiceDecorator
+from .token_counter import message_text
+
+logger = logging.getLogger(__name__)
+
+WORD = re.compile(r"\w+")
+
+# Palavras ignoradas na comparação: não mudam o significado do pedido
+STOPWORDS = {
+    "a", "o", "as", "os", "um", "uma", "de", "da", "do", "das", "dos", "em",
+    "no", "na", "nos", "nas", "para", "pra", "pro", "com", "e", "ou", "por",
+    "que", "the", "an", "of", "for", "to", "in", "on", "with", "and", "or",
+}  # fmt: skip
+
+# Termos equivalentes, normalizados para a mesma forma antes da comparação
+SYNONYMS = {
+    "beginner": "iniciante",
+    "basico": "iniciante",
+    "intermediate": "intermediario",
+    "advanced": "avancado",
+    "avancada": "avancado",
+}
+
+# Respostas que indicam campo não informado (ver EMPTY_ANSWERS no ExpertService)
+EMPTY_VALUES = {"na", "n a", "nenhuma", "nenhum", "nao", "none"}
+
+# Um número primo maior que 2^32, para o hashing universal do MinHash
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+class SemanticCachePolicy(BaseModel):
+    """
+    Política do cache semântico para um ponto de chamada do LLM
+
+    Attributes:
+        threshold (float): Similaridade mínima (Jaccard, em cada campo) para reaproveitar uma resposta
+        key_pattern (str | None): Regex (multilinha) cujo grupo 1 extrai os campos comparados; sem ela, o prompt inteiro é comparado
+        max_entries (int): Máximo de respostas guardadas para o ponto de chamada
+        ttl_seconds (float | None): Tempo de vida das respostas guardadas
+        audit_rate (float): Fração dos acertos conferidos com uma nova chamada ao LLM
+        audit_min_similarity (float): Similaridade mínima entre as respostas para o acerto ser considerado correto
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    threshold: float = Field(
+        default=0.85, gt=0, le=1, description="Similaridade mínima por campo"
+    )
+    key_pattern: str | None = Field(
+        default=None, description="Regex cujo grupo 1 extrai os campos comparados"
+    )
+    max_entries: int = Field(default=1_000, gt=0, description="Máximo de respostas")
+    ttl_seconds: float | None = Field(
+        default=None, gt=0, description="Tempo de vida das respostas"
+    )
+    audit_rate: float = Field(
+        default=0.0, ge=0, le=1, description="Fração dos acertos auditados"
+    )
+    audit_min_similarity: float = Field(
+        default=0.3, ge=0, le=1, description="Similaridade mínima entre respostas"
+    )
+
+
+class SemanticCacheAudit(BaseModel):
+    """
+    Resultado da auditoria de um acerto do cache semântico: a resposta
+    guardada é comparada com uma nova resposta do LLM para o mesmo prompt.
+
+    Attributes:
+        call_site (str): Ponto de chamada
+        fields (List[str]): Campos do prompt atual
+        cached_fields (List[str]): Campos do prompt da resposta guardada
+        similarity (float): Similaridade entre os prompts
+        response_similarity (float): Similaridade entre as respostas
+        false_hit (bool): Se o acerto foi considerado incorreto
+        created_at (datetime): Data da auditoria
+    """
+
+    call_site: str
+    fields: List[str]
+    cached_fields: List[str]
+    similarity: float
+    response_similarity: float
+    false_hit: bool
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza um texto para comparação: minúsculas, sem acentos,
+    sem stopwords e com sinônimos unificados.
+
+    Args:
+        text: Texto de entrada
+
+    Returns:
+        str: Palavras normalizadas separadas por espaço
+    """
+    text = fold(text)
+
+    if " ".join(WORD.findall(text)) in EMPTY_VALUES:
+        return ""
+
+    words = [SYNONYMS.get(word, word) for word in WORD.findall(text)]
+    return " ".join(word for word in words if word and word not in STOPWORDS)
+
+
+def shingles(text: str) -> set[str]:
+    """
+    Conjunto de palavras e trigramas de caracteres de um texto normalizado;
+    os trigramas toleram variações como plural e erros de digitação.
+
+    Args:
+        text: Texto normalizado (ver normalize_text)
+
+    Returns:
+        set[str]: Shingles do texto
+    """
+    result = set()
+    for word in text.split():
+        result.add(word)
+        result.update(char_trigrams(word))
+
+    return result
+
+
+def jaccard(first: set[str], second: set[str]) -> float:
+    """
+    Similaridade de Jaccard entre dois conjuntos (1.0 se ambos forem vazios)
+    """
+    if not first and not second:
+        return 1.0
+
+    return len(first & second) / len(first | second)
+
+
+class MinHashLSH:
+    """
+    Índice MinHash com LSH por bandas: cada conjunto é resumido em uma
+    assinatura de `bands * rows` mínimos de hashes, e conjuntos com alguma
+    banda idêntica são candidatos a similares. Com 16 bandas de 4 linhas,
+    conjuntos com Jaccard 0.85 viram candidatos com probabilidade ~100%,
+    e com Jaccard 0.3, com ~12%.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 4, seed: int = 1):
+        """
+        Args:
+            bands: Quantidade de bandas
+            rows: Quantidade de hashes por banda
+            seed: Semente das permutações (fixa, para assinaturas estáveis)
+        """
+        self.bands = bands
+        self.rows = rows
+
+        rng = np.random.default_rng(seed)
+        size = bands * rows
+        self._a = rng.integers(1, MERSENNE_PRIME, size=size, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=size, dtype=np.uint64)
+        self._buckets: Dict[tuple, set] = {}
+
+    def signature(self, features: set[str]) -> np.ndarray:
+        """
+        Calcula a assinatura MinHash de um conjunto de features.
+
+        Args:
+            features: Conjunto de features
+
+        Returns:
+            np.ndarray: Assinatura (uint64) com `bands * rows` valores
+        """
+        if not features:
+            return np.zeros(self.bands * self.rows, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature in features),
+            dtype=np.uint64,
+            count=len(features),
+        )
+
+        # Permutações universais: (a * x + b) mod p, com x < 2^32 e a, b < 2^61.
+        # O produto pode exceder 64 bits; o estouro é aceitável para o hashing
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % np.uint64(MERSENNE_PRIME)
+
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: Any, signature: np.ndarray) -> None:
+        """
+        Adiciona uma chave ao índice
+        """
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Any, signature: np.ndarray) -> None:
+        """
+        Remove uma chave do índice
+        """
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def candidates(self, signature: np.ndarray) -> set:
+        """
+        Retorna as chaves que compartilham alguma banda com a assinatura
+        """
+        result = set()
+        for band_key in self._band_keys(signature):
+            result |= self._buckets.get(band_key, set())
+
+        return result
+
+
+class _Entry(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    scope: str
+    fields: List[str]
+    field_shingles: List[set[str]]
+    signature: np.ndarray
+    response: Any
+    created_at: float
+
+
+class SemanticCacheLLMService(LLMServiceDecorator):
+    """
+    Cache semântico de respostas do LLM: reaproveita a resposta de um prompt
+    anterior quase igual ao atual (ex: "python pra iniciante" e "Python
+    beginner"), por ponto de chamada.
+
+    Apenas os pontos de chamada com uma política (`policies`) usam o cache;
+    os demais são repassados sem alteração. De cada prompt são extraídos os
+    campos comparados (`key_pattern`); o restante do prompt, com os campos
+    removidos, precisa ser idêntico. Os candidatos são encontrados por
+    MinHash/LSH e confirmados pela similaridade de Jaccard de cada campo,
+    que deve atingir o limiar da política.
+
+    Uma fração dos acertos (`audit_rate`) é conferida com uma nova chamada ao
+    LLM; acertos cuja resposta diverge da nova são registrados como falsos
+    acertos em `audits` e na métrica `llm.semantic_cache.audit`.
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        policies: Dict[str, SemanticCachePolicy],
+        max_audits: int = 100,
+        random_source: Callable[[], float] = random.random,
+    ):
+        """
+        Args:
+            llm_service: Serviço LLM que receberá as chamadas
+            policies: Políticas por ponto de chamada (call_site) que usam o cache
+            max_audits: Quantidade de auditorias mantidas em `audits`
+            random_source: Função que sorteia os acertos auditados
+        """
+        super().__init__(llm_service)
+        self.policies = policies
+        self.audits: deque[SemanticCacheAudit] = deque(maxlen=max_audits)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._random = random_source
+        self._patterns = {
+            call_site: re.compile(policy.key_pattern, re.MULTILINE)
+            for call_site, policy in policies.items()
+            if policy.key_pattern
+        }
+        self._lsh = MinHashLSH()
+        self._entries: Dict[str, OrderedDict[int, _Entry]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def hit_rate(self, call_site: str) -> float:
+        """
+        Retorna a taxa de acertos do cache para o ponto de chamada.
+
+        Args:
+            call_site: Identificador do ponto de chamada
+
+        Returns:
+            float: Fração das consultas respondidas pelo cache (0 sem consultas)
+        """
+        stats = self.stats.get(call_site, {})
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        return stats.get("hits", 0) / lookups if lookups else 0.0
+
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
+        """
+        Responde pelo cache quando possível; caso contrário, repassa a chamada.
+        """
+        return self._cached(
+            "invoke",
+            [message_text(message) for message in messages],
+            call_site,
+            lambda: self.llm_service.invoke(messages, call_site=call_site),
+        )
+
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Responde pelo cache em uma única parte quando possível; caso
+        contrário, repassa o streaming e guarda a resposta completa.
+        """
+        if call_site not in self.policies:
+            yield from self.llm_service.stream(messages, call_site=call_site)
+            return
+
+        texts = [message_text(message) for message in messages]
+        key = self._key("invoke", texts, call_site)
+
+        entry = self._lookup(key, call_site)
+        if entry is not None and not self._should_audit(call_site):
+            yield entry.response
+            return
+
+        chunks = []
+        for chunk in self.llm_service.stream(messages, call_site=call_site):
+            chunks.append(chunk)
+            yield chunk
+
+        response = "".join(chunks)
+        if entry is not None:
+            self._record_audit(key, entry, call_site, response)
+
+        self._store(key, call_site, response)
+
+    def invoke_with_structured_output(
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Responde pelo cache quando possível; caso contrário, repassa a chamada.
+        """
+        return self._cached(
+            "structured:" + json.dumps(schema, sort_keys=True),
+            [prompt],
+            call_site,
+            lambda: self.llm_service.invoke_with_structured_output(
+                prompt, schema, call_site=call_site
+            ),
+        )
+
+    def _cached(
+        self, kind: str, texts: List[str], call_site: str | None, call: Callable
+    ) -> Any:
+        if call_site not in self.policies:
+            return call()
+
+        key = self._key(kind, texts, call_site)
+
+        entry = self._lookup(key, call_site)
+        if entry is not None and not self._should_audit(call_site):
+            return copy.deepcopy(entry.response)
+
+        response = call()
+        if entry is not None:
+            self._record_audit(key, entry, call_site, response)
+
+        self._store(key, call_site, response)
+        return copy.deepcopy(response)
+
+    def _key(self, kind: str, texts: List[str], call_site: str) -> tuple:
+        """
+        Separa o prompt em escopo (o que precisa ser idêntico) e campos
+        comparados por similaridade.
+        """
+        text = "\n".join(texts)
+        pattern = self._patterns.get(call_site)
+        if pattern is None:
+            fields, template = [text], ""
+        else:
+            fields = [match.group(1) for match in pattern.finditer(text)]
+            template = pattern.sub("\x00", text)
+
+            # Os campos também podem aparecer fora das linhas extraídas
+            # (ex: "Você é um especialista {assunto}")
+            for value in sorted(set(fields), key=len, reverse=True):
+                if value.strip():
+                    template = re.sub(
+                        rf"(?<!\w){re.escape(value)}(?!\w)", "\x00", template
+                    )
+
+        scope = hashlib.sha1(f"{kind}\x01{template}".encode("utf-8")).hexdigest()
+        normalized = [normalize_text(field) for field in fields]
+        return scope, fields, [shingles(field) for field in normalized]
+
+    def _lookup(self, key: tuple, call_site: str) -> _Entry | None:
+        scope, fields, field_shingles = key
+        policy = self.policies[call_site]
+        signature = self._signature(field_shingles)
+
+        with self._lock:
+            entries = self._entries.setdefault(call_site, OrderedDict())
+            best, best_similarity = None, 0.0
+
+            for entry_id in self._lsh.candidates(signature):
+                entry = entries.get(entry_id)
+                if entry is None or entry.scope != scope:
+                    continue
+
+                if self._expired(entry, policy):
+                    self._remove(call_site, entry_id)
+                    continue
+
+                similarity = _similarity(field_shingles, entry.field_shingles)
+                if similarity >= policy.threshold and similarity > best_similarity:
+                    best, best_similarity = entry_id, similarity
+
+            stats = self.stats.setdefault(
+                call_site, {"hits": 0, "misses": 0, "audits": 0, "false_hits": 0}
+            )
+            stats["hits" if best is not None else "misses"] += 1
+
+            # Lida sob o lock: outra thread pode removê-la em seguida
+            hit = entries[best] if best is not None else None
+            if hit is not None:
+                entries.move_to_end(best)
+
+        metrics.increment(
+            "llm.semantic_cache",
+            call_site=call_site,
+            result="hit" if best is not None else "miss",
+        )
+
+        if hit is None:
+            return None
+
+        metrics.observe(
+            "llm.semantic_cache.similarity", best_similarity, call_site=call_site
+        )
+        logger.info(
+            "Cache semântico (%s): %s reaproveita %s (similaridade %.2f)",
+            call_site,
+            fields,
+            hit.fields,
+            best_similarity,
+        )
+        return hit
+
+    def _should_audit(self, call_site: str) -> bool:
+        """
+        Sorteia se um acerto deve ser auditado: nesse caso, a resposta
+        guardada é ignorada e comparada com a nova resposta do LLM.
+        """
+        audit_rate = self.policies[call_site].audit_rate
+        return audit_rate > 0 and self._random() < audit_rate
+
+    def _record_audit(
+        self, key: tuple, entry: _Entry, call_site: str, response: Any
+    ) -> None:
+        _, fields, field_shingles = key
+        policy = self.policies[call_site]
+        response_similarity = jaccard(
+            shingles(normalize_text(_response_text(response))),
+            shingles(normalize_text(_response_text(entry.response))),
+        )
+        false_hit = response_similarity < policy.audit_min_similarity
+
+        audit = SemanticCacheAudit(
+            call_site=call_site,
+            fields=fields,
+            cached_fields=entry.fields,
+            similarity=_similarity(field_shingles, entry.field_shingles),
+            response_similarity=response_similarity,
+            false_hit=false_hit,
+        )
+
+        with self._lock:
+            self.audits.append(audit)
+            self.stats[call_site]["audits"] += 1
+            self.stats[call_site]["false_hits"] += int(false_hit)
+
+        metrics.increment(
+            "llm.semantic_cache.audit",
+            call_site=call_site,
+            result="false_hit" if false_hit else "ok",
+        )
+        if false_hit:
+            logger.warning(
+                "Cache semântico (%s): falso acerto entre %s e %s "
+                "(similaridade das respostas %.2f)",
+                call_site,
+                fields,
+                entry.fields,
+                response_similarity,
+            )
+
+    def _store(self, key: tuple, call_site: str, response: Any) -> None:
+        scope, fields, field_shingles = key
+
+        entry = _Entry(
+            scope=scope,
+            fields=fields,
+            field_shingles=field_shingles,
+            signature=self._signature(field_shingles),
+            response=copy.deepcopy(response),
+            created_at=time.monotonic(),
+        )
+
+        with self._lock:
+            entries = self._entries.setdefault(call_site, OrderedDict())
+
+            # Um prompt com os mesmos campos substitui a resposta anterior
+            for entry_id, other in list(entries.items()):
+                if other.scope == scope and other.fields == fields:
+                    self._remove(call_site, entry_id)
+
+            entry_id = self._next_id
+            self._next_id += 1
+            entries[entry_id] = entry
+            self._lsh.add(entry_id, entry.signature)
+
+            while len(entries) > self.policies[call_site].max_entries:
+                self._remove(call_site, next(iter(entries)))
+
+    def _remove(self, call_site: str, entry_id: int) -> None:
+        entry = self._entries[call_site].pop(entry_id)
+        self._lsh.remove(entry_id, entry.signature)
+
+    def _signature(self, field_shingles: List[set[str]]) -> np.ndarray:
+        # Cada shingle é marcado com o índice do campo: "python" no assunto
+        # e "python" no ambiente são features diferentes
+        return self._lsh.signature(
+            {
+                f"{index}:{shingle}"
+                for index, shingles_ in enumerate(field_shingles)
+                for shingle in shingles_
+            }
+        )
+
+    @staticmethod
+    def _expired(entry: _Entry, policy: SemanticCachePolicy) -> bool:
+        return (
+            policy.ttl_seconds is not None
+            and time.monotonic() - entry.created_at > policy.ttl_seconds
+        )
+
+
+def _similarity(first: List[set[str]], second: List[set[str]]) -> float:
+    """
+    Similaridade entre dois prompts: a menor similaridade entre seus campos,
+    para que um único campo diferente (ex: o assunto) impeça o acerto.
+    """
+    if len(first) != len(second):
+        return 0.0
+
+    return min((jaccard(a, b) for a, b in zip(first, second)), default=1.0)
+
+
+def _response_text(response: Any) -> str:
+    if isinstance(response, str):
+        return response
+
+    return json.dumps(response, ensure_ascii=False, sort_keys=True)
@@ -0,0 +1,249 @@
+import copy
+import hashlib
+import json
+import logging
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List
+from langchain_core.messages import BaseMessage
+
+from domain.interfaces.llm_service import LLMService
+from monitoring import metrics
+
+from .llm_service_decorator import LLMServiceDecorator
+from .token_counter import message_text
+
+logger = logging.getLogger(__name__)
+
+
+class _Stream:
+    """
+    Resposta em streaming compartilhada: as partes recebidas do serviço
+    envolvido ficam em um buffer, que cada consumidor percorre no seu ritmo.
+
+    Quando o último consumidor para de ler (ex: a execução foi cancelada), o
+    streaming é abandonado: a leitura do serviço envolvido é interrompida na
+    parte seguinte e o gerador dele é fechado, encerrando a requisição.
+    """
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.abandoned = False
+        self.consumers = 1
+        self.error: BaseException | None = None
+        self.condition = threading.Condition()
+
+    def join(self) -> bool:
+        """
+        Registra mais um consumidor, se o streaming ainda não foi abandonado
+        """
+        with self.condition:
+            if self.abandoned:
+                return False
+            self.consumers += 1
+            return True
+
+    def leave(self) -> None:
+        """
+        Remove um consumidor; sem consumidores, o streaming é abandonado
+        """
+        with self.condition:
+            self.consumers -= 1
+            if self.consumers == 0 and not self.done:
+                self.abandoned = True
+
+    def feed(self, chunks: Iterator[str]) -> None:
+        try:
+            for chunk in chunks:
+                with self.condition:
+                    if self.abandoned:
+                        logger.info("Streaming abandonado por todos os consumidores")
+                        break
+                    self.chunks.append(chunk)
+                    self.condition.notify_all()
+        except BaseException as e:
+            self.error = e
+        finally:
+            chunks.close()
+            with self.condition:
+                self.done = True
+                self.condition.notify_all()
+
+    def read(self) -> Iterator[str]:
+        position = 0
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: position < len(self.chunks) or self.done
+                )
+                chunks = self.chunks[position:]
+                done = self.done
+
+            position += len(chunks)
+            yield from chunks
+
+            if done and position >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class SingleFlightLLMService(LLMServiceDecorator):
+    """
+    Agrupa chamadas idênticas em andamento (single-flight): enquanto uma
+    chamada com a mesma chave (tipo de chamada, ponto de chamada, mensagens
+    e schema) está em andamento, as chamadas seguintes aguardam o resultado
+    dela em vez de chamar o serviço envolvido. Erros também são repassados
+    a todas as chamadas agrupadas.
+
+    Diferente de um cache, nada é guardado após o término da chamada: o
+    agrupamento cobre apenas o intervalo em que o primeiro resultado ainda
+    não existe (ex: várias sessões iniciando o mesmo tutorial ao mesmo tempo).
+
+    No streaming, as partes são lidas do serviço envolvido em uma thread
+    própria e repassadas a todos os consumidores, inclusive ao primeiro,
+    para que um consumidor que pare de ler não interrompa os demais. Quando
+    nenhum consumidor resta, a requisição ao serviço envolvido é encerrada.
+    """
+
+    def __init__(self, llm_service: LLMService, max_stream_workers: int = 16):
+        """
+        Args:
+            llm_service: Serviço LLM que receberá as chamadas
+            max_stream_workers: Máximo de streamings lidos simultaneamente
+        """
+        super().__init__(llm_service)
+        self.stats = {"calls": 0, "coalesced": 0}
+        self._flights: Dict[str, Future | _Stream] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_stream_workers, thread_name_prefix="single-flight"
+        )
+
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
+        """
+        Repassa a chamada, ou aguarda uma chamada idêntica em andamento.
+        """
+        return self._call(
+            _request_key("invoke", messages, call_site),
+            call_site,
+            lambda: self.llm_service.invoke(messages, call_site=call_site),
+        )
+
+    def stream(
+        self, messages: List[BaseMessage], call_site: str | None = None
+    ) -> Iterator[str]:
+        """
+        Repassa o streaming, ou acompanha um streaming idêntico em andamento.
+        """
+        key = _request_key("stream", messages, call_site)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None or not flight.join()
+            if leader:
+                flight = self._flights[key] = _Stream()
+
+        self._record(call_site, leader)
+
+        if leader:
+            self._executor.submit(self._feed, key, flight, messages, call_site)
+
+        try:
+            yield from flight.read()
+        finally:
+            flight.leave()
+
+    def invoke_with_structured_output(
+        self, prompt: str, schema: Dict[str, Any], call_site: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Repassa a chamada, ou aguarda uma chamada idêntica em andamento.
+        """
+        result = self._call(
+            _request_key("structured", [prompt], call_site, schema),
+            call_site,
+            lambda: self.llm_service.invoke_with_structured_output(
+                prompt, schema, call_site=call_site
+            ),
+        )
+
+        # Cada chamador recebe sua própria cópia, pois o resultado é mutável
+        return copy.deepcopy(result)
+
+    def _call(self, key: str, call_site: str | None, call: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+
+        self._record(call_site, leader)
+
+        if not leader:
+            return flight.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def _feed(
+        self,
+        key: str,
+        flight: _Stream,
+        messages: List[BaseMessage],
+        call_site: str | None,
+    ) -> None:
+        try:
+            flight.feed(self.llm_service.stream(messages, call_site=call_site))
+        finally:
+            # Um streaming abandonado pode já ter sido substituído por outro
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _record(self, call_site: str | None, leader: bool) -> None:
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["coalesced"] += int(not leader)
+
+        metrics.increment(
+            "llm.single_flight",
+            call_site=call_site or "default",
+            result="upstream" if leader else "coalesced",
+        )
+        if not leader:
+            logger.info("Chamada agrupada com outra em andamento (%s)", call_site)
+
+
+def _request_key(
+    kind: str,
+    messages: List[Any],
+    call_site: str | None,
+    schema: Dict[str, Any] | None = None,
+) -> str:
+    """
+    Calcula a chave de uma chamada: chamadas com a mesma chave são idênticas.
+    """
+    payload = json.dumps(
+        [
+            kind,
+            call_site,
+            [[type(message).__name__, message_text(message)] for message in messages],
+            schema,
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
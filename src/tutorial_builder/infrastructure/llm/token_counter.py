@@ -0,0 +1,80 @@
+import math
+import re
+
+from typing import Any, List
+
+# Palavras (incluindo acentuação) ou sinais de pontuação isolados
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# Tokens extras por mensagem (papel e delimitadores do formato de chat)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Tokens reservados para o início da resposta do assistente
+REPLY_OVERHEAD_TOKENS = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estima localmente a quantidade de tokens de um texto, sem chamar a API.
+
+    A estimativa segue o comportamento típico dos tokenizadores BPE:
+    cada palavra consome aproximadamente um token a cada 4 caracteres,
+    cada sinal de pontuação consome um token e quebras de linha também
+    são contadas. O resultado tende a ser levemente conservador.
+
+    Args:
+        text: Texto a ser estimado
+
+    Returns:
+        int: Quantidade estimada de tokens
+    """
+    if not text:
+        return 0
+
+    tokens = 0
+    for piece in _PIECE_PATTERN.findall(text):
+        if piece[0].isalnum() or piece[0] == "_":
+            tokens += math.ceil(len(piece) / 4)
+        else:
+            tokens += 1
+
+    return tokens + text.count("\n")
+
+
+def message_text(message: Any) -> str:
+    """
+    Extrai o texto de uma mensagem (string ou BaseMessage).
+
+    Args:
+        message: Mensagem no formato aceito pelo LLMService
+
+    Returns:
+        str: O conteúdo textual da mensagem
+    """
+    if isinstance(message, str):
+        return message
+
+    content = getattr(message, "content", message)
+    if isinstance(content, str):
+        return content
+
+    return str(content)
+
+
+def count_message_tokens(messages: List[Any]) -> int:
+    """
+    Estima a quantidade de tokens do prompt de uma chamada de chat.
+
+    Args:
+        messages: Lista de mensagens (strings ou BaseMessage)
+
+    Returns:
+        int: Quantidade estimada de tokens do prompt
+    """
+    return (
+        sum(
+            estimate_tokens(message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+            for message in messages
+        )
+        + REPLY_OVERHEAD_TOKENS
+    )
@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Iterator, List
+from langchain_core.messages import BaseMessage
+
+from domain.interfaces.llm_service import LLMService
+
+from .llm_service_decorator import LLMServiceDecorator
+
+# Recebe o ponto de chamada e cada parte da resposta
+TokenSink = Callable[[str, str], None]
+
+_token_sink: ContextVar[TokenSink | None] = ContextVar("token_sink", default=None)
+
+
+@contextmanager
+def token_stream_scope(sink: TokenSink) -> Iterator[TokenSink]:
+    """
+    Associa ao contexto atual a função que recebe as partes das respostas do
+    LLM (ver TokenStreamingLLMService) à medida que são geradas.
+
+    Args:
+        sink: Função chamada com o ponto de chamada e cada parte da resposta
+    """
+    reset = _token_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _token_sink.reset(reset)
+
+
+class TokenStreamingLLMService(LLMServiceDecorator):
+    """
+    Publica as respostas do LLM parte a parte, para quem estiver acompanhando
+    a execução (ex: a API, por server-sent events), sem mudar o contrato de
+    `invoke`: dentro de um `token_stream_scope`, as chamadas dos pontos
+    configurados são feitas em streaming, cada parte é enviada ao receptor
+    do contexto e a resposta completa é devolvida normalmente.
+
+    Apenas pontos de chamada com respostas curtas devem ser configurados: o
+    streaming não faz as continuações de respostas truncadas do `invoke`.
+    Fora de um escopo, ou em outros pontos, as chamadas são repassadas.
+    """
+
+    def __init__(self, llm_service: LLMService, call_sites: Iterable[str]):
+        """
+        Args:
+            llm_service: Serviço LLM envolvido
+            call_sites: Pontos de chamada cujas respostas são publicadas
+        """
+        super().__init__(llm_service)
+        self.call_sites = frozenset(call_sites)
+
+    def invoke(self, messages: List[BaseMessage], call_site: str | None = None) -> str:
+        """
+        Repassa a chamada, publicando as partes da resposta quando houver um
+        receptor no contexto.
+        """
+        sink = _token_sink.get()
+        if sink is None or call_site not in self.call_sites:
+            return self.llm_service.invoke(messages, call_site=call_site)
+
+        chunks = []
+        for chunk in self.llm_service.stream(messages, call_site=call_site):
+            chunks.append(chunk)
+            sink(call_site, chunk)
+
+        return "".join(chunks)
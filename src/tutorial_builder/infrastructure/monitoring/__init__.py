@@ -0,0 +1,3 @@
+from .metrics import Metrics, metrics
+
+__all__ = ["Metrics", "metrics"]
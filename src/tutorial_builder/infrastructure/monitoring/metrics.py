@@ -0,0 +1,100 @@
+import logging
+import threading
+
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    """
+    Registro simples de métricas em memória (contadores e observações).
+
+    As métricas são identificadas pelo nome e por rótulos opcionais,
+    por exemplo: `metrics.observe("llm.prompt_tokens", 1200, call_site="writer")`.
+    Cada registro também é enviado ao log, para ser coletado externamente.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._observations: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> str:
+        if not labels:
+            return name
+
+        labels_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        return f"{name}{{{labels_str}}}"
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Incrementa um contador.
+
+        Args:
+            name: Nome da métrica
+            value: Valor a ser somado ao contador
+            labels: Rótulos da métrica
+        """
+        key = self._key(name, labels)
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+        logger.info("metric %s += %s", key, value)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Registra uma observação (ex: quantidade de tokens, latência).
+
+        Args:
+            name: Nome da métrica
+            value: Valor observado
+            labels: Rótulos da métrica
+        """
+        key = self._key(name, labels)
+
+        with self._lock:
+            summary = self._observations.setdefault(
+                key, {"count": 0, "sum": 0.0, "min": value, "max": value}
+            )
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+
+        logger.info("metric %s = %s", key, value)
+
+    def get_counter(self, name: str, **labels: Any) -> float:
+        """
+        Retorna o valor atual de um contador.
+        """
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retorna uma cópia de todas as métricas registradas.
+
+        Returns:
+            Dict[str, Any]: Contadores e resumos das observações
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "observations": {
+                    key: dict(summary) for key, summary in self._observations.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """
+        Remove todas as métricas registradas.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+
+
+metrics = Metrics()
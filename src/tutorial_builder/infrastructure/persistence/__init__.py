@@ -1,3 +1,35 @@
+from .blob_store import InMemoryBlobStore, content_digest
+from .compact_codec import CompactSerializer
+from .dedup_saver import DedupMemorySaver
+from .dedup_serializer import DedupSerializer
+from .hydration import hydrate, hydrate_many, validate_many
 from .memory_state import MemoryState
+from .learning_path_library import SQLiteLearningPathLibrary, normalize_key
+from .session_store import InMemorySessionStore, SQLiteSessionStore, initial_state
+from .solution_cache import SQLiteSolutionCache
+from .tutorial_archive import MmapTutorialArchive
+from .text_codec import compress_text, decompress_text, train_dictionary
+from .tutorial_repository import SQLiteTutorialRepository
 
-__all__ = ["MemoryState"]
+__all__ = [
+    "CompactSerializer",
+    "DedupMemorySaver",
+    "DedupSerializer",
+    "InMemoryBlobStore",
+    "InMemorySessionStore",
+    "content_digest",
+    "MemoryState",
+    "MmapTutorialArchive",
+    "SQLiteLearningPathLibrary",
+    "SQLiteSessionStore",
+    "SQLiteSolutionCache",
+    "SQLiteTutorialRepository",
+    "compress_text",
+    "decompress_text",
+    "hydrate",
+    "hydrate_many",
+    "initial_state",
+    "normalize_key",
+    "train_dictionary",
+    "validate_many",
+]
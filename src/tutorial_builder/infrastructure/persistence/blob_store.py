@@ -0,0 +1,114 @@
+import hashlib
+import threading
+
+from typing import Dict, Set
+
+from domain.interfaces import BlobStore
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Calcula o hash que identifica um blob (BLAKE2b de 128 bits, em hexadecimal)
+
+    Args:
+        data: Conteúdo do blob
+
+    Returns:
+        str: Hash do conteúdo
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class InMemoryBlobStore(BlobStore):
+    """
+    Armazenamento endereçado por conteúdo em memória, com o mesmo ciclo de
+    vida do checkpointer em memória (MemorySaver) que o utiliza.
+
+    Cada blob conta os donos (conversas) que o referenciam: quando o último
+    deles é liberado, o blob é descartado.
+    """
+
+    def __init__(self):
+        self._blobs: Dict[str, bytes] = {}
+        self._owners: Dict[str, Set[str]] = {}
+        self._references: Dict[str, int] = {}
+        self._pinned: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    @property
+    def size(self) -> int:
+        """
+        Total de bytes guardados
+        """
+        with self._lock:
+            return sum(len(data) for data in self._blobs.values())
+
+    def put(self, data: bytes, owner: str | None = None) -> str:
+        """
+        Guarda um blob (sem efeito se ele já existir)
+
+        Args:
+            data: Conteúdo do blob
+            owner: Dono que passa a referenciar o blob (ex: a conversa do
+                checkpoint); blobs sem dono nunca são removidos
+
+        Returns:
+            str: Hash do conteúdo, usado para referenciar o blob
+        """
+        digest = content_digest(data)
+
+        with self._lock:
+            self._blobs.setdefault(digest, data)
+
+            if owner is None:
+                self._pinned.add(digest)
+            else:
+                digests = self._owners.setdefault(owner, set())
+                if digest not in digests:
+                    digests.add(digest)
+                    self._references[digest] = self._references.get(digest, 0) + 1
+
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Busca um blob pelo hash
+
+        Args:
+            digest: Hash do conteúdo
+
+        Returns:
+            bytes: Conteúdo do blob
+
+        Raises:
+            KeyError: Se o blob não existir
+        """
+        with self._lock:
+            return self._blobs[digest]
+
+    def release(self, owner: str) -> int:
+        """
+        Remove as referências de um dono e descarta os blobs que não são mais
+        referenciados por nenhum dono
+
+        Args:
+            owner: Dono das referências
+
+        Returns:
+            int: Quantidade de blobs descartados
+        """
+        removed = 0
+
+        with self._lock:
+            for digest in self._owners.pop(owner, ()):
+                self._references[digest] -= 1
+                if self._references[digest] == 0:
+                    del self._references[digest]
+                    if digest not in self._pinned:
+                        del self._blobs[digest]
+                        removed += 1
+
+        return removed
@@ -0,0 +1,293 @@
+import logging
+
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type
+
+import ormsgpack
+
+from pydantic import BaseModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from entities import (
+    Expert,
+    ExpertStep,
+    Planner,
+    StepStatus,
+    TroubleShooting,
+    Writer,
+    WriterMode,
+)
+from entities.expert import DifficultyLevel
+
+from .hydration import hydrate
+
+logger = logging.getLogger(__name__)
+
+# Tipo informado ao checkpointer para os valores codificados por este módulo
+COMPACT_TYPE = "compact"
+
+# Códigos das extensões msgpack
+EXT_ENTITY = 1
+EXT_ENUM = 2
+EXT_DATETIME = 3
+EXT_MESSAGE = 4
+EXT_TUPLE = 5
+
+# Esquemas das entidades: código -> (classe, campos de cada versão).
+# Os valores são gravados como [código, versão, valor1, valor2, ...], na ordem
+# dos campos da versão, sem os nomes. Ao adicionar, remover ou reordenar
+# campos de uma entidade, acrescente uma nova versão ao final da lista (nunca
+# altere as anteriores): dados antigos continuam legíveis, e campos ausentes
+# em versões antigas recebem o valor padrão.
+ENTITY_SCHEMAS: Dict[int, Tuple[Type[BaseModel], List[Tuple[str, ...]]]] = {
+    1: (
+        Planner,
+        [("subject", "level", "project_type", "environment", "instructions")],
+    ),
+    2: (
+        Expert,
+        [
+            (
+                "subject",
+                "difficulty_level",
+                "learning_path",
+                "project_type",
+                "environment",
+                "instructions",
+                "learning_objectives",
+                "prerequisites",
+                "created_at",
+                "last_updated_at",
+            )
+        ],
+    ),
+    3: (
+        ExpertStep,
+        [
+            (
+                "step_number",
+                "title",
+                "description",
+                "prerequisites",
+                "content",
+                "estimated_time",
+                "resources",
+                "trouble_shooting",
+                "feedback",
+                "depends_on",
+                "status",
+                "completed_at",
+            )
+        ],
+    ),
+    4: (TroubleShooting, [("problem", "solution", "reported_at")]),
+    5: (
+        Writer,
+        [
+            (
+                "subject",
+                "difficulty_level",
+                "expert",
+                "title",
+                "tutorial",
+                "keywords",
+                "created_at",
+            )
+        ],
+    ),
+}
+
+ENUMS: Dict[int, Type[Enum]] = {1: StepStatus, 2: DifficultyLevel, 3: WriterMode}
+
+MESSAGES: Dict[int, Type[BaseMessage]] = {
+    1: HumanMessage,
+    2: AIMessage,
+    3: SystemMessage,
+    4: ToolMessage,
+    5: RemoveMessage,
+}
+
+OPTIONS = (
+    ormsgpack.OPT_PASSTHROUGH_DATETIME
+    | ormsgpack.OPT_PASSTHROUGH_ENUM
+    | ormsgpack.OPT_PASSTHROUGH_TUPLE
+    | ormsgpack.OPT_NON_STR_KEYS
+)
+
+_ENTITY_CODES = {cls: code for code, (cls, _) in ENTITY_SCHEMAS.items()}
+_ENUM_CODES = {cls: code for code, cls in ENUMS.items()}
+
+# Campos de cada versão que ainda existem no modelo, calculados uma única vez
+_DECODE_FIELDS = {
+    (code, version): tuple(name for name in fields if name in cls.model_fields)
+    for code, (cls, versions) in ENTITY_SCHEMAS.items()
+    for version, fields in enumerate(versions)
+}
+_MESSAGE_CODES = {cls: code for code, cls in MESSAGES.items()}
+
+
+def _check_schemas() -> None:
+    """
+    Garante que a última versão do esquema de cada entidade tenha todos os
+    campos do modelo, para que nenhum campo seja perdido silenciosamente.
+    """
+    for cls, versions in ENTITY_SCHEMAS.values():
+        missing = set(cls.model_fields) - set(versions[-1])
+        if missing:
+            raise ValueError(
+                f"O esquema compacto de {cls.__name__} não inclui {sorted(missing)}; "
+                "acrescente uma nova versão em ENTITY_SCHEMAS"
+            )
+
+
+_check_schemas()
+
+
+def encode(value: Any) -> bytes:
+    """
+    Codifica um valor em msgpack compacto: entidades (Planner, Expert,
+    Writer...) viram listas de valores na ordem do esquema, sem nomes de
+    campos nem caminhos de classes; mensagens do LangChain guardam apenas os
+    campos diferentes do padrão.
+
+    Args:
+        value: Valor a ser codificado
+
+    Returns:
+        bytes: Valor codificado
+
+    Raises:
+        TypeError: Se o valor contiver um tipo não suportado
+    """
+    try:
+        return ormsgpack.packb(value, default=_default, option=OPTIONS)
+    except ormsgpack.MsgpackEncodeError as e:
+        raise TypeError(str(e)) from e
+
+
+def decode(data: bytes) -> Any:
+    """
+    Decodifica um valor gerado por `encode`.
+
+    Args:
+        data: Valor codificado
+
+    Returns:
+        Any: Valor decodificado
+    """
+    return ormsgpack.unpackb(
+        data, ext_hook=_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+    )
+
+
+def _default(value: Any) -> ormsgpack.Ext:
+    if (code := _ENTITY_CODES.get(type(value))) is not None:
+        _, versions = ENTITY_SCHEMAS[code]
+        fields = versions[-1]
+        row = [code, len(versions) - 1]
+        row.extend(getattr(value, field, None) for field in fields)
+        return ormsgpack.Ext(EXT_ENTITY, encode(row))
+
+    if (code := _ENUM_CODES.get(type(value))) is not None:
+        return ormsgpack.Ext(EXT_ENUM, encode([code, value.value]))
+
+    if isinstance(value, datetime):
+        return ormsgpack.Ext(EXT_DATETIME, value.isoformat().encode("ascii"))
+
+    if (code := _MESSAGE_CODES.get(type(value))) is not None:
+        fields = value.model_dump(exclude_defaults=True)
+        return ormsgpack.Ext(EXT_MESSAGE, encode([code, fields]))
+
+    if isinstance(value, tuple) and not hasattr(value, "_fields"):
+        return ormsgpack.Ext(EXT_TUPLE, encode(list(value)))
+
+    raise TypeError(f"Tipo não suportado: {type(value).__name__}")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_ENTITY:
+        entity_code, version, *values = decode(data)
+        cls, versions = ENTITY_SCHEMAS[entity_code]
+
+        if len(_DECODE_FIELDS[entity_code, version]) == len(versions[version]):
+            return hydrate(cls, dict(zip(versions[version], values)))
+
+        # Versão antiga com campos que não existem mais no modelo
+        return hydrate(
+            cls,
+            {
+                name: value
+                for name, value in zip(versions[version], values)
+                if name in _DECODE_FIELDS[entity_code, version]
+            },
+        )
+
+    if code == EXT_ENUM:
+        return _decode_enum(data)
+
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("ascii"))
+
+    if code == EXT_MESSAGE:
+        message_code, fields = decode(data)
+        return MESSAGES[message_code](**fields)
+
+    if code == EXT_TUPLE:
+        return tuple(decode(data))
+
+    raise ValueError(f"Extensão msgpack desconhecida: {code}")
+
+
+@lru_cache(maxsize=1024)
+def _decode_enum(data: bytes) -> Enum:
+    # Poucos valores distintos, repetidos em cada passo (ex: status)
+    enum_code, value = decode(data)
+    return ENUMS[enum_code](value)
+
+
+class CompactSerializer(SerializerProtocol):
+    """
+    Serializador de checkpoints que usa a codificação compacta (`encode`)
+    para o estado do tutorial. Valores com tipos não suportados (ex: objetos
+    internos do LangGraph) são serializados pelo serializador envolvido.
+    """
+
+    def __init__(self, serde: SerializerProtocol | None = None):
+        """
+        Args:
+            serde: Serializador usado para os valores não suportados
+        """
+        self.serde = serde or JsonPlusSerializer()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        if obj is None or isinstance(obj, (bytes, bytearray)):
+            return self.serde.dumps_typed(obj)
+
+        try:
+            return COMPACT_TYPE, encode(obj)
+        except TypeError as e:
+            logger.debug("Valor serializado sem a codificação compacta: %s", e)
+            return self.serde.dumps_typed(obj)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        if data[0] == COMPACT_TYPE:
+            return decode(data[1])
+
+        return self.serde.loads_typed(data)
@@ -0,0 +1,47 @@
+from typing import Any, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata
+from langgraph.checkpoint.memory import MemorySaver
+
+from .dedup_serializer import DedupSerializer
+
+
+class DedupMemorySaver(MemorySaver):
+    """
+    Checkpointer em memória para o DedupSerializer: os blobs gravados nos
+    checkpoints de uma conversa pertencem a ela, e são descartados quando a
+    conversa é removida (delete_thread) e nenhuma outra os referencia.
+    """
+
+    def __init__(self, serde: DedupSerializer):
+        """
+        Args:
+            serde: Serializador dos checkpoints, com o armazenamento de blobs
+        """
+        super().__init__(serde=serde)
+        self.dedup = serde
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self.dedup.owned_by(config["configurable"]["thread_id"]):
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self.dedup.owned_by(config["configurable"]["thread_id"]):
+            super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self.dedup.blob_store.release(thread_id)
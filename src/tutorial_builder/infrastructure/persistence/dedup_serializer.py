@@ -0,0 +1,190 @@
+import json
+import threading
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from pydantic import BaseModel
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from domain.interfaces import BlobStore
+from monitoring import metrics
+
+# Marca os textos substituídos por referências a blobs
+REF_PREFIX = "\x00blob:"
+
+# Separador dos blocos de um texto: cada parágrafo ou bloco de código vira um
+# blob, para que um passo e a mensagem que o exibe compartilhem os blocos
+PARAGRAPH_SEPARATOR = "\n\n"
+
+
+class DedupSerializer(SerializerProtocol):
+    """
+    Serializador de checkpoints que guarda textos longos em um armazenamento
+    endereçado por conteúdo (BlobStore) e grava no checkpoint apenas as
+    referências (hashes).
+
+    Cada texto longo é dividido em parágrafos; parágrafos longos viram blobs
+    e a lista de partes do texto (hashes e parágrafos curtos) vira outro
+    blob, referenciado no checkpoint por um único hash. Assim, o conteúdo de um passo,
+    a mensagem que o exibe e as escritas de cada nó referenciam os mesmos
+    blobs, e cada checkpoint acrescenta ao armazenamento apenas os blobs
+    novos. O restante do estado é serializado pelo serializador envolvido.
+    """
+
+    def __init__(
+        self,
+        blob_store: BlobStore,
+        serde: SerializerProtocol | None = None,
+        min_text_size: int = 512,
+        min_blob_size: int = 64,
+    ):
+        """
+        Args:
+            blob_store: Armazenamento dos blobs
+            serde: Serializador do restante do estado
+            min_text_size: Tamanho mínimo (caracteres) de um texto para ser dividido
+            min_blob_size: Tamanho mínimo (caracteres) de um parágrafo para virar blob
+        """
+        self.blob_store = blob_store
+        self.serde = serde or JsonPlusSerializer()
+        self.min_text_size = min_text_size
+        self.min_blob_size = min_blob_size
+        self._owner = threading.local()
+
+    @contextmanager
+    def owned_by(self, owner: str) -> Iterator[None]:
+        """
+        Associa os blobs guardados dentro do bloco (na thread atual) a um dono,
+        para que sejam descartados quando ele for liberado (ver
+        BlobStore.release).
+
+        Args:
+            owner: Dono dos blobs (ex: a conversa do checkpoint)
+        """
+        previous = getattr(self._owner, "value", None)
+        self._owner.value = owner
+        try:
+            yield
+        finally:
+            self._owner.value = previous
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(self.externalize(obj))
+
+    def loads(self, data: bytes) -> Any:
+        return self.restore(self.serde.loads(data))
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        return self.serde.dumps_typed(self.externalize(obj))
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        return self.restore(self.serde.loads_typed(data))
+
+    def externalize(self, value: Any) -> Any:
+        """
+        Substitui os textos longos de um valor (percorrendo listas, tuplas,
+        dicionários e modelos pydantic) por referências a blobs.
+
+        Args:
+            value: Valor a ser serializado
+
+        Returns:
+            Any: Cópia do valor com os textos longos substituídos
+        """
+        if isinstance(value, str):
+            # Textos que já começam com a marca também são convertidos,
+            # para que a restauração não os confunda com referências
+            if len(value) < self.min_text_size and not value.startswith(REF_PREFIX):
+                return value
+
+            return self._to_reference(value)
+
+        return _map(value, self.externalize)
+
+    def restore(self, value: Any) -> Any:
+        """
+        Substitui as referências a blobs de um valor pelos textos originais.
+
+        Args:
+            value: Valor desserializado
+
+        Returns:
+            Any: Cópia do valor com os textos restaurados
+        """
+        if isinstance(value, str):
+            return (
+                self._from_reference(value) if value.startswith(REF_PREFIX) else value
+            )
+
+        return _map(value, self.restore)
+
+    def _to_reference(self, text: str) -> str:
+        parts = []
+        blobs = 0
+
+        for paragraph in text.split(PARAGRAPH_SEPARATOR):
+            if len(paragraph) < self.min_blob_size:
+                parts.append(paragraph)
+            else:
+                parts.append([self._put(paragraph.encode("utf-8"))])
+                blobs += 1
+
+        metrics.increment("checkpoint.dedup.blobs", blobs)
+
+        # A lista de partes também é um blob: o checkpoint guarda um único
+        # hash por texto, independente da quantidade de parágrafos
+        manifest = json.dumps(parts, ensure_ascii=False).encode("utf-8")
+        return REF_PREFIX + self._put(manifest)
+
+    def _put(self, data: bytes) -> str:
+        return self.blob_store.put(data, owner=getattr(self._owner, "value", None))
+
+    def _from_reference(self, reference: str) -> str:
+        parts = json.loads(self.blob_store.get(reference[len(REF_PREFIX) :]))
+
+        return PARAGRAPH_SEPARATOR.join(
+            (
+                self.blob_store.get(part[0]).decode("utf-8")
+                if isinstance(part, list)
+                else part
+            )
+            for part in parts
+        )
+
+
+def _map(value: Any, function) -> Any:
+    """
+    Aplica a função aos itens de listas, tuplas, dicionários e campos de
+    modelos pydantic, devolvendo o próprio valor se nada mudar.
+    """
+    if isinstance(value, list):
+        items = [function(item) for item in value]
+        changed = any(new is not old for new, old in zip(items, value))
+        return items if changed else value
+
+    if isinstance(value, tuple):
+        items = [function(item) for item in value]
+        if all(new is old for new, old in zip(items, value)):
+            return value
+
+        # Tuplas nomeadas são recriadas com o mesmo tipo
+        return type(value)(*items) if hasattr(value, "_fields") else tuple(items)
+
+    if isinstance(value, dict):
+        items = {key: function(item) for key, item in value.items()}
+        changed = any(items[key] is not item for key, item in value.items())
+        return items if changed else value
+
+    if isinstance(value, BaseModel):
+        updates = {}
+        for name in type(value).model_fields:
+            item = getattr(value, name, None)
+            new = function(item)
+            if new is not item:
+                updates[name] = new
+
+        return value.model_copy(update=updates) if updates else value
+
+    return value
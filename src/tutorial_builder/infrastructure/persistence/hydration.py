@@ -0,0 +1,191 @@
+from copy import copy
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    KeysView,
+    List,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from typing import get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# Conversão de um valor armazenado para o tipo do campo (None: sem conversão)
+Converter = Callable[[Any], Any] | None
+
+_new = object.__new__
+_set = object.__setattr__
+
+
+def hydrate(cls: Type[Model], data: Dict[str, Any]) -> Model:
+    """
+    Reconstrói uma entidade a partir de dados já validados (gravados pela
+    própria aplicação), sem executar validadores nem `default_factory` dos
+    campos presentes. Modelos aninhados, enums e datas em texto (ex: saída
+    de `model_dump(mode="json")`) são convertidos pelo tipo de cada campo;
+    campos ausentes recebem o valor padrão.
+
+    Não use com dados externos: valores inválidos não geram erro (ver
+    `validate_many`).
+
+    Args:
+        cls: Classe da entidade (ex: Expert, Writer)
+        data: Campos da entidade
+
+    Returns:
+        Model: Entidade reconstruída
+    """
+    names, converters, defaults = _plan(cls)
+
+    if data.keys() == names:
+        values = dict(data)
+        fields_set = set(names)
+    else:
+        values = {
+            name: data[name] if name in data else default()
+            for name, default in defaults.items()
+        }
+        fields_set = names & data.keys()
+
+    # Só os campos com modelos, enums ou datas passam por conversão
+    for name, converter in converters:
+        value = values[name]
+        if value is not None:
+            values[name] = converter(value)
+
+    instance = _new(cls)
+    _set(instance, "__dict__", values)
+    _set(instance, "__pydantic_fields_set__", fields_set)
+    _set(instance, "__pydantic_extra__", None)
+    _set(instance, "__pydantic_private__", None)
+    return instance
+
+
+def hydrate_many(cls: Type[Model], items: Iterable[Dict[str, Any]]) -> List[Model]:
+    """
+    Reconstrói várias entidades a partir de dados já validados (ver `hydrate`)
+
+    Args:
+        cls: Classe das entidades
+        items: Campos de cada entidade
+
+    Returns:
+        List[Model]: Entidades reconstruídas, na mesma ordem
+    """
+    return [hydrate(cls, data) for data in items]
+
+
+def validate_many(
+    cls: Type[Model], data: Iterable[Dict[str, Any]] | str | bytes
+) -> List[Model]:
+    """
+    Valida várias entidades de uma vez, com todos os validadores, para dados
+    de origem externa (ex: importação de tutoriais). A lista é validada por
+    um único TypeAdapter, e JSON é validado sem passar por dicionários.
+
+    Args:
+        cls: Classe das entidades
+        data: Lista de campos de cada entidade, ou a lista em JSON
+
+    Returns:
+        List[Model]: Entidades validadas, na mesma ordem
+
+    Raises:
+        pydantic.ValidationError: Se alguma entidade for inválida
+    """
+    adapter = _adapter(cls)
+
+    if isinstance(data, (str, bytes)):
+        return adapter.validate_json(data)
+
+    return adapter.validate_python(data if isinstance(data, list) else list(data))
+
+
+@lru_cache(maxsize=None)
+def _adapter(cls: Type[Model]) -> TypeAdapter:
+    return TypeAdapter(List[cls])
+
+
+@lru_cache(maxsize=None)
+def _plan(cls: Type[BaseModel]) -> Tuple[
+    KeysView[str],
+    Tuple[Tuple[str, Callable[[Any], Any]], ...],
+    Dict[str, Callable[[], Any]],
+]:
+    """
+    Calcula, uma única vez por classe, os campos, a conversão dos campos que
+    precisam dela e a função que gera o valor padrão de cada campo.
+    """
+    converters = tuple(
+        (name, converter)
+        for name, field in cls.model_fields.items()
+        if (converter := _converter(field.annotation)) is not None
+    )
+    defaults = {name: _default(field) for name, field in cls.model_fields.items()}
+    return defaults.keys(), converters, defaults
+
+
+def _default(field: FieldInfo) -> Callable[[], Any]:
+    if field.default_factory is not None:
+        return field.default_factory
+
+    # Padrões mutáveis são copiados, para não serem compartilhados
+    if isinstance(field.default, (list, dict, set)):
+        return lambda: copy(field.default)
+
+    return lambda: field.default
+
+
+def _converter(annotation: Any) -> Converter:
+    origin = get_origin(annotation)
+
+    # Optional[X] e X | None: None não é convertido
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        return _converter(args[0]) if len(args) == 1 else None
+
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (Any,)
+
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return lambda items: [
+                value if isinstance(value, BaseModel) else hydrate(item, value)
+                for value in items
+            ]
+
+        convert = _converter(item)
+        if convert is None:
+            return None
+
+        return lambda items: [convert(value) for value in items]
+
+    # Modelos já reconstruídos (ex: pelo compact_codec) são mantidos
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: (
+            value if isinstance(value, BaseModel) else hydrate(annotation, value)
+        )
+
+    # Valores gravados fora do enum (ex: o nível em português do Planner, no
+    # histórico) são mantidos como estão
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        members = {member.value: member for member in annotation}
+        return lambda value: members.get(value, value)
+
+    if annotation is datetime:
+        return lambda value: (
+            datetime.fromisoformat(value) if isinstance(value, str) else value
+        )
+
+    return None
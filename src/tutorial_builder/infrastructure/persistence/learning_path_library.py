@@ -0,0 +1,274 @@
+import difflib
+import json
+import logging
+import re
+import sqlite3
+import threading
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from entities import Planner, ExpertStep
+from domain.interfaces import LearningPathLibrary
+from domain.text import fold
+from monitoring import metrics
+
+from .hydration import hydrate_many
+
+logger = logging.getLogger(__name__)
+
+# Valores que o planner usa para indicar que o usuário não informou o campo
+EMPTY_VALUES = {"", "n/a", "na", "nenhum", "nenhuma", "none", "null", "-"}
+
+# Assuntos curtos demais (ex: "react" e "preact") não usam busca aproximada
+MIN_FUZZY_LENGTH = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learning_paths (
+    subject_key TEXT NOT NULL,
+    level TEXT NOT NULL,
+    project_type_key TEXT NOT NULL,
+    environment_key TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    source TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (
+        subject_key, level, project_type_key, environment_key, prompt_version
+    )
+)
+"""
+
+
+def normalize_key(value: str | None) -> str:
+    """
+    Normaliza um campo do plano para uso como chave: remove acentos,
+    pontuação e espaços redundantes. Campos vazios ou "N/A" viram "".
+
+    Args:
+        value: Valor do campo
+
+    Returns:
+        str: Valor normalizado
+    """
+    if value is None:
+        return ""
+
+    text = fold(str(value)).strip()
+
+    if text in EMPTY_VALUES:
+        return ""
+
+    # Preserva símbolos que fazem parte de nomes de tecnologias (c++, c#, .net)
+    text = re.sub(r"[^\w+#.]+", " ", text)
+    return " ".join(text.split()).rstrip(".")
+
+
+class SQLiteLearningPathLibrary(LearningPathLibrary):
+    """
+    Biblioteca de caminhos de aprendizado persistida em SQLite.
+
+    A chave é o plano normalizado (assunto, nível, tipo de projeto, ambiente)
+    mais a versão do prompt. Quando não há entrada para o assunto exato,
+    o assunto mais parecido (difflib) com os mesmos demais campos é usado,
+    desde que a similaridade atinja `similarity_threshold` e os assuntos
+    tenham a mesma inicial e pelo menos `MIN_FUZZY_LENGTH` caracteres.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "learning_paths.db",
+        similarity_threshold: float = 0.85,
+        max_age: timedelta | None = None,
+    ):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (":memory:" para uso em memória)
+            similarity_threshold: Similaridade mínima (0 a 1) entre os assuntos
+            max_age: Idade máxima de uma entrada; None para não expirar
+        """
+        self.path = str(path)
+        self.similarity_threshold = similarity_threshold
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(SCHEMA)
+        self._connection.commit()
+
+    def find(self, planner: Planner, prompt_version: str) -> List[ExpertStep] | None:
+        """
+        Busca um caminho de aprendizado compatível com o plano
+
+        Args:
+            planner: Plano de aprendizado do usuário
+            prompt_version: Versão do prompt que gera o caminho de aprendizado
+
+        Returns:
+            List[ExpertStep] | None: Passos do caminho encontrado, ou None
+        """
+        subject_key, *key = self._key(planner)
+        if not subject_key:
+            return None
+
+        with self._lock:
+            rows = self._connection.execute(
+                """
+                SELECT subject_key, steps, created_at FROM learning_paths
+                WHERE level = ? AND project_type_key = ? AND environment_key = ?
+                    AND prompt_version = ?
+                """,
+                (*key, prompt_version),
+            ).fetchall()
+
+        candidates = {row[0]: row for row in rows if not self._is_stale(row[2])}
+
+        match = candidates.get(subject_key)
+        if match is None:
+            close_matches = difflib.get_close_matches(
+                subject_key,
+                [
+                    candidate
+                    for candidate in candidates
+                    if self._can_fuzzy_match(subject_key, candidate)
+                ],
+                n=1,
+                cutoff=self.similarity_threshold,
+            )
+            match = candidates[close_matches[0]] if close_matches else None
+
+        if match is None:
+            metrics.increment("learning_path_library.lookup", result="miss")
+            return None
+
+        metrics.increment(
+            "learning_path_library.lookup",
+            result="hit" if match[0] == subject_key else "fuzzy_hit",
+        )
+
+        with self._lock:
+            self._connection.execute(
+                """
+                UPDATE learning_paths SET hits = hits + 1
+                WHERE subject_key = ? AND level = ? AND project_type_key = ?
+                    AND environment_key = ? AND prompt_version = ?
+                """,
+                (match[0], *key, prompt_version),
+            )
+            self._connection.commit()
+
+        # Passos gravados por `save`, já validados
+        return hydrate_many(ExpertStep, json.loads(match[1]))
+
+    def save(
+        self,
+        planner: Planner,
+        learning_path: List[ExpertStep],
+        prompt_version: str,
+        source: str = "session",
+    ) -> None:
+        """
+        Salva (ou substitui) o caminho de aprendizado do plano.
+
+        Apenas a estrutura do caminho (número, título, descrição, tempo
+        estimado e dependências) é salva; o conteúdo dos passos é gerado em cada sessão.
+
+        Args:
+            planner: Plano de aprendizado do usuário
+            learning_path: Passos do caminho de aprendizado
+            prompt_version: Versão do prompt que gerou o caminho
+            source: Origem do caminho (ex: "precompute" ou "session")
+        """
+        key = self._key(planner)
+        if not key[0] or not learning_path:
+            return
+
+        steps = [
+            step.model_dump(
+                include={
+                    "step_number",
+                    "title",
+                    "description",
+                    "estimated_time",
+                    "depends_on",
+                }
+            )
+            for step in learning_path
+        ]
+
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO learning_paths (
+                    subject_key, level, project_type_key, environment_key,
+                    prompt_version, subject, steps, source, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT DO UPDATE SET
+                    subject = excluded.subject,
+                    steps = excluded.steps,
+                    source = excluded.source,
+                    created_at = excluded.created_at
+                """,
+                (
+                    *key,
+                    prompt_version,
+                    planner.subject,
+                    json.dumps(steps, ensure_ascii=False),
+                    source,
+                    datetime.now().isoformat(),
+                ),
+            )
+            self._connection.commit()
+
+        metrics.increment("learning_path_library.saved", source=source)
+
+    def purge(self, prompt_version: str) -> int:
+        """
+        Remove os caminhos gerados por versões do prompt diferentes da atual
+        e, se `max_age` estiver definido, os caminhos expirados.
+
+        Args:
+            prompt_version: Versão atual do prompt
+
+        Returns:
+            int: Quantidade de caminhos removidos
+        """
+        oldest = (
+            (datetime.now() - self.max_age).isoformat()
+            if self.max_age is not None
+            else ""
+        )
+
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM learning_paths WHERE prompt_version != ? OR created_at < ?",
+                (prompt_version, oldest),
+            )
+            self._connection.commit()
+
+        logger.info("Caminhos de aprendizado removidos: %d", cursor.rowcount)
+        return cursor.rowcount
+
+    def _key(self, planner: Planner) -> tuple[str, str, str, str]:
+        return (
+            normalize_key(planner.subject),
+            normalize_key(planner.level),
+            normalize_key(planner.project_type),
+            normalize_key(planner.environment),
+        )
+
+    @staticmethod
+    def _can_fuzzy_match(subject_key: str, candidate: str) -> bool:
+        return (
+            min(len(subject_key), len(candidate)) >= MIN_FUZZY_LENGTH
+            and subject_key[0] == candidate[0]
+        )
+
+    def _is_stale(self, created_at: str) -> bool:
+        if self.max_age is None:
+            return False
+
+        return datetime.fromisoformat(created_at) < datetime.now() - self.max_age
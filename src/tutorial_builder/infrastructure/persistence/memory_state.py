@@ -1,20 +1,49 @@
 from typing import Dict, Any, List
 from langchain_core.messages import BaseMessage
 from langgraph.checkpoint.memory import MemorySaver
-from domain.entities.planner import Planner
+from entities.planner import Planner
+from domain.interfaces import BlobStore
+
+from .blob_store import InMemoryBlobStore
+from .compact_codec import CompactSerializer
+from .dedup_saver import DedupMemorySaver
+from .dedup_serializer import DedupSerializer
 
 
 class MemoryState:
     """
     Implementação do estado em memória para o grafo.
+
+    Os checkpoints guardam os textos longos (conteúdo dos passos, mensagens,
+    tutorial) uma única vez, no armazenamento de blobs (ver DedupSerializer),
+    descartados com as conversas que os referenciam (ver DedupMemorySaver),
+    e as entidades em msgpack compacto e versionado (ver CompactSerializer).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        blob_store: BlobStore | None = None,
+        dedup: bool = True,
+        compact: bool = True,
+    ):
+        """
+        Args:
+            blob_store: Armazenamento dos textos longos dos checkpoints
+            dedup: Se False, os checkpoints guardam o estado completo
+            compact: Se False, usa o serializador padrão do LangGraph
+        """
+        self.blob_store = blob_store or InMemoryBlobStore()
         self.messages: List[BaseMessage] = []
         self.planner_output: Planner = Planner()
         self.expert_output: Dict[str, Any] | None = None
         self.writer_output: Dict[str, Any] | None = None
-        self.memory_saver = MemorySaver()
+        serde = CompactSerializer() if compact else None
+        if dedup:
+            self.memory_saver = DedupMemorySaver(
+                DedupSerializer(self.blob_store, serde=serde)
+            )
+        else:
+            self.memory_saver = MemorySaver(serde=serde)
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,185 @@
+import copy
+import sqlite3
+import threading
+import uuid
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+from domain.interfaces import SessionStore
+
+from .compact_codec import decode, encode
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+
+def initial_state() -> Dict[str, Any]:
+    """
+    Estado do workflow de uma sessão nova
+
+    Returns:
+        Dict[str, Any]: Estado sem mensagens nem saídas dos agentes
+    """
+    return {
+        "messages": [],
+        "planner_output": None,
+        "expert_output": None,
+        "writer_output": None,
+    }
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Sessões em memória, com o mesmo ciclo de vida do checkpointer em memória
+    (MemorySaver) do workflow: cada processo tem as suas sessões, então,
+    com vários processos, as requisições de uma sessão devem ir sempre para
+    o mesmo processo.
+
+    Os estados são copiados ao salvar e ao buscar, para que quem os recebe
+    possa alterá-los sem afetar a sessão.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self) -> str:
+        """
+        Cria uma sessão com o estado inicial do workflow
+
+        Returns:
+            str: Identificador da sessão (usado também como thread_id)
+        """
+        session_id = uuid.uuid4().hex
+
+        with self._lock:
+            self._sessions[session_id] = initial_state()
+
+        return session_id
+
+    def get(self, session_id: str) -> Dict[str, Any] | None:
+        """
+        Busca o estado de uma sessão
+
+        Args:
+            session_id: Identificador da sessão
+
+        Returns:
+            Dict[str, Any] | None: Estado do workflow, ou None se a sessão
+                não existir
+        """
+        with self._lock:
+            state = self._sessions.get(session_id)
+
+        return copy.deepcopy(state) if state is not None else None
+
+    def save(self, session_id: str, state: Dict[str, Any]) -> None:
+        """
+        Salva o estado de uma sessão
+
+        Args:
+            session_id: Identificador da sessão
+            state: Estado do workflow após a rodada
+        """
+        state = copy.deepcopy(state)
+
+        with self._lock:
+            self._sessions[session_id] = state
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessões persistidas em SQLite, compartilhadas entre processos: a API e os
+    processos do workflow podem ser reiniciados, e uma sessão pode passar de
+    um processo para outro (ver WorkerSupervisor) sem perder a conversa.
+
+    Os estados são gravados na codificação compacta dos checkpoints
+    (mensagens e entidades em msgpack). O banco usa WAL, para que as leituras
+    de um processo não esperem as gravações de outro.
+    """
+
+    def __init__(self, path: str | Path = "sessions.db", timeout: float = 30.0):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (":memory:" para uso em memória)
+            timeout: Tempo máximo, em segundos, de espera pelo bloqueio de
+                gravação de outro processo
+        """
+        self.path = str(path)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, timeout=timeout, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(SCHEMA)
+        self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT count(*) FROM sessions").fetchone()
+
+        return row[0]
+
+    def create(self) -> str:
+        """
+        Cria uma sessão com o estado inicial do workflow
+
+        Returns:
+            str: Identificador da sessão (usado também como thread_id)
+        """
+        session_id = uuid.uuid4().hex
+        self.save(session_id, initial_state())
+
+        return session_id
+
+    def get(self, session_id: str) -> Dict[str, Any] | None:
+        """
+        Busca o estado de uma sessão
+
+        Args:
+            session_id: Identificador da sessão
+
+        Returns:
+            Dict[str, Any] | None: Estado do workflow, ou None se a sessão
+                não existir
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+
+        return decode(row[0]) if row is not None else None
+
+    def save(self, session_id: str, state: Dict[str, Any]) -> None:
+        """
+        Salva o estado de uma sessão
+
+        Args:
+            session_id: Identificador da sessão
+            state: Estado do workflow após a rodada
+        """
+        data = encode(state)
+
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO sessions (id, state, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT DO UPDATE SET
+                    state = excluded.state,
+                    updated_at = excluded.updated_at
+                """,
+                (session_id, data, datetime.now().isoformat()),
+            )
+            self._connection.commit()
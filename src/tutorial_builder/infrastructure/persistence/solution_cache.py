@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+
+from datetime import datetime
+from pathlib import Path
+
+from domain.interfaces import SolutionCache
+from monitoring import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    signature TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (signature, subject)
+)
+"""
+
+
+class SQLiteSolutionCache(SolutionCache):
+    """
+    Cache de soluções persistido em SQLite, indexado pela assinatura
+    normalizada do erro e pelo assunto do tutorial.
+    """
+
+    def __init__(self, path: str | Path = "solutions.db"):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (":memory:" para uso em memória)
+        """
+        self.path = str(path)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(SCHEMA)
+        self._connection.commit()
+
+    def get(self, signature: str, subject: str) -> str | None:
+        """
+        Busca a solução de um erro
+
+        Args:
+            signature: Assinatura normalizada do erro
+            subject: Assunto do tutorial
+
+        Returns:
+            str | None: A solução salva, ou None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT solution FROM solutions WHERE signature = ? AND subject = ?",
+                (signature, subject),
+            ).fetchone()
+
+            if row is not None:
+                self._connection.execute(
+                    "UPDATE solutions SET hits = hits + 1 "
+                    "WHERE signature = ? AND subject = ?",
+                    (signature, subject),
+                )
+                self._connection.commit()
+
+        metrics.increment(
+            "troubleshooting.solution_cache", result="hit" if row else "miss"
+        )
+        return row[0] if row else None
+
+    def put(self, signature: str, subject: str, solution: str) -> None:
+        """
+        Salva a solução de um erro, substituindo a anterior
+
+        Args:
+            signature: Assinatura normalizada do erro
+            subject: Assunto do tutorial
+            solution: Solução para o erro
+        """
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO solutions (signature, subject, solution, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT DO UPDATE SET
+                    solution = excluded.solution,
+                    created_at = excluded.created_at
+                """,
+                (signature, subject, solution, datetime.now().isoformat()),
+            )
+            self._connection.commit()
@@ -0,0 +1,100 @@
+import zlib
+
+from collections import Counter
+from typing import Iterable
+
+# Tamanho máximo útil de um dicionário zlib (janela do DEFLATE)
+MAX_DICTIONARY_SIZE = 32 * 1024
+
+# Linhas mais curtas não compensam a referência no dicionário
+MIN_LINE_LENGTH = 8
+
+
+def train_dictionary(
+    samples: Iterable[str],
+    size: int = MAX_DICTIONARY_SIZE,
+    min_document_frequency: float = 0.05,
+) -> bytes:
+    """
+    Monta um dicionário pré-definido (zdict) para o zlib a partir de textos
+    de exemplo: as linhas que se repetem em muitos textos (títulos, frases
+    padrão, trechos de código) são concatenadas, as mais valiosas no final,
+    onde as referências do DEFLATE são mais baratas.
+
+    Args:
+        samples: Textos de exemplo (ex: tutoriais já gerados)
+        size: Tamanho máximo do dicionário em bytes
+        min_document_frequency: Fração mínima dos textos em que a linha aparece
+
+    Returns:
+        bytes: Dicionário (vazio se não houver linhas repetidas)
+    """
+    document_frequency: Counter[str] = Counter()
+    count = 0
+
+    for sample in samples:
+        count += 1
+        document_frequency.update(
+            {line for line in sample.splitlines() if len(line) >= MIN_LINE_LENGTH}
+        )
+
+    min_count = max(2, int(count * min_document_frequency))
+    lines = [
+        line for line, frequency in document_frequency.items() if frequency >= min_count
+    ]
+
+    # Valor de cada linha: bytes economizados em todos os textos
+    lines.sort(
+        key=lambda line: document_frequency[line] * len(line.encode("utf-8")),
+        reverse=True,
+    )
+
+    selected, total = [], 0
+    for line in lines:
+        data = line.encode("utf-8") + b"\n"
+        if total + len(data) > size:
+            continue
+
+        selected.append(data)
+        total += len(data)
+
+    return b"".join(reversed(selected))
+
+
+def compress_text(text: str, dictionary: bytes | None = None, level: int = 9) -> bytes:
+    """
+    Comprime um texto com zlib, usando o dicionário pré-definido se houver
+
+    Args:
+        text: Texto a ser comprimido
+        dictionary: Dicionário pré-definido (ver train_dictionary)
+        level: Nível de compressão do zlib (0 a 9)
+
+    Returns:
+        bytes: Texto comprimido
+    """
+    if dictionary:
+        compressor = zlib.compressobj(level, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level)
+
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+def decompress_text(data: bytes, dictionary: bytes | None = None) -> str:
+    """
+    Descomprime um texto gerado por `compress_text`, com o mesmo dicionário
+
+    Args:
+        data: Texto comprimido
+        dictionary: Dicionário usado na compressão
+
+    Returns:
+        str: Texto original
+    """
+    if dictionary:
+        decompressor = zlib.decompressobj(zdict=dictionary)
+    else:
+        decompressor = zlib.decompressobj()
+
+    return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
@@ -0,0 +1,273 @@
+import json
+import mmap
+import os
+import struct
+import threading
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from entities import ArchivedTutorial
+from domain.interfaces import TutorialArchive
+from monitoring import metrics
+
+from .hydration import hydrate
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem bloqueio entre processos
+    fcntl = None
+
+# Início do arquivo de índice, com a versão do formato
+INDEX_MAGIC = b"TBARCH\x00\x01"
+
+# Registro de cada tutorial no índice: posição e tamanho do cabeçalho
+RECORD = struct.Struct("<QI")
+
+# Cabeçalhos (metadados e posições das seções) mantidos em memória
+HEADER_CACHE_SIZE = 256
+
+
+class MmapTutorialArchive(TutorialArchive):
+    """
+    Arquivo somente de acréscimo dos tutoriais concluídos, persistido em um
+    diretório:
+
+    - `tutorials.dat`: conteúdo das seções de cada tutorial (UTF-8), seguido
+        de um cabeçalho JSON com os metadados e a posição de cada seção;
+    - `tutorials.idx`: índice de registros de tamanho fixo (posição e tamanho
+        do cabeçalho de cada tutorial), na ordem em que foram acrescentados.
+
+    Os dois arquivos são mapeados em memória (mmap): abrir o arquivo não lê
+    nenhum tutorial, e ler uma seção lê apenas o seu cabeçalho e o trecho da
+    seção. O conteúdo é gravado antes do registro no índice, então, após uma
+    falha, um tutorial incompleto é simplesmente ignorado. Arquivos
+    acrescentados por outra instância (ex: o workflow e a página de leitura)
+    são percebidos na próxima leitura. Os acréscimos são serializados entre
+    processos por um bloqueio de arquivo (`tutorials.lock`), para que vários
+    processos do workflow possam compartilhar o arquivo.
+    """
+
+    def __init__(self, directory: str | Path):
+        """
+        Args:
+            directory: Diretório do arquivo (criado se não existir)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._data_path = self.directory / "tutorials.dat"
+        self._index_path = self.directory / "tutorials.idx"
+        self._lock_path = self.directory / "tutorials.lock"
+        self._lock = threading.Lock()
+        self._headers: OrderedDict[int, Tuple[ArchivedTutorial, list]] = OrderedDict()
+
+        self._data_path.touch()
+        self._open_index()
+
+        self._data: mmap.mmap | None = None
+        self._index: mmap.mmap | None = None
+        self._index_size = -1
+        self._count = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remap()
+            return self._count
+
+    def append(self, tutorial: ArchivedTutorial, contents: List[str]) -> int:
+        """
+        Acrescenta um tutorial ao arquivo
+
+        Args:
+            tutorial: Metadados do tutorial (o identificador é ignorado)
+            contents: Conteúdo de cada seção, na ordem de `tutorial.sections`
+
+        Returns:
+            int: Identificador do tutorial no arquivo
+
+        Raises:
+            ValueError: Se a quantidade de seções e de conteúdos for diferente
+        """
+        if len(contents) != len(tutorial.sections):
+            raise ValueError("Cada seção do tutorial precisa de um conteúdo")
+
+        with self._lock, self._exclusive():
+            with open(self._data_path, "ab") as f:
+                sections = []
+                for title, content in zip(tutorial.sections, contents):
+                    data = content.encode("utf-8")
+                    sections.append([title, f.tell(), len(data)])
+                    f.write(data)
+
+                header = tutorial.model_dump(
+                    mode="json", exclude={"id", "sections"}
+                ) | {"sections": sections}
+                header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+                header_offset = f.tell()
+                f.write(header)
+
+            with open(self._index_path, "ab") as f:
+                f.write(RECORD.pack(header_offset, len(header)))
+
+            self._remap()
+            tutorial_id = self._count
+
+        metrics.increment("reading_archive.appended")
+        return tutorial_id
+
+    def get(self, tutorial_id: int) -> ArchivedTutorial | None:
+        """
+        Busca os metadados de um tutorial
+
+        Args:
+            tutorial_id: Identificador do tutorial no arquivo
+
+        Returns:
+            ArchivedTutorial | None: O tutorial, ou None se não existir
+        """
+        with self._lock:
+            self._remap()
+            if not 1 <= tutorial_id <= self._count:
+                return None
+
+            return self._header(tutorial_id)[0]
+
+    def recent(self, offset: int = 0, limit: int = 20) -> List[ArchivedTutorial]:
+        """
+        Lista os tutoriais do mais recente para o mais antigo
+
+        Args:
+            offset: Quantidade de tutoriais a pular
+            limit: Quantidade máxima de tutoriais
+
+        Returns:
+            List[ArchivedTutorial]: Metadados dos tutoriais
+        """
+        with self._lock:
+            self._remap()
+            last = self._count - max(offset, 0)
+            first = max(last - max(limit, 0), 0)
+
+            return [
+                self._header(tutorial_id)[0] for tutorial_id in range(last, first, -1)
+            ]
+
+    def read_section(self, tutorial_id: int, number: int) -> str:
+        """
+        Lê o conteúdo de uma seção, sem ler as demais
+
+        Args:
+            tutorial_id: Identificador do tutorial no arquivo
+            number: Número da seção, começando em 1
+
+        Returns:
+            str: Conteúdo da seção em Markdown
+
+        Raises:
+            KeyError: Se o tutorial ou a seção não existirem
+        """
+        with self._lock:
+            self._remap()
+            if not 1 <= tutorial_id <= self._count:
+                raise KeyError(f"Tutorial {tutorial_id} não encontrado no arquivo")
+
+            _, sections = self._header(tutorial_id)
+            if not 1 <= number <= len(sections):
+                raise KeyError(f"Seção {number} não encontrada")
+
+            _, start, length = sections[number - 1]
+            return self._data[start : start + length].decode("utf-8")
+
+    def close(self) -> None:
+        """
+        Libera os mapeamentos em memória
+        """
+        with self._lock:
+            for mapping in (self._data, self._index):
+                if mapping is not None:
+                    mapping.close()
+
+            self._data = self._index = None
+            self._index_size = -1
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """
+        Bloqueia os acréscimos de outros processos ao arquivo
+        """
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._lock_path, "ab") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _open_index(self) -> None:
+        if not self._index_path.exists() or self._index_path.stat().st_size == 0:
+            self._index_path.write_bytes(INDEX_MAGIC)
+            return
+
+        with open(self._index_path, "r+b") as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(
+                    f"{self._index_path} não é um índice do arquivo de tutoriais"
+                )
+
+            # Registro incompleto de uma gravação interrompida
+            size = os.fstat(f.fileno()).st_size
+            excess = (size - len(INDEX_MAGIC)) % RECORD.size
+            if excess:
+                f.truncate(size - excess)
+
+    def _remap(self) -> None:
+        """
+        Mapeia novamente os arquivos se eles cresceram desde a última leitura
+        (apenas uma chamada a stat quando nada mudou).
+        """
+        index_size = os.stat(self._index_path).st_size
+        if index_size == self._index_size:
+            return
+
+        self._index = _map(self._index_path, self._index)
+        self._data = _map(self._data_path, self._data)
+        self._index_size = index_size
+        self._count = (index_size - len(INDEX_MAGIC)) // RECORD.size
+
+    def _header(self, tutorial_id: int) -> Tuple[ArchivedTutorial, list]:
+        if tutorial_id in self._headers:
+            self._headers.move_to_end(tutorial_id)
+            return self._headers[tutorial_id]
+
+        position = len(INDEX_MAGIC) + (tutorial_id - 1) * RECORD.size
+        offset, length = RECORD.unpack_from(self._index, position)
+        header = json.loads(self._data[offset : offset + length])
+
+        sections = header.pop("sections")
+        tutorial = hydrate(
+            ArchivedTutorial,
+            header | {"id": tutorial_id, "sections": [title for title, *_ in sections]},
+        )
+
+        self._headers[tutorial_id] = (tutorial, sections)
+        if len(self._headers) > HEADER_CACHE_SIZE:
+            self._headers.popitem(last=False)
+
+        return tutorial, sections
+
+
+def _map(path: Path, previous: mmap.mmap | None) -> mmap.mmap | None:
+    if previous is not None:
+        previous.close()
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
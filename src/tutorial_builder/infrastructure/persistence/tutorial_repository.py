@@ -0,0 +1,626 @@
+import re
+import sqlite3
+import threading
+
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from entities import Writer, TutorialSearchPage, TutorialSearchResult
+from domain.interfaces import TutorialRepository
+from domain.text import fold
+
+from .compact_codec import decode, encode
+from .hydration import hydrate
+from .text_codec import compress_text, decompress_text, train_dictionary
+
+# Peso de cada coluna do índice no ranking bm25: title, keywords, subject, body
+COLUMN_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+# Limite de termos por busca, para manter o custo da consulta previsível
+MAX_QUERY_TERMS = 16
+
+# Colunas curtas, buscadas antes do conteúdo (primeiro nível da busca)
+METADATA_COLUMNS = "{title keywords subject}"
+
+# Acima deste número de resultados só no conteúdo, os termos aparecem em quase
+# todos os tutoriais (idf próximo de zero): ordenar todos por bm25 custaria
+# dezenas de ms sem melhorar a ordem, então eles são ordenados por recência
+MAX_RANKED_BODY_MATCHES = 2_000
+
+# Versão do esquema (PRAGMA user_version); ver _migrate
+SCHEMA_VERSION = 1
+
+# Quantidade de palavras dos trechos exibidos nos resultados da busca
+SNIPPET_TOKENS = 16
+
+# O conteúdo (body) é gravado comprimido com zlib, usando o dicionário
+# `dictionary_id` (0: sem dicionário; NULL: texto sem compressão, de
+# históricos antigos). Os dicionários nunca são alterados, apenas
+# acrescentados, para que os conteúdos antigos continuem legíveis.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tutorials (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    keywords TEXT NOT NULL DEFAULT '',
+    subject TEXT,
+    difficulty_level TEXT,
+    body BLOB NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    expert BLOB,
+    dictionary_id INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS tutorials_created_at ON tutorials (created_at);
+
+CREATE TABLE IF NOT EXISTS compression_dictionaries (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL,
+    samples INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# Índice sem conteúdo (content=''): como o conteúdo é gravado comprimido, o
+# índice guarda apenas os termos, e os trechos dos resultados são montados a
+# partir do conteúdo descomprimido (ver make_snippet)
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS tutorials_fts USING fts5(
+    title,
+    keywords,
+    subject,
+    body,
+    content='',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+INSERT INTO tutorials_fts (tutorials_fts, rank)
+VALUES ('rank', 'bm25({", ".join(map(str, COLUMN_WEIGHTS))})');
+"""
+
+SEARCH_QUERY = """
+SELECT
+    t.id, t.title, t.subject, t.difficulty_level, t.keywords, t.created_at,
+    t.body, t.dictionary_id, rank
+FROM tutorials_fts
+JOIN tutorials AS t ON t.id = tutorials_fts.rowid
+WHERE tutorials_fts MATCH ?
+ORDER BY {order}
+LIMIT ? OFFSET ?
+"""
+
+COUNT_QUERY = "SELECT count(*) FROM tutorials_fts WHERE tutorials_fts MATCH ?"
+
+RECENT_QUERY = """
+SELECT
+    id, title, subject, difficulty_level, keywords, created_at,
+    body, dictionary_id, 0.0
+FROM tutorials
+ORDER BY created_at DESC, id DESC
+LIMIT ? OFFSET ?
+"""
+
+
+def build_match_query(query: str) -> str:
+    """
+    Converte o texto digitado pelo usuário em uma consulta FTS5 segura:
+    cada termo vira uma frase entre aspas (sem operadores da sintaxe FTS5)
+    e o último termo é buscado por prefixo, para a busca enquanto se digita.
+
+    Args:
+        query: Texto digitado pelo usuário
+
+    Returns:
+        str: Consulta FTS5 (vazia se não houver termos)
+    """
+    terms = re.findall(r"\w+", query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return ""
+
+    phrases = [f'"{term}"' for term in terms]
+    phrases[-1] += "*"
+    return " ".join(phrases)
+
+
+def make_snippet(text: str, query: str, size: int = SNIPPET_TOKENS) -> str:
+    """
+    Monta o trecho de um resultado da busca: as `size` palavras a partir da
+    primeira ocorrência de um termo da consulta, com os termos em negrito.
+    Segue as regras da consulta FTS5 (acentos ignorados, último termo por
+    prefixo).
+
+    Args:
+        text: Conteúdo do tutorial
+        query: Texto digitado pelo usuário
+        size: Quantidade de palavras do trecho
+
+    Returns:
+        str: Trecho em Markdown
+    """
+    terms = [fold(term) for term in re.findall(r"\w+", query)[:MAX_QUERY_TERMS]]
+    prefix = terms.pop() if terms else None
+    terms = set(terms)
+
+    def matches(word: str) -> bool:
+        word = fold(word)
+        return word in terms or (prefix is not None and word.startswith(prefix))
+
+    # Percorre as palavras só até completar o trecho, guardando as anteriores
+    # à primeira ocorrência (o trecho começa um pouco antes dela)
+    before = deque(maxlen=size // 4)
+    window = []
+    more = False
+
+    for word in re.finditer(r"\w+", text):
+        if len(window) == size:
+            more = True
+            break
+
+        if window or matches(word.group()):
+            window.append(word)
+        else:
+            before.append(word)
+
+    if not window:
+        # Nenhuma ocorrência (ex: termo só no título): início do texto
+        window = list(re.finditer(r"\w+", text))[: size + 1]
+        before.clear()
+        more = len(window) > size
+        window = window[:size]
+    else:
+        window = [*before, *window]
+        more = more or len(window) > size
+        window = window[:size]
+
+    if not window:
+        return ""
+
+    parts, position = [], window[0].start()
+    for word in window:
+        parts.append(text[position : word.start()])
+        parts.append(f"**{word.group()}**" if matches(word.group()) else word.group())
+        position = word.end()
+
+    snippet = " ".join("".join(parts).split())
+    return ("…" if window[0].start() > 0 else "") + snippet + ("…" if more else "")
+
+
+class SQLiteTutorialRepository(TutorialRepository):
+    """
+    Histórico de tutoriais persistido em SQLite, com índice FTS5 sobre
+    título, palavras-chave, assunto e conteúdo.
+
+    O índice não guarda o conteúdo (o texto não é duplicado) e é ordenado
+    por bm25, com pesos maiores para título e palavras-chave. Acentos são
+    ignorados na busca.
+
+    O conteúdo é gravado comprimido com zlib e um dicionário pré-definido,
+    treinado com os próprios tutoriais (ver text_codec): tutoriais repetem
+    títulos, frases e blocos de código, que passam a ser referências ao
+    dicionário. O primeiro dicionário é treinado automaticamente quando o
+    histórico atinge `auto_train_after` tutoriais; novos dicionários podem
+    ser treinados com `train_dictionary` e aplicados com `recompress`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = "tutorials.db",
+        auto_train_after: int | None = 100,
+        compression_level: int = 9,
+    ):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (":memory:" para uso em memória)
+            auto_train_after: Tutoriais necessários para treinar o primeiro
+                dicionário automaticamente (None para nunca treinar)
+            compression_level: Nível de compressão do zlib (0 a 9)
+        """
+        self.path = str(path)
+        self.auto_train_after = auto_train_after
+        self.compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._migrate()
+        self._connection.commit()
+
+        self._dictionaries: dict[int, bytes] = {0: b""}
+        row = self._connection.execute(
+            "SELECT max(id) FROM compression_dictionaries"
+        ).fetchone()
+        self._dictionary_id = row[0] or 0
+
+    def _migrate(self) -> None:
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(tutorials)")
+        }
+
+        # Históricos criados antes de o caminho de aprendizado ser salvo
+        if "expert" not in columns:
+            self._connection.execute("ALTER TABLE tutorials ADD COLUMN expert BLOB")
+
+        # Históricos criados antes da compressão do conteúdo: o índice lia o
+        # texto da tabela (conteúdo externo) e é recriado sem conteúdo
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            if "dictionary_id" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE tutorials ADD COLUMN dictionary_id INTEGER"
+                )
+
+            self._connection.execute("DROP TABLE IF EXISTS tutorials_fts")
+            self._connection.executescript(FTS_SCHEMA)
+            self._connection.execute(
+                """
+                INSERT INTO tutorials_fts (rowid, title, keywords, subject, body)
+                SELECT id, title, keywords, subject, body FROM tutorials
+                """
+            )
+
+        self._connection.executescript(FTS_SCHEMA)
+        self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def save(self, writer: Writer) -> int:
+        """
+        Salva um tutorial no histórico
+
+        Args:
+            writer: Objeto Writer com o tutorial gerado
+
+        Returns:
+            int: Identificador do tutorial no histórico
+        """
+        return self.save_many([writer])[0]
+
+    def save_many(self, writers: List[Writer]) -> List[int]:
+        """
+        Salva vários tutoriais em uma única transação
+
+        Args:
+            writers: Objetos Writer com os tutoriais gerados
+
+        Returns:
+            List[int]: Identificadores dos tutoriais, na mesma ordem
+        """
+        ids = []
+
+        with self._lock, self._connection:
+            dictionary_id = self._dictionary_id
+            dictionary = self._dictionary(dictionary_id)
+
+            for writer in writers:
+                body = writer.tutorial or ""
+                row = (
+                    writer.title,
+                    ", ".join(writer.keywords or []),
+                    writer.subject,
+                    _level(writer.difficulty_level),
+                    compress_text(body, dictionary, self.compression_level),
+                    dictionary_id,
+                    (writer.created_at or datetime.now()).isoformat(),
+                    # Caminho de aprendizado em msgpack compacto (ver compact_codec)
+                    encode(writer.expert) if writer.expert is not None else None,
+                )
+
+                cursor = self._connection.execute(
+                    """
+                    INSERT INTO tutorials (
+                        title, keywords, subject, difficulty_level, body,
+                        dictionary_id, created_at, expert
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    row,
+                )
+                self._connection.execute(
+                    """
+                    INSERT INTO tutorials_fts (rowid, title, keywords, subject, body)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (cursor.lastrowid, row[0], row[1], row[2], body),
+                )
+                ids.append(cursor.lastrowid)
+
+        if self._should_train():
+            if self.train_dictionary() is not None:
+                self.recompress()
+
+        return ids
+
+    def train_dictionary(self, sample_size: int = 500) -> int | None:
+        """
+        Treina um novo dicionário de compressão com os tutoriais mais
+        recentes e o usa nos próximos tutoriais salvos. Os tutoriais já
+        salvos continuam com o dicionário anterior até `recompress`.
+
+        Args:
+            sample_size: Quantidade de tutoriais usados no treino
+
+        Returns:
+            int | None: Versão do novo dicionário, ou None se os tutoriais
+                não tiverem conteúdo repetido suficiente
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                """
+                SELECT body, dictionary_id FROM tutorials
+                ORDER BY id DESC LIMIT ?
+                """,
+                (sample_size,),
+            ).fetchall()
+            samples = [
+                self._decompress(body, dictionary_id) for body, dictionary_id in rows
+            ]
+
+        dictionary = train_dictionary(samples)
+        if not dictionary:
+            return None
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                """
+                INSERT INTO compression_dictionaries (data, samples, created_at)
+                VALUES (?, ?, ?)
+                """,
+                (dictionary, len(samples), datetime.now().isoformat()),
+            )
+            self._dictionary_id = cursor.lastrowid
+            self._dictionaries[cursor.lastrowid] = dictionary
+
+        return self._dictionary_id
+
+    def recompress(self, batch_size: int = 500) -> int:
+        """
+        Comprime novamente, com o dicionário atual, os tutoriais gravados sem
+        compressão ou com dicionários anteriores.
+
+        Args:
+            batch_size: Quantidade de tutoriais por transação
+
+        Returns:
+            int: Quantidade de tutoriais comprimidos novamente
+        """
+        total = 0
+
+        while True:
+            with self._lock, self._connection:
+                dictionary_id = self._dictionary_id
+                rows = self._connection.execute(
+                    """
+                    SELECT id, body, dictionary_id FROM tutorials
+                    WHERE dictionary_id IS NULL OR dictionary_id != ?
+                    LIMIT ?
+                    """,
+                    (dictionary_id, batch_size),
+                ).fetchall()
+
+                dictionary = self._dictionary(dictionary_id)
+                self._connection.executemany(
+                    "UPDATE tutorials SET body = ?, dictionary_id = ? WHERE id = ?",
+                    [
+                        (
+                            compress_text(
+                                self._decompress(body, old_dictionary_id),
+                                dictionary,
+                                self.compression_level,
+                            ),
+                            dictionary_id,
+                            tutorial_id,
+                        )
+                        for tutorial_id, body, old_dictionary_id in rows
+                    ],
+                )
+
+            total += len(rows)
+            if len(rows) < batch_size:
+                return total
+
+    def _should_train(self) -> bool:
+        if self._dictionary_id or self.auto_train_after is None:
+            return False
+
+        with self._lock:
+            count = self._connection.execute(
+                "SELECT count(*) FROM tutorials"
+            ).fetchone()[0]
+
+        return count >= self.auto_train_after
+
+    def _dictionary(self, dictionary_id: int) -> bytes:
+        if dictionary_id not in self._dictionaries:
+            row = self._connection.execute(
+                "SELECT data FROM compression_dictionaries WHERE id = ?",
+                (dictionary_id,),
+            ).fetchone()
+            self._dictionaries[dictionary_id] = row[0]
+
+        return self._dictionaries[dictionary_id]
+
+    def _decompress(self, body: bytes | str, dictionary_id: int | None) -> str:
+        # Conteúdos de históricos antigos, gravados sem compressão
+        if dictionary_id is None:
+            return body
+
+        return decompress_text(body, self._dictionary(dictionary_id))
+
+    def get(self, tutorial_id: int) -> Writer | None:
+        """
+        Busca um tutorial pelo identificador
+
+        Args:
+            tutorial_id: Identificador do tutorial
+
+        Returns:
+            Writer | None: O tutorial, ou None se não existir
+        """
+        with self._lock:
+            row = self._connection.execute(
+                """
+                SELECT
+                    title, keywords, subject, difficulty_level, body, dictionary_id,
+                    created_at, expert
+                FROM tutorials WHERE id = ?
+                """,
+                (tutorial_id,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            title, keywords, subject, difficulty_level, body, dictionary_id = row[:6]
+            created_at, expert = row[6:]
+            body = self._decompress(body, dictionary_id)
+
+        # O nível é gravado como veio do Planner, que usa valores em português
+        return hydrate(
+            Writer,
+            {
+                "title": title,
+                "keywords": _split_keywords(keywords),
+                "subject": subject,
+                "difficulty_level": difficulty_level,
+                "tutorial": body,
+                "created_at": created_at,
+                "expert": decode(expert) if expert is not None else None,
+            },
+        )
+
+    def search(
+        self, query: str = "", page: int = 1, page_size: int = 20
+    ) -> TutorialSearchPage:
+        """
+        Busca tutoriais por texto, ordenados por relevância. Sem texto,
+        lista os tutoriais mais recentes.
+
+        Tutoriais com os termos no título, palavras-chave ou assunto vêm
+        primeiro, ordenados por bm25; em seguida, os que têm os termos apenas
+        no conteúdo, ordenados por bm25 ou, se forem muitos, por recência.
+
+        Args:
+            query: Texto buscado no título, palavras-chave, assunto e conteúdo
+            page: Número da página, começando em 1
+            page_size: Quantidade máxima de resultados por página
+
+        Returns:
+            TutorialSearchPage: Página de resultados
+        """
+        page = max(page, 1)
+        page_size = max(page_size, 1)
+
+        # Busca um resultado a mais para saber se há próxima página
+        limit, offset = page_size + 1, (page - 1) * page_size
+        match_query = build_match_query(query)
+
+        with self._lock:
+            if match_query:
+                rows = self._search(match_query, limit, offset)
+            else:
+                rows = self._connection.execute(
+                    RECENT_QUERY, (limit, offset)
+                ).fetchall()
+
+            # Apenas os resultados da página são descomprimidos
+            bodies = [self._decompress(row[6], row[7]) for row in rows[:page_size]]
+
+        results = [
+            TutorialSearchResult(
+                id=row[0],
+                title=row[1],
+                subject=row[2],
+                difficulty_level=row[3],
+                keywords=_split_keywords(row[4]),
+                created_at=datetime.fromisoformat(row[5]),
+                snippet=make_snippet(body, query) if match_query else body[:200],
+                # bm25 do SQLite é negativo: quanto menor, mais relevante
+                score=-row[8],
+            )
+            for row, body in zip(rows, bodies)
+        ]
+
+        return TutorialSearchPage(
+            query=query,
+            page=page,
+            page_size=page_size,
+            has_more=len(rows) > page_size,
+            results=results,
+        )
+
+    def _search(self, match_query: str, limit: int, offset: int) -> List[tuple]:
+        metadata_query = f"{METADATA_COLUMNS}: ({match_query})"
+        body_query = f"({match_query}) NOT {metadata_query}"
+
+        metadata_count = self._count(metadata_query)
+        rows = []
+
+        if offset < metadata_count:
+            rows = self._connection.execute(
+                SEARCH_QUERY.format(order="rank"), (metadata_query, limit, offset)
+            ).fetchall()
+
+        if (remaining := limit - len(rows)) > 0:
+            order = (
+                "rank"
+                if self._count(body_query) <= MAX_RANKED_BODY_MATCHES
+                else "tutorials_fts.rowid DESC"
+            )
+            rows += self._connection.execute(
+                SEARCH_QUERY.format(order=order),
+                (body_query, remaining, max(0, offset - metadata_count)),
+            ).fetchall()
+
+        return rows
+
+    def _count(self, match_query: str) -> int:
+        return self._connection.execute(COUNT_QUERY, (match_query,)).fetchone()[0]
+
+    def delete(self, tutorial_id: int) -> bool:
+        """
+        Remove um tutorial do histórico
+
+        Args:
+            tutorial_id: Identificador do tutorial
+
+        Returns:
+            bool: True se o tutorial existia e foi removido
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                """
+                SELECT title, keywords, subject, body, dictionary_id
+                FROM tutorials WHERE id = ?
+                """,
+                (tutorial_id,),
+            ).fetchone()
+
+            if row is None:
+                return False
+
+            row = (*row[:3], self._decompress(row[3], row[4]))
+
+            # Índices sem conteúdo exigem os valores antigos na remoção
+            self._connection.execute(
+                """
+                INSERT INTO tutorials_fts (
+                    tutorials_fts, rowid, title, keywords, subject, body
+                ) VALUES ('delete', ?, ?, ?, ?, ?)
+                """,
+                (tutorial_id, *row),
+            )
+            self._connection.execute(
+                "DELETE FROM tutorials WHERE id = ?", (tutorial_id,)
+            )
+
+        return True
+
+
+def _level(difficulty_level) -> str | None:
+    if difficulty_level is None:
+        return None
+
+    return getattr(difficulty_level, "value", str(difficulty_level))
+
+
+def _split_keywords(keywords: str | None) -> List[str]:
+    return [keyword for keyword in (keywords or "").split(", ") if keyword]
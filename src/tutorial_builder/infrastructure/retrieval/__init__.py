@@ -0,0 +1,5 @@
+from .chunker import chunk_markdown
+from .hashed_embedder import HashedNgramEmbedder
+from .memmap_index import MemmapVectorIndex
+
+__all__ = ["chunk_markdown", "HashedNgramEmbedder", "MemmapVectorIndex"]
@@ -0,0 +1,89 @@
+import re
+
+from typing import List
+
+HEADING = re.compile(r"^#{1,6}\s")
+
+
+def split_blocks(text: str) -> List[str]:
+    """
+    Divide um texto Markdown em blocos: parágrafos, listas e blocos de
+    código (```), que nunca são divididos ao meio.
+
+    Args:
+        text: Texto Markdown
+
+    Returns:
+        List[str]: Blocos não vazios, na ordem do texto
+    """
+    blocks: List[str] = []
+    current: List[str] = []
+    in_code_block = False
+
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code_block = not in_code_block
+
+        # Títulos iniciam um novo bloco; linhas em branco encerram o bloco atual
+        starts_block = not in_code_block and HEADING.match(line)
+        ends_block = not in_code_block and not line.strip()
+
+        if (starts_block or ends_block) and current:
+            blocks.append("\n".join(current).strip())
+            current = []
+
+        if not ends_block:
+            current.append(line)
+
+    if current:
+        blocks.append("\n".join(current).strip())
+
+    return [block for block in blocks if block]
+
+
+def chunk_markdown(text: str, max_chars: int = 800) -> List[str]:
+    """
+    Agrupa os blocos de um texto Markdown em trechos de até `max_chars`
+    caracteres. Cada trecho começa com o último título visto, para que o
+    trecho seja compreensível (e encontrável) isoladamente. Blocos maiores
+    que o limite formam um trecho sozinhos.
+
+    Args:
+        text: Texto Markdown
+        max_chars: Tamanho máximo aproximado de cada trecho
+
+    Returns:
+        List[str]: Trechos do texto
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    heading = ""
+
+    def flush() -> None:
+        nonlocal current, size
+        if current and not all(_is_heading(block) for block in current):
+            prefix = [heading] if heading and not HEADING.match(current[0]) else []
+            chunks.append("\n\n".join(prefix + current))
+        current, size = [], 0
+
+    for block in split_blocks(text):
+        if HEADING.match(block):
+            flush()
+            heading = block.splitlines()[0]
+
+        if size + len(block) > max_chars:
+            flush()
+
+        current.append(block)
+        size += len(block)
+
+    flush()
+    return chunks
+
+
+def _is_heading(block: str) -> bool:
+    """
+    Verifica se o bloco contém apenas um título, sem conteúdo.
+    """
+    return bool(HEADING.match(block)) and "\n" not in block
@@ -0,0 +1,127 @@
+import re
+import zlib
+
+from typing import Iterable, List
+
+import numpy as np
+
+from domain.text import char_trigrams, fold
+
+WORD = re.compile(r"\w+")
+
+
+class HashedNgramEmbedder:
+    """
+    Embedding local, sem modelo: cada texto vira um vetor de dimensão fixa
+    com a contagem de palavras, pares de palavras e trigramas de caracteres
+    (tolerantes a variações como plural e erros de digitação), projetados por
+    hashing com sinal.
+
+    O hash usado é o crc32, estável entre processos (ao contrário de `hash`),
+    para que vetores salvos em disco continuem válidos. Os vetores são
+    normalizados (norma L2 igual a 1): o produto escalar é a similaridade
+    de cosseno.
+    """
+
+    def __init__(
+        self,
+        dim: int = 384,
+        word_weight: float = 1.0,
+        bigram_weight: float = 0.5,
+        trigram_weight: float = 0.25,
+    ):
+        """
+        Args:
+            dim: Dimensão dos vetores
+            word_weight: Peso das palavras
+            bigram_weight: Peso dos pares de palavras consecutivas
+            trigram_weight: Peso dos trigramas de caracteres de cada palavra
+        """
+        self.dim = dim
+        self.weights = (word_weight, bigram_weight, trigram_weight)
+
+    @property
+    def config(self) -> dict:
+        """
+        Configuração do embedding; índices só são compatíveis com a mesma.
+        """
+        return {"name": "hashed_ngram", "dim": self.dim, "weights": self.weights}
+
+    def features(self, text: str) -> List[tuple[str, float]]:
+        """
+        Extrai as features do texto com seus pesos.
+
+        Args:
+            text: Texto de entrada
+
+        Returns:
+            List[tuple[str, float]]: Pares (feature, peso)
+        """
+        words = WORD.findall(fold(text))
+
+        word_weight, bigram_weight, trigram_weight = self.weights
+        features = [(word, word_weight) for word in words]
+        features += [
+            (f"{first} {second}", bigram_weight)
+            for first, second in zip(words, words[1:])
+        ]
+
+        for word in words:
+            features += [(trigram, trigram_weight) for trigram in char_trigrams(word)]
+
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Calcula o vetor de um texto.
+
+        Args:
+            text: Texto de entrada
+
+        Returns:
+            np.ndarray: Vetor float32 normalizado
+        """
+        features = self.features(text)
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        if not features:
+            return vector
+
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature, _ in features),
+            dtype=np.uint32,
+            count=len(features),
+        )
+        weights = np.fromiter(
+            (weight for _, weight in features), dtype=np.float32, count=len(features)
+        )
+
+        # O bit mais alto do hash define o sinal, reduzindo o viés das colisões
+        signs = np.where(hashes >> 31, 1.0, -1.0).astype(np.float32)
+        vector += np.bincount(
+            hashes % self.dim, weights=weights * signs, minlength=self.dim
+        ).astype(np.float32)
+
+        # Escala sublinear: termos muito repetidos não dominam o vetor
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed_many(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Calcula os vetores de vários textos.
+
+        Args:
+            texts: Textos de entrada
+
+        Returns:
+            np.ndarray: Matriz float32 com um vetor por linha
+        """
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+
+        return matrix
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import logging
+import threading
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+
+from entities import RetrievedChunk
+from domain.interfaces import RetrievalIndex
+from monitoring import metrics
+
+from .chunker import chunk_markdown
+from .hashed_embedder import HashedNgramEmbedder
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem bloqueio entre processos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class MemmapVectorIndex(RetrievalIndex):
+    """
+    Índice vetorial local, persistido em um diretório:
+
+    - `vectors.f32`: matriz de vetores (float32), mapeada em memória (np.memmap)
+        e ampliada dobrando a capacidade quando necessário;
+    - `chunks.jsonl`: texto e origem de cada trecho, uma linha por vetor;
+    - `index.json`: configuração do embedding usado para criar os vetores.
+
+    Apenas as posições das linhas de `chunks.jsonl` ficam em memória; os textos
+    são lidos do disco só para os trechos retornados. A busca é um único
+    produto matriz-vetor seguido de `argpartition` para os k melhores.
+    Os vetores são gravados antes dos textos, então, após uma falha, vetores
+    sem texto correspondente são simplesmente ignorados.
+
+    Vários processos podem usar o mesmo diretório (ex: os processos do
+    workflow): os acréscimos são serializados por um bloqueio de arquivo
+    (`index.lock`), e cada processo lê os trechos acrescentados pelos outros
+    antes de acrescentar os seus e antes de buscar.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        embedder: HashedNgramEmbedder | None = None,
+        max_chunk_chars: int = 800,
+        min_score: float = 0.1,
+        initial_capacity: int = 1_024,
+    ):
+        """
+        Args:
+            directory: Diretório do índice (criado se não existir)
+            embedder: Embedding usado para os vetores
+            max_chunk_chars: Tamanho máximo aproximado de cada trecho
+            min_score: Similaridade mínima para um trecho ser retornado
+            initial_capacity: Capacidade inicial da matriz, em vetores
+        """
+        self.directory = Path(directory)
+        self.embedder = embedder or HashedNgramEmbedder()
+        self.max_chunk_chars = max_chunk_chars
+        self.min_score = min_score
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / "vectors.f32"
+        self._chunks_path = self.directory / "chunks.jsonl"
+        self._lock_path = self.directory / "index.lock"
+        self._lock = threading.Lock()
+
+        with self._exclusive():
+            self._check_config()
+            self._load_chunks()
+            self._open_vectors(max(initial_capacity, self._count))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, text: str, source: str) -> int:
+        """
+        Divide um documento em trechos e adiciona ao índice os que ainda não
+        estão nele.
+
+        Args:
+            text: Texto do documento (Markdown)
+            source: Origem do documento (ex: "tutorial:42")
+
+        Returns:
+            int: Quantidade de trechos adicionados
+        """
+        with self._lock, self._exclusive():
+            # Trechos acrescentados por outros processos desde a última leitura
+            self._refresh()
+
+            chunks = []
+            for chunk in chunk_markdown(text, self.max_chunk_chars):
+                digest = _digest(chunk)
+                if digest not in self._digests:
+                    self._digests.add(digest)
+                    chunks.append(chunk)
+
+            if not chunks:
+                return 0
+
+            vectors = self.embedder.embed_many(chunks)
+            start = self._count
+            self._ensure_capacity(start + len(chunks))
+            self._vectors[start : start + len(chunks)] = vectors
+            self._vectors.flush()
+
+            with open(self._chunks_path, "ab") as f:
+                for chunk in chunks:
+                    self._offsets.append(f.tell())
+                    line = json.dumps({"text": chunk, "source": source})
+                    f.write(line.encode("utf-8") + b"\n")
+
+                self._end = f.tell()
+
+            self._count += len(chunks)
+
+        metrics.increment("retrieval.chunks_added", len(chunks))
+        return len(chunks)
+
+    def search(self, query: str, k: int = 3) -> List[RetrievedChunk]:
+        """
+        Busca os trechos mais parecidos com a consulta (similaridade de cosseno)
+
+        Args:
+            query: Texto da consulta
+            k: Quantidade máxima de trechos
+
+        Returns:
+            List[RetrievedChunk]: Trechos em ordem decrescente de similaridade
+        """
+        query_vector = self.embedder.embed(query)
+
+        with self._lock:
+            if self._chunks_size() != self._end:
+                with self._exclusive():
+                    self._refresh()
+                    self._ensure_capacity(self._count)
+
+            count = self._count
+            matrix = self._vectors[:count]
+            offsets = self._offsets
+
+        if count == 0 or k <= 0 or not query_vector.any():
+            return []
+
+        scores = matrix @ query_vector
+
+        if count > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(count)
+
+        top = top[np.argsort(-scores[top])]
+        top = [index for index in top if scores[index] >= self.min_score]
+
+        results = []
+        with open(self._chunks_path, "rb") as f:
+            for index in top:
+                f.seek(offsets[index])
+                chunk = json.loads(f.readline())
+                results.append(
+                    RetrievedChunk(
+                        text=chunk["text"],
+                        source=chunk["source"],
+                        score=float(scores[index]),
+                    )
+                )
+
+        metrics.increment("retrieval.queries", hit=bool(results))
+        return results
+
+    def _check_config(self) -> None:
+        config_path = self.directory / "index.json"
+        config = self.embedder.config
+
+        if not config_path.exists():
+            config_path.write_text(json.dumps(config))
+            return
+
+        stored = json.loads(config_path.read_text())
+        if stored != json.loads(json.dumps(config)):
+            raise ValueError(
+                f"O índice em {self.directory} foi criado com outro embedding "
+                f"({stored}); apague o diretório para recriá-lo"
+            )
+
+    def _load_chunks(self) -> None:
+        self._offsets: List[int] = []
+        self._digests: set[str] = set()
+        self._end = 0
+        self._count = 0
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """
+        Lê as linhas de `chunks.jsonl` gravadas depois da última leitura (por
+        este ou por outros processos). Deve ser chamada com o bloqueio do
+        arquivo, para não confundir uma gravação em andamento com uma
+        interrompida.
+        """
+        if self._chunks_size() == self._end:
+            return
+
+        with open(self._chunks_path, "r+b") as f:
+            f.seek(self._end)
+            offset = self._end
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Linha incompleta de uma gravação interrompida
+                    f.truncate(offset)
+                    break
+
+                self._offsets.append(offset)
+                self._digests.add(_digest(json.loads(line)["text"]))
+                offset += len(line)
+
+        self._end = offset
+        self._count = len(self._offsets)
+
+    def _chunks_size(self) -> int:
+        try:
+            return self._chunks_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """
+        Bloqueia os acréscimos de outros processos ao índice
+        """
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._lock_path, "ab") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _open_vectors(self, capacity: int) -> None:
+        size = capacity * self.embedder.dim * 4
+
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+
+        capacity = self._vectors_path.stat().st_size // (self.embedder.dim * 4)
+        self._vectors = np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, self.embedder.dim),
+        )
+
+    def _ensure_capacity(self, required: int) -> None:
+        capacity = self._vectors.shape[0]
+        if required <= capacity:
+            return
+
+        while capacity < required:
+            capacity *= 2
+
+        logger.info("Ampliando o índice vetorial para %d vetores", capacity)
+        self._vectors.flush()
+        self._open_vectors(capacity)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
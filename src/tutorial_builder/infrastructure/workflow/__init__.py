@@ -1,3 +1,14 @@
 from .tutorial_workflow import TutorialWorkflow
+from .hash_ring import HashRing
+from .run_manager import RunEvent, RunManager, RunStatus, WorkflowRun
+from .supervisor import WorkerSupervisor
 
-__all__ = ["TutorialWorkflow"]
+__all__ = [
+    "TutorialWorkflow",
+    "HashRing",
+    "RunEvent",
+    "RunManager",
+    "RunStatus",
+    "WorkerSupervisor",
+    "WorkflowRun",
+]
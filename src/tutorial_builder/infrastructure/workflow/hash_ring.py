@@ -0,0 +1,98 @@
+import bisect
+import hashlib
+
+from typing import Dict, Iterable, List
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class HashRing:
+    """
+    Hash consistente: distribui chaves (ex: thread_id) entre nós (ex:
+    processos do workflow) de forma estável. Cada nó ocupa vários pontos
+    virtuais no anel, para equilibrar a carga; ao adicionar ou remover um nó,
+    só as chaves dos pontos afetados (cerca de 1/N) mudam de dono.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 128):
+        """
+        Args:
+            nodes: Nós iniciais
+            replicas: Pontos virtuais de cada nó no anel
+        """
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._nodes: set[str] = set()
+
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    @property
+    def nodes(self) -> List[str]:
+        """
+        Nós do anel, em ordem alfabética
+        """
+        return sorted(self._nodes)
+
+    def add(self, node: str) -> None:
+        """
+        Adiciona um nó ao anel (sem efeito se ele já existir)
+
+        Args:
+            node: Nome do nó
+        """
+        if node in self._nodes:
+            return
+
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            # Colisões (raríssimas) ficam com o primeiro nó
+            if point not in self._owners:
+                self._owners[point] = node
+                bisect.insort(self._points, point)
+
+    def remove(self, node: str) -> None:
+        """
+        Remove um nó do anel (sem efeito se ele não existir)
+
+        Args:
+            node: Nome do nó
+        """
+        if node not in self._nodes:
+            return
+
+        self._nodes.discard(node)
+        self._points = [point for point in self._points if self._owners[point] != node]
+        self._owners = {point: self._owners[point] for point in self._points}
+
+    def get(self, key: str) -> str:
+        """
+        Retorna o nó responsável pela chave: o dono do primeiro ponto do anel
+        a partir do hash da chave
+
+        Args:
+            key: Chave (ex: thread_id)
+
+        Returns:
+            str: Nome do nó
+
+        Raises:
+            LookupError: Se o anel não tiver nós
+        """
+        if not self._points:
+            raise LookupError("O anel não tem nós")
+
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
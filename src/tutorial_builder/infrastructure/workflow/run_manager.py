@@ -0,0 +1,411 @@
+import copy
+import datetime
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from interfaces import Workflow
+from llm import (
+    CancellationToken,
+    RunCancelledError,
+    cancellation_scope,
+    token_stream_scope,
+)
+from monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+# Descrição do progresso quando cada nó do grafo termina
+NODE_LABELS = {
+    "planner": "Planejamento atualizado",
+    "expert": "Conteúdo do passo gerado",
+    "writer": "Tutorial final escrito",
+    "troubleshooting": "Solução do problema gerada",
+    "qa": "Resposta gerada",
+}
+
+
+class RunStatus(str, Enum):
+    """
+    Situação de uma execução do workflow
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class RunEvent(NamedTuple):
+    """
+    Evento de progresso de uma execução
+
+    Attributes:
+        kind (str): "node" (um nó do grafo terminou), "progress" (mensagem de
+            um nó, em markdown) ou "token" (parte de uma resposta do LLM)
+        text (str): Descrição do nó, mensagem ou parte da resposta
+        source (str): Nome do nó ou ponto de chamada do LLM, se houver
+    """
+
+    kind: str
+    text: str
+    source: str | None = None
+
+
+class WorkflowRun:
+    """
+    Uma rodada do workflow (uma mensagem do usuário) executada em segundo
+    plano. O progresso fica em `events`, que pode ser consultado
+    periodicamente, aguardado com `wait_events` ou acompanhado com
+    `subscribe` (ex: de um event loop asyncio).
+
+    Attributes:
+        thread_id (str): Identificador da conversa (thread_id do LangGraph)
+        status (RunStatus): Situação da execução
+        events (List[RunEvent]): Eventos de progresso
+        result (Dict[str, Any]): Estado final do workflow, se concluída
+        error (BaseException): Erro da execução, se falhou
+        created_at (datetime): Data e hora do envio
+        finished_at (datetime): Data e hora do término
+    """
+
+    def __init__(self, thread_id: str):
+        self.thread_id = thread_id
+        self.status = RunStatus.QUEUED
+        self.events: List[RunEvent] = []
+        self.result: Dict[str, Any] | None = None
+        self.error: BaseException | None = None
+        self.created_at = datetime.datetime.now()
+        self.finished_at: datetime.datetime | None = None
+        self.token = CancellationToken()
+        self._condition = threading.Condition()
+        self._subscribers: List[Callable[[], None]] = []
+
+    @property
+    def done(self) -> bool:
+        """
+        Indica se a execução terminou (concluída, cancelada ou com falha)
+        """
+        return self.status in (
+            RunStatus.COMPLETED,
+            RunStatus.CANCELLED,
+            RunStatus.FAILED,
+        )
+
+    def wait_events(
+        self, position: int = 0, timeout: float | None = None
+    ) -> List[RunEvent]:
+        """
+        Aguarda novos eventos de progresso
+
+        Args:
+            position: Quantidade de eventos já recebidos
+            timeout: Tempo máximo de espera em segundos (None espera até
+                haver novidades; 0 apenas consulta)
+
+        Returns:
+            List[RunEvent]: Eventos a partir de `position` (vazia se a execução
+                terminou ou o tempo acabou sem novidades)
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: len(self.events) > position or self.done, timeout
+            )
+            return self.events[position:]
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Aguarda o término da execução
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            bool: True se a execução terminou
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.done, timeout)
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Registra uma função chamada, na thread da execução, a cada novo evento
+        e no término (imediatamente, se a execução já terminou). A função não
+        recebe argumentos: o estado atual é lido da própria execução.
+
+        Args:
+            callback: Função sem argumentos, que não deve bloquear
+
+        Returns:
+            Callable[[], None]: Função que cancela o registro
+        """
+        with self._condition:
+            if not self.done:
+                self._subscribers.append(callback)
+                return lambda: self._unsubscribe(callback)
+
+        callback()
+        return lambda: None
+
+    def _unsubscribe(self, callback: Callable[[], None]) -> None:
+        with self._condition:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self) -> None:
+        with self._condition:
+            self._condition.notify_all()
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("Falha ao notificar o progresso da execução: %s", e)
+
+    def _publish(self, kind: str, text: str, source: str | None = None) -> None:
+        with self._condition:
+            if self.done:
+                return
+            self.events.append(RunEvent(kind, text, source))
+
+        self._notify()
+
+    def _finish(
+        self,
+        status: RunStatus,
+        result: Dict[str, Any] | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        with self._condition:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = datetime.datetime.now()
+
+        self._notify()
+
+        with self._condition:
+            self._subscribers.clear()
+
+
+class RunManager:
+    """
+    Executa as rodadas do workflow em segundo plano, em um pool de threads,
+    para que a interface continue respondendo e possa cancelar uma rodada
+    lenta.
+
+    Cada conversa (thread_id) tem no máximo uma rodada em andamento; rodadas
+    de conversas diferentes rodam em paralelo, até o limite do pool.
+
+    O cancelamento interrompe a chamada ao LLM em andamento (ver
+    CancellableLLMService) e desfaz o checkpoint parcial: a conversa volta ao
+    último checkpoint anterior à rodada. O estado recebido é copiado no envio,
+    então os objetos de quem chamou (ex: o st.session_state) nunca recebem
+    alterações de uma rodada cancelada ou com falha.
+    """
+
+    def __init__(self, workflow: Workflow, max_workers: int = 4):
+        """
+        Args:
+            workflow: Workflow executado em cada rodada
+            max_workers: Quantidade máxima de rodadas executadas ao mesmo tempo
+        """
+        self.workflow = workflow
+        self._graph = workflow.compile()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="workflow-run"
+        )
+        self._runs: Dict[str, WorkflowRun] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        state: Dict[str, Any],
+        config: Dict[str, Any],
+        on_complete: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> WorkflowRun:
+        """
+        Envia uma rodada do workflow para execução em segundo plano
+
+        Args:
+            state: Estado de entrada do workflow
+            config: Configurações do workflow, com o thread_id da conversa
+            on_complete: Função chamada com o estado final, na thread da
+                execução, antes de ela ser marcada como concluída (ex: para
+                salvar a sessão); se falhar, a execução falha
+
+        Returns:
+            WorkflowRun: A execução, para acompanhar o progresso e o resultado
+
+        Raises:
+            RuntimeError: Se já houver uma rodada em andamento na conversa
+        """
+        thread_id = str(config.get("configurable", {}).get("thread_id", "default"))
+
+        with self._lock:
+            active = self._runs.get(thread_id)
+            if active is not None and not active.done:
+                raise RuntimeError(
+                    f"Já existe uma execução em andamento na conversa {thread_id}"
+                )
+
+            run = WorkflowRun(thread_id)
+            self._runs[thread_id] = run
+
+        self._executor.submit(
+            self._execute, run, copy.deepcopy(state), config, on_complete
+        )
+        metrics.increment("workflow_runs.submitted")
+
+        return run
+
+    def get(self, thread_id: str) -> WorkflowRun | None:
+        """
+        Retorna a última rodada da conversa
+
+        Args:
+            thread_id: Identificador da conversa
+
+        Returns:
+            WorkflowRun | None: A rodada, ou None se a conversa não tiver rodadas
+        """
+        with self._lock:
+            return self._runs.get(thread_id)
+
+    def cancel(self, thread_id: str) -> bool:
+        """
+        Solicita o cancelamento da rodada em andamento na conversa
+
+        Args:
+            thread_id: Identificador da conversa
+
+        Returns:
+            bool: True se havia uma rodada em andamento
+        """
+        run = self.get(thread_id)
+        if run is None or run.done:
+            return False
+
+        run.token.cancel()
+        return True
+
+    @property
+    def thread_ids(self) -> List[str]:
+        """
+        Conversas com rodadas neste gerenciador
+        """
+        with self._lock:
+            return list(self._runs)
+
+    def release(self, thread_id: str) -> bool:
+        """
+        Descarta a última rodada e os checkpoints da conversa (ex: quando ela
+        passa a ser atendida por outro processo). O estado da conversa deve
+        estar salvo fora do checkpointer, como nas sessões da API.
+
+        Args:
+            thread_id: Identificador da conversa
+
+        Returns:
+            bool: False se houver uma rodada em andamento (nada é descartado)
+        """
+        with self._lock:
+            run = self._runs.get(thread_id)
+            if run is not None and not run.done:
+                return False
+
+            self._runs.pop(thread_id, None)
+
+        if self._graph.checkpointer is not None:
+            self._graph.checkpointer.delete_thread(thread_id)
+
+        return True
+
+    def shutdown(self) -> None:
+        """
+        Cancela as rodadas em andamento e encerra o pool
+        """
+        with self._lock:
+            runs = list(self._runs.values())
+
+        for run in runs:
+            run.token.cancel()
+
+        self._executor.shutdown(wait=True)
+
+    def _execute(
+        self,
+        run: WorkflowRun,
+        state: Dict[str, Any],
+        config: Dict[str, Any],
+        on_complete: Callable[[Dict[str, Any]], None] | None,
+    ) -> None:
+        graph = self._graph
+
+        if run.token.cancelled:
+            run._finish(RunStatus.CANCELLED)
+            metrics.increment("workflow_runs.cancelled")
+            return
+
+        run.status = RunStatus.RUNNING
+        snapshot = graph.get_state(config)
+        result = None
+
+        try:
+            with (
+                cancellation_scope(run.token),
+                token_stream_scope(
+                    lambda call_site, text: run._publish("token", text, call_site)
+                ),
+            ):
+                for mode, chunk in graph.stream(
+                    state, config, stream_mode=["updates", "custom", "values"]
+                ):
+                    if mode == "values":
+                        result = chunk
+                    elif mode == "custom":
+                        run._publish("progress", str(chunk))
+                    else:
+                        for node in chunk:
+                            run._publish("node", NODE_LABELS.get(node, node), node)
+
+                    run.token.raise_if_cancelled()
+
+            if on_complete is not None:
+                on_complete(result)
+
+        except RunCancelledError:
+            self._rollback(graph, snapshot, config)
+            run._finish(RunStatus.CANCELLED)
+            metrics.increment("workflow_runs.cancelled")
+            return
+
+        except Exception as e:
+            logger.exception("Falha na execução do workflow (%s)", run.thread_id)
+            self._rollback(graph, snapshot, config)
+            run._finish(RunStatus.FAILED, error=e)
+            metrics.increment("workflow_runs.failed")
+            return
+
+        run._finish(RunStatus.COMPLETED, result=result)
+        metrics.increment("workflow_runs.completed")
+
+    def _rollback(self, graph: Any, snapshot: Any, config: Dict[str, Any]) -> None:
+        """
+        Volta a conversa ao checkpoint anterior à rodada, descartando os
+        checkpoints dos nós que chegaram a terminar.
+        """
+        try:
+            # Sem valores, o checkpoint anterior é copiado como o mais recente
+            if snapshot.config.get("configurable", {}).get("checkpoint_id"):
+                graph.update_state(snapshot.config, None)
+            elif graph.checkpointer is not None:
+                graph.checkpointer.delete_thread(
+                    config.get("configurable", {}).get("thread_id")
+                )
+        except Exception as e:
+            logger.warning("Não foi possível desfazer o checkpoint parcial: %s", e)
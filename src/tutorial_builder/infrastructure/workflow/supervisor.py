@@ -0,0 +1,549 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Set
+
+from monitoring import metrics
+
+from .hash_ring import HashRing
+from .run_manager import RunManager, RunStatus, WorkflowRun
+
+logger = logging.getLogger(__name__)
+
+# Tempo máximo, em segundos, para um processo criar o workflow e ficar pronto
+STARTUP_TIMEOUT = 120.0
+
+# Tempo máximo, em segundos, para um processo terminar ao ser encerrado
+STOP_TIMEOUT = 30.0
+
+
+class _Worker:
+    """
+    Processo do workflow, visto pelo supervisor
+    """
+
+    def __init__(self, name: str, process: Any, connection: Connection):
+        self.name = name
+        self.process = process
+        self.connection = connection
+        self.active: Set[str] = set()
+        self.stopping = False
+        self._send_lock = threading.Lock()
+
+    def send(self, message: tuple) -> None:
+        with self._send_lock:
+            self.connection.send(message)
+
+
+class WorkerSupervisor:
+    """
+    Executa as rodadas do workflow em vários processos, para usar todos os
+    núcleos (o GIL limita o RunManager a um núcleo), com a mesma interface do
+    RunManager (submit, get, cancel e shutdown).
+
+    Cada conversa (thread_id) é atendida sempre pelo mesmo processo, escolhido
+    por hash consistente, de modo que o checkpointer em memória e os caches
+    de cada processo continuem aproveitados. Ao adicionar ou remover um
+    processo, apenas cerca de 1/N das conversas mudam de dono: como cada
+    rodada recebe o estado completo da sessão, salvo fora dos processos
+    (ex: SQLiteSessionStore), o novo dono continua a conversa sem o
+    checkpoint anterior, e o antigo descarta o que tinha da conversa.
+
+    Processos que terminam inesperadamente são substituídos, com o mesmo nome
+    (as conversas não mudam de dono), e as suas rodadas em andamento falham.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], RunManager],
+        processes: int = 2,
+        restart: bool = True,
+        replicas: int = 128,
+    ):
+        """
+        Args:
+            factory: Função que cria o RunManager de cada processo (deve ser
+                importável pelos processos, ex: `main.create_run_manager`)
+            processes: Quantidade inicial de processos
+            restart: Se True, substitui os processos que terminarem
+                inesperadamente
+            replicas: Pontos virtuais de cada processo no hash consistente
+        """
+        self.factory = factory
+        self.restart = restart
+
+        self._context = multiprocessing.get_context("spawn")
+        self._ring = HashRing(replicas=replicas)
+        self._workers: Dict[str, _Worker] = {}
+        self._runs: Dict[str, WorkflowRun] = {}
+        self._callbacks: Dict[str, Callable[[Dict[str, Any]], None] | None] = {}
+        self._owners: Dict[str, str] = {}
+        self._names = itertools.count(1)
+        self._lock = threading.RLock()
+        self._drained = threading.Condition(self._lock)
+        self._closed = False
+
+        # Acorda a thread de leitura quando os processos mudam
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+        self._completions = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="workflow-completion"
+        )
+        self._reader = threading.Thread(
+            target=self._read, name="workflow-supervisor", daemon=True
+        )
+        self._reader.start()
+
+        workers = [self._spawn(f"worker-{next(self._names)}") for _ in range(processes)]
+        try:
+            for worker in workers:
+                self._register(worker)
+        except BaseException:
+            for worker in workers:
+                worker.process.kill()
+            self.shutdown()
+            raise
+
+    @property
+    def workers(self) -> List[str]:
+        """
+        Nomes dos processos que recebem conversas
+        """
+        with self._lock:
+            return self._ring.nodes
+
+    def owner(self, thread_id: str) -> str:
+        """
+        Retorna o processo responsável pela conversa
+
+        Args:
+            thread_id: Identificador da conversa
+
+        Returns:
+            str: Nome do processo
+
+        Raises:
+            LookupError: Se não houver processos
+        """
+        with self._lock:
+            return self._ring.get(thread_id)
+
+    def add_worker(self) -> str:
+        """
+        Inicia um novo processo e passa para ele as conversas que o hash
+        consistente lhe atribui (os donos anteriores descartam o que tinham
+        delas)
+
+        Returns:
+            str: Nome do processo
+        """
+        worker = self._spawn(f"worker-{next(self._names)}")
+        self._register(worker)
+        metrics.increment("workflow_supervisor.workers_added")
+
+        return worker.name
+
+    def remove_worker(self, name: str, timeout: float | None = None) -> bool:
+        """
+        Remove um processo: ele deixa de receber conversas, termina as rodadas
+        em andamento e é encerrado. As próximas rodadas das suas conversas vão
+        para os novos donos.
+
+        Args:
+            name: Nome do processo
+            timeout: Tempo máximo de espera pelas rodadas em andamento (após
+                o tempo, elas são canceladas)
+
+        Returns:
+            bool: False se o processo não existir
+        """
+        with self._lock:
+            worker = self._workers.get(name)
+            if worker is None or worker.stopping:
+                return False
+
+            self._ring.remove(name)
+            if not self._drained.wait_for(lambda: not worker.active, timeout):
+                for thread_id in list(worker.active):
+                    self.cancel(thread_id)
+                self._drained.wait_for(lambda: not worker.active, STOP_TIMEOUT)
+
+            worker.stopping = True
+
+        self._stop(worker)
+        metrics.increment("workflow_supervisor.workers_removed")
+
+        return True
+
+    def submit(
+        self,
+        state: Dict[str, Any],
+        config: Dict[str, Any],
+        on_complete: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> WorkflowRun:
+        """
+        Envia uma rodada do workflow para o processo responsável pela conversa
+
+        Args:
+            state: Estado de entrada do workflow, completo (o processo pode
+                não ter o checkpoint da conversa)
+            config: Configurações do workflow, com o thread_id da conversa
+            on_complete: Função chamada com o estado final, neste processo,
+                antes de a rodada ser marcada como concluída
+
+        Returns:
+            WorkflowRun: A execução, atualizada com os eventos do processo
+
+        Raises:
+            RuntimeError: Se já houver uma rodada em andamento na conversa ou
+                se não houver processos
+        """
+        thread_id = str(config.get("configurable", {}).get("thread_id", "default"))
+
+        with self._lock:
+            active = self._runs.get(thread_id)
+            if active is not None and not active.done:
+                raise RuntimeError(
+                    f"Já existe uma execução em andamento na conversa {thread_id}"
+                )
+            if self._closed or not len(self._ring):
+                raise RuntimeError("Nenhum processo do workflow disponível")
+
+            worker = self._workers[self._ring.get(thread_id)]
+            run = WorkflowRun(thread_id)
+            self._runs[thread_id] = run
+            self._callbacks[thread_id] = on_complete
+            self._owners[thread_id] = worker.name
+            worker.active.add(thread_id)
+
+        try:
+            worker.send(("submit", thread_id, state, config))
+        except (OSError, ValueError) as e:
+            self._complete(worker, thread_id, RunStatus.FAILED, None, str(e))
+
+        metrics.increment("workflow_supervisor.submitted", worker=worker.name)
+        return run
+
+    def get(self, thread_id: str) -> WorkflowRun | None:
+        """
+        Retorna a última rodada da conversa
+
+        Args:
+            thread_id: Identificador da conversa
+
+        Returns:
+            WorkflowRun | None: A rodada, ou None se a conversa não tiver rodadas
+        """
+        with self._lock:
+            return self._runs.get(thread_id)
+
+    def cancel(self, thread_id: str) -> bool:
+        """
+        Solicita o cancelamento da rodada em andamento na conversa
+
+        Args:
+            thread_id: Identificador da conversa
+
+        Returns:
+            bool: True se havia uma rodada em andamento
+        """
+        with self._lock:
+            run = self._runs.get(thread_id)
+            worker = self._workers.get(self._owners.get(thread_id, ""))
+
+        if run is None or run.done:
+            return False
+
+        run.token.cancel()
+        if worker is not None:
+            try:
+                worker.send(("cancel", thread_id))
+            except (OSError, ValueError):
+                pass
+
+        return True
+
+    def shutdown(self) -> None:
+        """
+        Cancela as rodadas em andamento e encerra os processos
+        """
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers.values())
+            for worker in workers:
+                worker.stopping = True
+            self._ring = HashRing(replicas=self._ring.replicas)
+
+        for worker in workers:
+            self._stop(worker)
+
+        self._wakeup_writer.send(None)
+        self._reader.join()
+        self._completions.shutdown(wait=True)
+
+        # Rodadas dos processos que terminaram sem respondê-las
+        with self._lock:
+            runs = [run for run in self._runs.values() if not run.done]
+        for run in runs:
+            run._finish(RunStatus.CANCELLED)
+
+    def _spawn(self, name: str) -> _Worker:
+        connection, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(name, child, self.factory),
+            name=f"tutorial-builder-{name}",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+
+        return _Worker(name, process, connection)
+
+    def _register(self, worker: _Worker) -> None:
+        # Aguarda o processo criar o workflow antes de lhe enviar conversas
+        if not worker.connection.poll(STARTUP_TIMEOUT):
+            worker.process.kill()
+            raise RuntimeError(f"O processo {worker.name} não ficou pronto a tempo")
+        try:
+            worker.connection.recv()
+        except EOFError:
+            raise RuntimeError(f"O processo {worker.name} terminou ao iniciar")
+
+        with self._lock:
+            self._workers[worker.name] = worker
+            self._ring.add(worker.name)
+            self._broadcast_ring()
+
+        self._wakeup_writer.send(None)
+        logger.info("Processo %s pronto (pid %s)", worker.name, worker.process.pid)
+
+    def _broadcast_ring(self) -> None:
+        # Cada processo descarta as conversas que deixaram de ser suas
+        message = ("ring", self._ring.nodes, self._ring.replicas)
+        for worker in self._workers.values():
+            if not worker.stopping:
+                try:
+                    worker.send(message)
+                except (OSError, ValueError):
+                    pass
+
+    def _stop(self, worker: _Worker) -> None:
+        try:
+            worker.send(("stop",))
+        except (OSError, ValueError):
+            pass
+
+        worker.process.join(STOP_TIMEOUT)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+
+    def _read(self) -> None:
+        """
+        Recebe os eventos de todos os processos e atualiza as rodadas
+        """
+        while True:
+            with self._lock:
+                if self._closed and not self._workers:
+                    return
+                connections = {
+                    worker.connection: worker for worker in self._workers.values()
+                }
+
+            for connection in wait([self._wakeup_reader, *connections]):
+                if connection is self._wakeup_reader:
+                    self._wakeup_reader.recv()
+                    continue
+
+                worker = connections[connection]
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    self._exited(worker)
+                    continue
+
+                self._dispatch(worker, message)
+
+    def _dispatch(self, worker: _Worker, message: tuple) -> None:
+        kind, thread_id, *payload = message
+        run = self.get(thread_id)
+        if run is None or run.done:
+            return
+
+        if kind == "events":
+            if run.status == RunStatus.QUEUED:
+                run.status = RunStatus.RUNNING
+            for event in payload[0]:
+                run._publish(*event)
+
+        elif kind == "done":
+            status, result, error = payload
+            self._complete(worker, thread_id, RunStatus(status), result, error)
+
+    def _complete(
+        self,
+        worker: _Worker,
+        thread_id: str,
+        status: RunStatus,
+        result: Dict[str, Any] | None,
+        error: str | None,
+    ) -> None:
+        with self._lock:
+            run = self._runs.get(thread_id)
+            callback = self._callbacks.pop(thread_id, None)
+            worker.active.discard(thread_id)
+            self._drained.notify_all()
+
+        if run is None or run.done:
+            return
+
+        if status != RunStatus.COMPLETED or callback is None:
+            run._finish(
+                status,
+                result=result,
+                error=RuntimeError(error) if error is not None else None,
+            )
+            metrics.increment(f"workflow_supervisor.{status.value}")
+            return
+
+        # Salvar a sessão não deve atrasar os eventos das outras rodadas
+        self._completions.submit(self._finish_completed, run, result, callback)
+
+    def _finish_completed(
+        self,
+        run: WorkflowRun,
+        result: Dict[str, Any],
+        callback: Callable[[Dict[str, Any]], None],
+    ) -> None:
+        try:
+            callback(result)
+        except Exception as e:
+            logger.exception("Falha ao concluir a rodada (%s)", run.thread_id)
+            run._finish(RunStatus.FAILED, error=e)
+            metrics.increment("workflow_supervisor.failed")
+            return
+
+        run._finish(RunStatus.COMPLETED, result=result)
+        metrics.increment("workflow_supervisor.completed")
+
+    def _exited(self, worker: _Worker) -> None:
+        """
+        Trata o término de um processo: esperado (ao remover o processo ou
+        encerrar o supervisor) ou não, quando as suas rodadas falham e ele é
+        substituído.
+        """
+        with self._lock:
+            if self._workers.get(worker.name) is worker:
+                del self._workers[worker.name]
+            active = list(worker.active)
+            unexpected = not worker.stopping
+            if unexpected:
+                self._ring.remove(worker.name)
+
+        worker.connection.close()
+        for thread_id in active:
+            self._complete(
+                worker,
+                thread_id,
+                RunStatus.FAILED if unexpected else RunStatus.CANCELLED,
+                None,
+                f"O processo {worker.name} terminou durante a rodada",
+            )
+
+        if not unexpected:
+            return
+
+        logger.error("O processo %s terminou inesperadamente", worker.name)
+        metrics.increment("workflow_supervisor.crashes")
+        if self.restart and not self._closed:
+            threading.Thread(
+                target=self._replace, args=(worker.name,), daemon=True
+            ).start()
+
+    def _replace(self, name: str) -> None:
+        try:
+            self._register(self._spawn(name))
+        except Exception:
+            logger.exception("Não foi possível substituir o processo %s", name)
+
+
+def _worker_main(
+    name: str, connection: Connection, factory: Callable[[], RunManager]
+) -> None:
+    """
+    Laço de um processo do workflow: executa as rodadas recebidas do
+    supervisor no seu RunManager e envia os eventos de volta
+    """
+    # O processo é encerrado pelo supervisor (ex: no Ctrl+C do servidor), e
+    # não diretamente pelo sinal, que seria visto como uma falha
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    manager = factory()
+    send_lock = threading.Lock()
+
+    def send(message: tuple) -> None:
+        with send_lock:
+            connection.send(message)
+
+    def forward(run: WorkflowRun) -> Callable[[], None]:
+        position = 0
+        finished = False
+        lock = threading.Lock()
+
+        def callback() -> None:
+            nonlocal position, finished
+            with lock:
+                if finished:
+                    return
+
+                done = run.done
+                events = run.events[position:]
+                position += len(events)
+                if events:
+                    send(("events", run.thread_id, [tuple(e) for e in events]))
+                if done:
+                    finished = True
+                    error = str(run.error) if run.error is not None else None
+                    send(("done", run.thread_id, run.status.value, run.result, error))
+
+        return callback
+
+    send(("ready", os.getpid()))
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                break
+
+            command, *payload = message
+            if command == "submit":
+                thread_id, state, config = payload
+                try:
+                    run = manager.submit(state, config)
+                except RuntimeError as e:
+                    send(("done", thread_id, RunStatus.FAILED.value, None, str(e)))
+                    continue
+                run.subscribe(forward(run))
+
+            elif command == "cancel":
+                manager.cancel(payload[0])
+
+            elif command == "ring":
+                nodes, replicas = payload
+                ring = HashRing(nodes, replicas=replicas)
+                for thread_id in manager.thread_ids:
+                    if ring.get(thread_id) != name:
+                        manager.release(thread_id)
+
+            elif command == "stop":
+                break
+    finally:
+        manager.shutdown()
+        connection.close()
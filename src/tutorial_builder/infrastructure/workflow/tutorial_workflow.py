@@ -1,12 +1,27 @@
-import streamlit as st
+import logging
 
 from typing import Dict, Any
-from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 from langgraph.graph import MessagesState, StateGraph, START, END
 
 from entities import Planner, Expert, Writer
-from interfaces import PlannerAgent, Workflow, PlannerAgent, ExpertAgent, WriterAgent
+from interfaces import (
+    PlannerAgent,
+    Workflow,
+    PlannerAgent,
+    ExpertAgent,
+    WriterAgent,
+    TroubleshootingAgent,
+    QAAgent,
+    TutorialRepository,
+    RetrievalIndex,
+)
 from persistence import MemoryState
+from services import ReadingService, split_sections
+
+logger = logging.getLogger(__name__)
 
 
 class TutorialState(MessagesState):
@@ -31,14 +46,26 @@ class TutorialWorkflow(Workflow):
         expert_service: ExpertAgent,
         writer_service: WriterAgent,
         memory_state: MemoryState,
+        troubleshooting_service: TroubleshootingAgent | None = None,
+        tutorial_repository: TutorialRepository | None = None,
+        retrieval_index: RetrievalIndex | None = None,
+        reading_service: ReadingService | None = None,
+        qa_service: QAAgent | None = None,
     ):
         self.planner_service = planner_service
         self.expert_service = expert_service
         self.writer_service = writer_service
         self.memory_state = memory_state
+        self.troubleshooting_service = troubleshooting_service
+        self.tutorial_repository = tutorial_repository
+        self.retrieval_index = retrieval_index
+        self.reading_service = reading_service
+        self.qa_service = qa_service
         self._workflow = None
 
-    def _create_planner_node(self, state: TutorialState) -> TutorialState:
+    def _create_planner_node(
+        self, state: TutorialState, config: RunnableConfig
+    ) -> TutorialState:
         """
         Nó responsável por planejar o tutorial com base nas entradas do usuário.
         """
@@ -57,6 +84,16 @@ class TutorialWorkflow(Workflow):
                 last_human_message, state["planner_output"]
             )
 
+            # Assunto e nível conhecidos: adianta o caminho de aprendizado
+            # enquanto o usuário responde às perguntas opcionais
+            if (
+                state["planner_output"].is_valid()
+                and not state["planner_output"].is_fullfilled()
+            ):
+                self.expert_service.speculate_learning_path(
+                    state["planner_output"], _session_id(config)
+                )
+
             # Gera a resposta
             system_message = self.planner_service.create_system_message(
                 state["planner_output"]
@@ -77,35 +114,47 @@ class TutorialWorkflow(Workflow):
 
         return state
 
-    def _create_expert_node(self, state: TutorialState) -> TutorialState:
+    def _create_expert_node(
+        self, state: TutorialState, config: RunnableConfig
+    ) -> TutorialState:
         """
         Nó responsável por fornecer conhecimento especializado sobre o assunto.
         """
         # Recupera o expert do estado se existir, senão pega um novo
         expert = state["expert_output"] or self.expert_service.get_expert()
 
-        self.expert_service.expert = expert
-
         expert.subject = state["planner_output"].subject
         expert.difficulty_level = state["planner_output"].level
         expert.project_type = state["planner_output"].project_type
         expert.environment = state["planner_output"].environment
         expert.instructions = state["planner_output"].instructions
 
+        # Progresso exibido durante a execução (modo de stream "custom", ver
+        # RunManager); sem um stream, as mensagens são descartadas
+        progress = get_stream_writer()
+
         try:
             if not expert.learning_path:
-                self.expert_service.generate_learning_path(state["planner_output"])
-
-                # Adiciona uma mensagem resumindo o caminho de aprendizado
+                # Exibe o caminho de aprendizado à medida que os passos chegam
                 summary = "Caminho de aprendizado gerado:\n\n"
-                for step in expert.learning_path:
-                    summary += f"{step.step_number}. {step.title} (Tempo estimado: {step.estimated_time} minutos)\n"
+                learning_path = []
+
+                for step in self.expert_service.stream_learning_path(
+                    state["planner_output"], session_id=_session_id(config)
+                ):
+                    learning_path.append(step)
+                    line = f"{step.step_number}. {step.title} (Tempo estimado: {step.estimated_time} minutos)"
+                    summary += line + "\n"
+                    progress(line)
 
                 summary += "\n\n**Digite OK para continuar.**"
 
+                expert.learning_path = learning_path
                 state["expert_output"] = expert
                 state["messages"].append(AIMessage(content=summary))
 
+                self.writer_service.prefetch_frame(expert)
+
                 return state
 
         except Exception as e:
@@ -114,10 +163,14 @@ class TutorialWorkflow(Workflow):
 
         try:
             current_step = expert.get_current_step()
-            step_content = self.expert_service.generate_step_content(current_step)
+            step_content = self.expert_service.generate_step_content(
+                current_step, expert
+            )
 
-            with st.expander(f"Passo {step_content.step_number}: Pré-requisitos"):
-                st.write(step_content.prerequisites)
+            progress(
+                f"**Passo {step_content.step_number}: Pré-requisitos**\n\n"
+                f"{step_content.prerequisites}"
+            )
 
             ai_message_md = f"""
 # Passo {step_content.step_number}: {step_content.title}
@@ -130,12 +183,66 @@ class TutorialWorkflow(Workflow):
             state["messages"].append(AIMessage(content=ai_message_md))
             state["expert_output"] = expert
 
+            self.writer_service.prefetch_section(step_content, expert)
+
             return state
 
         except Exception as e:
             print("\n\nErro na geração do conteúdo do passo atual:", str(e))
             return state
 
+    def _create_troubleshooting_node(self, state: TutorialState) -> TutorialState:
+        """
+        Nó responsável por solucionar um erro reportado pelo usuário no último
+        passo exibido.
+        """
+        expert = state["expert_output"]
+        step = expert.get_last_completed_step()
+        problem = state["messages"][-1].content
+
+        try:
+            trouble_shooting = self.troubleshooting_service.solve(expert, step, problem)
+        except Exception:
+            logger.exception("Erro na solução do problema reportado")
+            return state
+
+        ai_message_md = f"""
+## Solução de problema: Passo {step.step_number}
+
+{trouble_shooting.solution}
+
+**Digite OK para continuar.**
+"""
+
+        state["messages"].append(AIMessage(content=ai_message_md))
+        state["expert_output"] = expert
+
+        return state
+
+    def _create_qa_node(self, state: TutorialState) -> TutorialState:
+        """
+        Nó responsável por responder a uma pergunta sobre o tutorial concluído,
+        com base apenas nas seções relevantes para a pergunta.
+        """
+        writer = state["writer_output"]
+        question = state["messages"][-1].content
+
+        try:
+            answer = self.qa_service.answer(
+                question, writer.title or writer.subject or "", split_sections(writer)
+            )
+        except Exception:
+            logger.exception("Erro na resposta à pergunta sobre o tutorial")
+            return state
+
+        ai_message_md = answer.answer
+        if answer.sections:
+            ai_message_md += f"\n\n*Seções consultadas: {', '.join(answer.sections)}*"
+
+        state["messages"].append(AIMessage(content=ai_message_md))
+
+        return state
+
     def _create_writer_node(self, state: TutorialState) -> TutorialState:
         """
         Nó responsável por escrever o tutorial final com base nas saídas anteriores.
@@ -143,8 +250,6 @@ class TutorialWorkflow(Workflow):
         if state["writer_output"] is None:
             state["writer_output"] = Writer()
 
-        self.writer_service.expert = state["expert_output"]
-
         tutorial = self.writer_service.generate_tutorial(state["expert_output"])
 
         print("tutorial", tutorial)
@@ -154,8 +259,27 @@ class TutorialWorkflow(Workflow):
         state["writer_output"] = tutorial
         state["messages"].append(AIMessage(content=state["writer_output"].tutorial))
 
-        with open(f"tutorial-{state['writer_output'].subject}.md", "w") as f:
-            f.write(state["writer_output"].tutorial)
+        source = f"tutorial:{state['writer_output'].subject}"
+        tutorial_id = None
+        if self.tutorial_repository is not None:
+            tutorial_id = self.tutorial_repository.save(state["writer_output"])
+            source = f"tutorial:{tutorial_id}"
+            logger.info("Tutorial salvo no histórico: %s", tutorial_id)
+        else:
+            with open(f"tutorial-{state['writer_output'].subject}.md", "w") as f:
+                f.write(state["writer_output"].tutorial)
+
+        if self.retrieval_index is not None and state["writer_output"].tutorial:
+            self.retrieval_index.add(state["writer_output"].tutorial, source)
+
+        if self.reading_service is not None and state["writer_output"].tutorial:
+            self.reading_service.archive_tutorial(
+                state["writer_output"], history_id=tutorial_id
+            )
+
+        self.expert_service.save_learning_path(
+            state["planner_output"], state["expert_output"].learning_path
+        )
 
         return state
 
@@ -164,10 +288,47 @@ class TutorialWorkflow(Workflow):
         Função que decide para qual nó seguir após o planner.
         """
         if state["planner_output"] and state["planner_output"].is_fullfilled():
+            if self._is_error_report(state):
+                return "troubleshooting"
+
+            if self._is_tutorial_question(state):
+                return "qa"
+
             return "expert"
 
         return END
 
+    def _is_error_report(self, state: TutorialState) -> bool:
+        """
+        Verifica se a última mensagem do usuário relata um erro em um passo
+        já exibido.
+        """
+        expert = state["expert_output"]
+
+        return (
+            self.troubleshooting_service is not None
+            and expert is not None
+            and expert.get_last_completed_step() is not None
+            and isinstance(state["messages"][-1], HumanMessage)
+            and self.troubleshooting_service.is_error_report(
+                state["messages"][-1].content
+            )
+        )
+
+    def _is_tutorial_question(self, state: TutorialState) -> bool:
+        """
+        Verifica se a última mensagem do usuário é uma pergunta sobre o
+        tutorial já concluído.
+        """
+        writer = state["writer_output"]
+
+        return (
+            self.qa_service is not None
+            and writer is not None
+            and bool(writer.tutorial)
+            and isinstance(state["messages"][-1], HumanMessage)
+        )
+
     def _should_continue_expert(self, state: TutorialState) -> str:
         """
         Função que decide para qual nó seguir após o expert.
@@ -192,10 +353,14 @@ class TutorialWorkflow(Workflow):
             workflow.add_node("planner", self._create_planner_node)
             workflow.add_node("expert", self._create_expert_node)
             workflow.add_node("writer", self._create_writer_node)
+            workflow.add_node("troubleshooting", self._create_troubleshooting_node)
+            workflow.add_node("qa", self._create_qa_node)
 
             # Adiciona as arestas
             workflow.add_edge(START, "planner")
             workflow.add_edge("writer", END)
+            workflow.add_edge("troubleshooting", END)
+            workflow.add_edge("qa", END)
 
             # Adiciona as arestas condicionais
             workflow.add_conditional_edges("planner", self._should_continue_planner)
@@ -221,3 +386,10 @@ class TutorialWorkflow(Workflow):
         """
         workflow = self.compile()
         return workflow.invoke(state, config)
+
+
+def _session_id(config: RunnableConfig) -> str:
+    """
+    Retorna o identificador da sessão (thread_id) da configuração do grafo.
+    """
+    return str(config.get("configurable", {}).get("thread_id", "default"))
@@ -1,16 +1,228 @@
+import os
+
 from dotenv import load_dotenv
 
-from interfaces import PlannerAgent, LLMService, Workflow, ExpertAgent, WriterAgent
-from entities import Expert, Writer
-from llm import OpenAIService
-from persistence import MemoryState
-from workflow import TutorialWorkflow
-from services import PlannerService, ExpertService, WriterService
+from interfaces import (
+    PlannerAgent,
+    LLMService,
+    SessionStore,
+    Workflow,
+    ExpertAgent,
+    WriterAgent,
+    TutorialRepository,
+)
+from entities import Expert, Writer, WriterMode
+from llm import (
+    CancellableLLMService,
+    ContextGuardLLMService,
+    FakeLLMService,
+    OpenAIService,
+    OverflowStrategy,
+    SemanticCacheLLMService,
+    SemanticCachePolicy,
+    SingleFlightLLMService,
+    TokenBudget,
+    TokenStreamingLLMService,
+)
+from persistence import (
+    MemoryState,
+    MmapTutorialArchive,
+    SQLiteLearningPathLibrary,
+    SQLiteSessionStore,
+    SQLiteSolutionCache,
+    SQLiteTutorialRepository,
+)
+from retrieval import MemmapVectorIndex
+from workflow import RunManager, TutorialWorkflow, WorkerSupervisor
+from services import (
+    PlannerService,
+    ExpertService,
+    WriterService,
+    TroubleshootingService,
+    ReadingService,
+    QAService,
+)
 
 
 load_dotenv()
 
 
+# Orçamento de tokens por ponto de chamada do LLM (gpt-4o-mini: 128k de contexto)
+TOKEN_BUDGETS = {
+    "planner.extract_info": TokenBudget(
+        max_prompt_tokens=4_000, max_output_tokens=1_024
+    ),
+    "planner.response": TokenBudget(
+        max_prompt_tokens=16_000,
+        max_output_tokens=1_024,
+        strategy=OverflowStrategy.TRUNCATE_OLDEST,
+    ),
+    "expert.learning_path": TokenBudget(
+        max_prompt_tokens=4_000, max_output_tokens=4_096
+    ),
+    "expert.step_content": TokenBudget(
+        max_prompt_tokens=32_000,
+        max_output_tokens=8_192,
+        strategy=OverflowStrategy.COMPACT,
+    ),
+    "writer.tutorial": TokenBudget(
+        max_prompt_tokens=64_000,
+        max_output_tokens=16_384,
+        strategy=OverflowStrategy.COMPACT,
+    ),
+    "writer.section": TokenBudget(
+        max_prompt_tokens=16_000,
+        max_output_tokens=8_192,
+        strategy=OverflowStrategy.COMPACT,
+    ),
+    "writer.reduce": TokenBudget(max_prompt_tokens=8_000, max_output_tokens=4_096),
+    "writer.structured": TokenBudget(
+        max_prompt_tokens=64_000,
+        max_output_tokens=16_384,
+        strategy=OverflowStrategy.COMPACT,
+    ),
+    "troubleshooting.solve": TokenBudget(
+        max_prompt_tokens=16_000,
+        max_output_tokens=2_048,
+        strategy=OverflowStrategy.COMPACT,
+    ),
+    "qa.answer": TokenBudget(
+        max_prompt_tokens=4_000,
+        max_output_tokens=1_024,
+        strategy=OverflowStrategy.COMPACT,
+    ),
+    "writer.title": TokenBudget(
+        max_prompt_tokens=32_000,
+        max_output_tokens=256,
+        strategy=OverflowStrategy.COMPACT,
+    ),
+}
+
+
+# Pontos de chamada que aceitam respostas de prompts quase iguais.
+# O caminho de aprendizado depende apenas dos campos do plano, comparados um a um
+SEMANTIC_CACHE_POLICIES = {
+    "expert.learning_path": SemanticCachePolicy(
+        threshold=0.8,
+        key_pattern=(
+            r"^(?:ASSUNTO|NÍVEL DE DIFICULDADE|TIPO DE PROJETO|AMBIENTE"
+            r"|INSTRUÇÕES ADICIONAIS DO USUÁRIO): (.*)$"
+        ),
+        ttl_seconds=7 * 24 * 3600,
+        audit_rate=0.05,
+    ),
+}
+
+
+# Pontos de chamada com respostas curtas, enviadas parte a parte para quem
+# acompanha a execução (ex: pela API, com server-sent events)
+STREAMED_CALL_SITES = {"planner.response", "troubleshooting.solve", "qa.answer"}
+
+
+def fake_responder(prompt: str, call_site: str | None) -> str:
+    """
+    Resposta do LLM simulado (TUTORIAL_BUILDER_LLM=fake), para testes de
+    carga e desenvolvimento sem a API da OpenAI.
+    """
+    return (
+        f"Resposta simulada ({call_site or 'default'}). Sobre qual assunto você "
+        "gostaria de aprender e qual o seu nível de experiência?"
+    )
+
+
+def create_base_llm_service() -> LLMService:
+    """
+    Cria o serviço LLM que faz as chamadas: a OpenAI ou, com
+    TUTORIAL_BUILDER_LLM=fake, o LLM simulado, com a latência definida por
+    FAKE_LLM_LATENCY (por chamada) e FAKE_LLM_LATENCY_PER_TOKEN, em segundos.
+
+    Returns:
+        LLMService: O serviço LLM
+    """
+    if os.getenv("TUTORIAL_BUILDER_LLM", "openai") == "fake":
+        return FakeLLMService(
+            responder=fake_responder,
+            latency=float(os.getenv("FAKE_LLM_LATENCY", "0.2")),
+            latency_per_token=float(os.getenv("FAKE_LLM_LATENCY_PER_TOKEN", "0.005")),
+        )
+
+    return OpenAIService()
+
+
+def create_llm_service() -> LLMService:
+    """
+    Cria o serviço LLM com a guarda de contexto, o agrupamento de chamadas
+    idênticas em andamento, o cache semântico, o cancelamento pelas
+    execuções em segundo plano e a publicação das respostas parte a parte.
+
+    Returns:
+        LLMService: O serviço LLM configurado
+    """
+    return TokenStreamingLLMService(
+        CancellableLLMService(
+            SemanticCacheLLMService(
+                SingleFlightLLMService(
+                    ContextGuardLLMService(
+                        create_base_llm_service(), budgets=TOKEN_BUDGETS
+                    )
+                ),
+                policies=SEMANTIC_CACHE_POLICIES,
+            )
+        ),
+        call_sites=STREAMED_CALL_SITES,
+    )
+
+
+def create_learning_path_library() -> SQLiteLearningPathLibrary:
+    """
+    Cria a biblioteca de caminhos de aprendizado pré-calculados.
+
+    Returns:
+        SQLiteLearningPathLibrary: A biblioteca configurada
+    """
+    return SQLiteLearningPathLibrary(
+        os.getenv("LEARNING_PATH_LIBRARY", "learning_paths.db")
+    )
+
+
+def create_reading_service(llm_service: LLMService | None = None) -> ReadingService:
+    """
+    Cria o serviço do modo leitura, com o arquivo dos tutoriais concluídos.
+
+    Args:
+        llm_service: Serviço LLM para responder às perguntas sobre os
+            tutoriais (se omitido, o modo leitura não responde perguntas)
+
+    Returns:
+        ReadingService: O serviço configurado
+    """
+    return ReadingService(
+        MmapTutorialArchive(os.getenv("READING_ARCHIVE", "reading_archive")),
+        qa_agent=QAService(llm_service) if llm_service is not None else None,
+    )
+
+
+def create_tutorial_repository() -> TutorialRepository:
+    """
+    Cria o histórico dos tutoriais gerados.
+
+    Returns:
+        TutorialRepository: O histórico configurado
+    """
+    return SQLiteTutorialRepository(os.getenv("TUTORIAL_HISTORY", "tutorials.db"))
+
+
+def create_session_store() -> SessionStore:
+    """
+    Cria o armazenamento das sessões de conversa da API, compartilhado pelos
+    processos da API e do workflow.
+
+    Returns:
+        SessionStore: O armazenamento configurado
+    """
+    return SQLiteSessionStore(os.getenv("SESSION_STORE", "sessions.db"))
+
+
 def create_workflow() -> Workflow:
     """
     Cria o workflow do tutorial.
@@ -19,10 +231,25 @@ def create_workflow() -> Workflow:
         Workflow: O workflow configurado
     """
     # Inicializa as dependências
-    llm_service: LLMService = OpenAIService()
+    llm_service: LLMService = create_llm_service()
+    retrieval_index = MemmapVectorIndex(os.getenv("RETRIEVAL_INDEX", "retrieval_index"))
     planner_service: PlannerAgent = PlannerService(llm_service)
-    expert_service: ExpertAgent = ExpertService(llm_service, Expert())
-    writer_service: WriterAgent = WriterService(llm_service, Writer(), Expert())
+    expert_service: ExpertAgent = ExpertService(
+        llm_service,
+        Expert(),
+        library=create_learning_path_library(),
+        retrieval=retrieval_index,
+    )
+    writer_service: WriterAgent = WriterService(
+        llm_service,
+        Writer(),
+        Expert(),
+        mode=WriterMode(os.getenv("WRITER_MODE", WriterMode.SINGLE_CALL)),
+    )
+    troubleshooting_service = TroubleshootingService(
+        llm_service,
+        cache=SQLiteSolutionCache(os.getenv("SOLUTION_CACHE", "solutions.db")),
+    )
     memory_state = MemoryState()
 
     # Cria o workflow
@@ -31,4 +258,37 @@ def create_workflow() -> Workflow:
         expert_service=expert_service,
         writer_service=writer_service,
         memory_state=memory_state,
+        troubleshooting_service=troubleshooting_service,
+        tutorial_repository=create_tutorial_repository(),
+        retrieval_index=retrieval_index,
+        reading_service=create_reading_service(),
+        qa_service=QAService(llm_service),
     )
+
+
+def create_run_manager() -> RunManager:
+    """
+    Cria o gerenciador das execuções do workflow em segundo plano.
+
+    Returns:
+        RunManager: O gerenciador configurado
+    """
+    return RunManager(
+        create_workflow(), max_workers=int(os.getenv("WORKFLOW_WORKERS", "4"))
+    )
+
+
+def create_workflow_runner() -> RunManager | WorkerSupervisor:
+    """
+    Cria o executor das rodadas do workflow da API: com WORKFLOW_PROCESSES
+    maior que 1, um supervisor com esse número de processos (cada um com o
+    seu RunManager); senão, um RunManager neste processo.
+
+    Returns:
+        RunManager | WorkerSupervisor: O executor configurado
+    """
+    processes = int(os.getenv("WORKFLOW_PROCESSES", "1"))
+    if processes > 1:
+        return WorkerSupervisor(create_run_manager, processes=processes)
+
+    return create_run_manager()
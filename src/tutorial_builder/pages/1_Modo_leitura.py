@@ -0,0 +1,186 @@
+import os
+
+import streamlit as st
+
+from entities import TutorialAnswer
+from main import create_llm_service, create_reading_service
+from services import ReadingService
+
+# Tutoriais listados por página na barra lateral
+PAGE_SIZE = 20
+
+
+@st.cache_resource
+def get_reading_service() -> ReadingService:
+    # O arquivo é aberto uma única vez e compartilhado entre as sessões; as
+    # perguntas sobre os tutoriais só são respondidas com a chave da OpenAI
+    llm_service = create_llm_service() if os.getenv("OPENAI_API_KEY") else None
+    return create_reading_service(llm_service)
+
+
+def init_session_state() -> None:
+    if "reading_list_page" not in st.session_state:
+        st.session_state.reading_list_page = 1
+    if "reading_tutorial_id" not in st.session_state:
+        st.session_state.reading_tutorial_id = None
+    if "reading_section" not in st.session_state:
+        st.session_state.reading_section = 1
+    if "reading_answers" not in st.session_state:
+        st.session_state.reading_answers = {}
+
+
+def open_tutorial(tutorial_id: int) -> None:
+    st.session_state.reading_tutorial_id = tutorial_id
+    st.session_state.reading_section = 1
+
+
+def go_to_section(number: int) -> None:
+    st.session_state.reading_section = number
+
+
+def change_list_page(delta: int) -> None:
+    st.session_state.reading_list_page = max(
+        1, st.session_state.reading_list_page + delta
+    )
+
+
+def show_tutorial_list(service: ReadingService) -> None:
+    st.sidebar.header("Tutoriais")
+
+    tutorials, has_more = service.list_tutorials(
+        st.session_state.reading_list_page, PAGE_SIZE
+    )
+    if not tutorials:
+        st.sidebar.info("Nenhum tutorial concluído ainda.")
+        return
+
+    for tutorial in tutorials:
+        st.sidebar.button(
+            tutorial.title or f"Tutorial {tutorial.id}",
+            key=f"tutorial-{tutorial.id}",
+            on_click=open_tutorial,
+            args=(tutorial.id,),
+            use_container_width=True,
+            type=(
+                "primary"
+                if tutorial.id == st.session_state.reading_tutorial_id
+                else "secondary"
+            ),
+        )
+
+    previous, current, following = st.sidebar.columns([1, 2, 1])
+    previous.button(
+        "←",
+        key="list-previous",
+        on_click=change_list_page,
+        args=(-1,),
+        disabled=st.session_state.reading_list_page == 1,
+    )
+    current.caption(f"Página {st.session_state.reading_list_page}")
+    following.button(
+        "→",
+        key="list-next",
+        on_click=change_list_page,
+        args=(1,),
+        disabled=not has_more,
+    )
+
+
+def show_answer(answer: TutorialAnswer) -> None:
+    message = st.chat_message("assistant")
+    message.markdown(answer.answer)
+    if answer.sections:
+        message.caption("Seções consultadas: " + ", ".join(answer.sections))
+
+
+def show_questions(service: ReadingService, tutorial_id: int, number: int) -> None:
+    st.divider()
+    st.subheader("Dúvidas sobre o tutorial")
+
+    answers = st.session_state.reading_answers.setdefault(tutorial_id, [])
+    for answer in answers:
+        st.chat_message("user").markdown(answer.question)
+        show_answer(answer)
+
+    question = st.chat_input("Pergunte sobre este tutorial")
+    if not question:
+        return
+
+    st.chat_message("user").markdown(question)
+    with st.spinner("Consultando as seções do tutorial..."):
+        answer = service.ask(tutorial_id, question, current_section=number)
+
+    if answer is None:
+        st.warning("Não foi possível responder à pergunta.")
+        return
+
+    answers.append(answer)
+    show_answer(answer)
+
+
+def show_section(service: ReadingService) -> None:
+    section = None
+    if st.session_state.reading_tutorial_id is not None:
+        section = service.read(
+            st.session_state.reading_tutorial_id, st.session_state.reading_section
+        )
+
+    if section is None:
+        st.info("Escolha um tutorial na barra lateral para começar a leitura.")
+        return
+
+    tutorial = section.tutorial
+    total = len(tutorial.sections)
+
+    st.title(tutorial.title or "Tutorial")
+    st.caption(
+        " · ".join(
+            value for value in (tutorial.subject, tutorial.difficulty_level) if value
+        )
+    )
+
+    number = st.selectbox(
+        "Seção",
+        options=range(1, total + 1),
+        index=section.number - 1,
+        format_func=lambda number: tutorial.sections[number - 1],
+    )
+    if number != section.number:
+        go_to_section(number)
+        st.rerun()
+
+    st.progress(section.number / total, text=f"Seção {section.number} de {total}")
+
+    st.header(section.title)
+    st.markdown(section.content)
+
+    previous, _, following = st.columns([1, 3, 1])
+    previous.button(
+        "← Anterior",
+        on_click=go_to_section,
+        args=(section.number - 1,),
+        disabled=not section.has_previous,
+    )
+    following.button(
+        "Próxima →",
+        on_click=go_to_section,
+        args=(section.number + 1,),
+        disabled=not section.has_next,
+    )
+
+    if service.qa_agent is not None:
+        show_questions(service, tutorial.id, section.number)
+
+
+def main() -> None:
+    st.set_page_config(page_title="Modo leitura", layout="wide")
+
+    init_session_state()
+
+    service = get_reading_service()
+    show_tutorial_list(service)
+    show_section(service)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Job em lote que pré-calcula caminhos de aprendizado para os assuntos mais
+pedidos e os salva na biblioteca consultada pelo ExpertService.
+
+Uso:
+    python src/tutorial_builder/precompute_learning_paths.py python react docker
+    python src/tutorial_builder/precompute_learning_paths.py --subjects-file assuntos.txt
+"""
+
+import argparse
+import logging
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List
+
+from entities import Expert, Planner
+from services import ExpertService
+from main import create_learning_path_library, create_llm_service
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ["iniciante", "intermediario", "avancado"]
+
+
+def precompute(
+    subjects: List[str],
+    levels: List[str] = LEVELS,
+    workers: int = 4,
+    force: bool = False,
+) -> int:
+    """
+    Gera e salva os caminhos de aprendizado de cada combinação assunto/nível.
+
+    Args:
+        subjects: Assuntos a serem pré-calculados
+        levels: Níveis de dificuldade
+        workers: Quantidade de gerações em paralelo
+        force: Regenera caminhos que já existem na biblioteca
+
+    Returns:
+        int: Quantidade de caminhos gerados
+    """
+    llm_service = create_llm_service()
+    library = create_learning_path_library()
+    prompt_version = ExpertService(llm_service, Expert()).prompt_version
+
+    library.purge(prompt_version)
+
+    planners = [
+        Planner(subject=subject, level=level)
+        for subject in subjects
+        for level in levels
+    ]
+    if not force:
+        planners = [
+            planner
+            for planner in planners
+            if library.find(planner, prompt_version) is None
+        ]
+
+    def generate(planner: Planner) -> Planner:
+        expert_service = ExpertService(llm_service, Expert())
+        learning_path = expert_service.generate_learning_path(planner)
+        library.save(planner, learning_path, prompt_version, source="precompute")
+        return planner
+
+    generated = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(generate, planner) for planner in planners]
+
+        for future in as_completed(futures):
+            try:
+                planner = future.result()
+            except Exception as e:
+                logger.error("Falha ao gerar caminho de aprendizado: %s", e)
+                continue
+
+            generated += 1
+            logger.info("Caminho gerado: %s (%s)", planner.subject, planner.level)
+
+    return generated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("subjects", nargs="*", help="Assuntos a pré-calcular")
+    parser.add_argument(
+        "--subjects-file", help="Arquivo com um assunto por linha (# comenta)"
+    )
+    parser.add_argument("--levels", nargs="+", choices=LEVELS, default=LEVELS)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    subjects = list(args.subjects)
+    if args.subjects_file:
+        with open(args.subjects_file, encoding="utf-8") as f:
+            subjects += [
+                line.strip()
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+
+    if not subjects:
+        parser.error("informe ao menos um assunto")
+
+    logging.basicConfig(level=logging.INFO)
+
+    generated = precompute(subjects, args.levels, args.workers, args.force)
+    print(f"{generated} caminhos de aprendizado gerados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Torna os pacotes do projeto importáveis pelos testes, espelhando o
+mapeamento de pacotes definido em `pyproject.toml`.
+
+Uso:
+    python -m unittest
+"""
+
+import sys
+
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src" / "tutorial_builder"
+
+for path in (
+    SRC,
+    SRC / "domain",
+    SRC / "application",
+    SRC / "infrastructure",
+):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+
+from langchain_core.messages import HumanMessage
+
+from entities import Expert, ExpertStep, Planner, StepStatus, Writer
+from llm import FakeLLMService
+from persistence import MemoryState, SQLiteTutorialRepository
+from services import ExpertService, PlannerService, WriterService
+from workflow import TutorialWorkflow
+
+# Texto longo o bastante para ser guardado no armazenamento de blobs
+CONTENT = "\n\n".join(f"Parágrafo {n} do conteúdo do passo. " * 4 for n in range(8))
+
+
+def make_state() -> dict:
+    return {
+        "messages": [HumanMessage(content="OK")],
+        "planner_output": Planner(
+            subject="Go",
+            level="iniciante",
+            project_type="api",
+            environment="linux",
+            instructions="N/A",
+        ),
+        "expert_output": Expert(
+            subject="Go",
+            learning_path=[
+                ExpertStep(
+                    step_number=n,
+                    title=f"Passo {n}",
+                    description=f"Descrição {n}",
+                    estimated_time=10,
+                    status=StepStatus.COMPLETED if n == 1 else StepStatus.PENDING,
+                    content=CONTENT if n == 1 else None,
+                )
+                for n in (1, 2)
+            ],
+        ),
+        "writer_output": None,
+    }
+
+
+class CheckpointBlobsTest(unittest.TestCase):
+    """
+    Os blobs dos checkpoints são descartados com a última conversa que os
+    referencia.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.memory_state = MemoryState()
+
+        llm = FakeLLMService(responder=lambda prompt, site: CONTENT)
+        workflow = TutorialWorkflow(
+            PlannerService(llm),
+            ExpertService(llm, Expert()),
+            WriterService(llm, Writer(), Expert()),
+            self.memory_state,
+            tutorial_repository=SQLiteTutorialRepository(
+                f"{self.directory.name}/tutorials.db"
+            ),
+        )
+        self.graph = workflow.compile()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def config(self, thread_id: str) -> dict:
+        return {"configurable": {"thread_id": thread_id}}
+
+    def test_blobs_are_released_with_the_last_thread(self):
+        for thread_id in ("a", "b"):
+            self.graph.invoke(make_state(), self.config(thread_id))
+
+        blob_store = self.memory_state.blob_store
+        blobs = len(blob_store)
+        self.assertGreater(blobs, 0)
+
+        # Os blobs compartilhados continuam disponíveis para a outra conversa
+        self.graph.checkpointer.delete_thread("a")
+        self.assertEqual(len(blob_store), blobs)
+        state = self.graph.get_state(self.config("b")).values
+        self.assertEqual(state["expert_output"].learning_path[0].content, CONTENT)
+
+        self.graph.checkpointer.delete_thread("b")
+        self.assertEqual(len(blob_store), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
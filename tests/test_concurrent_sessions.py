@@ -0,0 +1,129 @@
+import re
+import tempfile
+import unittest
+
+from langchain_core.messages import HumanMessage
+
+from entities import Expert, ExpertStep, Planner, StepStatus, Writer
+from llm import CancellableLLMService, FakeLLMService
+from persistence import MemoryState, SQLiteTutorialRepository
+from services import ExpertService, PlannerService, WriterService
+from workflow import RunManager, RunStatus, TutorialWorkflow
+
+# Assunto da sessão, nos prompts do passo e do tutorial final
+SUBJECT = re.compile(r"(?:especialista em|no assunto:) (\w+)")
+
+
+def subject_of(prompt: str) -> str:
+    return SUBJECT.search(prompt).group(1)
+
+
+def tutorial_responder(prompt: str, call_site: str | None) -> str:
+    return f"# Tutorial de {subject_of(prompt)}"
+
+
+def step_responder(prompt: str, schema: dict, call_site: str | None) -> dict:
+    subject = subject_of(prompt)
+    return {"content": f"Conteúdo de {subject}", "prerequisites": subject}
+
+
+def make_state(subject: str) -> dict:
+    planner = Planner(
+        subject=subject,
+        level="iniciante",
+        project_type="api",
+        environment="linux",
+        instructions="N/A",
+    )
+    expert = Expert(
+        subject=subject,
+        learning_path=[
+            ExpertStep(
+                step_number=1,
+                title=f"{subject}: passo 1",
+                description="Primeiro passo",
+                prerequisites=subject,
+                content=f"Conteúdo de {subject}",
+                estimated_time=10,
+                status=StepStatus.COMPLETED,
+            ),
+            ExpertStep(
+                step_number=2,
+                title=f"{subject}: passo 2",
+                description="Segundo passo",
+                estimated_time=10,
+            ),
+        ],
+    )
+
+    return {
+        "messages": [HumanMessage(content="OK")],
+        "planner_output": planner,
+        "expert_output": expert,
+        "writer_output": None,
+    }
+
+
+class ConcurrentSessionsTest(unittest.TestCase):
+    """
+    Rodadas de conversas diferentes executadas ao mesmo tempo pelo mesmo
+    workflow não podem misturar os passos nem os tutoriais das sessões.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        # A latência mantém as duas rodadas em andamento ao mesmo tempo
+        llm = CancellableLLMService(
+            FakeLLMService(
+                responder=tutorial_responder,
+                structured_responder=step_responder,
+                latency=0.2,
+            )
+        )
+        workflow = TutorialWorkflow(
+            PlannerService(llm),
+            ExpertService(llm, Expert()),
+            WriterService(llm, Writer(), Expert()),
+            MemoryState(),
+            tutorial_repository=SQLiteTutorialRepository(
+                f"{self.directory.name}/tutorials.db"
+            ),
+        )
+        self.manager = RunManager(workflow, max_workers=2)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self.directory.cleanup()
+
+    def test_sessions_keep_their_own_steps_and_tutorials(self):
+        subjects = ["Go", "Rust"]
+        runs = {
+            subject: self.manager.submit(
+                make_state(subject), {"configurable": {"thread_id": subject}}
+            )
+            for subject in subjects
+        }
+
+        for subject, run in runs.items():
+            self.assertTrue(run.wait(timeout=30))
+            self.assertEqual(run.status, RunStatus.COMPLETED, run.error)
+
+            expert = run.result["expert_output"]
+            self.assertEqual(
+                [step.title for step in expert.learning_path],
+                [f"{subject}: passo 1", f"{subject}: passo 2"],
+            )
+            self.assertEqual(expert.learning_path[1].content, f"Conteúdo de {subject}")
+
+            writer = run.result["writer_output"]
+            self.assertEqual(writer.subject, subject)
+            self.assertEqual(writer.tutorial, f"# Tutorial de {subject}")
+
+        self.assertIsNot(
+            runs["Go"].result["writer_output"], runs["Rust"].result["writer_output"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from services.error_signature import is_error_report
+
+
+class ErrorReportTest(unittest.TestCase):
+    """
+    Só mensagens que relatam um erro de fato são encaminhadas para a solução
+    de problemas; menções negadas ("sem erros") seguem o tutorial.
+    """
+
+    def test_negated_mentions_are_not_error_reports(self):
+        for message in (
+            "ok, sem erros",
+            "Deu certo, nenhum erro",
+            "Não deu erro nenhum, pode seguir",
+            "ran it, no errors",
+        ):
+            with self.subTest(message=message):
+                self.assertFalse(is_error_report(message))
+
+    def test_error_reports(self):
+        for message in (
+            "deu erro ao rodar o comando",
+            "nenhum erro no build, mas o teste falhou",
+            "bash: go: command not found",
+            "Traceback (most recent call last):\n"
+            '  File "app.py", line 1, in <module>\n'
+            "ModuleNotFoundError: No module named 'flask'",
+        ):
+            with self.subTest(message=message):
+                self.assertTrue(is_error_report(message))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from entities import Expert, ExpertStep, RetrievedChunk, StepStatus
+from interfaces import RetrievalIndex
+from llm import FakeLLMService
+from services import ExpertService
+
+
+class ForeignIndex(RetrievalIndex):
+    """
+    Índice que sempre devolve um passo de outro usuário com o mesmo assunto
+    """
+
+    def add(self, text: str, source: str) -> int:
+        return 0
+
+    def search(self, query: str, k: int = 3) -> list[RetrievedChunk]:
+        return [RetrievedChunk(text="Passo 3 de outro usuário", source="step:Go:3")]
+
+
+def make_expert(steps: int) -> Expert:
+    return Expert(
+        subject="Go",
+        learning_path=[
+            ExpertStep(
+                step_number=n,
+                title=f"Passo {n}",
+                description=f"Descrição {n}",
+                content=f"Conteúdo da sessão {n}" if n < steps else None,
+                estimated_time=10,
+                status=StepStatus.COMPLETED if n < steps else StepStatus.PENDING,
+            )
+            for n in range(1, steps + 1)
+        ],
+    )
+
+
+class ExpertPromptTest(unittest.TestCase):
+    def setUp(self):
+        self.prompts = []
+
+        def responder(prompt: str, schema: dict, call_site: str | None) -> dict:
+            self.prompts.append(prompt)
+            return {"content": "novo conteúdo", "prerequisites": ""}
+
+        self.service = ExpertService(
+            FakeLLMService(structured_responder=responder),
+            Expert(),
+            retrieval=ForeignIndex(),
+            recent_steps=2,
+        )
+
+    def test_recent_steps_of_the_session_keep_their_content(self):
+        expert = make_expert(6)
+        self.service.generate_step_content(expert.get_step(6), expert)
+
+        prompt = self.prompts[-1]
+        self.assertIn("Conteúdo da sessão 4", prompt)
+        self.assertIn("Conteúdo da sessão 5", prompt)
+        self.assertNotIn("Conteúdo da sessão 3", prompt)
+        self.assertIn("Descrição 3", prompt)
+
+        # Os trechos recuperados são apenas referências extras
+        self.assertIn("Passo 3 de outro usuário", prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
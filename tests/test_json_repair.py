@@ -0,0 +1,30 @@
+import unittest
+
+from entities import ExpertStep
+from llm import FakeLLMService
+from services.json_repair import JsonRepairError, JsonRepairService
+
+FIXED = '[{"step_number": 1, "title": "Instalar o Go", "estimated_time": 5}]'
+
+
+class JsonRepairScalarTest(unittest.TestCase):
+    """
+    Respostas escalares, quando se espera uma lista de objetos, seguem para o
+    reparo em vez de interromper a chamada com TypeError.
+    """
+
+    def test_scalar_is_repaired_by_the_llm(self):
+        service = JsonRepairService(FakeLLMService(responder=lambda p, s: FIXED))
+
+        for text in ("42", "true", 42):
+            with self.subTest(text=text):
+                steps = service.parse(text, ExpertStep, many=True)
+                self.assertEqual([step.title for step in steps], ["Instalar o Go"])
+
+    def test_scalar_without_llm_fails_with_repair_error(self):
+        with self.assertRaises(JsonRepairError):
+            JsonRepairService().parse("42", ExpertStep, many=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
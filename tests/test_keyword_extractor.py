@@ -0,0 +1,41 @@
+import unittest
+
+from services.keyword_extractor import extract_keywords
+
+TUTORIAL = """
+# Tutorial de Go
+
+## Instalando o compilador
+
+Instale o compilador e crie o módulo com `go mod init`.
+
+## Criando a API
+
+Crie a API com o pacote net/http. O compilador gera um binário.
+"""
+
+
+class KeywordExtractorTest(unittest.TestCase):
+    def test_short_subjects_are_kept(self):
+        for subject in ("Go", "C", "R"):
+            with self.subTest(subject=subject):
+                keywords = extract_keywords(
+                    f"Tutorial de {subject}", TUTORIAL, subject=subject
+                )
+                self.assertEqual(keywords[0], subject)
+                self.assertEqual(keywords.count(subject), 1)
+
+    def test_short_title_words_are_kept_without_subject(self):
+        keywords = extract_keywords("Tutorial de Go", TUTORIAL)
+
+        self.assertIn("Go", keywords)
+        self.assertIn("compilador", keywords)
+
+    def test_limit_includes_the_subject(self):
+        self.assertEqual(
+            len(extract_keywords("Go", TUTORIAL, limit=3, subject="Go")), 3
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
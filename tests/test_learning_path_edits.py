@@ -0,0 +1,88 @@
+import unittest
+
+from entities import Expert, ExpertStep, StepStatus
+
+
+def make_expert(depends_on: dict[int, list[int]]) -> Expert:
+    return Expert(
+        subject="Go",
+        learning_path=[
+            ExpertStep(
+                step_number=n,
+                title=f"Passo {n}",
+                description=f"Descrição {n}",
+                content=f"Conteúdo {n}",
+                estimated_time=10,
+                depends_on=depends_on.get(n, []),
+                status=StepStatus.COMPLETED,
+            )
+            for n in range(1, 6)
+        ],
+    )
+
+
+def titles(expert: Expert) -> list[str]:
+    return [step.title for step in expert.learning_path]
+
+
+class LearningPathEditsTest(unittest.TestCase):
+    def test_invalidation_returns_transitive_dependents(self):
+        expert = make_expert({3: [2], 4: [3], 5: [1]})
+
+        self.assertEqual(expert.invalidate_step(2), [2, 3, 4])
+        self.assertEqual(
+            [step.status for step in expert.learning_path],
+            [
+                StepStatus.COMPLETED,
+                StepStatus.PENDING,
+                StepStatus.PENDING,
+                StepStatus.PENDING,
+                StepStatus.COMPLETED,
+            ],
+        )
+        self.assertIsNone(expert.get_step(3).content)
+
+    def test_insert_renumbers_following_steps(self):
+        expert = make_expert({3: [2], 5: [4]})
+
+        step = expert.insert_step(2, "Novo passo", depends_on=[1])
+
+        self.assertEqual(step.step_number, 2)
+        self.assertEqual(titles(expert)[:3], ["Passo 1", "Novo passo", "Passo 2"])
+        self.assertEqual(
+            [s.step_number for s in expert.learning_path], [1, 2, 3, 4, 5, 6]
+        )
+        self.assertEqual(expert.get_step(4).depends_on, [3])
+        self.assertEqual(expert.get_step(6).depends_on, [5])
+        self.assertEqual(expert.get_step(4).status, StepStatus.COMPLETED)
+
+    def test_remove_drops_dependency_and_invalidates_dependents(self):
+        expert = make_expert({3: [1, 2], 4: [3]})
+
+        self.assertEqual(expert.remove_step(2), [2, 3])
+        self.assertEqual(titles(expert), ["Passo 1", "Passo 3", "Passo 4", "Passo 5"])
+        self.assertEqual(expert.get_step(2).depends_on, [1])
+        self.assertEqual(expert.get_step(3).depends_on, [2])
+        self.assertEqual(expert.get_step(4).status, StepStatus.COMPLETED)
+
+    def test_move_keeps_dependencies_sorted(self):
+        expert = make_expert({5: [2, 4]})
+
+        # "Passo 4" vai para antes de "Passo 2": as dependências de
+        # "Passo 5" passam a ser [4, 2] se não forem reordenadas
+        self.assertEqual(expert.move_step(4, 2), [2, 5])
+        self.assertEqual(
+            titles(expert), ["Passo 1", "Passo 4", "Passo 2", "Passo 3", "Passo 5"]
+        )
+        self.assertEqual(expert.get_step(5).depends_on, [2, 3])
+
+    def test_move_before_a_dependency_is_rejected(self):
+        expert = make_expert({3: [2]})
+
+        with self.assertRaises(ValueError):
+            expert.move_step(3, 1)
+        self.assertEqual(titles(expert), [f"Passo {n}" for n in range(1, 6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
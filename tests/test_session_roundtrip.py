@@ -0,0 +1,93 @@
+import tempfile
+import unittest
+import warnings
+
+from langchain_core.messages import HumanMessage
+
+from entities import Expert, ExpertStep, Planner, StepStatus, Writer
+from llm import FakeLLMService
+from persistence import MemoryState, SQLiteSessionStore, SQLiteTutorialRepository
+from services import ExpertService, PlannerService, WriterService
+from workflow import TutorialWorkflow
+
+
+def make_state() -> dict:
+    return {
+        "messages": [HumanMessage(content="OK")],
+        "planner_output": Planner(
+            subject="Go",
+            level="iniciante",
+            project_type="api",
+            environment="linux",
+            instructions="N/A",
+        ),
+        "expert_output": Expert(
+            subject="Go",
+            learning_path=[
+                ExpertStep(
+                    step_number=n,
+                    title=f"Passo {n}",
+                    description=f"Descrição {n}",
+                    estimated_time=10,
+                    status=StepStatus.COMPLETED if n == 1 else StepStatus.PENDING,
+                    content="Conteúdo" if n == 1 else None,
+                )
+                for n in (1, 2)
+            ],
+        ),
+        "writer_output": None,
+    }
+
+
+class SessionRoundtripTest(unittest.TestCase):
+    """
+    Sessões restauradas do SQLiteSessionStore voltam com as mesmas classes de
+    entidade usadas pelo workflow e seguem pelo workflow até o tutorial final.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SQLiteSessionStore(f"{self.directory.name}/sessions.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_restored_session_runs_through_the_workflow(self):
+        session_id = self.store.create()
+        self.store.save(session_id, make_state())
+        state = self.store.get(session_id)
+
+        self.assertIsInstance(state["planner_output"], Planner)
+        self.assertIsInstance(state["expert_output"], Expert)
+        self.assertIsInstance(state["expert_output"].learning_path[0], ExpertStep)
+
+        # Com as classes corretas, a validação e a serialização não reclamam
+        Writer(subject="Go", expert=state["expert_output"])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            state["expert_output"].model_dump()
+
+        llm = FakeLLMService(responder=lambda prompt, site: "# Tutorial de Go")
+        workflow = TutorialWorkflow(
+            PlannerService(llm),
+            ExpertService(llm, Expert()),
+            WriterService(llm, Writer(), Expert()),
+            MemoryState(),
+            tutorial_repository=SQLiteTutorialRepository(
+                f"{self.directory.name}/tutorials.db"
+            ),
+        )
+        result = workflow.compile().invoke(
+            state, {"configurable": {"thread_id": session_id}}
+        )
+        self.store.save(session_id, result)
+
+        restored = self.store.get(session_id)
+        self.assertIsInstance(restored["writer_output"], Writer)
+        self.assertIsInstance(restored["writer_output"].expert, Expert)
+        self.assertEqual(restored["writer_output"].tutorial, "# Tutorial de Go")
+        self.assertTrue(restored["expert_output"].is_completed())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+
+from langchain_core.messages import HumanMessage
+
+from llm import FakeLLMService, SingleFlightLLMService
+
+
+class SlowStreamLLMService(FakeLLMService):
+    """
+    Streaming lento que registra quando o gerador é fechado
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.closed = threading.Event()
+        self.chunks_sent = 0
+
+    def stream(self, messages, call_site=None):
+        try:
+            for n in range(50):
+                self.chunks_sent += 1
+                yield f"parte {n} "
+                time.sleep(0.01)
+        finally:
+            self.closed.set()
+
+
+class SingleFlightStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.upstream = SlowStreamLLMService()
+        self.llm = SingleFlightLLMService(self.upstream)
+        self.messages = [HumanMessage(content="Explique Go")]
+
+    def test_stream_without_consumers_closes_the_request(self):
+        chunks = self.llm.stream(self.messages)
+        next(chunks)
+        chunks.close()
+
+        self.assertTrue(self.upstream.closed.wait(timeout=5))
+        self.assertLess(self.upstream.chunks_sent, 50)
+
+    def test_remaining_consumer_keeps_the_stream(self):
+        first = self.llm.stream(self.messages)
+        second = self.llm.stream(self.messages)
+        next(first)
+        next(second)
+        first.close()
+
+        self.assertEqual(len(list(second)), 49)
+        self.assertEqual(self.upstream.chunks_sent, 50)
+        self.assertEqual(self.llm.stats["coalesced"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
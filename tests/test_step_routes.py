@@ -0,0 +1,117 @@
+import asyncio
+import json
+import unittest
+
+from api import create_app
+from entities import Expert, ExpertStep, StepStatus, Writer
+from persistence import InMemorySessionStore, initial_state
+
+
+class IdleRuns:
+    """
+    Gerenciador de rodadas sem rodadas em andamento
+    """
+
+    def get(self, thread_id: str) -> None:
+        return None
+
+    def shutdown(self) -> None:
+        pass
+
+
+def make_expert() -> Expert:
+    return Expert(
+        subject="Go",
+        learning_path=[
+            ExpertStep(
+                step_number=n,
+                title=f"Passo {n}",
+                description=f"Descrição {n}",
+                content=f"Conteúdo {n}",
+                estimated_time=10,
+                depends_on=[n - 1] if n == 3 else [],
+                status=StepStatus.COMPLETED,
+            )
+            for n in range(1, 5)
+        ],
+    )
+
+
+class StepRoutesTest(unittest.TestCase):
+    """
+    As rotas de edição dos passos alteram o caminho de aprendizado da sessão
+    e deixam pendentes os passos a serem gerados novamente.
+    """
+
+    def setUp(self):
+        self.sessions = InMemorySessionStore()
+        self.app = create_app(IdleRuns(), self.sessions)
+
+        self.session_id = self.sessions.create()
+        state = initial_state()
+        state["expert_output"] = make_expert()
+        state["writer_output"] = Writer(subject="Go", tutorial="# Tutorial de Go")
+        self.sessions.save(self.session_id, state)
+
+    def request(self, method: str, path: str, payload: dict | None = None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": body}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "headers": []}
+        asyncio.run(self.app(scope, receive, send))
+
+        return sent[0]["status"], json.loads(sent[1]["body"])
+
+    def test_feedback_leaves_step_and_dependents_pending(self):
+        status, body = self.request(
+            "PATCH",
+            f"/sessions/{self.session_id}/steps/2",
+            {"feedback": "Mais exemplos, por favor"},
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body["pending_steps"], [2, 3])
+
+        state = self.sessions.get(self.session_id)
+        expert = state["expert_output"]
+        self.assertEqual(expert.get_current_step().step_number, 2)
+        self.assertEqual(expert.get_step(2).feedback, "Mais exemplos, por favor")
+        self.assertEqual(expert.get_step(4).status, StepStatus.COMPLETED)
+        self.assertIsNone(state["writer_output"])
+
+    def test_insert_and_remove_renumber_the_steps(self):
+        path = f"/sessions/{self.session_id}/steps"
+        status, body = self.request("POST", path, {"position": 1, "title": "Setup"})
+        self.assertEqual((status, body["pending_steps"]), (201, [1]))
+
+        status, body = self.request("DELETE", f"{path}/3")
+        self.assertEqual((status, body["pending_steps"]), (200, [3]))
+
+        expert = self.sessions.get(self.session_id)["expert_output"]
+        self.assertEqual(
+            [step.title for step in expert.learning_path],
+            ["Setup", "Passo 1", "Passo 3", "Passo 4"],
+        )
+        self.assertEqual(expert.get_step(3).depends_on, [])
+
+    def test_invalid_edit_is_rejected_without_saving(self):
+        status, _ = self.request(
+            "PATCH",
+            f"/sessions/{self.session_id}/steps/3",
+            {"title": "Outro título", "position": 1},
+        )
+
+        self.assertEqual(status, 400)
+        expert = self.sessions.get(self.session_id)["expert_output"]
+        self.assertEqual(expert.get_step(3).title, "Passo 3")
+        self.assertTrue(expert.is_completed())
+
+
+if __name__ == "__main__":
+    unittest.main()